@@ -0,0 +1,49 @@
+"""Compatibility search index
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'compatibility_index',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('profile_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('moon_state', sa.Integer(), nullable=False),
+        sa.Column('is_manglik', sa.Integer(), nullable=True),
+        sa.Column('manglik_cancelled', sa.Integer(), nullable=True),
+        sa.Column('birth_date', sa.DateTime(), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['profile_id'], ['profiles.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('profile_id')
+    )
+    op.create_index('ix_compatibility_index_id', 'compatibility_index', ['id'])
+    op.create_index('ix_compatibility_index_user_id', 'compatibility_index', ['user_id'])
+    op.create_index('ix_compatibility_index_birth_date', 'compatibility_index', ['birth_date'])
+    op.create_index('ix_compatibility_index_bucket', 'compatibility_index', ['user_id', 'moon_state', 'is_manglik'])
+    op.create_index('ix_compatibility_index_location', 'compatibility_index', ['user_id', 'latitude', 'longitude'])
+
+
+def downgrade():
+    op.drop_index('ix_compatibility_index_location', 'compatibility_index')
+    op.drop_index('ix_compatibility_index_bucket', 'compatibility_index')
+    op.drop_index('ix_compatibility_index_birth_date', 'compatibility_index')
+    op.drop_index('ix_compatibility_index_user_id', 'compatibility_index')
+    op.drop_index('ix_compatibility_index_id', 'compatibility_index')
+    op.drop_table('compatibility_index')
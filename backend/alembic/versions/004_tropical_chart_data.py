@@ -0,0 +1,23 @@
+"""Tropical chart data for ayanamsa variants
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('natal_charts', sa.Column('tropical_data', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('natal_charts', 'tropical_data')
@@ -0,0 +1,25 @@
+"""Canonical chart hash on profiles
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('profiles', sa.Column('chart_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_profiles_chart_hash', 'profiles', ['chart_hash'])
+
+
+def downgrade():
+    op.drop_index('ix_profiles_chart_hash', 'profiles')
+    op.drop_column('profiles', 'chart_hash')
@@ -0,0 +1,72 @@
+"""Bulk profile import jobs
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'profile_import_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('total_rows', sa.Integer(), nullable=True),
+        sa.Column('imported_rows', sa.Integer(), nullable=True),
+        sa.Column('row_errors', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_profile_import_jobs_id', 'profile_import_jobs', ['id'])
+    op.create_index('ix_profile_import_jobs_user_id', 'profile_import_jobs', ['user_id'])
+
+    op.create_table(
+        'profile_import_chunks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('chunk_index', sa.Integer(), nullable=False),
+        sa.Column('first_profile_id', sa.Integer(), nullable=False),
+        sa.Column('last_profile_id', sa.Integer(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('cursor', sa.Integer(), nullable=True),
+        sa.Column('processed', sa.Integer(), nullable=True),
+        sa.Column('failed', sa.Integer(), nullable=True),
+        sa.Column('errors', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['profile_import_jobs.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_profile_import_chunks_id', 'profile_import_chunks', ['id'])
+    op.create_index('ix_profile_import_chunks_job_id', 'profile_import_chunks', ['job_id'])
+
+    op.add_column('profiles', sa.Column('import_job_id', sa.Integer(), nullable=True))
+    op.create_index('ix_profiles_import_job_id', 'profiles', ['import_job_id'])
+    op.create_foreign_key(
+        'fk_profiles_import_job_id', 'profiles', 'profile_import_jobs', ['import_job_id'], ['id']
+    )
+
+
+def downgrade():
+    op.drop_constraint('fk_profiles_import_job_id', 'profiles', type_='foreignkey')
+    op.drop_index('ix_profiles_import_job_id', 'profiles')
+    op.drop_column('profiles', 'import_job_id')
+    op.drop_index('ix_profile_import_chunks_job_id', 'profile_import_chunks')
+    op.drop_index('ix_profile_import_chunks_id', 'profile_import_chunks')
+    op.drop_table('profile_import_chunks')
+    op.drop_index('ix_profile_import_jobs_user_id', 'profile_import_jobs')
+    op.drop_index('ix_profile_import_jobs_id', 'profile_import_jobs')
+    op.drop_table('profile_import_jobs')
@@ -0,0 +1,66 @@
+"""Scheduled notifications queue and planning cursors
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'scheduled_notifications',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('profile_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=30), nullable=False),
+        sa.Column('due_at', sa.DateTime(), nullable=False),
+        sa.Column('event_at', sa.DateTime(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('body', sa.String(length=500), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=True),
+        sa.Column('dedupe_key', sa.String(length=120), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['profile_id'], ['profiles.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('dedupe_key')
+    )
+    op.create_index('ix_scheduled_notifications_id', 'scheduled_notifications', ['id'])
+    op.create_index('ix_scheduled_notifications_user_id', 'scheduled_notifications', ['user_id'])
+    op.create_index('ix_scheduled_notifications_queue', 'scheduled_notifications', ['status', 'due_at'])
+    op.create_index('ix_scheduled_notifications_profile', 'scheduled_notifications', ['profile_id', 'due_at'])
+
+    op.create_table(
+        'notification_cursors',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('profile_id', sa.Integer(), nullable=False),
+        sa.Column('planned_until', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['profile_id'], ['profiles.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('profile_id')
+    )
+    op.create_index('ix_notification_cursors_id', 'notification_cursors', ['id'])
+    op.create_index('ix_notification_cursors_planned_until', 'notification_cursors', ['planned_until'])
+
+
+def downgrade():
+    op.drop_index('ix_notification_cursors_planned_until', 'notification_cursors')
+    op.drop_index('ix_notification_cursors_id', 'notification_cursors')
+    op.drop_table('notification_cursors')
+    op.drop_index('ix_scheduled_notifications_profile', 'scheduled_notifications')
+    op.drop_index('ix_scheduled_notifications_queue', 'scheduled_notifications')
+    op.drop_index('ix_scheduled_notifications_user_id', 'scheduled_notifications')
+    op.drop_index('ix_scheduled_notifications_id', 'scheduled_notifications')
+    op.drop_table('scheduled_notifications')
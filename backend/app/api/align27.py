@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from datetime import datetime, date, timedelta
-from typing import Optional
+from typing import List, Optional
 from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.models.user import User
@@ -11,13 +11,23 @@ from app.models.chart import NatalChart, PlanetaryPosition
 from app.models.dasha import Dasha, DashaLevel
 from app.modules.align27.calculator import align27_calculator
 from app.modules.ephemeris.calculator import ephemeris
+from app.modules.transits.snapshot_cache import transit_cache
 
 router = APIRouter(prefix="/api/align27", tags=["align27"])
 
+MAX_MULTI_PLANNER_PROFILES = 50
+
+
+def find_natal_chart(profile: Profile, db: Session) -> Optional[NatalChart]:
+    """Stored chart for a profile, including one shared with another profile"""
+    if profile.chart_hash:
+        return db.query(NatalChart).filter(NatalChart.chart_hash == profile.chart_hash).first()
+    return db.query(NatalChart).filter(NatalChart.profile_id == profile.id).first()
+
 
 def get_chart_data(profile: Profile, db: Session):
     """Get natal chart data for a profile"""
-    chart = db.query(NatalChart).filter(NatalChart.profile_id == profile.id).first()
+    chart = find_natal_chart(profile, db)
     if not chart:
         from app.api.charts import get_or_compute_chart
         chart = get_or_compute_chart(profile, db)
@@ -35,7 +45,7 @@ def get_chart_data(profile: Profile, db: Session):
 
 def get_current_dasha(profile: Profile, db: Session, target_date: date) -> dict:
     """Get current dasha for profile on target date"""
-    chart = db.query(NatalChart).filter(NatalChart.profile_id == profile.id).first()
+    chart = find_natal_chart(profile, db)
     if not chart:
         return None
     
@@ -59,8 +69,7 @@ def get_current_dasha(profile: Profile, db: Session, target_date: date) -> dict:
 
 def get_transiting_planets(target_date: date) -> dict:
     """Get current transit positions"""
-    jd = ephemeris.get_julian_day(datetime.combine(target_date, datetime.min.time()))
-    planets = ephemeris.get_all_planets(jd)
+    planets = transit_cache.get_positions(datetime.combine(target_date, datetime.min.time()))
     
     for planet, pos in planets.items():
         pos["rasi"] = ephemeris.get_rasi(pos["longitude"])
@@ -431,6 +440,67 @@ async def get_planner(
     }
 
 
+@router.get("/planner/multi")
+async def get_multi_planner(
+    profile_ids: List[int] = Query(..., description="Profile IDs (repeat the parameter)"),
+    start: str = Query(..., description="Start date YYYY-MM-DD"),
+    days: int = Query(90, ge=1, le=365, description="Number of days"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get planner for several profiles in one call.
+    Transits and the hora table are computed once and shared; the response is a
+    columnar (profiles x days) matrix of scores and color codes.
+    """
+    profile_ids = list(dict.fromkeys(profile_ids))
+    if len(profile_ids) > MAX_MULTI_PLANNER_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {MAX_MULTI_PLANNER_PROFILES} profiles per request"
+        )
+
+    profiles = db.query(Profile).filter(
+        Profile.id.in_(profile_ids),
+        Profile.user_id == current_user.id
+    ).all()
+    profiles_by_id = {p.id: p for p in profiles}
+
+    missing = [pid for pid in profile_ids if pid not in profiles_by_id]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Profiles not found: {missing}")
+
+    try:
+        start_date = datetime.strptime(start, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+    moon_rasis = []
+    asc_rasis = []
+    dasha_lords = []
+    for pid in profile_ids:
+        profile = profiles_by_id[pid]
+        chart, moon_rasi, asc_rasi = get_chart_data(profile, db)
+        current_dasha = get_current_dasha(profile, db, start_date)
+        moon_rasis.append(moon_rasi)
+        asc_rasis.append(asc_rasi)
+        dasha_lords.append(current_dasha["lord"] if current_dasha else None)
+
+    # Global transits are shared by every profile
+    transits = get_transiting_planets(start_date)
+
+    matrix = align27_calculator.generate_planner_matrix(
+        start_date, days, moon_rasis, asc_rasis, transits, dasha_lords
+    )
+
+    return {
+        "profile_ids": profile_ids,
+        "start_date": start_date.isoformat(),
+        "days": days,
+        **matrix
+    }
+
+
 @router.get("/ics")
 async def get_ics_export(
     profile_id: int,
@@ -1,24 +1,51 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, date
+from typing import List, Optional
+from pydantic import BaseModel, Field
 import hashlib
+import logging
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.models.user import User
 from app.models.profile import Profile
 from app.models.chart import NatalChart, PlanetaryPosition, DivisionalChart
 from app.modules.charts.calculator import chart_calculator
-from app.modules.ephemeris.calculator import ephemeris
+from app.modules.charts.ayanamsa import ayanamsa_variants
+from app.modules.charts.canonical import chart_canonicalizer
+from app.modules.charts.similarity import get_chart_similarity_index, chart_encoder
+from app.modules.charts.rectification import rectification_engine, VARGAS
+from app.modules.charts.kp import kp_calculator, KP_PLANETS
+from app.modules.charts.render import chart_renderer, get_chart_image_cache, CHART_STYLES
+from app.modules.ephemeris.calculator import ephemeris, AYANAMSA_MAP, NAKSHATRAS, EVENT_SIGNIFICATIONS
+from app.api.panchang import format_time
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/charts", tags=["charts"])
 
+
+class LifeEvent(BaseModel):
+    date: date
+    kind: str
+
+
+class RectificationScoreRequest(BaseModel):
+    events: List[LifeEvent]
+    window_minutes: float = Field(30, gt=0, le=settings.RECTIFICATION_MAX_WINDOW_MINUTES)
+    vargas: Optional[List[int]] = None
+    limit: int = Field(20, ge=1, le=200)
+
+
 @router.get("/{profile_id}")
 async def get_chart(
     profile_id: int,
     chart: str = "D1",
     style: str = "north_indian",
+    ayanamsa: Optional[str] = Query(None, description="Derive the chart for another ayanamsa"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -37,6 +64,25 @@ async def get_chart(
     # Get divisional chart
     division = 1 if chart == "D1" else int(chart[1:])
     
+    if ayanamsa and ayanamsa != profile.ayanamsa:
+        if ayanamsa not in AYANAMSA_MAP:
+            raise HTTPException(status_code=400, detail=f"Unknown ayanamsa: {ayanamsa}")
+        
+        # Derived from the stored tropical chart, no recompute
+        variant = ayanamsa_variants.derive(get_tropical_data(natal_chart, profile, db), ayanamsa)
+        if division == 1:
+            return format_variant_chart(variant)
+        
+        if division not in variant["divisional_charts"]:
+            raise HTTPException(status_code=404, detail=f"Chart {chart} not found")
+        
+        return {
+            "division": division,
+            "division_name": ayanamsa_variants.div_calculator.DIVISIONS[division],
+            "ayanamsa": ayanamsa,
+            "planetary_positions": variant["divisional_charts"][division]
+        }
+    
     if division == 1:
         # Return D1 with North Indian format
         return format_north_indian_chart(natal_chart, profile)
@@ -88,6 +134,309 @@ async def get_divisional_chart(
         "planetary_positions": div_chart.planetary_positions
     }
 
+@router.get("/{profile_id}/ayanamsas")
+async def get_ayanamsa_comparison(
+    profile_id: int,
+    ayanamsas: Optional[List[str]] = Query(None, description="Ayanamsas to compare (default: all)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Compare the chart side by side under several ayanamsas"""
+    profile = db.query(Profile).filter(
+        Profile.id == profile_id,
+        Profile.user_id == current_user.id
+    ).first()
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    ayanamsas = list(dict.fromkeys(ayanamsas or AYANAMSA_MAP))
+    unknown = [name for name in ayanamsas if name not in AYANAMSA_MAP]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown ayanamsas: {unknown}")
+    
+    natal_chart = get_or_compute_chart(profile, db)
+    tropical = get_tropical_data(natal_chart, profile, db)
+    
+    return {
+        "profile_id": profile_id,
+        "default_ayanamsa": profile.ayanamsa,
+        **ayanamsa_variants.compare(tropical, ayanamsas)
+    }
+
+def rectification_segments(profile: Profile, window_minutes: float, vargas: Optional[List[int]]) -> tuple:
+    """Validate options and split the window around the recorded birth time into distinct charts"""
+    if not 0 < window_minutes <= settings.RECTIFICATION_MAX_WINDOW_MINUTES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"window_minutes must be between 0 and {settings.RECTIFICATION_MAX_WINDOW_MINUTES}"
+        )
+    vargas = sorted(set(vargas or VARGAS) | {1})
+    unknown = [d for d in vargas if d not in VARGAS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown vargas: {unknown}")
+    
+    canonical = chart_canonicalizer.for_profile(profile)
+    birth_jd = ephemeris.get_julian_day(canonical["instant"])
+    segments = rectification_engine.segments(
+        birth_jd, window_minutes, canonical["latitude"], canonical["longitude"], canonical["ayanamsa"], vargas
+    )
+    return birth_jd, segments
+
+
+def format_rectification_segment(index: int, segment: dict, birth_jd: float, timezone: str) -> dict:
+    chart = segment["chart"]
+    return {
+        "index": index,
+        "start": format_time(ephemeris.get_datetime(segment["start_jd"]), timezone),
+        "end": format_time(ephemeris.get_datetime(segment["end_jd"]), timezone),
+        "start_offset_minutes": round((segment["start_jd"] - birth_jd) * 1440.0, 2),
+        "end_offset_minutes": round((segment["end_jd"] - birth_jd) * 1440.0, 2),
+        "duration_minutes": round((segment["end_jd"] - segment["start_jd"]) * 1440.0, 2),
+        "contains_recorded_time": segment["start_jd"] <= birth_jd < segment["end_jd"],
+        "ascendant": chart["ASCENDANT"],
+        "planets": {body: chart[body] for body in chart if body != "ASCENDANT"},
+        "changes": segment["changes"]
+    }
+
+@router.get("/{profile_id}/rectification")
+async def get_rectification_segments(
+    profile_id: int,
+    window_minutes: float = Query(30, gt=0, le=settings.RECTIFICATION_MAX_WINDOW_MINUTES,
+                                  description="Minutes either side of the recorded birth time"),
+    vargas: Optional[List[int]] = Query(None, description="Vargas to track (default: D1-D60)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Distinct charts around the recorded birth time: each segment lists the rasi of
+    the ascendant and planets in every tracked varga plus their nakshatras, and
+    what changed when it began.
+    """
+    profile = db.query(Profile).filter(
+        Profile.id == profile_id,
+        Profile.user_id == current_user.id
+    ).first()
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    birth_jd, segments = rectification_segments(profile, window_minutes, vargas)
+    return {
+        "profile_id": profile_id,
+        "window_minutes": window_minutes,
+        "segments": [
+            format_rectification_segment(i, segment, birth_jd, profile.timezone)
+            for i, segment in enumerate(segments)
+        ]
+    }
+
+@router.post("/{profile_id}/rectification/score")
+async def score_rectification_segments(
+    profile_id: int,
+    request: RectificationScoreRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Rank the candidate segments by how well their dashas time known life events"""
+    profile = db.query(Profile).filter(
+        Profile.id == profile_id,
+        Profile.user_id == current_user.id
+    ).first()
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    if not request.events:
+        raise HTTPException(status_code=400, detail="At least one life event is required")
+    unknown = sorted({e.kind for e in request.events} - set(EVENT_SIGNIFICATIONS))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown event kinds: {unknown} (expected one of {list(EVENT_SIGNIFICATIONS)})"
+        )
+    
+    birth_jd, segments = rectification_segments(profile, request.window_minutes, request.vargas)
+    ranked = rectification_engine.score(segments, [e.model_dump() for e in request.events])
+    return {
+        "profile_id": profile_id,
+        "window_minutes": request.window_minutes,
+        "total_segments": len(segments),
+        "candidates": [
+            {
+                **format_rectification_segment(r["segment"], segments[r["segment"]], birth_jd, profile.timezone),
+                "score": r["score"],
+                "events": r["events"]
+            }
+            for r in ranked[:request.limit]
+        ]
+    }
+
+@router.get("/{profile_id}/similar")
+async def get_similar_charts(
+    profile_id: int,
+    k: int = Query(10, ge=1, le=100, description="Number of neighbours"),
+    ascendant_rasi: Optional[int] = Query(None, ge=1, le=12),
+    moon_rasi: Optional[int] = Query(None, ge=1, le=12),
+    moon_nakshatra: Optional[int] = Query(None, ge=1, le=27),
+    birth_year_from: Optional[int] = None,
+    birth_year_to: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Charts among your profiles most similar to this one, nearest first, with the
+    distance contributed by each feature group (longitudes, D1/D9/D10, SAV).
+    """
+    profile = db.query(Profile).filter(
+        Profile.id == profile_id,
+        Profile.user_id == current_user.id
+    ).first()
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    natal_chart = get_or_compute_chart(profile, db)
+    index = get_chart_similarity_index()
+    index.sync(db)
+    
+    # Candidates: charts of the user's own profiles that pass the filters
+    candidates = db.query(NatalChart.id).join(
+        Profile, Profile.chart_hash == NatalChart.chart_hash
+    ).filter(Profile.user_id == current_user.id)
+    if ascendant_rasi:
+        candidates = candidates.filter(
+            NatalChart.ascendant >= (ascendant_rasi - 1) * 30.0,
+            NatalChart.ascendant < ascendant_rasi * 30.0
+        )
+    if moon_rasi or moon_nakshatra:
+        candidates = candidates.join(
+            PlanetaryPosition, PlanetaryPosition.natal_chart_id == NatalChart.id
+        ).filter(PlanetaryPosition.planet == "MOON")
+        if moon_rasi:
+            candidates = candidates.filter(PlanetaryPosition.rasi == moon_rasi)
+        if moon_nakshatra:
+            candidates = candidates.filter(PlanetaryPosition.nakshatra == NAKSHATRAS[moon_nakshatra - 1])
+    if birth_year_from:
+        candidates = candidates.filter(Profile.birth_date >= datetime(birth_year_from, 1, 1))
+    if birth_year_to:
+        candidates = candidates.filter(Profile.birth_date < datetime(birth_year_to + 1, 1, 1))
+    allowed = [cid for (cid,) in candidates.distinct()]
+    
+    longitudes = dict(db.query(PlanetaryPosition.planet, PlanetaryPosition.longitude).filter(
+        PlanetaryPosition.natal_chart_id == natal_chart.id
+    ))
+    query = chart_encoder.encode(natal_chart.ascendant, longitudes)
+    neighbours = index.search(query, k, allowed, exclude=[natal_chart.id])
+    
+    charts = {
+        c.id: c for c in db.query(NatalChart).filter(NatalChart.id.in_([n["chart_id"] for n in neighbours]))
+    }
+    profiles = {}
+    for p in db.query(Profile).filter(
+        Profile.user_id == current_user.id,
+        Profile.chart_hash.in_([c.chart_hash for c in charts.values()])
+    ).order_by(Profile.id):
+        profiles.setdefault(p.chart_hash, []).append({"id": p.id, "name": p.name})
+    
+    return {
+        "profile_id": profile_id,
+        "chart_id": natal_chart.id,
+        "candidates": len(allowed),
+        "neighbours": [
+            {
+                **n,
+                "ascendant_rasi": int(charts[n["chart_id"]].ascendant / 30.0) + 1,
+                "profiles": profiles.get(charts[n["chart_id"]].chart_hash, [])
+            }
+            for n in neighbours if n["chart_id"] in charts
+        ]
+    }
+
+@router.get("/{profile_id}/kp")
+async def get_kp_chart(
+    profile_id: int,
+    ayanamsa: str = Query("KP", description="Ayanamsa for KP longitudes"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get KP sign, star, sub and sub-sub lords of planets and Placidus cusps, with house significators"""
+    profile = db.query(Profile).filter(
+        Profile.id == profile_id,
+        Profile.user_id == current_user.id
+    ).first()
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    ayanamsa = ayanamsa.upper()
+    if ayanamsa not in AYANAMSA_MAP:
+        raise HTTPException(status_code=400, detail=f"Unknown ayanamsa: {ayanamsa}")
+    
+    natal_chart = get_or_compute_chart(profile, db)
+    variant = ayanamsa_variants.derive(get_tropical_data(natal_chart, profile, db), ayanamsa)
+    
+    longitudes = [variant["planets"][planet]["longitude"] for planet in KP_PLANETS]
+    cusps = variant["house_cusps"]
+    houses = kp_calculator.houses(longitudes, cusps)[0]
+    significators = kp_calculator.significators(longitudes, cusps)[0]
+    
+    return {
+        "profile_id": profile_id,
+        "ayanamsa": ayanamsa,
+        "ayanamsa_value": variant["ayanamsa_value"],
+        "planets": {
+            planet: {**lords, "house": int(houses[i]), "is_retrograde": variant["planets"][planet]["is_retrograde"]}
+            for i, (planet, lords) in enumerate(zip(KP_PLANETS, kp_calculator.describe(longitudes)))
+        },
+        "cusps": {str(h + 1): lords for h, lords in enumerate(kp_calculator.describe(cusps))},
+        "significators": kp_calculator.significator_table(significators)
+    }
+
+@router.get("/{profile_id}/svg")
+async def get_chart_svg(
+    profile_id: int,
+    request: Request,
+    chart: str = "D1",
+    style: str = "north_indian",
+    degrees: bool = Query(False, description="Show degrees beside planets"),
+    size: int = Query(400, ge=120, le=1600),
+    ayanamsa: Optional[str] = Query(None, description="Derive the chart for another ayanamsa"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get a natal or divisional chart rendered as SVG, served from the chart image cache"""
+    profile = db.query(Profile).filter(
+        Profile.id == profile_id,
+        Profile.user_id == current_user.id
+    ).first()
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    if style not in CHART_STYLES:
+        raise HTTPException(status_code=400, detail=f"Unknown chart style: {style}")
+    
+    division = parse_division(chart)
+    ayanamsa = (ayanamsa or profile.ayanamsa).upper()
+    if ayanamsa not in AYANAMSA_MAP:
+        raise HTTPException(status_code=400, detail=f"Unknown ayanamsa: {ayanamsa}")
+    
+    # The key depends only on canonical birth data, so hits skip the chart tables entirely
+    cache = get_chart_image_cache()
+    chart_hash = chart_canonicalizer.chart_hash(chart_canonicalizer.for_profile(profile))
+    key = cache.key(chart_hash, division, style, {"degrees": degrees, "size": size, "ayanamsa": ayanamsa})
+    headers = {"ETag": f'"{key}"', "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    
+    def render() -> bytes:
+        natal_chart = get_or_compute_chart(profile, db)
+        data = chart_image_data(natal_chart, profile, division, ayanamsa, db)
+        return chart_renderer.svg(data, style, size, degrees).encode()
+    
+    return Response(content=cache.get_or_render(key, render), media_type="image/svg+xml", headers=headers)
+
 @router.get("/{profile_id}/bundle")
 async def get_chart_bundle(
     profile_id: int,
@@ -143,19 +492,9 @@ async def get_chart_bundle(
 
 def get_or_compute_chart(profile: Profile, db: Session) -> NatalChart:
     """Get cached chart or compute new one"""
-    # Build datetime from profile
-    birth_datetime = datetime.combine(
-        profile.birth_date.date(),
-        datetime.strptime(profile.birth_time, "%H:%M:%S").time()
-    )
-    
-    # Generate hash
-    chart_hash = chart_calculator.generate_chart_hash(
-        birth_datetime,
-        profile.latitude,
-        profile.longitude,
-        profile.ayanamsa
-    )
+    # Canonical birth data; profiles that canonicalize alike share one chart
+    canonical = chart_canonicalizer.for_profile(profile)
+    chart_hash = chart_canonicalizer.chart_hash(canonical)
     
     # Check cache
     natal_chart = db.query(NatalChart).filter(
@@ -163,14 +502,17 @@ def get_or_compute_chart(profile: Profile, db: Session) -> NatalChart:
     ).first()
     
     if natal_chart:
+        if profile.chart_hash != chart_hash:
+            profile.chart_hash = chart_hash
+            db.commit()
         return natal_chart
     
     # Compute new chart
     chart_data = chart_calculator.calculate_natal_chart(
-        birth_datetime,
-        profile.latitude,
-        profile.longitude,
-        profile.ayanamsa
+        canonical["instant"],
+        canonical["latitude"],
+        canonical["longitude"],
+        canonical["ayanamsa"]
     )
     
     # Store in DB
@@ -182,10 +524,22 @@ def get_or_compute_chart(profile: Profile, db: Session) -> NatalChart:
         ascendant=chart_data["ascendant"],
         mc=chart_data["mc"],
         house_cusps=chart_data["house_cusps"],
+        tropical_data=chart_data["tropical"],
         created_at=datetime.utcnow()
     )
     db.add(natal_chart)
-    db.flush()
+    profile.chart_hash = chart_hash
+    try:
+        db.flush()
+    except IntegrityError:
+        # Another worker stored the same canonical chart first; use theirs
+        db.rollback()
+        natal_chart = db.query(NatalChart).filter(
+            NatalChart.chart_hash == chart_hash
+        ).one()
+        profile.chart_hash = chart_hash
+        db.commit()
+        return natal_chart
     
     # Store planetary positions
     for planet, pos in chart_data["planets"].items():
@@ -224,8 +578,82 @@ def get_or_compute_chart(profile: Profile, db: Session) -> NatalChart:
     db.commit()
     db.refresh(natal_chart)
     
+    # Keep the similarity index in step; anything missed is picked up by its next sync
+    try:
+        get_chart_similarity_index().add_chart(
+            natal_chart.id,
+            chart_data["ascendant"],
+            {planet: pos["longitude"] for planet, pos in chart_data["planets"].items()}
+        )
+    except Exception:
+        logger.exception("Could not add chart %s to the similarity index", natal_chart.id)
+    
     return natal_chart
 
+def get_tropical_data(natal_chart: NatalChart, profile: Profile, db: Session) -> dict:
+    """Tropical form of a stored chart, backfilled once for charts saved before it was kept
+    (or before all 12 house cusps were kept)"""
+    if natal_chart.tropical_data and len(natal_chart.tropical_data.get("house_cusps", [])) == 12:
+        return natal_chart.tropical_data
+    
+    canonical = chart_canonicalizer.for_profile(profile)
+    natal_chart.tropical_data = ayanamsa_variants.tropical_pass(
+        canonical["instant"],
+        canonical["latitude"],
+        canonical["longitude"]
+    )
+    db.commit()
+    
+    return natal_chart.tropical_data
+
+def parse_division(chart: str) -> int:
+    """Division number of a chart name such as D1 or D9"""
+    division = int(chart[1:]) if chart[:1].upper() == "D" and chart[1:].isdigit() else None
+    if division not in ayanamsa_variants.div_calculator.DIVISIONS:
+        raise HTTPException(status_code=404, detail=f"Chart {chart} not found")
+    return division
+
+def chart_image_data(natal_chart: NatalChart, profile: Profile, division: int, ayanamsa: str, db: Session) -> dict:
+    """Lagna rasi and (planet, rasi, degree, retrograde) placements of a chart for rendering"""
+    div_calc = ayanamsa_variants.div_calculator
+    title = f"D{division} {div_calc.DIVISIONS[division]}"
+    
+    if ayanamsa != profile.ayanamsa:
+        variant = ayanamsa_variants.derive(get_tropical_data(natal_chart, profile, db), ayanamsa)
+        ascendant = variant["ascendant"]
+        planets = {
+            planet: (pos["rasi"], pos["degree_in_rasi"], pos["is_retrograde"])
+            for planet, pos in variant["planets"].items()
+        }
+        div_positions = variant["divisional_charts"].get(division, {})
+    else:
+        ascendant = natal_chart.ascendant
+        planets = {
+            pos.planet: (pos.rasi, pos.degree_in_rasi, bool(pos.is_retrograde))
+            for pos in db.query(PlanetaryPosition).filter(PlanetaryPosition.natal_chart_id == natal_chart.id)
+        }
+        div_chart = None if division == 1 else db.query(DivisionalChart).filter(
+            DivisionalChart.natal_chart_id == natal_chart.id,
+            DivisionalChart.division == division
+        ).first()
+        div_positions = div_chart.planetary_positions if div_chart else {}
+    
+    if division == 1:
+        placements = [(planet, rasi, degree, retro) for planet, (rasi, degree, retro) in planets.items()]
+    else:
+        # Degrees within a varga sign carry no meaning here, only the sign
+        placements = [
+            (planet, int(rasi), None, planets.get(planet, (None, None, False))[2])
+            for planet, rasi in div_positions.items()
+        ]
+    
+    return {
+        "division": division,
+        "title": title,
+        "ascendant_rasi": div_calc.calculate_divisional_position(ascendant, division),
+        "placements": placements
+    }
+
 def format_north_indian_chart(natal_chart: NatalChart, profile: Profile) -> dict:
     """Format chart for North Indian display"""
     # Get planetary positions
@@ -235,9 +663,29 @@ def format_north_indian_chart(natal_chart: NatalChart, profile: Profile) -> dict
     positions = db.query(PlanetaryPosition).filter(
         PlanetaryPosition.natal_chart_id == natal_chart.id
     ).all()
+    placements = [(pos.planet, pos.rasi, pos.degree_in_rasi) for pos in positions]
+    
+    db.close()
+    
+    return north_indian_layout(natal_chart.ascendant, placements)
+
+def format_variant_chart(variant: dict) -> dict:
+    """Format a derived ayanamsa variant for North Indian display"""
+    placements = [
+        (planet, pos["rasi"], pos["degree_in_rasi"])
+        for planet, pos in variant["planets"].items()
+    ]
     
+    return {
+        **north_indian_layout(variant["ascendant"], placements),
+        "ayanamsa": variant["ayanamsa"],
+        "ayanamsa_value": variant["ayanamsa_value"]
+    }
+
+def north_indian_layout(ascendant: float, placements: list) -> dict:
+    """Place (planet, rasi, degree_in_rasi) tuples into North Indian houses"""
     # Calculate ascendant rasi
-    asc_rasi = int(natal_chart.ascendant / 30.0) + 1
+    asc_rasi = int(ascendant / 30.0) + 1
     
     # North Indian chart has fixed house positions
     # Houses are arranged: 1=center-top, 2=left, 3=bottom-left, etc.
@@ -252,22 +700,19 @@ def format_north_indian_chart(natal_chart: NatalChart, profile: Profile) -> dict
         }
     
     # Place planets in houses
-    for pos in positions:
-        planet_rasi = pos.rasi
+    for planet, planet_rasi, degree_in_rasi in placements:
         # Find which house this rasi is in
         for house_num, house_data in houses.items():
             if house_data["rasi"] == planet_rasi:
                 houses[house_num]["planets"].append({
-                    "planet": pos.planet,
-                    "degree": round(pos.degree_in_rasi, 2)
+                    "planet": planet,
+                    "degree": round(degree_in_rasi, 2)
                 })
                 break
     
-    db.close()
-    
     return {
         "chart_type": "north_indian",
-        "ascendant": natal_chart.ascendant,
+        "ascendant": ascendant,
         "ascendant_rasi": asc_rasi,
         "houses": houses,
         "sign_names": [
@@ -1,18 +1,125 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
+from pydantic import BaseModel
 from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.models.user import User
 from app.models.profile import Profile
-from app.models.compatibility import CompatibilityReport
+from app.models.compatibility import CompatibilityReport, CompatibilityIndexEntry
 from app.api.charts import get_or_compute_chart
 from app.modules.compatibility.calculator import compatibility_calculator
+from app.modules.compatibility.matrix import (
+    ashtakoot_table, moon_state, manglik_screen, compatibility_label, MAX_SCORE
+)
+from app.modules.compatibility.search import compatibility_search
+from app.modules.dasha.sandhi import sandhi_detector, DEFAULT_TOLERANCE_DAYS
 from app.models.chart import PlanetaryPosition
 
 router = APIRouter(prefix="/api/compatibility", tags=["compatibility"])
 
+MAX_MATRIX_PROFILES = 1000
+MAX_BREAKDOWN_CELLS = 100
+
+
+class CompatibilityMatrixRequest(BaseModel):
+    male_profile_ids: List[int]
+    female_profile_ids: List[int]
+    include_breakdown: bool = False
+
+
+def load_match_states(profile_ids: List[int], current_user: User, db: Session) -> Dict[str, list]:
+    """Moon state and Manglik inputs for each profile, in request order"""
+    profiles = {
+        p.id: p for p in db.query(Profile).filter(
+            Profile.id.in_(profile_ids),
+            Profile.user_id == current_user.id
+        ).all()
+    }
+    
+    missing = [pid for pid in profile_ids if pid not in profiles]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Profiles not found: {missing}")
+    
+    charts = {pid: get_or_compute_chart(profiles[pid], db) for pid in dict.fromkeys(profile_ids)}
+    
+    positions = {}
+    for pos in db.query(PlanetaryPosition).filter(
+        PlanetaryPosition.natal_chart_id.in_([chart.id for chart in charts.values()]),
+        PlanetaryPosition.planet.in_(["MOON", "MARS", "JUPITER"])
+    ).all():
+        positions[(pos.natal_chart_id, pos.planet)] = pos
+    
+    states = {"moon": [], "mars_rasi": [], "asc_rasi": [], "jupiter_rasi": [], "mars_strong": []}
+    for pid in profile_ids:
+        chart = charts[pid]
+        mars = positions[(chart.id, "MARS")]
+        states["moon"].append(positions[(chart.id, "MOON")].longitude)
+        states["mars_rasi"].append(mars.rasi)
+        states["asc_rasi"].append(int(chart.ascendant / 30.0) + 1)
+        states["jupiter_rasi"].append(positions[(chart.id, "JUPITER")].rasi)
+        states["mars_strong"].append(mars.dignity in ["Own", "Exalted"])
+    
+    return states
+
+
+@router.post("/matrix")
+async def get_compatibility_matrix(
+    request: CompatibilityMatrixRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Score male profiles (rows) against female profiles (columns) from the precomputed Ashtakoot table"""
+    if not request.male_profile_ids or not request.female_profile_ids:
+        raise HTTPException(status_code=400, detail="Both profile lists are required")
+    
+    if max(len(request.male_profile_ids), len(request.female_profile_ids)) > MAX_MATRIX_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {MAX_MATRIX_PROFILES} profiles per side"
+        )
+    
+    male = load_match_states(request.male_profile_ids, current_user, db)
+    female = load_match_states(request.female_profile_ids, current_user, db)
+    
+    male_states = moon_state(male["moon"])
+    female_states = moon_state(female["moon"])
+    totals = ashtakoot_table.score_matrix(male_states, female_states)
+    
+    male_manglik = manglik_screen(male["mars_rasi"], male["asc_rasi"], male["jupiter_rasi"], male["mars_strong"])
+    female_manglik = manglik_screen(
+        female["mars_rasi"], female["asc_rasi"], female["jupiter_rasi"], female["mars_strong"]
+    )
+    manglik_match = male_manglik["is_manglik"][:, None] == female_manglik["is_manglik"][None, :]
+    
+    result = {
+        "male_profile_ids": request.male_profile_ids,
+        "female_profile_ids": request.female_profile_ids,
+        "max": MAX_SCORE,
+        "totals": totals.tolist(),
+        "compatibility": [[compatibility_label(t) for t in row] for row in totals.tolist()],
+        "manglik": {
+            "male": {key: values.tolist() for key, values in male_manglik.items()},
+            "female": {key: values.tolist() for key, values in female_manglik.items()}
+        },
+        "manglik_match": manglik_match.tolist()
+    }
+    
+    if request.include_breakdown:
+        if totals.size > MAX_BREAKDOWN_CELLS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Breakdown is limited to {MAX_BREAKDOWN_CELLS} pairs"
+            )
+        result["breakdown"] = [
+            [ashtakoot_table.breakdown(m, f) for f in female_states.tolist()]
+            for m in male_states.tolist()
+        ]
+    
+    return result
+
+
 @router.get("/{profile_id}/manglik")
 async def check_manglik_status(
     profile_id: int,
@@ -60,6 +167,65 @@ async def check_manglik_status(
         "manglik_status": manglik
     }
 
+@router.get("/{profile_id}/search")
+async def search_compatible_profiles(
+    profile_id: int,
+    k: int = Query(50, ge=1, le=500, description="Number of matches"),
+    side: str = Query("male", pattern="^(male|female)$", description="Side of the query profile"),
+    min_score: float = Query(0, ge=0, le=36),
+    min_age: Optional[int] = Query(None, ge=0),
+    max_age: Optional[int] = Query(None, ge=0),
+    near_latitude: Optional[float] = Query(None, ge=-90, le=90),
+    near_longitude: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: Optional[float] = Query(None, gt=0),
+    manglik_match: bool = False,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the best Ashtakoot matches for a profile among the user's stored profiles"""
+    profile = db.query(Profile).filter(
+        Profile.id == profile_id,
+        Profile.user_id == current_user.id
+    ).first()
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    if radius_km is not None and (near_latitude is None or near_longitude is None):
+        raise HTTPException(status_code=400, detail="radius_km requires near_latitude and near_longitude")
+    
+    compatibility_search.sync(db, current_user.id, get_or_compute_chart)
+    
+    query_entry = db.query(CompatibilityIndexEntry).filter(
+        CompatibilityIndexEntry.profile_id == profile_id
+    ).first()
+    
+    result = compatibility_search.search(
+        db, current_user.id, query_entry,
+        k=k,
+        query_side=side,
+        min_score=min_score,
+        min_age=min_age,
+        max_age=max_age,
+        near=(near_latitude, near_longitude) if radius_km is not None else None,
+        radius_km=radius_km,
+        manglik_match=manglik_match
+    )
+    
+    names = dict(db.query(Profile.id, Profile.name).filter(
+        Profile.id.in_([m["profile_id"] for m in result["matches"]])
+    ).all())
+    for match in result["matches"]:
+        match["name"] = names.get(match["profile_id"])
+    
+    return {
+        "profile": {"id": profile.id, "name": profile.name},
+        "side": side,
+        "k": k,
+        "buckets_scanned": result["buckets_scanned"],
+        "matches": result["matches"]
+    }
+
 @router.get("/{profile1_id}/{profile2_id}")
 async def get_compatibility(
     profile1_id: int,
@@ -148,8 +314,8 @@ async def get_compatibility(
         "recommendation": get_manglik_recommendation(manglik1, manglik2)
     }
     
-    # Check Dasha Sandhi (simplified)
-    dasha_sandhi = check_dasha_sandhi(profile1, profile2)
+    # Check Dasha Sandhi
+    dasha_sandhi = check_dasha_sandhi(profile1, profile2, chart1, chart2)
     
     # Generate recommendations
     recommendations = generate_recommendations(ashtakoot, manglik_analysis)
@@ -260,13 +426,37 @@ def get_manglik_recommendation(manglik1: dict, manglik2: dict) -> str:
     return "Manglik dosha mismatch. Recommend remedial measures before proceeding."
 
 
-def check_dasha_sandhi(profile1: Profile, profile2: Profile) -> dict:
-    """Check for Dasha Sandhi (dasha transition periods)"""
-    # Simplified check - in real implementation would check actual dasha periods
+def check_dasha_sandhi(profile1: Profile, profile2: Profile, chart1: dict, chart2: dict) -> dict:
+    """Check for Dasha Sandhi (overlapping Maha Dasha transitions from today on)"""
+    people = []
+    for profile, chart in ((profile1, chart1), (profile2, chart2)):
+        birth_datetime = datetime.combine(
+            profile.birth_date.date(),
+            datetime.strptime(profile.birth_time, "%H:%M:%S").time()
+        )
+        people.append({
+            "id": profile.id,
+            **sandhi_detector.transitions(birth_datetime, chart["planets"]["MOON"]["longitude"], levels=["maha"])
+        })
+
+    windows = sandhi_detector.detect(people, DEFAULT_TOLERANCE_DAYS, start=datetime.utcnow())
+
+    if not windows:
+        return {
+            "sandhi_present": False,
+            "description": "No major dasha transitions affecting compatibility",
+            "recommendation": "Proceed with normal timeline",
+            "windows": []
+        }
+
+    first = windows[0]
     return {
-        "sandhi_present": False,
-        "description": "No major dasha transitions affecting compatibility",
-        "recommendation": "Proceed with normal timeline"
+        "sandhi_present": True,
+        "description": (
+            f"Both partners change Maha Dasha between {first['start'][:10]} and {first['end'][:10]}"
+        ),
+        "recommendation": "Avoid scheduling the marriage within the sandhi window",
+        "windows": windows
     }
 
 
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from app.core.database import get_db
 from app.core.auth import get_current_user
@@ -10,10 +10,13 @@ from app.models.profile import Profile
 from app.models.chart import NatalChart, PlanetaryPosition
 from app.models.dasha import Dasha, DashaSystem, DashaLevel
 from app.modules.dasha.calculator import dasha_engine, VimshottariDasha
+from app.modules.dasha.sandhi import sandhi_detector, SANDHI_LEVELS, DEFAULT_TOLERANCE_DAYS
 from app.api.charts import get_or_compute_chart
 
 router = APIRouter(prefix="/api/dashas", tags=["dashas"])
 
+MAX_SANDHI_PROFILES = 50
+
 @router.get("/systems")
 async def get_dasha_systems():
     """Get available dasha systems"""
@@ -27,6 +30,81 @@ async def get_dasha_systems():
         ]
     }
 
+@router.get("/sandhi")
+async def get_dasha_sandhi(
+    profile_ids: List[int] = Query(..., description="Profile IDs (repeat the parameter)"),
+    tolerance_days: int = Query(DEFAULT_TOLERANCE_DAYS, ge=1, le=3650, description="Maximum gap between transitions"),
+    levels: List[str] = Query(["maha", "antar"], description="maha and/or antar"),
+    min_people: int = Query(2, ge=2, description="Minimum profiles sharing a window"),
+    start: Optional[str] = Query(None, description="Start date YYYY-MM-DD"),
+    end: Optional[str] = Query(None, description="End date YYYY-MM-DD"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Find Vimshottari dasha sandhi windows shared by two or more profiles.
+    All Maha/Antar transitions are merged into one sorted array and swept once.
+    """
+    profile_ids = list(dict.fromkeys(profile_ids))
+    if len(profile_ids) < 2:
+        raise HTTPException(status_code=400, detail="At least 2 profiles are required")
+    if len(profile_ids) > MAX_SANDHI_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {MAX_SANDHI_PROFILES} profiles per request"
+        )
+
+    invalid = [level for level in levels if level not in SANDHI_LEVELS]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid levels: {invalid}")
+
+    try:
+        start_date = datetime.strptime(start, "%Y-%m-%d") if start else None
+        end_date = datetime.strptime(end, "%Y-%m-%d") if end else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+    profiles = db.query(Profile).filter(
+        Profile.id.in_(profile_ids),
+        Profile.user_id == current_user.id
+    ).all()
+    profiles_by_id = {p.id: p for p in profiles}
+
+    missing = [pid for pid in profile_ids if pid not in profiles_by_id]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Profiles not found: {missing}")
+
+    people = []
+    for pid in profile_ids:
+        profile = profiles_by_id[pid]
+        natal_chart = get_or_compute_chart(profile, db)
+        moon_pos = db.query(PlanetaryPosition).filter(
+            PlanetaryPosition.natal_chart_id == natal_chart.id,
+            PlanetaryPosition.planet == "MOON"
+        ).first()
+        if not moon_pos:
+            raise HTTPException(status_code=500, detail="Moon position not found")
+
+        birth_datetime = datetime.combine(
+            profile.birth_date.date(),
+            datetime.strptime(profile.birth_time, "%H:%M:%S").time()
+        )
+        people.append({
+            "id": pid,
+            **sandhi_detector.transitions(birth_datetime, moon_pos.longitude, levels=levels)
+        })
+
+    windows = sandhi_detector.detect(
+        people, tolerance_days, min_people=min_people, start=start_date, end=end_date
+    )
+
+    return {
+        "profile_ids": profile_ids,
+        "tolerance_days": tolerance_days,
+        "levels": levels,
+        "windows": windows
+    }
+
 @router.get("/{profile_id}")
 async def get_dashas(
     profile_id: int,
@@ -79,8 +157,9 @@ async def get_dasha_children(
         NatalChart.id == parent_dasha.natal_chart_id
     ).first()
     
+    # Charts are shared by chart hash, so any of the user's profiles on it grants access
     profile = db.query(Profile).filter(
-        Profile.id == natal_chart.profile_id,
+        Profile.chart_hash == natal_chart.chart_hash,
         Profile.user_id == current_user.id
     ).first()
     
@@ -12,7 +12,8 @@ from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.models.user import User
 from app.models.profile import Profile
-from app.api.charts import get_or_compute_chart
+from app.api.charts import get_or_compute_chart, chart_image_data
+from app.modules.charts.render import chart_renderer, CHART_STYLES
 from app.api.dashas import get_or_compute_dashas, get_current_dasha
 from app.api.transits import get_today_transits
 
@@ -21,6 +22,7 @@ router = APIRouter(prefix="/api/export", tags=["export"])
 @router.get("/pdf/{profile_id}")
 async def export_pdf(
     profile_id: int,
+    chart_style: str = "north_indian",
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -33,6 +35,9 @@ async def export_pdf(
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
+    if chart_style not in CHART_STYLES:
+        raise HTTPException(status_code=400, detail=f"Unknown chart style: {chart_style}")
+    
     # Generate PDF
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter)
@@ -63,6 +68,26 @@ async def export_pdf(
         PlanetaryPosition.natal_chart_id == natal_chart.id
     ).all()
     
+    # Rasi and Navamsa charts, drawn with the same layout as the SVG charts
+    elements.append(Paragraph("<b>Birth Charts</b>", styles['Heading2']))
+    elements.append(Spacer(1, 0.1*inch))
+    
+    caption_style = ParagraphStyle('ChartCaption', parent=styles['Normal'], alignment=1)
+    charts = [chart_image_data(natal_chart, profile, division, profile.ayanamsa, db) for division in (1, 9)]
+    chart_table = Table(
+        [
+            [chart_renderer.drawing(chart, chart_style, 3*inch) for chart in charts],
+            [Paragraph(f"<b>{chart['title']}</b>", caption_style) for chart in charts]
+        ],
+        colWidths=[3.4*inch, 3.4*inch]
+    )
+    chart_table.setStyle(TableStyle([
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+    ]))
+    elements.append(chart_table)
+    elements.append(Spacer(1, 0.3*inch))
+    
     # Planetary Positions Table
     elements.append(Paragraph("<b>Planetary Positions (D1 - Rashi Chart)</b>", styles['Heading2']))
     elements.append(Spacer(1, 0.1*inch))
@@ -158,8 +183,8 @@ async def export_pdf(
     
     # Get natal Moon
     from app.modules.ephemeris.calculator import ephemeris
-    jd = ephemeris.get_julian_day(now)
-    transiting_planets = ephemeris.get_all_planets(jd)
+    from app.modules.transits.snapshot_cache import transit_cache
+    transiting_planets = transit_cache.get_positions(now)
     
     elements.append(Paragraph(f"<b>Date:</b> {now.strftime('%B %d, %Y')}", styles['Normal']))
     
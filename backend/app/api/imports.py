@@ -0,0 +1,298 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, date, timedelta
+from typing import Dict, List
+
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.core.database import get_db, SessionLocal
+from app.models.user import User
+from app.models.profile import Profile
+from app.models.profile_import import ProfileImportJob, ProfileImportChunk
+from app.models.align27 import DayScore
+from app.models.dasha import Dasha, DashaSystem
+from app.modules.align27.calculator import align27_calculator
+from app.modules.imports.profile_import import profile_import_parser, plan_chunks
+from app.api.charts import get_or_compute_chart
+from app.api.dashas import get_or_compute_dashas
+from app.api.align27 import get_chart_data, get_current_dasha, get_transiting_planets
+
+router = APIRouter(prefix="/api/profiles/import", tags=["imports"])
+
+INSERT_BATCH_SIZE = 1000
+
+
+def precompute_profile(profile: Profile, days: List[date], transits: Dict, db: Session):
+    """Chart, Vimshottari dashas and upcoming Align27 day scores for one profile"""
+    natal_chart = get_or_compute_chart(profile, db)
+
+    has_dashas = db.query(Dasha.id).filter(
+        Dasha.natal_chart_id == natal_chart.id,
+        Dasha.system == DashaSystem.VIMSHOTTARI
+    ).first()
+    if not has_dashas:
+        get_or_compute_dashas(natal_chart, profile, "VIMSHOTTARI", db)
+        db.commit()
+
+    _, moon_rasi, asc_rasi = get_chart_data(profile, db)
+    for target_date in days:
+        calc_hash = align27_calculator.calculate_hash(profile.id, target_date, moon_rasi, asc_rasi)
+        cached = db.query(DayScore.id).filter(
+            DayScore.profile_id == profile.id,
+            DayScore.date == target_date,
+            DayScore.calculation_hash == calc_hash
+        ).first()
+        if cached:
+            continue
+
+        # Transits are shared by every profile in the chunk
+        if target_date not in transits:
+            transits[target_date] = get_transiting_planets(target_date)
+
+        result = align27_calculator.calculate_day_score(
+            target_date, moon_rasi, asc_rasi, transits[target_date],
+            get_current_dasha(profile, db, target_date)
+        )
+
+        db.query(DayScore).filter(
+            DayScore.profile_id == profile.id,
+            DayScore.date == target_date
+        ).delete()
+        db.add(DayScore(
+            profile_id=profile.id,
+            date=target_date,
+            score=result["score"],
+            traffic_light=result["color"],
+            reasons=result["reasons"],
+            key_transits=result["key_transits"],
+            dasha_overlay=result["dasha_overlay"],
+            calculation_hash=calc_hash,
+            created_at=datetime.utcnow()
+        ))
+    db.commit()
+
+
+def precompute_chunk(chunk_id: int):
+    """Precompute one chunk in its own session, resuming after its cursor"""
+    db = SessionLocal()
+    try:
+        chunk = db.query(ProfileImportChunk).filter(ProfileImportChunk.id == chunk_id).first()
+        if not chunk or chunk.status == "COMPLETED":
+            return
+
+        chunk.status = "RUNNING"
+        chunk.updated_at = datetime.utcnow()
+        db.commit()
+
+        after = chunk.cursor if chunk.cursor is not None else chunk.first_profile_id - 1
+        profiles = db.query(Profile).filter(
+            Profile.import_job_id == chunk.job_id,
+            Profile.id > after,
+            Profile.id <= chunk.last_profile_id
+        ).order_by(Profile.id).all()
+
+        start = date.today()
+        days = [start + timedelta(days=i) for i in range(settings.BULK_IMPORT_ALIGN27_DAYS)]
+        transits = {}
+
+        for profile in profiles:
+            profile_id = profile.id
+            error = None
+            try:
+                precompute_profile(profile, days, transits, db)
+            except Exception as e:
+                db.rollback()
+                error = {"profile_id": profile_id, "error": str(e)}
+
+            # Progress is committed per profile so a restarted chunk skips finished work
+            chunk.cursor = profile_id
+            chunk.processed = (chunk.processed or 0) + 1
+            if error:
+                chunk.failed = (chunk.failed or 0) + 1
+                chunk.errors = (chunk.errors or []) + [error]
+            chunk.updated_at = datetime.utcnow()
+            db.commit()
+
+        chunk.status = "COMPLETED"
+        chunk.updated_at = datetime.utcnow()
+        db.commit()
+
+        pending = db.query(ProfileImportChunk).filter(
+            ProfileImportChunk.job_id == chunk.job_id,
+            ProfileImportChunk.status != "COMPLETED"
+        ).count()
+        if not pending:
+            job = db.query(ProfileImportJob).filter(ProfileImportJob.id == chunk.job_id).first()
+            job.status = "COMPLETED"
+            job.updated_at = datetime.utcnow()
+            db.commit()
+    finally:
+        db.close()
+
+
+def run_chunks(chunk_ids: List[int]):
+    """Precompute chunks across a process pool (a single process on SQLite)"""
+    workers = 1 if settings.DATABASE_URL.startswith("sqlite") else settings.BULK_IMPORT_WORKERS
+    workers = min(workers, len(chunk_ids))
+    if workers <= 1:
+        for chunk_id in chunk_ids:
+            precompute_chunk(chunk_id)
+        return
+
+    # Spawned workers build their own engine instead of inheriting pooled connections
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        list(pool.map(precompute_chunk, chunk_ids))
+
+
+def dispatch_chunks(chunk_ids: List[int], background_tasks: BackgroundTasks):
+    """Hand chunks to Celery when enabled, otherwise to a local process pool"""
+    if not chunk_ids:
+        return
+    if settings.BULK_IMPORT_USE_CELERY:
+        from app.workers.tasks import precompute_import_chunk
+        for chunk_id in chunk_ids:
+            precompute_import_chunk.delay(chunk_id)
+    else:
+        background_tasks.add_task(run_chunks, chunk_ids)
+
+
+def format_job(job: ProfileImportJob, chunks: List[ProfileImportChunk]) -> dict:
+    """Validation results and precompute progress for an import"""
+    processed = sum(c.processed or 0 for c in chunks)
+    return {
+        "id": job.id,
+        "filename": job.filename,
+        "status": job.status,
+        "total_rows": job.total_rows,
+        "imported_rows": job.imported_rows,
+        "rejected_rows": len(job.row_errors or []),
+        "row_errors": job.row_errors or [],
+        "precompute": {
+            "chunks": len(chunks),
+            "completed_chunks": sum(1 for c in chunks if c.status == "COMPLETED"),
+            "processed": processed,
+            "failed": sum(c.failed or 0 for c in chunks),
+            "total": job.imported_rows,
+            "progress": round(processed / job.imported_rows, 4) if job.imported_rows else 1.0
+        },
+        "precompute_errors": [e for c in chunks for e in (c.errors or [])],
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None
+    }
+
+
+def get_job(job_id: int, current_user: User, db: Session):
+    job = db.query(ProfileImportJob).filter(
+        ProfileImportJob.id == job_id,
+        ProfileImportJob.user_id == current_user.id
+    ).first()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Import not found")
+
+    chunks = db.query(ProfileImportChunk).filter(
+        ProfileImportChunk.job_id == job.id
+    ).order_by(ProfileImportChunk.chunk_index).all()
+    return job, chunks
+
+
+@router.post("")
+async def import_profiles(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk-create profiles from a CSV or JSON file.
+    Invalid rows are reported and skipped; charts, dashas and Align27 scores for
+    the imported profiles are precomputed in the background.
+    """
+    content = await file.read()
+    try:
+        records = profile_import_parser.parse(content, file.filename or "")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Could not read file: {e}")
+
+    if not records:
+        raise HTTPException(status_code=400, detail="File contains no profiles")
+    if len(records) > settings.BULK_IMPORT_MAX_ROWS:
+        raise HTTPException(status_code=400, detail=f"Maximum {settings.BULK_IMPORT_MAX_ROWS} profiles per import")
+
+    rows, row_errors = profile_import_parser.validate(records)
+
+    now = datetime.utcnow()
+    job = ProfileImportJob(
+        user_id=current_user.id,
+        filename=file.filename,
+        status="PRECOMPUTING" if rows else "FAILED",
+        total_rows=len(records),
+        imported_rows=len(rows),
+        row_errors=row_errors,
+        created_at=now,
+        updated_at=now
+    )
+    db.add(job)
+    db.flush()
+
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.bulk_insert_mappings(Profile, [
+            {
+                **{k: v for k, v in row.items() if k != "row"},
+                "user_id": current_user.id,
+                "import_job_id": job.id,
+                "created_at": now,
+                "updated_at": now
+            }
+            for row in rows[start:start + INSERT_BATCH_SIZE]
+        ])
+
+    profile_ids = [pid for (pid,) in db.query(Profile.id).filter(Profile.import_job_id == job.id)]
+    chunks = [
+        ProfileImportChunk(job_id=job.id, status="PENDING", processed=0, failed=0, errors=[], updated_at=now, **plan)
+        for plan in plan_chunks(profile_ids, settings.BULK_IMPORT_CHUNK_SIZE)
+    ]
+    db.add_all(chunks)
+    db.commit()
+
+    dispatch_chunks([c.id for c in chunks], background_tasks)
+    return format_job(job, chunks)
+
+
+@router.get("/{job_id}")
+async def get_import(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Import status, row errors and precompute progress"""
+    job, chunks = get_job(job_id, current_user, db)
+    return format_job(job, chunks)
+
+
+@router.post("/{job_id}/resume")
+async def resume_import(
+    job_id: int,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Re-dispatch unfinished chunks, e.g. after a worker restart"""
+    job, chunks = get_job(job_id, current_user, db)
+
+    unfinished = [c for c in chunks if c.status != "COMPLETED"]
+    if not unfinished:
+        raise HTTPException(status_code=400, detail="Import has no unfinished chunks")
+
+    for chunk in unfinished:
+        chunk.status = "PENDING"
+        chunk.updated_at = datetime.utcnow()
+    job.status = "PRECOMPUTING"
+    job.updated_at = datetime.utcnow()
+    db.commit()
+
+    dispatch_chunks([c.id for c in unfinished], background_tasks)
+    return format_job(job, chunks)
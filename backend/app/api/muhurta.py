@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.auth import get_current_user
+from app.models.user import User
+from app.modules.ephemeris.calculator import ephemeris
+from app.modules.geo.timezones import timezone_resolver
+from app.modules.muhurta.search import muhurta_search, MAX_SEARCH_DAYS
+from app.api.panchang import validate_options, format_time
+
+router = APIRouter(prefix="/api/muhurta", tags=["muhurta"])
+
+
+@router.get("/search")
+async def search_muhurta(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    timezone: str = Query("UTC", description="IANA timezone of the place"),
+    start: Optional[str] = Query(None, description="Local start date YYYY-MM-DD (default today)"),
+    days: int = Query(60, ge=1, le=MAX_SEARCH_DAYS),
+    tithi: Optional[List[int]] = Query(None, description="Allowed tithis (1-30)"),
+    nakshatra: Optional[List[int]] = Query(None, description="Allowed nakshatras (1-27)"),
+    yoga: Optional[List[int]] = Query(None, description="Allowed yogas (1-27)"),
+    karana: Optional[List[int]] = Query(None, description="Allowed karanas (1-60)"),
+    vara: Optional[List[str]] = Query(None, description="Allowed vara lords, or 'benefic'"),
+    hora: Optional[List[str]] = Query(None, description="Allowed hora lords, or 'benefic'"),
+    lagna: Optional[List[str]] = Query(None, description="Allowed rising signs (1-12) or movable/fixed/dual"),
+    avoid_rahu_kalam: bool = Query(False),
+    optional: List[str] = Query([], description="Constraints to prefer rather than require"),
+    min_minutes: float = Query(15, ge=1, le=1440),
+    limit: int = Query(20, ge=1, le=100),
+    ayanamsa: str = Query("LAHIRI"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Find electional windows at a place where every required constraint holds.
+    Windows are ranked by how many optional constraints they also meet, then by length.
+    """
+    validate_options(timezone, ayanamsa)
+    try:
+        start_date = datetime.strptime(start, "%Y-%m-%d") if start else datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid start format. Use YYYY-MM-DD")
+
+    given = {
+        "tithi": tithi, "nakshatra": nakshatra, "yoga": yoga, "karana": karana,
+        "vara": vara, "hora": hora, "lagna": lagna,
+        "rahu_kalam": [] if avoid_rahu_kalam else None
+    }
+    given = {name: values for name, values in given.items() if values is not None}
+    if not given:
+        raise HTTPException(status_code=400, detail="At least one constraint is required")
+
+    unknown = [name for name in optional if name not in given]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Optional constraints not given: {unknown}")
+
+    try:
+        constraints = {name: muhurta_search.normalize(name, values) for name, values in given.items()}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    start_jd = ephemeris.get_julian_day(timezone_resolver.to_utc(start_date, timezone))
+    end_jd = ephemeris.get_julian_day(timezone_resolver.to_utc(start_date + timedelta(days=days), timezone))
+
+    windows = muhurta_search.search(
+        start_jd, end_jd, latitude, longitude,
+        required={name: allowed for name, allowed in constraints.items() if name not in optional},
+        optional={name: allowed for name, allowed in constraints.items() if name in optional},
+        ayanamsa=ayanamsa, min_minutes=min_minutes, limit=limit
+    )
+
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "timezone": timezone,
+        "start": start_date.date().isoformat(),
+        "days": days,
+        "constraints": constraints,
+        "optional": optional,
+        "windows": [
+            {**w, "start": format_time(w["start"], timezone), "end": format_time(w["end"], timezone)}
+            for w in windows
+        ]
+    }
@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.core.database import get_db, SessionLocal
+from app.models.user import User
+from app.models.profile import Profile
+from app.modules.notifications.scheduler import notification_scheduler, get_notification_sink, NotificationSink
+from app.api.charts import get_or_compute_chart
+from app.api.align27 import get_transiting_planets
+
+router = APIRouter(prefix="/api/notifications", tags=["notifications"])
+
+
+def run_notification_tick(sink: NotificationSink = None, now: datetime = None) -> Dict[str, int]:
+    """One scheduler pass in its own session: refill a batch of profiles and send what is due"""
+    db = SessionLocal()
+    try:
+        return notification_scheduler.tick(
+            db, sink or get_notification_sink(), get_or_compute_chart, get_transiting_planets, now
+        )
+    finally:
+        db.close()
+
+
+@router.get("/upcoming")
+async def get_upcoming_notifications(
+    profile_id: Optional[int] = Query(None, description="Only this profile"),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the user's scheduled notifications (golden moments, dasha changes), soonest first.
+    The queue is filled by the notification worker, or for one profile by POST /{profile_id}/plan.
+    """
+    return {
+        "notifications": notification_scheduler.upcoming(db, current_user.id, profile_id, limit=limit)
+    }
+
+
+@router.post("/{profile_id}/plan")
+async def plan_profile_notifications(
+    profile_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Plan a profile's notifications now instead of waiting for the worker (e.g. just
+    created). Nothing is done while its plan is current and its birth data unchanged.
+    """
+    profile = db.query(Profile).filter(
+        Profile.id == profile_id,
+        Profile.user_id == current_user.id
+    ).first()
+
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    planned = notification_scheduler.refill(
+        db, get_or_compute_chart, get_transiting_planets, user_id=current_user.id, profile_id=profile_id, limit=1
+    )
+    return {
+        "planned": bool(planned),
+        "notifications": notification_scheduler.upcoming(db, current_user.id, profile_id)
+    }
@@ -0,0 +1,127 @@
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.auth import get_current_user
+from app.models.user import User
+from app.modules.ephemeris.calculator import AYANAMSA_MAP, NAKSHATRAS
+from app.modules.geo.timezones import timezone_resolver
+from app.modules.panchang.calculator import panchang_calculator
+from app.modules.panchang.lagna import lagna_calculator, DIVISIONS
+
+router = APIRouter(prefix="/api/panchang", tags=["panchang"])
+
+TIME_FIELDS = ["sunrise", "sunset", "next_sunrise"]
+SIGN_NAMES = [
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+]
+LIMBS = ["tithi", "nakshatra", "yoga", "karana"]
+
+
+def validate_options(timezone: Optional[str], ayanamsa: str):
+    if timezone and not timezone_resolver.is_valid(timezone):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: {timezone}")
+    if ayanamsa not in AYANAMSA_MAP:
+        raise HTTPException(status_code=400, detail=f"Unknown ayanamsa: {ayanamsa}")
+
+
+def format_time(value: datetime, timezone: Optional[str]) -> str:
+    """UTC by default, or local time with offset when a timezone is given"""
+    if not timezone:
+        return value.isoformat()
+    return value.replace(tzinfo=dt_timezone.utc).astimezone(ZoneInfo(timezone)).isoformat()
+
+
+def format_day(day: Dict, timezone: Optional[str]) -> Dict:
+    formatted = {**day}
+    for field in TIME_FIELDS:
+        formatted[field] = format_time(day[field], timezone)
+    for limb in LIMBS:
+        formatted[limb] = {**day[limb], "ends": format_time(day[limb]["ends"], timezone)}
+    return formatted
+
+
+@router.get("/day")
+async def get_panchang_day(
+    date: str = Query(..., description="Date in YYYY-MM-DD format"),
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    timezone: Optional[str] = Query(None, description="IANA timezone for displayed times (default UTC)"),
+    ayanamsa: str = Query("LAHIRI"),
+    current_user: User = Depends(get_current_user)
+):
+    """Vara, tithi, nakshatra, yoga and karana at sunrise with their end times"""
+    try:
+        target_date = datetime.strptime(date, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    validate_options(timezone, ayanamsa)
+
+    day = panchang_calculator.for_date(target_date, latitude, longitude, ayanamsa)
+    return {"latitude": latitude, "longitude": longitude, "timezone": timezone or "UTC",
+            "ayanamsa": ayanamsa, **format_day(day, timezone)}
+
+
+@router.get("/year")
+async def get_panchang_year(
+    year: int = Query(..., ge=1800, le=2100),
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    timezone: Optional[str] = Query(None, description="IANA timezone for displayed times (default UTC)"),
+    ayanamsa: str = Query("LAHIRI"),
+    current_user: User = Depends(get_current_user)
+):
+    """Panchang at sunrise for every day of a year"""
+    validate_options(timezone, ayanamsa)
+
+    days = panchang_calculator.for_year(year, latitude, longitude, ayanamsa)
+    return {
+        "year": year,
+        "latitude": latitude,
+        "longitude": longitude,
+        "timezone": timezone or "UTC",
+        "ayanamsa": ayanamsa,
+        "days": [format_day(day, timezone) for day in days]
+    }
+
+
+@router.get("/lagna")
+async def get_lagna_table(
+    date: str = Query(..., description="Date in YYYY-MM-DD format"),
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    timezone: Optional[str] = Query(None, description="IANA timezone for displayed times (default UTC)"),
+    division: str = Query("sign", description="sign or nakshatra"),
+    ayanamsa: str = Query("LAHIRI"),
+    current_user: User = Depends(get_current_user)
+):
+    """Times the ascendant enters each sign (or nakshatra) over a local mean day"""
+    try:
+        target_date = datetime.strptime(date, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    if division not in DIVISIONS:
+        raise HTTPException(status_code=400, detail=f"division must be one of {list(DIVISIONS)}")
+    validate_options(timezone, ayanamsa)
+
+    table = lagna_calculator.day(target_date, latitude, longitude, ayanamsa, division)
+    ends = list(table["starts"][1:]) + [table["end"]]
+    return {
+        "date": target_date.isoformat(),
+        "latitude": latitude,
+        "longitude": longitude,
+        "timezone": timezone or "UTC",
+        "division": division,
+        "segments": [
+            {
+                "value": int(value),
+                "name": (NAKSHATRAS if division == "nakshatra" else SIGN_NAMES)[int(value) - 1],
+                "start": format_time(panchang_calculator._datetime(start), timezone),
+                "end": format_time(panchang_calculator._datetime(end), timezone)
+            }
+            for start, end, value in zip(table["starts"], ends, table["values"])
+        ]
+    }
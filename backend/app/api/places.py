@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.auth import get_current_user
+from app.models.user import User
+from app.modules.geo.gazetteer import gazetteer, TRIE_TOP_K
+
+router = APIRouter(prefix="/api/places", tags=["places"])
+
+
+def get_gazetteer():
+    """Loaded gazetteer or 503 when it has not been built"""
+    loaded = gazetteer.gazetteer
+    if loaded is None:
+        raise HTTPException(status_code=503, detail="Gazetteer not installed")
+    return loaded
+
+
+@router.get("/search")
+async def search_places(
+    q: str = Query(..., min_length=1, max_length=100, description="Place name prefix"),
+    limit: int = Query(10, ge=1, le=TRIE_TOP_K),
+    current_user: User = Depends(get_current_user)
+):
+    """Autocomplete place names, most populous first"""
+    return {"query": q, "places": get_gazetteer().search(q, limit)}
+
+
+@router.get("/reverse")
+async def reverse_place(
+    latitude: float = Query(..., ge=-90, le=90),
+    longitude: float = Query(..., ge=-180, le=180),
+    current_user: User = Depends(get_current_user)
+):
+    """Nearest place and IANA timezone for coordinates"""
+    return {"latitude": latitude, "longitude": longitude, **get_gazetteer().reverse(latitude, longitude)}
@@ -1,14 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
+import json
+import numpy as np
 
 from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.models.user import User
 from app.models.profile import Profile
-from app.models.chart import PlanetaryPosition
+from app.models.chart import NatalChart, PlanetaryPosition
 from app.modules.ephemeris.calculator import ephemeris
+from app.modules.transits.snapshot_cache import transit_cache
+from app.modules.transits.events import transit_events, EVENT_TYPES, EVENT_PLANETS
+from app.modules.transits.natal_index import natal_longitude_index, NATAL_BODIES
+from app.modules.transits.sade_sati import saturn_timeline
+from app.modules.transits.heatmap import lifetime_heatmap, LIFE_AREAS
+from app.modules.charts.canonical import chart_canonicalizer
 from app.api.charts import get_or_compute_chart
 from app.api.dashas import get_current_dasha, get_or_compute_dashas
 
@@ -39,8 +48,7 @@ async def get_today_transits(
     
     # Get today's transits
     today = datetime.now()
-    jd = ephemeris.get_julian_day(today)
-    transiting_planets = ephemeris.get_all_planets(jd)
+    transiting_planets = transit_cache.get_positions(today)
     
     # Add rasi to transiting planets
     for planet, pos in transiting_planets.items():
@@ -92,15 +100,73 @@ async def get_today_transits(
         }
     }
 
+# Sampling steps for transit ranges and the longest range each may cover
+RANGE_STEPS = {
+    "hourly": timedelta(hours=1),
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1)
+}
+MAX_RANGE_DAYS = {"hourly": 92, "daily": 366 * 25, "weekly": 366 * 100}
+MAX_STREAM_RANGE_DAYS = {"hourly": 366 * 5, "daily": 366 * 200, "weekly": 366 * 500}
+STREAM_CHUNK_POINTS = 500
+
+
+def parse_transit_range(start: str, end: str, step: str, limits: dict) -> List[datetime]:
+    """Validate a transit range request and return its sample datetimes"""
+    if step not in RANGE_STEPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid step. Use one of: {', '.join(RANGE_STEPS)}"
+        )
+
+    try:
+        start_date = datetime.fromisoformat(start)
+        end_date = datetime.fromisoformat(end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use ISO 8601")
+
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="End date must not be before start date")
+
+    if (end_date - start_date).days > limits[step]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large for {step} step (max {limits[step]} days)"
+        )
+
+    step_delta = RANGE_STEPS[step]
+    count = int((end_date - start_date) / step_delta) + 1
+    return [start_date + i * step_delta for i in range(count)]
+
+
+def compute_transit_columns(sample_dates: List[datetime]) -> dict:
+    """Compute columnar longitude and rasi arrays for sample datetimes"""
+    jds = np.array([ephemeris.get_julian_day(d) for d in sample_dates])
+    series = ephemeris.get_planet_series(jds)
+
+    return {
+        "dates": [d.isoformat() for d in sample_dates],
+        "planets": {
+            planet: {
+                "longitude": np.round(data["longitude"], 4).tolist(),
+                "rasi": ephemeris.get_rasi_array(data["longitude"]).tolist()
+            }
+            for planet, data in series.items()
+        }
+    }
+
+
 @router.get("/range/{profile_id}")
 async def get_transits_range(
     profile_id: int,
     start: str,
     end: str,
+    step: str = Query("daily", description="hourly, daily or weekly"),
+    format: str = Query("rows", pattern="^(rows|columnar)$", description="rows or columnar"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get transits for a date range"""
+    """Get transits for a date range as per-date rows or per-planet columns"""
     profile = db.query(Profile).filter(
         Profile.id == profile_id,
         Profile.user_id == current_user.id
@@ -109,34 +175,33 @@ async def get_transits_range(
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
-    natal_chart = get_or_compute_chart(profile, db)
+    sample_dates = parse_transit_range(start, end, step, MAX_RANGE_DAYS)
     
-    start_date = datetime.fromisoformat(start)
-    end_date = datetime.fromisoformat(end)
+    if format == "columnar":
+        return {
+            "start_date": start,
+            "end_date": end,
+            "step": step,
+            **compute_transit_columns(sample_dates)
+        }
     
-    transits = []
-    current_date = start_date
+    jds = np.array([ephemeris.get_julian_day(d) for d in sample_dates])
+    series = ephemeris.get_planet_series(jds)
+    rasis = {planet: ephemeris.get_rasi_array(data["longitude"]) for planet, data in series.items()}
     
-    while current_date <= end_date:
-        jd = ephemeris.get_julian_day(current_date)
-        planets = ephemeris.get_all_planets(jd)
-        
-        # Add rasi
-        for planet, pos in planets.items():
-            pos["rasi"] = ephemeris.get_rasi(pos["longitude"])
-        
-        transits.append({
+    transits = [
+        {
             "date": current_date.isoformat(),
             "planets": {
                 planet: {
-                    "rasi": pos["rasi"],
-                    "longitude": pos["longitude"]
+                    "rasi": int(rasis[planet][i]),
+                    "longitude": float(data["longitude"][i])
                 }
-                for planet, pos in planets.items()
+                for planet, data in series.items()
             }
-        })
-        
-        current_date += timedelta(days=1)
+        }
+        for i, current_date in enumerate(sample_dates)
+    ]
     
     return {
         "start_date": start,
@@ -144,6 +209,223 @@ async def get_transits_range(
         "transits": transits
     }
 
+
+@router.get("/range/{profile_id}/stream")
+async def stream_transits_range(
+    profile_id: int,
+    start: str,
+    end: str,
+    step: str = Query("daily", description="hourly, daily or weekly"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stream transits for a long date range as NDJSON columnar chunks"""
+    profile = db.query(Profile).filter(
+        Profile.id == profile_id,
+        Profile.user_id == current_user.id
+    ).first()
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    sample_dates = parse_transit_range(start, end, step, MAX_STREAM_RANGE_DAYS)
+    
+    def generate():
+        yield json.dumps({
+            "start_date": start,
+            "end_date": end,
+            "step": step,
+            "points": len(sample_dates)
+        }) + "\n"
+        for offset in range(0, len(sample_dates), STREAM_CHUNK_POINTS):
+            chunk = sample_dates[offset:offset + STREAM_CHUNK_POINTS]
+            yield json.dumps({"offset": offset, **compute_transit_columns(chunk)}) + "\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+# Longest range solved on the fly when the precomputed events table does not cover it
+MAX_SOLVED_EVENT_RANGE_DAYS = 366 * 5
+
+
+@router.get("/events")
+async def get_transit_events(
+    start: str = Query(..., description="Start datetime (ISO 8601, UTC)"),
+    end: str = Query(..., description="End datetime (ISO 8601, UTC)"),
+    types: Optional[List[str]] = Query(None, description="Event types (repeat the parameter)"),
+    planets: Optional[List[str]] = Query(None, description="Planets (repeat the parameter)"),
+    current_user: User = Depends(get_current_user)
+):
+    """Get global transit events (ingresses, stations, nakshatra changes, combustion, eclipses)"""
+    try:
+        start_date = datetime.fromisoformat(start)
+        end_date = datetime.fromisoformat(end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use ISO 8601")
+    
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="End date must not be before start date")
+    
+    types = [t.upper() for t in types] if types else None
+    planets = [p.upper() for p in planets] if planets else None
+    
+    invalid_types = set(types or []) - set(EVENT_TYPES)
+    if invalid_types:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid event types: {', '.join(sorted(invalid_types))}"
+        )
+    invalid_planets = set(planets or []) - set(EVENT_PLANETS)
+    if invalid_planets:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid planets: {', '.join(sorted(invalid_planets))}"
+        )
+    
+    start_jd = ephemeris.get_julian_day(start_date)
+    end_jd = ephemeris.get_julian_day(end_date)
+    
+    table = transit_events.table
+    precomputed = table is not None and table.covers(start_jd, end_jd)
+    if not precomputed and (end_date - start_date).days > MAX_SOLVED_EVENT_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large without precomputed events (max {MAX_SOLVED_EVENT_RANGE_DAYS} days)"
+        )
+    
+    events = transit_events.find(start_jd, end_jd, types, planets)
+    
+    return {
+        "start_date": start,
+        "end_date": end,
+        "source": "table" if precomputed else "solver",
+        "events": transit_events.to_dicts(events)
+    }
+
+# Longest sweep for the reverse natal lookup
+MAX_NATAL_HITS_RANGE_DAYS = 366 * 2
+
+
+@router.get("/natal-hits")
+async def get_natal_hits(
+    planet: str = Query(..., description="Transiting planet"),
+    natal: str = Query(..., description="Natal point (planet or ASCENDANT)"),
+    start: str = Query(..., description="Start datetime (ISO 8601, UTC)"),
+    end: str = Query(..., description="End datetime (ISO 8601, UTC)"),
+    orb: float = Query(1.0, gt=0, le=10, description="Orb in degrees"),
+    angle: float = Query(0.0, ge=0, lt=360, description="Aspect angle (0 conjunction, 180 opposition)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Find which of the user's profiles a transit touches, e.g. Saturn over the natal
+    Moon within 1° this week, or Jupiter returning to natal Jupiter this month
+    """
+    planet, natal = planet.upper(), natal.upper()
+    if planet not in EVENT_PLANETS:
+        raise HTTPException(status_code=400, detail=f"Invalid planet: {planet}")
+    if natal not in NATAL_BODIES:
+        raise HTTPException(status_code=400, detail=f"Invalid natal point: {natal}")
+
+    try:
+        start_date = datetime.fromisoformat(start)
+        end_date = datetime.fromisoformat(end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use ISO 8601")
+
+    if end_date <= start_date:
+        raise HTTPException(status_code=400, detail="End date must be after start date")
+    if (end_date - start_date).days > MAX_NATAL_HITS_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large (max {MAX_NATAL_HITS_RANGE_DAYS} days)"
+        )
+
+    # Only the current user's profiles are swept and reported
+    profiles = {}
+    for chart_id, profile in db.query(NatalChart.id, Profile).join(
+        Profile, Profile.chart_hash == NatalChart.chart_hash
+    ).filter(Profile.user_id == current_user.id):
+        profiles.setdefault(chart_id, []).append(profile)
+
+    natal_longitude_index.refresh(db)
+    hits = natal_longitude_index.sweep(
+        planet, natal, ephemeris.get_julian_day(start_date), ephemeris.get_julian_day(end_date), orb, angle,
+        chart_ids=list(profiles)
+    )
+
+    results = []
+    for hit in hits:
+        for profile in profiles.get(hit["chart_id"], []):
+            results.append({
+                "profile_id": profile.id,
+                "profile_name": profile.name,
+                "natal_longitude": round(hit["natal_longitude"], 4),
+                "start": ephemeris.get_datetime(hit["start_jd"]).isoformat(),
+                "end": ephemeris.get_datetime(hit["end_jd"]).isoformat(),
+                "exact": [ephemeris.get_datetime(jd).isoformat() for jd in hit["exact_jds"]],
+                "closest_orb": hit["closest_orb"]
+            })
+
+    return {
+        "planet": planet,
+        "natal": natal,
+        "angle": angle,
+        "orb": orb,
+        "start_date": start,
+        "end_date": end,
+        "hits": results
+    }
+
+LIFETIME_YEARS = 100
+
+
+@router.get("/sade-sati/{profile_id}")
+async def get_sade_sati_timeline(
+    profile_id: int,
+    years: int = Query(LIFETIME_YEARS, ge=1, le=120, description="Years from birth"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get lifetime Sade Sati phases and Dhaiya/Kantaka periods"""
+    profile = db.query(Profile).filter(
+        Profile.id == profile_id,
+        Profile.user_id == current_user.id
+    ).first()
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    natal_chart = get_or_compute_chart(profile, db)
+    
+    natal_moon = db.query(PlanetaryPosition).filter(
+        PlanetaryPosition.natal_chart_id == natal_chart.id,
+        PlanetaryPosition.planet == "MOON"
+    ).first()
+    
+    start_jd = natal_chart.julian_day
+    end_jd = start_jd + years * 365.25
+    timeline = saturn_timeline.calculate(natal_moon.rasi, start_jd, end_jd)
+    
+    # Locate the current and next Sade Sati cycles
+    now = datetime.utcnow().isoformat()
+    current_cycle = None
+    next_cycle = None
+    for cycle in timeline["sade_sati"]:
+        if (cycle["start"] or "") <= now and (cycle["end"] is None or now < cycle["end"]):
+            current_cycle = cycle
+        elif cycle["start"] and cycle["start"] > now and next_cycle is None:
+            next_cycle = cycle
+    
+    return {
+        "profile_id": profile_id,
+        "natal_moon_rasi": natal_moon.rasi,
+        "start_date": ephemeris.get_datetime(start_jd).isoformat(),
+        "end_date": ephemeris.get_datetime(end_jd).isoformat(),
+        "current_sade_sati": current_cycle,
+        "next_sade_sati": next_cycle,
+        **timeline
+    }
+
 def check_sade_sati(saturn_rasi: int, moon_rasi: int) -> dict:
     """Check Sade Sati phase"""
     diff = (saturn_rasi - moon_rasi) % 12
@@ -197,3 +479,64 @@ def check_dhaiya_kantaka(saturn_rasi: int, moon_rasi: int) -> dict:
         }
 
 import app.models.dasha
+
+
+@router.get("/heatmap/{profile_id}")
+async def get_lifetime_heatmap(
+    profile_id: int,
+    years: int = Query(LIFETIME_YEARS, ge=1, le=120, description="Years from birth"),
+    areas: Optional[List[str]] = Query(None, description="Life areas (repeat the parameter)"),
+    top: int = Query(5, ge=0, le=50, description="Top windows per area"),
+    threshold: Optional[int] = Query(None, ge=0, le=100, description="Minimum window score (default: top decile)"),
+    upcoming: bool = Query(False, description="Only windows from the current month on"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get month-by-month scores (0-100) for life areas from dasha lords and
+    Jupiter/Saturn transits, with the strongest windows per area
+    """
+    profile = db.query(Profile).filter(
+        Profile.id == profile_id,
+        Profile.user_id == current_user.id
+    ).first()
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    areas = [a.lower() for a in areas] if areas else LIFE_AREAS
+    invalid_areas = set(areas) - set(LIFE_AREAS)
+    if invalid_areas:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid areas: {', '.join(sorted(invalid_areas))}"
+        )
+    
+    natal_chart = get_or_compute_chart(profile, db)
+    positions = db.query(PlanetaryPosition).filter(
+        PlanetaryPosition.natal_chart_id == natal_chart.id
+    ).all()
+    rasis = {pos.planet: pos.rasi for pos in positions}
+    moon_longitude = next(pos.longitude for pos in positions if pos.planet == "MOON")
+    
+    heatmap = lifetime_heatmap.calculate(
+        chart_canonicalizer.local_datetime(profile.birth_date, profile.birth_time),
+        int(natal_chart.ascendant / 30.0) + 1,
+        rasis,
+        moon_longitude,
+        profile.ayanamsa or "LAHIRI",
+        years,
+        list(dict.fromkeys(areas))
+    )
+    windows = lifetime_heatmap.top_windows(
+        heatmap, top, threshold, datetime.utcnow().replace(day=1) if upcoming else None
+    )
+    
+    return {
+        "profile_id": profile_id,
+        "start_month": str(heatmap["months"][0].astype("datetime64[M]")),
+        "months": len(heatmap["months"]),
+        "areas": heatmap["areas"],
+        "scores": {area: heatmap["scores"][:, i].tolist() for i, area in enumerate(heatmap["areas"])},
+        "top_windows": windows
+    }
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import Optional, Dict, List
@@ -13,6 +13,98 @@ from app.models.chart import PlanetaryPosition
 
 router = APIRouter(prefix="/api/varshaphala", tags=["varshaphala"])
 
+MAX_VARSHAPHALA_RANGE_YEARS = 120
+
+
+@router.get("/{profile_id}/range")
+async def get_varshaphala_range(
+    profile_id: int,
+    start_age: int = Query(1, ge=0, le=MAX_VARSHAPHALA_RANGE_YEARS, description="First age"),
+    end_age: int = Query(80, ge=0, le=MAX_VARSHAPHALA_RANGE_YEARS, description="Last age"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get compact Varshaphala summaries for a range of ages"""
+    profile = db.query(Profile).filter(
+        Profile.id == profile_id,
+        Profile.user_id == current_user.id
+    ).first()
+    
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    if end_age < start_age:
+        raise HTTPException(status_code=400, detail="end_age must not be before start_age")
+    
+    birth_year = profile.birth_date.year
+    years = list(range(birth_year + start_age, birth_year + end_age + 1))
+    
+    records = {
+        record.year: record
+        for record in db.query(VarshaphalaRecord).filter(
+            VarshaphalaRecord.profile_id == profile_id,
+            VarshaphalaRecord.year.in_(years)
+        ).all()
+    }
+    
+    missing_years = [year for year in years if year not in records]
+    if missing_years:
+        natal_chart = get_or_compute_chart(profile, db)
+        
+        positions = db.query(PlanetaryPosition).filter(
+            PlanetaryPosition.natal_chart_id == natal_chart.id,
+            PlanetaryPosition.planet == "SUN"
+        ).first()
+        
+        if not positions:
+            raise HTTPException(status_code=500, detail="Could not find natal Sun position")
+        
+        birth_datetime = datetime.combine(
+            profile.birth_date.date(),
+            datetime.strptime(profile.birth_time, "%H:%M:%S").time()
+        )
+        
+        # Solve every solar return together, then batch the annual charts
+        pravesh_times = varshaphala_calculator.calculate_varsha_pravesh_batch(
+            birth_datetime, positions.longitude, missing_years
+        )
+        annual_charts = varshaphala_calculator.calculate_annual_charts(
+            pravesh_times, profile.latitude, profile.longitude
+        )
+        
+        new_records = []
+        for year, varsha_pravesh, annual_chart in zip(missing_years, pravesh_times, annual_charts):
+            record, _ = build_varshaphala_record(
+                profile_id, year, birth_datetime, varsha_pravesh, annual_chart
+            )
+            new_records.append(record)
+            records[year] = record
+        
+        db.add_all(new_records)
+        db.commit()
+    
+    return {
+        "profile_id": profile_id,
+        "start_age": start_age,
+        "end_age": end_age,
+        "computed": len(missing_years),
+        "years": [
+            {
+                "year": year,
+                "age": year - birth_year,
+                "varsha_pravesh_date": records[year].varsha_pravesh_date.isoformat(),
+                "ascendant_rasi": int(records[year].ascendant / 30.0) + 1,
+                "planet_rasis": {
+                    planet: pos["rasi"] for planet, pos in records[year].planetary_positions.items()
+                },
+                "tajika_yoga_count": len(records[year].tajika_yogas or []),
+                "overall_theme": (records[year].predictions or {}).get("overall_theme")
+            }
+            for year in years
+        ]
+    }
+
+
 @router.get("/{profile_id}/{year}")
 async def get_varshaphala(
     profile_id: int,
@@ -75,57 +167,14 @@ async def get_varshaphala(
         varsha_pravesh, profile.latitude, profile.longitude
     )
     
-    # Detect Tajika yogas
-    tajika_yogas = varshaphala_calculator.detect_tajika_yogas(annual_chart["planets"])
-    
-    # Calculate Sahams
-    sahams = varshaphala_calculator.calculate_sahams(
-        annual_chart["planets"], annual_chart["ascendant"]
-    )
-    
-    # Calculate Mudda Dasha
-    mudda_dasha = varshaphala_calculator.calculate_mudda_dasha(birth_datetime, year)
-    
-    # Format planetary positions
-    planets_formatted = {}
-    for planet, pos in annual_chart["planets"].items():
-        planets_formatted[planet] = {
-            "longitude": pos["longitude"],
-            "rasi": pos.get("rasi", int(pos["longitude"] / 30.0) + 1),
-            "nakshatra": pos.get("nakshatra", ""),
-            "is_retrograde": pos.get("is_retrograde", False)
-        }
-    
-    # Generate basic predictions
-    predictions = generate_annual_predictions(planets_formatted, tajika_yogas)
-    
     # Cache the result
-    record = VarshaphalaRecord(
-        profile_id=profile_id,
-        year=year,
-        varsha_pravesh_date=varsha_pravesh,
-        julian_day=annual_chart["julian_day"],
-        ascendant=annual_chart["ascendant"],
-        planetary_positions=planets_formatted,
-        tajika_yogas=[{"name": y["name"], "planets": y["planets"], "description": y["description"]} for y in tajika_yogas],
-        sahams=sahams,
-        annual_dasha=[{"sign": d["sign"], "start_date": d["start_date"].isoformat(), "end_date": d["end_date"].isoformat()} for d in mudda_dasha],
-        predictions=predictions
+    record, result = build_varshaphala_record(
+        profile_id, year, birth_datetime, varsha_pravesh, annual_chart
     )
     db.add(record)
     db.commit()
     
-    return {
-        "year": year,
-        "varsha_pravesh_date": varsha_pravesh.isoformat(),
-        "ascendant": annual_chart["ascendant"],
-        "ascendant_rasi": int(annual_chart["ascendant"] / 30.0) + 1,
-        "planetary_positions": planets_formatted,
-        "tajika_yogas": tajika_yogas,
-        "sahams": sahams,
-        "mudda_dasha": [{"sign": d["sign"], "start_date": d["start_date"].isoformat(), "end_date": d["end_date"].isoformat()} for d in mudda_dasha],
-        "predictions": predictions
-    }
+    return result
 
 
 @router.get("/{profile_id}/compare/{year1}/{year2}")
@@ -245,6 +294,66 @@ async def get_muntha(
     }
 
 
+def build_varshaphala_record(
+    profile_id: int,
+    year: int,
+    birth_datetime: datetime,
+    varsha_pravesh: datetime,
+    annual_chart: Dict
+):
+    """Build the cached record and full response for one annual chart"""
+    # Detect Tajika yogas
+    tajika_yogas = varshaphala_calculator.detect_tajika_yogas(annual_chart["planets"])
+    
+    # Calculate Sahams
+    sahams = varshaphala_calculator.calculate_sahams(
+        annual_chart["planets"], annual_chart["ascendant"]
+    )
+    
+    # Calculate Mudda Dasha
+    mudda_dasha = varshaphala_calculator.calculate_mudda_dasha(birth_datetime, year)
+    
+    # Format planetary positions
+    planets_formatted = {}
+    for planet, pos in annual_chart["planets"].items():
+        planets_formatted[planet] = {
+            "longitude": pos["longitude"],
+            "rasi": pos.get("rasi", int(pos["longitude"] / 30.0) + 1),
+            "nakshatra": pos.get("nakshatra", ""),
+            "is_retrograde": pos.get("is_retrograde", False)
+        }
+    
+    # Generate basic predictions
+    predictions = generate_annual_predictions(planets_formatted, tajika_yogas)
+    
+    record = VarshaphalaRecord(
+        profile_id=profile_id,
+        year=year,
+        varsha_pravesh_date=varsha_pravesh,
+        julian_day=annual_chart["julian_day"],
+        ascendant=annual_chart["ascendant"],
+        planetary_positions=planets_formatted,
+        tajika_yogas=[{"name": y["name"], "planets": y["planets"], "description": y["description"]} for y in tajika_yogas],
+        sahams=sahams,
+        annual_dasha=[{"sign": d["sign"], "start_date": d["start_date"].isoformat(), "end_date": d["end_date"].isoformat()} for d in mudda_dasha],
+        predictions=predictions
+    )
+    
+    result = {
+        "year": year,
+        "varsha_pravesh_date": varsha_pravesh.isoformat(),
+        "ascendant": annual_chart["ascendant"],
+        "ascendant_rasi": int(annual_chart["ascendant"] / 30.0) + 1,
+        "planetary_positions": planets_formatted,
+        "tajika_yogas": tajika_yogas,
+        "sahams": sahams,
+        "mudda_dasha": [{"sign": d["sign"], "start_date": d["start_date"].isoformat(), "end_date": d["end_date"].isoformat()} for d in mudda_dasha],
+        "predictions": predictions
+    }
+    
+    return record, result
+
+
 def generate_annual_predictions(planets: Dict, yogas: List) -> Dict:
     """Generate basic annual predictions"""
     predictions = {
@@ -0,0 +1,111 @@
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user
+from app.core.database import get_db
+from app.models.user import User
+from app.models.profile import Profile
+from app.modules.charts.canonical import chart_canonicalizer
+from app.modules.ephemeris.calculator import AYANAMSA_MAP
+from app.modules.geo.timezones import timezone_resolver
+from app.modules.whatif.graph import whatif_graph, whatif_sessions, NODES, RESULTS
+
+router = APIRouter(prefix="/api/whatif", tags=["whatif"])
+
+
+class WhatIfRequest(BaseModel):
+    birth_date: Optional[date] = None
+    birth_time: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    timezone: Optional[str] = None
+    ayanamsa: Optional[str] = None
+    shift_minutes: float = 0
+    reset: bool = False
+    include_values: bool = False
+
+
+def whatif_params(profile: Profile, request: WhatIfRequest) -> dict:
+    """Canonical birth params: the profile's own data with the request's overrides"""
+    timezone = request.timezone or profile.timezone
+    if request.timezone and not timezone_resolver.is_valid(request.timezone):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: {request.timezone}")
+    if request.ayanamsa and request.ayanamsa.upper() not in AYANAMSA_MAP:
+        raise HTTPException(status_code=400, detail=f"Unknown ayanamsa: {request.ayanamsa}")
+    latitude = profile.latitude if request.latitude is None else request.latitude
+    longitude = profile.longitude if request.longitude is None else request.longitude
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+        raise HTTPException(status_code=400, detail="Invalid coordinates")
+
+    birth_date = datetime.combine(request.birth_date, datetime.min.time()) if request.birth_date else profile.birth_date
+    try:
+        local_dt = chart_canonicalizer.local_datetime(birth_date, request.birth_time or profile.birth_time)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="birth_time must be HH:MM or HH:MM:SS")
+
+    birth_datetime = local_dt + timedelta(minutes=request.shift_minutes)
+    canonical = chart_canonicalizer.canonicalize(
+        birth_datetime, timezone, latitude, longitude, request.ayanamsa or profile.ayanamsa
+    )
+    # Dashas are timed from the local birth datetime, like the stored ones
+    return {**canonical, "birth_datetime": birth_datetime, "date": date.today()}
+
+
+@router.post("/{profile_id}")
+async def evaluate_whatif(
+    profile_id: int,
+    request: WhatIfRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Re-evaluate a profile's chart, yogas, strengths, ashtakavarga, dashas, remedies
+    and today's Align27 score for edited birth data. Only the parts whose inputs
+    changed since the previous call in this editor session are recomputed, and the
+    response carries what changed; the first call returns every value.
+    """
+    profile = db.query(Profile).filter(
+        Profile.id == profile_id,
+        Profile.user_id == current_user.id
+    ).first()
+
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    params = whatif_params(profile, request)
+    session_key = (current_user.id, profile_id)
+    previous = None if request.reset else whatif_sessions.get(session_key)
+
+    state, recomputed = whatif_graph.evaluate(params, previous)
+    whatif_sessions.put(session_key, state)
+
+    response = {
+        "profile_id": profile_id,
+        "birth": {
+            "instant": params["instant"].isoformat(),
+            "latitude": params["latitude"],
+            "longitude": params["longitude"],
+            "ayanamsa": params["ayanamsa"]
+        },
+        "recomputed": recomputed,
+        "reused": [name for name in NODES if name not in recomputed],
+        "changes": whatif_graph.changes(previous, state) if previous else None
+    }
+    if previous is None or request.include_values:
+        response["values"] = {name: state[name]["value"] for name in RESULTS}
+    return response
+
+
+@router.delete("/{profile_id}")
+async def end_whatif_session(
+    profile_id: int,
+    current_user: User = Depends(get_current_user)
+):
+    """Drop the editor session so the next call starts from scratch"""
+    if not whatif_sessions.discard((current_user.id, profile_id)):
+        raise HTTPException(status_code=404, detail="What-if session not found")
+    return {"message": "What-if session ended"}
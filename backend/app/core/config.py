@@ -28,9 +28,69 @@ class Settings(BaseSettings):
     # Ephemeris
     EPHEMERIS_PATH: str = "/app/ephe"
     DEFAULT_AYANAMSA: str = "LAHIRI"
-    
+
+    # Chart canonicalization (birth data that rounds to the same form shares one chart)
+    CHART_CANON_TIME_PRECISION: str = os.getenv("CHART_CANON_TIME_PRECISION", "second")  # second or minute
+    CHART_CANON_COORD_DECIMALS: int = int(os.getenv("CHART_CANON_COORD_DECIMALS", "4"))
+
+    # Transit snapshot cache
+    TRANSIT_CACHE_STEP_MINUTES: int = int(os.getenv("TRANSIT_CACHE_STEP_MINUTES", "60"))
+    TRANSIT_CACHE_MAX_ENTRIES: int = int(os.getenv("TRANSIT_CACHE_MAX_ENTRIES", "4096"))
+    TRANSIT_CACHE_REDIS_ENABLED: bool = os.getenv("TRANSIT_CACHE_REDIS_ENABLED", "false").lower() == "true"
+    TRANSIT_CACHE_REDIS_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # Precomputed transit events table (scripts/build_transit_events.py)
+    TRANSIT_EVENTS_PATH: str = os.getenv("TRANSIT_EVENTS_PATH", "/app/data/transit_events")
+
+    # Offline gazetteer (scripts/build_gazetteer.py)
+    GAZETTEER_PATH: str = os.getenv("GAZETTEER_PATH", "/app/data/gazetteer")
+
+    # Bulk profile import
+    BULK_IMPORT_MAX_ROWS: int = int(os.getenv("BULK_IMPORT_MAX_ROWS", "50000"))
+    BULK_IMPORT_CHUNK_SIZE: int = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", "250"))
+    BULK_IMPORT_WORKERS: int = int(os.getenv("BULK_IMPORT_WORKERS", "4"))
+    BULK_IMPORT_USE_CELERY: bool = os.getenv("BULK_IMPORT_USE_CELERY", "false").lower() == "true"
+    BULK_IMPORT_ALIGN27_DAYS: int = int(os.getenv("BULK_IMPORT_ALIGN27_DAYS", "7"))
+
+    # Panchang year tables are shared per location tile; the default location
+    # (Ujjain) stands in where no place is known, e.g. Align27 tithi scoring
+    PANCHANG_TILE_DEGREES: float = float(os.getenv("PANCHANG_TILE_DEGREES", "0.5"))
+    PANCHANG_DEFAULT_LATITUDE: float = float(os.getenv("PANCHANG_DEFAULT_LATITUDE", "23.1765"))
+    PANCHANG_DEFAULT_LONGITUDE: float = float(os.getenv("PANCHANG_DEFAULT_LONGITUDE", "75.7885"))
+    # Lagna changes shift ~4 minutes per degree of longitude, so its tiles are much finer
+    LAGNA_TILE_DEGREES: float = float(os.getenv("LAGNA_TILE_DEGREES", "0.01"))
+
+    # Birth-time rectification searches at most this far either side of the recorded time
+    RECTIFICATION_MAX_WINDOW_MINUTES: int = int(os.getenv("RECTIFICATION_MAX_WINDOW_MINUTES", "240"))
+
+    # Chart editor what-if sessions kept in memory for incremental recomputation
+    WHATIF_MAX_SESSIONS: int = int(os.getenv("WHATIF_MAX_SESSIONS", "500"))
+
+    # Notification scheduler: each profile is planned NOTIFICATION_HORIZON_HOURS ahead
+    # and replanned once less than NOTIFICATION_REFILL_HOURS of its plan remains
+    NOTIFICATION_HORIZON_HOURS: int = int(os.getenv("NOTIFICATION_HORIZON_HOURS", "48"))
+    NOTIFICATION_REFILL_HOURS: int = int(os.getenv("NOTIFICATION_REFILL_HOURS", "24"))
+    NOTIFICATION_REFILL_BATCH: int = int(os.getenv("NOTIFICATION_REFILL_BATCH", "500"))
+    NOTIFICATION_SEND_BATCH: int = int(os.getenv("NOTIFICATION_SEND_BATCH", "1000"))
+    NOTIFICATION_GOLDEN_LEAD_MINUTES: int = int(os.getenv("NOTIFICATION_GOLDEN_LEAD_MINUTES", "15"))
+    NOTIFICATION_DASHA_LEAD_HOURS: int = int(os.getenv("NOTIFICATION_DASHA_LEAD_HOURS", "24"))
+    NOTIFICATION_TICK_SECONDS: int = int(os.getenv("NOTIFICATION_TICK_SECONDS", "60"))
+    # Push provider for delivery; the beat task is only scheduled once one is set
+    # ("local" keeps messages in memory and is meant for development)
+    NOTIFICATION_SINK: str = os.getenv("NOTIFICATION_SINK", "")
+
+    # Rendered chart images (SVG), content-addressed; an empty path keeps them in memory only
+    CHART_IMAGE_CACHE_PATH: str = os.getenv("CHART_IMAGE_CACHE_PATH", "/app/data/chart_images")
+    CHART_IMAGE_CACHE_MAX_ENTRIES: int = int(os.getenv("CHART_IMAGE_CACHE_MAX_ENTRIES", "2048"))
+
     # FAISS
     FAISS_INDEX_PATH: str = "/app/data/faiss_index"
+    # Chart similarity index, separate from the KB index; filtered searches over at
+    # most CHART_SIMILARITY_EXACT_LIMIT charts are ranked exactly instead of via HNSW
+    CHART_SIMILARITY_INDEX_PATH: str = os.getenv("CHART_SIMILARITY_INDEX_PATH", "/app/data/chart_similarity_index")
+    CHART_SIMILARITY_SAVE_EVERY: int = int(os.getenv("CHART_SIMILARITY_SAVE_EVERY", "100"))
+    CHART_SIMILARITY_EXACT_LIMIT: int = int(os.getenv("CHART_SIMILARITY_EXACT_LIMIT", "4096"))
+    CHART_SIMILARITY_EF_SEARCH: int = int(os.getenv("CHART_SIMILARITY_EF_SEARCH", "128"))
     
     # Celery
     CELERY_BROKER_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
@@ -3,7 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import os
 
 from app.core.database import get_db, engine
@@ -14,6 +14,7 @@ from app.core.auth import (
 from app.models.user import User
 from app.models.profile import Profile
 from app.models import Base
+from app.modules.geo.gazetteer import gazetteer
 
 # Import routers
 from app.api import charts, dashas, transits, export as export_router
@@ -21,6 +22,7 @@ from app.api import ashtakavarga, yogas, strength, varshaphala, compatibility, r
 from app.api import align27
 from app.api import kb, chat, ml  # Batch 5
 from app.api import dashboard  # Batch 6
+from app.api import places, imports, panchang, muhurta, whatif, notifications
 
 app = FastAPI(
     title="AstroOS API",
@@ -61,6 +63,22 @@ app.include_router(ml.router)
 # Include routers - Batch 6
 app.include_router(dashboard.router)
 
+# Offline place lookup
+app.include_router(places.router)
+
+# Bulk profile import
+app.include_router(imports.router)
+
+# Panchang and muhurta search
+app.include_router(panchang.router)
+app.include_router(muhurta.router)
+
+# Chart editor what-if sessions
+app.include_router(whatif.router)
+
+# Scheduled push notifications
+app.include_router(notifications.router)
+
 @app.on_event("startup")
 async def startup():
     """Create tables on startup if they don't exist"""
@@ -138,9 +156,9 @@ async def create_profile(
     birth_date: str,
     birth_time: str,
     birth_place: str,
-    latitude: float,
-    longitude: float,
-    timezone: str,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    timezone: Optional[str] = None,
     ayanamsa: str = "LAHIRI",
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -148,6 +166,12 @@ async def create_profile(
     from datetime import datetime
     bd = datetime.fromisoformat(birth_date)
     
+    # Missing coordinates or timezone come from the offline gazetteer
+    try:
+        latitude, longitude, timezone = gazetteer.resolve(birth_place, latitude, longitude, timezone)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     profile = Profile(
         user_id=current_user.id,
         name=name,
@@ -165,7 +189,14 @@ async def create_profile(
     db.commit()
     db.refresh(profile)
     
-    return {"id": profile.id, "name": profile.name, "message": "Profile created successfully"}
+    return {
+        "id": profile.id,
+        "name": profile.name,
+        "latitude": profile.latitude,
+        "longitude": profile.longitude,
+        "timezone": profile.timezone,
+        "message": "Profile created successfully"
+    }
 
 @app.get("/api/profiles/{profile_id}")
 async def get_profile(
@@ -8,22 +8,26 @@ from app.models.ashtakavarga import AshtakavargaTable
 from app.models.strength import Strength
 from app.models.transit import Transit
 from app.models.varshaphala import VarshaphalaRecord
-from app.models.compatibility import CompatibilityReport
+from app.models.compatibility import CompatibilityReport, CompatibilityIndexEntry
 from app.models.remedy import Remedy
 from app.models.align27 import DayScore, Moment, RitualRecommendation
 from app.models.kb import KBSource, KBChunk, KBEmbedding
 from app.models.chat import ChatSession, ChatMessage
 from app.models.ml import MLTrainingExample, MLModel
 from app.models.dashboard import DashboardWidget, UserDashboardLayout, DashboardInsightCache
+from app.models.profile_import import ProfileImportJob, ProfileImportChunk
+from app.models.notification import ScheduledNotification, NotificationCursor
 
 __all__ = [
     "Base",
     "User", "Profile", "NatalChart", "PlanetaryPosition", "DivisionalChart",
     "Dasha", "Yoga", "AshtakavargaTable", "Strength", "Transit",
-    "VarshaphalaRecord", "CompatibilityReport", "Remedy",
+    "VarshaphalaRecord", "CompatibilityReport", "CompatibilityIndexEntry", "Remedy",
     "DayScore", "Moment", "RitualRecommendation",
     "KBSource", "KBChunk", "KBEmbedding",
     "ChatSession", "ChatMessage",
     "MLTrainingExample", "MLModel",
-    "DashboardWidget", "UserDashboardLayout", "DashboardInsightCache"
+    "DashboardWidget", "UserDashboardLayout", "DashboardInsightCache",
+    "ProfileImportJob", "ProfileImportChunk",
+    "ScheduledNotification", "NotificationCursor"
 ]
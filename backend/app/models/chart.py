@@ -15,6 +15,7 @@ class NatalChart(Base):
     ascendant = Column(Float)
     mc = Column(Float)
     house_cusps = Column(JSON)  # List of 12 house cusps
+    tropical_data = Column(JSON)  # Tropical planets, ascendant, cusps and ayanamsa values
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, Text, Index
 from app.core.database import Base
 
 class CompatibilityReport(Base):
@@ -13,3 +13,22 @@ class CompatibilityReport(Base):
     dasha_sandhi = Column(JSON)  # Changed to JSON for dict storage
     recommendations = Column(JSON)  # Changed to JSON for list storage
     created_at = Column(DateTime)
+
+class CompatibilityIndexEntry(Base):
+    """Per-profile Moon state and Manglik status for compatibility search"""
+    __tablename__ = "compatibility_index"
+    __table_args__ = (
+        Index("ix_compatibility_index_bucket", "user_id", "moon_state", "is_manglik"),
+        Index("ix_compatibility_index_location", "user_id", "latitude", "longitude"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    profile_id = Column(Integer, ForeignKey("profiles.id"), nullable=False, unique=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    moon_state = Column(Integer, nullable=False)  # Moon nakshatra-pada, 0-107
+    is_manglik = Column(Integer, default=0)
+    manglik_cancelled = Column(Integer, default=0)
+    birth_date = Column(DateTime, nullable=False, index=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    updated_at = Column(DateTime)
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index
+from app.core.database import Base
+
+class ScheduledNotification(Base):
+    """A planned push notification; pending rows ordered by due_at form the send queue"""
+    __tablename__ = "scheduled_notifications"
+    __table_args__ = (
+        Index("ix_scheduled_notifications_queue", "status", "due_at"),
+        Index("ix_scheduled_notifications_profile", "profile_id", "due_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    profile_id = Column(Integer, ForeignKey("profiles.id"), nullable=False)
+    kind = Column(String(30), nullable=False)  # GOLDEN_MOMENT, DASHA_CHANGE
+    due_at = Column(DateTime, nullable=False)  # UTC send time
+    event_at = Column(DateTime, nullable=False)  # UTC start of the event
+    title = Column(String(255), nullable=False)
+    body = Column(String(500))
+    payload = Column(JSON)
+    dedupe_key = Column(String(120), nullable=False, unique=True)
+    status = Column(String(20), nullable=False, default="PENDING")  # PENDING, SENT, EXPIRED
+    sent_at = Column(DateTime)
+    created_at = Column(DateTime)
+
+class NotificationCursor(Base):
+    """How far ahead a profile's notifications have been planned"""
+    __tablename__ = "notification_cursors"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    profile_id = Column(Integer, ForeignKey("profiles.id"), nullable=False, unique=True)
+    planned_until = Column(DateTime, nullable=False, index=True)  # UTC
+    updated_at = Column(DateTime)
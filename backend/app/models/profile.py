@@ -24,6 +24,8 @@ class Profile(Base):
     ayanamsa = Column(String(50), default="LAHIRI")
     chart_style = Column(SQLEnum(ChartStyle), default=ChartStyle.NORTH_INDIAN)
     language_preference = Column(String(10), default="en")
+    chart_hash = Column(String(64), index=True)  # Canonical chart shared with identical births
+    import_job_id = Column(Integer, ForeignKey("profile_import_jobs.id"), nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -31,3 +33,5 @@ class Profile(Base):
     user = relationship("User", back_populates="profiles")
     natal_charts = relationship("NatalChart", back_populates="profile", cascade="all, delete-orphan")
     day_scores = relationship("DayScore", back_populates="profile", cascade="all, delete-orphan")
+    scheduled_notifications = relationship("ScheduledNotification", cascade="all, delete-orphan")
+    notification_cursor = relationship("NotificationCursor", uselist=False, cascade="all, delete-orphan")
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON
+from app.core.database import Base
+
+class ProfileImportJob(Base):
+    """Bulk profile upload: validation results and overall status"""
+    __tablename__ = "profile_import_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    filename = Column(String(255))
+    status = Column(String(50))  # PRECOMPUTING, COMPLETED, FAILED
+    total_rows = Column(Integer, default=0)
+    imported_rows = Column(Integer, default=0)
+    row_errors = Column(JSON)  # [{row, error}] from validation
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+
+class ProfileImportChunk(Base):
+    """A contiguous slice of an import's profiles, precomputed by one worker"""
+    __tablename__ = "profile_import_chunks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("profile_import_jobs.id"), nullable=False, index=True)
+    chunk_index = Column(Integer, nullable=False)
+    first_profile_id = Column(Integer, nullable=False)
+    last_profile_id = Column(Integer, nullable=False)
+    size = Column(Integer, nullable=False)
+    status = Column(String(50))  # PENDING, RUNNING, COMPLETED
+    cursor = Column(Integer)  # Last profile id processed, for resuming
+    processed = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    errors = Column(JSON)  # [{profile_id, error}] from precompute
+    updated_at = Column(DateTime)
@@ -2,6 +2,12 @@ from typing import Dict, List, Tuple
 from datetime import datetime, date, time, timedelta
 import hashlib
 import json
+import numpy as np
+from app.modules.panchang.calculator import panchang_calculator
+
+# Part of the DayScore cache key; bump when scoring changes so stored scores are recomputed
+# (v2: moon phase scored from the tithi at sunrise rather than the day of the month)
+DAY_SCORE_VERSION = "v2"
 
 class Align27Calculator:
     """
@@ -199,12 +205,9 @@ class Align27Calculator:
         return 0.0
     
     def _calculate_moon_phase_score(self, target_date: date) -> float:
-        """Calculate score based on lunar phase (simplified)"""
-        # Use a deterministic calculation based on date
-        day_of_month = target_date.day
-        
-        # Approximate tithi (1-15 Shukla, 16-30 Krishna)
-        tithi = (day_of_month % 30) + 1
+        """Calculate score based on the tithi prevailing at sunrise"""
+        # Tithi (1-15 Shukla, 16-30 Krishna) from the cached panchang year table
+        tithi = panchang_calculator.tithi_at_sunrise(target_date)
         
         # Favorable tithis: 2, 3, 5, 7, 10, 11, 13 (Shukla Paksha)
         favorable_tithis = [2, 3, 5, 7, 10, 11, 13]
@@ -518,7 +521,94 @@ class Align27Calculator:
             })
         
         return planner
-    
+
+    def generate_planner_matrix(self,
+                                start_date: date,
+                                days: int,
+                                natal_moon_rasis: List[int],
+                                natal_asc_rasis: List[int],
+                                transiting_planets: Dict,
+                                dasha_lords: List[str],
+                                sunrise: time = time(6, 0),
+                                sunset: time = time(18, 0)) -> Dict:
+        """
+        Generate planner scores for many profiles at once.
+        Scoring follows calculate_day_score / generate_moments, but shared
+        inputs (transits, hora table, lunar phase) are computed once and the
+        (profiles x days) grid is scored with array operations.
+        """
+        moon = np.asarray(natal_moon_rasis, dtype=np.int64)
+        asc = np.asarray(natal_asc_rasis, dtype=np.int64)
+        dates = [start_date + timedelta(days=i) for i in range(days)]
+        weekdays = np.array([d.weekday() for d in dates], dtype=np.int64)
+
+        # Day lord component, looked up per (profile, weekday)
+        day_lord_table = np.array([
+            [self._score_day_lord(self.WEEKDAY_LORDS[w], m, a) for w in range(7)]
+            for m, a in zip(moon.tolist(), asc.tolist())
+        ], dtype=np.float64).reshape(len(moon), 7)
+        score = 50.0 + day_lord_table[:, weekdays]
+
+        # Transit component depends only on natal Moon rasi; added planet by
+        # planet in the same order as calculate_day_score
+        for planet, pos in transiting_planets.items():
+            if planet in ["RAHU", "KETU"]:
+                continue
+            transit_rasi = pos.get("rasi", 1)
+            weight = self.TRANSIT_WEIGHTS.get(planet, 0.5)
+            by_moon = np.array([
+                self._calculate_transit_effect(planet, transit_rasi, r, 1) * weight
+                for r in range(1, 13)
+            ])
+            score = score + by_moon[moon - 1][:, None]
+
+        dasha_scores = np.array([
+            self._score_dasha_influence({"lord": lord} if lord else None, 0)
+            for lord in dasha_lords
+        ], dtype=np.float64)
+        score = score + dasha_scores[:, None]
+
+        moon_phase = np.array([self._calculate_moon_phase_score(d) for d in dates])
+        score = np.clip(score + moon_phase[None, :], 0, 100)
+
+        color_codes = np.where(score >= 65, 0, np.where(score >= 40, 1, 2))
+
+        # Hora table is shared by every profile and day
+        dt_start = datetime.combine(start_date, sunrise)
+        hora_duration = (datetime.combine(start_date, sunset) - dt_start).total_seconds() / 12
+        horas = []
+        for i in range(12):
+            hora_start = dt_start + timedelta(seconds=i * hora_duration)
+            horas.append({
+                "start": hora_start.strftime("%H:%M"),
+                "end": (hora_start + timedelta(seconds=hora_duration)).strftime("%H:%M")
+            })
+
+        hora_scores = np.array([
+            [self._score_hora(lord, m, a) for lord in self.HORA_ORDER]
+            for m, a in zip(moon.tolist(), asc.tolist())
+        ], dtype=np.float64).reshape(len(moon), 7)
+        day_lord_index = np.array([6, 0, 1, 2, 3, 4, 5])[weekdays]
+        hora_lords = (day_lord_index[:, None] + np.arange(12)[None, :]) % 7
+        grid_hora_scores = hora_scores[:, hora_lords]  # (profiles, days, 12)
+
+        # First maximum matches the stable sort used by generate_moments
+        best_hora = np.argmax(grid_hora_scores, axis=2)
+        ranked = -np.sort(-grid_hora_scores, axis=2)
+        productive = np.minimum(2, (ranked[:, :, 1:4] > 0).sum(axis=2))
+        moment_counts = 2 + productive
+
+        return {
+            "dates": [d.isoformat() for d in dates],
+            "weekdays": [d.strftime("%A") for d in dates],
+            "scores": [[round(float(s), 1) for s in row] for row in score],
+            "colors": color_codes.tolist(),
+            "color_legend": ["GREEN", "AMBER", "RED"],
+            "horas": horas,
+            "best_hora": best_hora.tolist(),
+            "moment_counts": moment_counts.tolist()
+        }
+
     def generate_ics_events(self,
                            start_date: date,
                            end_date: date,
@@ -573,7 +663,7 @@ class Align27Calculator:
     def calculate_hash(self, profile_id: int, target_date: date, 
                       natal_moon_rasi: int, natal_asc_rasi: int) -> str:
         """Calculate deterministic hash for caching"""
-        data = f"{profile_id}:{target_date.isoformat()}:{natal_moon_rasi}:{natal_asc_rasi}"
+        data = f"{DAY_SCORE_VERSION}:{profile_id}:{target_date.isoformat()}:{natal_moon_rasi}:{natal_asc_rasi}"
         return hashlib.sha256(data.encode()).hexdigest()[:32]
 
 align27_calculator = Align27Calculator()
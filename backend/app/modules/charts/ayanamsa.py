@@ -0,0 +1,141 @@
+"""
+Ayanamsa Variants
+A chart is computed once in tropical form. The sidereal chart for any ayanamsa
+is that tropical chart shifted by a single per-moment constant, so switching
+ayanamsa is array arithmetic instead of a new ephemeris pass.
+"""
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from app.modules.ephemeris.calculator import ephemeris, AYANAMSA_MAP, NAKSHATRAS, COMBUSTION_DEGREES
+from app.modules.charts.calculator import DivisionalChartCalculator
+
+NAKSHATRA_SPAN = 360.0 / 27.0
+
+
+class AyanamsaVariants:
+    """Tropical chart pass and lazily derived sidereal variants"""
+
+    def __init__(self):
+        self.div_calculator = DivisionalChartCalculator()
+
+    def tropical_pass(self, dt: datetime, lat: float, lon: float) -> Dict:
+        """Everything ayanamsa-independent about a chart, plus each ayanamsa value and rate"""
+        jd = ephemeris.get_julian_day(dt)
+        ascendant, house_cusps = ephemeris.get_houses(jd, lat, lon)
+
+        values = ephemeris.get_ayanamsa_values(jd)
+        next_day = ephemeris.get_ayanamsa_values(jd + 1.0)
+
+        return {
+            "julian_day": jd,
+            "ascendant": ascendant,
+            "house_cusps": list(house_cusps),
+            "planets": ephemeris.get_tropical_planets(jd),
+            "ayanamsas": {
+                name: {"value": value, "rate": next_day[name] - value}
+                for name, value in values.items()
+            }
+        }
+
+    def derive(self, tropical: Dict, ayanamsa: str = "LAHIRI") -> Dict:
+        """Sidereal chart for one ayanamsa, in the shape calculate_natal_chart returns"""
+        if ayanamsa not in tropical["ayanamsas"]:
+            raise ValueError(f"Unknown ayanamsa: {ayanamsa}")
+        shift = tropical["ayanamsas"][ayanamsa]["value"]
+        rate = tropical["ayanamsas"][ayanamsa]["rate"]
+
+        names = list(tropical["planets"])
+        source = [tropical["planets"][name] for name in names]
+        longitudes = (np.array([p["longitude"] for p in source]) - shift) % 360.0
+        speeds = np.array([p["speed"] for p in source]) - rate
+
+        rasis = (longitudes // 30.0).astype(int) + 1
+        nakshatras = (longitudes // NAKSHATRA_SPAN).astype(int)
+        padas = ((longitudes % NAKSHATRA_SPAN) // (NAKSHATRA_SPAN / 4)).astype(int) + 1
+
+        sun_lon = longitudes[names.index("SUN")]
+        sun_diff = np.abs(longitudes - sun_lon)
+        sun_diff = np.minimum(sun_diff, 360.0 - sun_diff)
+
+        planets = {}
+        for i, name in enumerate(names):
+            rasi = int(rasis[i])
+            planets[name] = {
+                "longitude": float(longitudes[i]),
+                "latitude": source[i]["latitude"],
+                "distance": source[i]["distance"],
+                "speed": float(speeds[i]),
+                "is_retrograde": bool(speeds[i] < 0) if name not in ["RAHU", "KETU"] else False,
+                "nakshatra": NAKSHATRAS[nakshatras[i]],
+                "pada": int(padas[i]),
+                "rasi": rasi,
+                "degree_in_rasi": float(longitudes[i] % 30.0),
+                "is_combust": name not in ["SUN", "RAHU", "KETU"] and
+                              bool(sun_diff[i] <= COMBUSTION_DEGREES.get(name, 15)),
+                "dignity": ephemeris.get_dignity(name, rasi)
+            }
+
+        divisional_charts = {}
+        for div_num in self.div_calculator.DIVISIONS:
+            div_rasis = self.div_calculator.calculate_divisional_array(longitudes, div_num)
+            divisional_charts[div_num] = dict(zip(names, div_rasis.tolist()))
+
+        cusps = (np.array(tropical["house_cusps"]) - shift) % 360.0
+
+        return {
+            "julian_day": tropical["julian_day"],
+            "ayanamsa": ayanamsa,
+            "ayanamsa_value": shift,
+            "ascendant": (tropical["ascendant"] - shift) % 360.0,
+            "mc": float(cusps[9]),
+            "house_cusps": cusps.tolist(),
+            "planets": planets,
+            "divisional_charts": divisional_charts
+        }
+
+    def compare(self, tropical: Dict, ayanamsas: List[str] = None) -> Dict:
+        """Side-by-side sidereal placements and the factors that change between ayanamsas"""
+        ayanamsas = ayanamsas or list(AYANAMSA_MAP)
+        variants = {name: self.derive(tropical, name) for name in ayanamsas}
+
+        comparison = {}
+        for name, chart in variants.items():
+            comparison[name] = {
+                "ayanamsa_value": chart["ayanamsa_value"],
+                "ascendant": chart["ascendant"],
+                "ascendant_rasi": int(chart["ascendant"] / 30.0) + 1,
+                "planets": {
+                    planet: {
+                        "longitude": pos["longitude"],
+                        "rasi": pos["rasi"],
+                        "nakshatra": pos["nakshatra"],
+                        "pada": pos["pada"],
+                        "navamsa": chart["divisional_charts"][9][planet],
+                        "dignity": pos["dignity"]
+                    }
+                    for planet, pos in chart["planets"].items()
+                }
+            }
+
+        differences = {}
+        for planet in tropical["planets"]:
+            changed = [
+                field for field in ["rasi", "nakshatra", "pada", "navamsa"]
+                if len({comparison[name]["planets"][planet][field] for name in ayanamsas}) > 1
+            ]
+            if changed:
+                differences[planet] = changed
+
+        return {
+            "ayanamsas": comparison,
+            "differences": {
+                "ascendant_rasi": len({comparison[name]["ascendant_rasi"] for name in ayanamsas}) > 1,
+                "planets": differences
+            }
+        }
+
+
+ayanamsa_variants = AyanamsaVariants()
@@ -1,8 +1,8 @@
 from typing import Dict, List
-import hashlib
 import json
 from datetime import datetime
-from app.modules.ephemeris.calculator import ephemeris
+import numpy as np
+from app.modules.ephemeris.calculator import AYANAMSA_MAP
 
 class DivisionalChartCalculator:
     """Calculate all divisional charts D1-D60"""
@@ -46,6 +46,24 @@ class DivisionalChartCalculator:
         
         return result_rasi + 1  # Return 1-based rasi number
     
+    def calculate_divisional_array(self, longitudes: np.ndarray, division: int) -> np.ndarray:
+        """Vectorized calculate_divisional_position for an array of longitudes"""
+        longitudes = np.asarray(longitudes, dtype=float)
+        rasi = (longitudes // 30.0).astype(int)
+        division_index = ((longitudes % 30.0) // (30.0 / division)).astype(int)
+        
+        if division == 2:  # Hora
+            first_half = division_index == 0
+            result_rasi = np.where(rasi % 2 == 0, np.where(first_half, 4, 5), np.where(first_half, 5, 4))
+        elif division == 3:  # Drekkana
+            result_rasi = (rasi + division_index * 4) % 12
+        elif division == 9:  # Navamsa
+            result_rasi = ((rasi % 3) * 3 + rasi // 3 + division_index) % 12
+        else:
+            result_rasi = (rasi + division_index) % 12
+        
+        return result_rasi + 1
+    
     def calculate_all_divisions(self, planetary_positions: Dict[str, Dict]) -> Dict[int, Dict[str, int]]:
         """Calculate all divisional charts for all planets"""
         divisions = {}
@@ -65,52 +83,22 @@ class ChartCalculator:
         self.div_calculator = DivisionalChartCalculator()
     
     def generate_chart_hash(self, dt: datetime, lat: float, lon: float, ayanamsa: str) -> str:
-        """Generate deterministic hash for chart caching"""
-        data = f"{dt.isoformat()}_{lat}_{lon}_{ayanamsa}"
-        return hashlib.sha256(data.encode()).hexdigest()
+        """Generate deterministic hash for chart caching (naive dt is a UTC instant)"""
+        from app.modules.charts.canonical import chart_canonicalizer
+        
+        canonical = chart_canonicalizer.canonicalize(dt, "UTC", lat, lon, ayanamsa)
+        return chart_canonicalizer.chart_hash(canonical)
     
     def calculate_natal_chart(self, dt: datetime, lat: float, lon: float, ayanamsa: str = "LAHIRI") -> Dict:
         """Calculate complete natal chart"""
-        # Get Julian Day
-        jd = ephemeris.get_julian_day(dt)
-        
-        # Get ayanamsa value
-        ayanamsa_value = ephemeris.get_ayanamsa(jd)
-        
-        # Calculate houses and ascendant
-        ascendant, house_cusps = ephemeris.get_houses(jd, lat, lon)
-        
-        # Apply ayanamsa to ascendant
-        asc_sidereal = (ascendant - ayanamsa_value) % 360.0
-        
-        # Get all planetary positions
-        planets = ephemeris.get_all_planets(jd)
-        
-        # Enhance planet data with additional info
-        sun_lon = planets["SUN"]["longitude"]
-        for planet, pos in planets.items():
-            lon = pos["longitude"]
-            pos["nakshatra"], pos["pada"] = ephemeris.get_nakshatra(lon)
-            pos["rasi"] = ephemeris.get_rasi(lon)
-            pos["degree_in_rasi"] = lon % 30.0
-            pos["is_combust"] = ephemeris.is_combust(lon, sun_lon, planet)
-            pos["dignity"] = ephemeris.get_dignity(planet, pos["rasi"])
-        
-        # Calculate MC (10th house cusp)
-        mc = (house_cusps[9] - ayanamsa_value) % 360.0
+        from app.modules.charts.ayanamsa import ayanamsa_variants
         
-        # Calculate divisional charts
-        divisional_charts = self.div_calculator.calculate_all_divisions(planets)
+        # One tropical pass; the sidereal chart for the requested ayanamsa is derived from it
+        tropical = ayanamsa_variants.tropical_pass(dt, lat, lon)
+        chart = ayanamsa_variants.derive(tropical, ayanamsa if ayanamsa in AYANAMSA_MAP else "LAHIRI")
+        chart["tropical"] = tropical
+        chart["chart_hash"] = self.generate_chart_hash(dt, lat, lon, ayanamsa)
         
-        return {
-            "julian_day": jd,
-            "ayanamsa_value": ayanamsa_value,
-            "ascendant": asc_sidereal,
-            "mc": mc,
-            "house_cusps": [(cusp - ayanamsa_value) % 360.0 for cusp in house_cusps],
-            "planets": planets,
-            "divisional_charts": divisional_charts,
-            "chart_hash": self.generate_chart_hash(dt, lat, lon, ayanamsa)
-        }
+        return chart
 
 chart_calculator = ChartCalculator()
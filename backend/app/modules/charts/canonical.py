@@ -0,0 +1,85 @@
+"""
+Chart Canonicalization
+Reduces birth data to a canonical form (UTC instant at a fixed time precision,
+coordinates at a fixed number of decimals, known ayanamsa) and hashes that
+form, so the same birth entered slightly differently maps to one stored chart.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict
+
+from app.core.config import settings
+from app.modules.ephemeris.calculator import AYANAMSA_MAP
+from app.modules.geo.timezones import timezone_resolver
+
+CANONICAL_HASH_VERSION = "v2"
+
+TIME_QUANTA = {
+    "second": timedelta(seconds=1),
+    "minute": timedelta(minutes=1)
+}
+
+
+class ChartCanonicalizer:
+    """Canonical birth data and content-addressed chart hashes"""
+
+    def __init__(self, time_precision: str = None, coord_decimals: int = None):
+        self.time_precision = time_precision or settings.CHART_CANON_TIME_PRECISION
+        if self.time_precision not in TIME_QUANTA:
+            raise ValueError(f"Unknown time precision: {self.time_precision}")
+        self.coord_decimals = settings.CHART_CANON_COORD_DECIMALS if coord_decimals is None else coord_decimals
+
+    @property
+    def time_quantum(self) -> timedelta:
+        return TIME_QUANTA[self.time_precision]
+
+    def local_datetime(self, birth_date: datetime, birth_time: str) -> datetime:
+        """Naive local birth datetime from the profile's date and HH:MM[:SS] time"""
+        fmt = "%H:%M:%S" if birth_time.count(":") == 2 else "%H:%M"
+        return datetime.combine(birth_date.date(), datetime.strptime(birth_time, fmt).time())
+
+    def to_utc(self, local_dt: datetime, tz_name: str) -> datetime:
+        """Naive UTC instant for a local datetime; unknown zones are taken as UTC"""
+        return timezone_resolver.to_utc(local_dt, tz_name)
+
+    def quantize(self, instant: datetime) -> datetime:
+        """Round an instant to the nearest time quantum"""
+        quantum = self.time_quantum
+        elapsed = instant - datetime(2000, 1, 1)
+        return datetime(2000, 1, 1) + quantum * round(elapsed / quantum)
+
+    def canonicalize(self, local_dt: datetime, tz_name: str, lat: float, lon: float,
+                     ayanamsa: str = "LAHIRI") -> Dict:
+        """Canonical (instant, latitude, longitude, ayanamsa) for one birth"""
+        ayanamsa = (ayanamsa or "").upper()
+        # Adding 0.0 folds -0.0 into 0.0 so both hash alike
+        return {
+            "instant": self.quantize(self.to_utc(local_dt, tz_name)),
+            "latitude": round(float(lat), self.coord_decimals) + 0.0,
+            "longitude": round(float(lon), self.coord_decimals) + 0.0,
+            "ayanamsa": ayanamsa if ayanamsa in AYANAMSA_MAP else "LAHIRI"
+        }
+
+    def for_profile(self, profile) -> Dict:
+        """Canonical form of a profile's birth data"""
+        return self.canonicalize(
+            self.local_datetime(profile.birth_date, profile.birth_time),
+            profile.timezone,
+            profile.latitude,
+            profile.longitude,
+            profile.ayanamsa
+        )
+
+    def chart_hash(self, canonical: Dict) -> str:
+        """Content-addressed hash of a canonical form"""
+        data = "|".join([
+            CANONICAL_HASH_VERSION,
+            canonical["instant"].isoformat(),
+            f"{canonical['latitude']:.{self.coord_decimals}f}",
+            f"{canonical['longitude']:.{self.coord_decimals}f}",
+            canonical["ayanamsa"]
+        ])
+        return hashlib.sha256(data.encode()).hexdigest()
+
+
+chart_canonicalizer = ChartCanonicalizer()
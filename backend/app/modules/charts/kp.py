@@ -0,0 +1,166 @@
+"""
+KP Sub-Lords
+Krishnamurti star, sub and sub-sub lords from one precomputed boundary table.
+Each nakshatra is split into 9 subs in Vimshottari proportion starting with its
+star lord, and each sub into 9 sub-subs starting with the sub lord; divisions
+that straddle a sign boundary are split there, which gives the 249 KP subs.
+Boundaries are built in exact integer units (1/18 arc-minute) and looked up with
+np.searchsorted, so any array of longitudes, from any number of charts, is
+resolved in one call. House significators come from planet x house occupation
+and ownership matrices.
+"""
+from typing import Dict
+
+import numpy as np
+
+from app.modules.dasha.calculator import VIMSHOTTARI_PERIODS, VIMSHOTTARI_SEQUENCE
+from app.modules.ephemeris.calculator import RASI_LORDS
+
+KP_PLANETS = ["SUN", "MOON", "MARS", "MERCURY", "JUPITER", "VENUS", "SATURN", "RAHU", "KETU"]
+SIGNIFICATOR_LEVELS = ["star_of_occupants", "occupants", "star_of_owners", "owners"]
+
+# A sub-sub spans years(sub) * years(sub-sub) units; one nakshatra is 120 * 120
+UNITS_PER_DEGREE = 1080
+NAKSHATRA_UNITS = 120 * 120
+SIGN_UNITS = 30 * UNITS_PER_DEGREE
+CIRCLE_UNITS = 360 * UNITS_PER_DEGREE
+
+LORDS = np.array(VIMSHOTTARI_SEQUENCE)
+PLANET_INDEX = {planet: i for i, planet in enumerate(KP_PLANETS)}
+# Lord codes (VIMSHOTTARI_SEQUENCE order) to KP_PLANETS rows, and each sign's lord as a row
+LORD_TO_PLANET = np.array([PLANET_INDEX[lord] for lord in VIMSHOTTARI_SEQUENCE])
+SIGN_LORD_PLANET = np.array([PLANET_INDEX[lord] for lord in RASI_LORDS])
+NODES = [PLANET_INDEX["RAHU"], PLANET_INDEX["KETU"]]
+
+
+class KPCalculator:
+    """Sorted KP boundary table and batched lord / significator lookups"""
+
+    def __init__(self):
+        years = [VIMSHOTTARI_PERIODS[lord] for lord in VIMSHOTTARI_SEQUENCE]
+        starts, stars, subs, sub_subs, sub_starts = [], [], [], [], []
+        position = 0
+        for nakshatra in range(27):
+            star = nakshatra % 9
+            for i in range(9):
+                sub = (star + i) % 9
+                sub_starts.append(position)
+                for j in range(9):
+                    starts.append(position)
+                    stars.append(star)
+                    subs.append(sub)
+                    sub_subs.append((sub + j) % 9)
+                    position += years[sub] * years[(sub + j) % 9]
+
+        # Split at sign boundaries; a split piece keeps the lords of the division it came from
+        signs = np.arange(0, CIRCLE_UNITS, SIGN_UNITS)
+        fine = np.asarray(starts)
+        rows = np.union1d(fine, signs)
+        parent = np.searchsorted(fine, rows, side="right") - 1
+        self.sub_boundaries = np.union1d(np.asarray(sub_starts), signs)
+
+        self.boundaries = rows / UNITS_PER_DEGREE
+        self.sign = (rows // SIGN_UNITS).astype(np.int8)
+        self.star = np.asarray(stars, dtype=np.int8)[parent]
+        self.sub = np.asarray(subs, dtype=np.int8)[parent]
+        self.sub_sub = np.asarray(sub_subs, dtype=np.int8)[parent]
+        self.number = (np.searchsorted(self.sub_boundaries, rows, side="right")).astype(np.int16)
+
+    @property
+    def sub_count(self) -> int:
+        return len(self.sub_boundaries)
+
+    def sub_table(self) -> list:
+        """The 249 KP subs: number, start and end longitude, sign, star and sub lords"""
+        bounds = np.append(self.sub_boundaries, CIRCLE_UNITS) / UNITS_PER_DEGREE
+        rows = np.searchsorted(self.boundaries, bounds[:-1], side="right") - 1
+        return [
+            {
+                "number": n + 1,
+                "start": round(float(bounds[n]), 6),
+                "end": round(float(bounds[n + 1]), 6),
+                "sign": int(self.sign[row]) + 1,
+                "sign_lord": RASI_LORDS[self.sign[row]],
+                "star_lord": str(LORDS[self.star[row]]),
+                "sub_lord": str(LORDS[self.sub[row]])
+            }
+            for n, row in enumerate(rows.tolist())
+        ]
+
+    def lookup(self, longitudes) -> Dict[str, np.ndarray]:
+        """Lord codes (index into VIMSHOTTARI_SEQUENCE) for longitudes of any shape"""
+        longitudes = np.mod(np.asarray(longitudes, dtype=np.float64), 360.0)
+        rows = np.searchsorted(self.boundaries, longitudes, side="right") - 1
+        return {
+            "sign": self.sign[rows] + 1,
+            "star": self.star[rows],
+            "sub": self.sub[rows],
+            "sub_sub": self.sub_sub[rows],
+            "number": self.number[rows]
+        }
+
+    def describe(self, longitudes) -> list:
+        """Named lords for a 1-D array of longitudes"""
+        codes = self.lookup(longitudes)
+        return [
+            {
+                "longitude": round(float(lon), 6),
+                "sign": int(codes["sign"][i]),
+                "sign_lord": RASI_LORDS[codes["sign"][i] - 1],
+                "star_lord": str(LORDS[codes["star"][i]]),
+                "sub_lord": str(LORDS[codes["sub"][i]]),
+                "sub_sub_lord": str(LORDS[codes["sub_sub"][i]]),
+                "kp_number": int(codes["number"][i])
+            }
+            for i, lon in enumerate(np.asarray(longitudes, dtype=np.float64).tolist())
+        ]
+
+    def houses(self, planet_longitudes: np.ndarray, cusps: np.ndarray) -> np.ndarray:
+        """
+        (charts, planets) house number 1-12 of each planet between consecutive cusps.
+        planet_longitudes is (charts, 9) in KP_PLANETS order, cusps is (charts, 12).
+        """
+        planet_longitudes, cusps = np.atleast_2d(planet_longitudes), np.atleast_2d(cusps)
+        offsets = (planet_longitudes - cusps[:, :1]) % 360.0
+        cusp_offsets = (cusps - cusps[:, :1]) % 360.0
+        return (offsets[:, :, None] >= cusp_offsets[:, None, :]).sum(axis=2)
+
+    def significators(self, planet_longitudes: np.ndarray, cusps: np.ndarray) -> np.ndarray:
+        """
+        (charts, 4, planets, houses) boolean significator matrix, levels as in
+        SIGNIFICATOR_LEVELS: planets in the star of occupants, occupants, planets in
+        the star of owners, owners. Rahu and Ketu own no sign and act for their sign lord.
+        """
+        planet_longitudes, cusps = np.atleast_2d(planet_longitudes), np.atleast_2d(cusps)
+        charts = len(planet_longitudes)
+        eye = np.eye(len(KP_PLANETS), dtype=np.int32)
+
+        occupation = np.eye(12, dtype=np.int32)[self.houses(planet_longitudes, cusps) - 1]
+        cusp_signs = (cusps // 30.0).astype(np.int64) % 12
+        ownership = np.swapaxes(eye[SIGN_LORD_PLANET[cusp_signs]], 1, 2)
+
+        node_signs = (planet_longitudes[:, NODES] // 30.0).astype(np.int64) % 12
+        for k, node in enumerate(NODES):
+            ownership[:, node] |= ownership[np.arange(charts), SIGN_LORD_PLANET[node_signs[:, k]]]
+
+        # star[c, p, q] = 1 when planet p is in the star of planet q
+        star = eye[LORD_TO_PLANET[self.lookup(planet_longitudes)["star"]]]
+        levels = np.stack([star @ occupation, occupation, star @ ownership, ownership], axis=1)
+        return levels > 0
+
+    def significator_table(self, significators: np.ndarray) -> Dict:
+        """Named significators of one chart per house and houses signified per planet"""
+        houses = {}
+        for h in range(12):
+            houses[str(h + 1)] = {
+                level: [KP_PLANETS[p] for p in np.flatnonzero(significators[i, :, h])]
+                for i, level in enumerate(SIGNIFICATOR_LEVELS)
+            }
+        planets = {
+            planet: (np.flatnonzero(significators[:, p, :].any(axis=0)) + 1).tolist()
+            for p, planet in enumerate(KP_PLANETS)
+        }
+        return {"houses": houses, "planets": planets}
+
+
+kp_calculator = KPCalculator()
@@ -0,0 +1,210 @@
+"""
+Birth-Time Rectification
+Every chart element that can change within a window around a recorded birth time
+does so when a longitude crosses a multiple of 30/D degrees (varga D) or of 13°20'
+(nakshatra). Those crossings are bracketed on a coarse grid and solved with Newton
+steps, so the window splits into segments of distinct charts without recomputing
+the chart minute by minute. Segments are then scored against dated life events by
+the Vimshottari lords running at each event.
+"""
+from datetime import date, datetime
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from app.modules.charts.calculator import DivisionalChartCalculator
+from app.modules.dasha.calculator import VimshottariDasha
+from app.modules.ephemeris.calculator import ephemeris, PLANETS, RASI_LORDS, EVENT_SIGNIFICATIONS
+
+BODIES = ["ASCENDANT", "SUN", "MOON", "MERCURY", "VENUS", "MARS", "JUPITER", "SATURN", "RAHU", "KETU"]
+VARGAS = list(DivisionalChartCalculator.DIVISIONS)
+NAKSHATRA_SPAN = 360.0 / 27.0
+
+SAMPLE_MINUTES = 5
+NEWTON_STEPS = 3
+
+
+class RectificationEngine:
+    """Varga and nakshatra boundary events and distinct-chart segments around a birth time"""
+
+    def __init__(self):
+        self.div_calculator = DivisionalChartCalculator()
+
+    def spans(self, vargas: Sequence[int]) -> Dict[str, float]:
+        """Boundary spacing in degrees for each tracked division"""
+        spans = {f"D{d}": 30.0 / d for d in vargas}
+        spans["nakshatra"] = NAKSHATRA_SPAN
+        return spans
+
+    def body_series(self, body: str, jds: np.ndarray, latitude: float,
+                    longitude: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Sidereal longitude and speed (degrees/day) of one body; call inside sidereal_mode"""
+        jds = np.asarray(jds, dtype=np.float64)
+        flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
+        longitudes, speeds = np.empty(len(jds)), np.empty(len(jds))
+        for i, jd in enumerate(jds):
+            if body == "ASCENDANT":
+                _, ascmc, _, ascmc_speed = swe.houses_ex2(jd, latitude, longitude, b'E', flag)
+                longitudes[i], speeds[i] = ascmc[0], ascmc_speed[0]
+            else:
+                result = swe.calc_ut(jd, PLANETS[body], flag)[0]
+                longitudes[i], speeds[i] = result[0], result[3]
+        if body == "KETU":
+            longitudes = (longitudes + 180.0) % 360.0
+        return longitudes, speeds
+
+    def boundary_events(self, start_jd: float, end_jd: float, latitude: float, longitude: float,
+                        ayanamsa: str, vargas: Sequence[int] = VARGAS) -> List[Dict]:
+        """Every instant in [start_jd, end_jd) at which a body crosses a tracked boundary, by time"""
+        spans = self.spans(vargas)
+        count = max(int(np.ceil((end_jd - start_jd) * 1440.0 / SAMPLE_MINUTES)), 1) + 1
+        samples = np.linspace(start_jd, end_jd, count)
+
+        events = []
+        with ephemeris.sidereal_mode(ayanamsa):
+            for body in BODIES:
+                unwrapped = np.unwrap(self.body_series(body, samples, latitude, longitude)[0], period=360.0)
+
+                # Bracket each boundary between grid samples; divisions share many boundaries,
+                # and a station can cross the same boundary again in a later bracket
+                guesses = {}
+                for span in spans.values():
+                    index = np.floor(unwrapped / span)
+                    for i in np.flatnonzero(np.diff(index)).tolist():
+                        low, high = sorted((int(index[i]), int(index[i + 1])))
+                        for k in range(low + 1, high + 1):
+                            degree = round((k * span) % 360.0, 6)
+                            if (degree, i) in guesses:
+                                continue
+                            fraction = (k * span - unwrapped[i]) / (unwrapped[i + 1] - unwrapped[i])
+                            guesses[(degree, i)] = samples[i] + fraction * (samples[i + 1] - samples[i])
+                if not guesses:
+                    continue
+
+                degrees = np.array([degree for degree, _ in guesses])
+                times = np.array(list(guesses.values()))
+                for _ in range(NEWTON_STEPS):
+                    longitudes, speeds = self.body_series(body, times, latitude, longitude)
+                    times = times - ((longitudes - degrees + 180.0) % 360.0 - 180.0) / speeds
+
+                for jd, degree in zip(times.tolist(), degrees.tolist()):
+                    if not start_jd <= jd < end_jd:
+                        continue
+                    divisions = [name for name, span in spans.items()
+                                 if abs(degree / span - round(degree / span)) < 1e-6]
+                    events.append({"jd": jd, "body": body, "degree": degree, "divisions": divisions})
+
+        return sorted(events, key=lambda e: e["jd"])
+
+    def placements(self, jds: np.ndarray, latitude: float, longitude: float, ayanamsa: str,
+                   vargas: Sequence[int] = VARGAS) -> Tuple[Dict[str, np.ndarray], Dict[Tuple[str, str], np.ndarray]]:
+        """Longitudes per body and 1-based placements per (body, division) at many instants"""
+        longitudes = {}
+        with ephemeris.sidereal_mode(ayanamsa):
+            for body in BODIES:
+                longitudes[body] = self.body_series(body, jds, latitude, longitude)[0]
+
+        columns = {}
+        for body, values in longitudes.items():
+            for d in vargas:
+                columns[(body, f"D{d}")] = self.div_calculator.calculate_divisional_array(values, d)
+            columns[(body, "nakshatra")] = (values // NAKSHATRA_SPAN).astype(int) % 27 + 1
+        return longitudes, columns
+
+    def segments(self, birth_jd: float, window_minutes: float, latitude: float, longitude: float,
+                 ayanamsa: str, vargas: Sequence[int] = VARGAS) -> List[Dict]:
+        """Distinct charts within ±window_minutes of the recorded birth time"""
+        start_jd = birth_jd - window_minutes / 1440.0
+        end_jd = birth_jd + window_minutes / 1440.0
+        events = self.boundary_events(start_jd, end_jd, latitude, longitude, ayanamsa, vargas)
+
+        cuts = np.unique([e["jd"] for e in events])
+        starts = np.concatenate([[start_jd], cuts])
+        ends = np.concatenate([cuts, [end_jd]])
+        longitudes, columns = self.placements((starts + ends) / 2.0, latitude, longitude, ayanamsa, vargas)
+
+        # A boundary touched without crossing leaves the chart unchanged; merge it away
+        keys = list(columns)
+        table = np.column_stack([columns[key] for key in keys])
+        opens = np.concatenate([[True], np.any(table[1:] != table[:-1], axis=1)])
+        rows = np.flatnonzero(opens)
+        ends = np.append(starts[rows[1:]], end_jd)
+
+        segments = []
+        for n, row in enumerate(rows.tolist()):
+            chart = {body: {} for body in BODIES}
+            for (body, division), values in columns.items():
+                chart[body][division] = int(values[row])
+            changes = [] if n == 0 else [
+                {"body": body, "division": division, "from": int(columns[(body, division)][rows[n - 1]]),
+                 "to": int(columns[(body, division)][row])}
+                for body, division in keys
+                if columns[(body, division)][row] != columns[(body, division)][rows[n - 1]]
+            ]
+            segments.append({
+                "start_jd": float(starts[row]),
+                "end_jd": float(ends[n]),
+                "moon_longitude": float(longitudes["MOON"][row]),
+                "chart": chart,
+                "changes": changes
+            })
+        return segments
+
+    def running_lords(self, birth_jd: float, moon_longitude: float, dates: Sequence[date]) -> List[Tuple[str, str]]:
+        """Vimshottari (maha, antar) lords in force on each date"""
+        calculator = VimshottariDasha(ephemeris.get_datetime(birth_jd), moon_longitude)
+        moments = [datetime(d.year, d.month, d.day) for d in dates]
+        years = max([(m - calculator.birth_date).days / 365.25 for m in moments] + [0.0]) + 1.0
+
+        lords = []
+        mahas = calculator.calculate_maha_dashas(int(np.ceil(years)))
+        for moment in moments:
+            running = (None, None)
+            for maha in mahas:
+                if maha["start_date"] <= moment < maha["end_date"]:
+                    antar = next((a for a in calculator.calculate_antar_dashas(maha)
+                                  if a["start_date"] <= moment < a["end_date"]), None)
+                    running = (maha["lord"], antar["lord"] if antar else None)
+                    break
+            lords.append(running)
+        return lords
+
+    def signifies(self, lord: str, chart: Dict[str, Dict[str, int]], division: str, houses: Sequence[int]) -> bool:
+        """Whether a planet owns or occupies one of the houses counted from the divisional ascendant"""
+        ascendant = chart["ASCENDANT"][division]
+        owned = {RASI_LORDS[(ascendant - 1 + h - 1) % 12] for h in houses}
+        occupied = (chart[lord][division] - ascendant) % 12 + 1
+        return lord in owned or occupied in houses
+
+    def score(self, segments: List[Dict], events: List[Dict]) -> List[Dict]:
+        """
+        Rank segments by how well their dashas time the events. Each event earns a
+        point when the maha or antar lord signifies the event's houses in D1 and in
+        the event's varga, normalized to 0-1 across all events.
+        """
+        dates = [e["date"] for e in events]
+        ranked = []
+        for index, segment in enumerate(segments):
+            mid = (segment["start_jd"] + segment["end_jd"]) / 2.0
+            chart = segment["chart"]
+            total, matches = 0, []
+            for event, (maha, antar) in zip(events, self.running_lords(mid, segment["moon_longitude"], dates)):
+                signification = EVENT_SIGNIFICATIONS[event["kind"]]
+                divisions = ["D1"] + ([f"D{signification['varga']}"]
+                                      if f"D{signification['varga']}" in chart["ASCENDANT"] else [])
+                points = sum(
+                    1 for lord in (maha, antar) if lord
+                    for division in divisions if self.signifies(lord, chart, division, signification["houses"])
+                )
+                total += points
+                matches.append({**event, "maha": maha, "antar": antar,
+                                "points": points, "max_points": 2 * len(divisions)})
+            possible = sum(m["max_points"] for m in matches)
+            ranked.append({"segment": index, "score": round(total / possible, 4) if possible else 0.0,
+                           "events": matches})
+
+        return sorted(ranked, key=lambda r: (-r["score"], r["segment"]))
+
+
+rectification_engine = RectificationEngine()
@@ -0,0 +1,287 @@
+"""
+Chart Renderer
+Server-side North and South Indian chart images. A chart is laid out once as a
+display list of lines, rectangles and labels, which is written out either as SVG
+or as a reportlab Drawing for the PDF report. Rendered SVG is cached under a
+digest of everything that determines its bytes (chart hash, division, style and
+options), in memory and in a directory of content-addressed files.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from reportlab.graphics.shapes import Drawing, Line, Rect, String
+from reportlab.lib import colors
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when the drawing changes so cached images are not served stale
+RENDER_VERSION = 1
+
+CHART_STYLES = ("north_indian", "south_indian")
+
+PLANET_ORDER = ["SUN", "MOON", "MARS", "MERCURY", "JUPITER", "VENUS", "SATURN", "RAHU", "KETU"]
+PLANET_LABELS = {
+    "SUN": "Su", "MOON": "Mo", "MARS": "Ma", "MERCURY": "Me", "JUPITER": "Ju",
+    "VENUS": "Ve", "SATURN": "Sa", "RAHU": "Ra", "KETU": "Ke"
+}
+SIGN_LABELS = ["Ari", "Tau", "Gem", "Can", "Leo", "Vir", "Lib", "Sco", "Sag", "Cap", "Aqu", "Pis"]
+
+COLORS = {
+    "background": "#fffbeb",
+    "frame": "#4c1d95",
+    "sign": "#6b7280",
+    "planet": "#111827",
+    "lagna": "#b91c1c",
+    "title": "#4c1d95"
+}
+
+# South Indian cells (column, row) by rasi; the signs are fixed, Pisces top-left
+SOUTH_CELLS = {
+    12: (0, 0), 1: (1, 0), 2: (2, 0), 3: (3, 0), 4: (3, 1), 5: (3, 2),
+    6: (3, 3), 7: (2, 3), 8: (1, 3), 9: (0, 3), 10: (0, 2), 11: (0, 1)
+}
+
+Placement = Tuple[str, int, Optional[float], bool]
+
+
+def _num(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+class ChartRenderer:
+    """Lay out a chart and draw it as SVG or as a reportlab Drawing"""
+
+    def north_houses(self, size: float) -> Dict[int, Tuple[Tuple[float, float], Tuple[float, float]]]:
+        """(label anchor, inner vertex) of each North Indian house on a size x size square"""
+        s = size
+        centre = (s / 2, s / 2)
+        inner = {"tl": (s / 4, s / 4), "tr": (3 * s / 4, s / 4), "br": (3 * s / 4, 3 * s / 4), "bl": (s / 4, 3 * s / 4)}
+        return {
+            1: ((s / 2, s / 4), centre),
+            2: ((s / 4, s / 12), inner["tl"]),
+            3: ((s / 12, s / 4), inner["tl"]),
+            4: ((s / 4, s / 2), centre),
+            5: ((s / 12, 3 * s / 4), inner["bl"]),
+            6: ((s / 4, 11 * s / 12), inner["bl"]),
+            7: ((s / 2, 3 * s / 4), centre),
+            8: ((3 * s / 4, 11 * s / 12), inner["br"]),
+            9: ((11 * s / 12, 3 * s / 4), inner["br"]),
+            10: ((3 * s / 4, s / 2), centre),
+            11: ((11 * s / 12, s / 4), inner["tr"]),
+            12: ((3 * s / 4, s / 12), inner["tr"])
+        }
+
+    def labels(self, chart: Dict, degrees: bool) -> Dict[int, List[Tuple[str, str]]]:
+        """(text, role) labels per rasi, lagna first and planets in the usual order"""
+        by_rasi = {rasi: [] for rasi in range(1, 13)}
+        by_rasi[chart["ascendant_rasi"]].append(("Asc", "lagna"))
+
+        order = {planet: i for i, planet in enumerate(PLANET_ORDER)}
+        for planet, rasi, degree, retrograde in sorted(chart["placements"], key=lambda p: order.get(p[0], len(order))):
+            text = PLANET_LABELS.get(planet, planet[:2].title())
+            if degrees and degree is not None:
+                text += f" {int(degree)}°"
+            if retrograde and planet not in ("RAHU", "KETU"):
+                text += "(R)"
+            by_rasi[rasi].append((text, "planet"))
+        return by_rasi
+
+    def _stack(self, items: List, x: float, y: float, font: float, columns: int, column_width: float) -> List[Tuple]:
+        """Text items for labels stacked in rows around (x, y)"""
+        rows = [items[i:i + columns] for i in range(0, len(items), columns)]
+        line = font * 1.2
+        top = y - (len(rows) - 1) * line / 2
+        placed = []
+        for r, row in enumerate(rows):
+            left = x - (len(row) - 1) * column_width / 2
+            for c, (text, role) in enumerate(row):
+                placed.append(("text", left + c * column_width, top + r * line + font * 0.35, text, font, role))
+        return placed
+
+    def display_list(self, chart: Dict, style: str = "north_indian", size: float = 400, degrees: bool = False) -> List[Tuple]:
+        """
+        Drawing primitives in a size x size box, y pointing down:
+        ("rect", x, y, w, h), ("line", x1, y1, x2, y2) and
+        ("text", x, baseline, text, font_size, role), text centred on x.
+        """
+        if style not in CHART_STYLES:
+            raise ValueError(f"Unknown chart style: {style}")
+        s = float(size)
+        font = s * (0.03 if degrees else 0.035)
+        sign_font = s * 0.028
+        by_rasi = self.labels(chart, degrees)
+        items = [("rect", 0.0, 0.0, s, s)]
+
+        if style == "north_indian":
+            items += [
+                ("line", 0.0, 0.0, s, s), ("line", s, 0.0, 0.0, s),
+                ("line", s / 2, 0.0, s, s / 2), ("line", s, s / 2, s / 2, s),
+                ("line", s / 2, s, 0.0, s / 2), ("line", 0.0, s / 2, s / 2, 0.0)
+            ]
+            for house, ((x, y), (ix, iy)) in self.north_houses(s).items():
+                rasi = (chart["ascendant_rasi"] + house - 2) % 12 + 1
+                diamond = house in (1, 4, 7, 10)
+                # Sign number just inside the house's inner vertex
+                share = 0.2 if diamond else 0.25
+                items.append(("text", ix + (x - ix) * share, iy + (y - iy) * share + sign_font * 0.35,
+                              str(rasi), sign_font, "sign"))
+                labels = by_rasi[rasi]
+                columns = 1 if len(labels) <= (4 if diamond else 3) else 2
+                items += self._stack(labels, x, y, font, columns, font * (4.2 if degrees else 2.6))
+        else:
+            cell = s / 4
+            items += [("line", cell * i, 0.0, cell * i, s) for i in (1, 3)]
+            items += [("line", 0.0, cell * i, s, cell * i) for i in (1, 3)]
+            items += [("line", cell * 2, 0.0, cell * 2, cell), ("line", cell * 2, s - cell, cell * 2, s),
+                      ("line", 0.0, cell * 2, cell, cell * 2), ("line", s - cell, cell * 2, s, cell * 2)]
+            for rasi, (col, row) in SOUTH_CELLS.items():
+                x, y = cell * col, cell * row
+                items.append(("text", x + cell / 2, y + cell * 0.16 + sign_font * 0.35,
+                              SIGN_LABELS[rasi - 1], sign_font, "sign"))
+                labels = by_rasi[rasi]
+                columns = 1 if len(labels) <= 3 else 2
+                items += self._stack(labels, x + cell / 2, y + cell * 0.6, font, columns, cell * 0.48)
+            if chart.get("title"):
+                items.append(("text", s / 2, s / 2 + font * 0.35, chart["title"], font * 1.2, "title"))
+
+        return items
+
+    def svg(self, chart: Dict, style: str = "north_indian", size: int = 400, degrees: bool = False) -> str:
+        """Chart as a standalone SVG document"""
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" width="{size}" height="{size}" '
+            f'font-family="Helvetica, Arial, sans-serif" text-anchor="middle">'
+        ]
+        if chart.get("title"):
+            parts.append(f"<title>{escape(chart['title'])}</title>")
+
+        lines, texts = [], []
+        for item in self.display_list(chart, style, size, degrees):
+            if item[0] == "rect":
+                _, x, y, w, h = item
+                parts.append(f'<rect x="{_num(x)}" y="{_num(y)}" width="{_num(w)}" height="{_num(h)}" '
+                             f'fill="{COLORS["background"]}" stroke="{COLORS["frame"]}" stroke-width="2"/>')
+            elif item[0] == "line":
+                lines.append('<line x1="%s" y1="%s" x2="%s" y2="%s"/>' % tuple(_num(v) for v in item[1:]))
+            else:
+                _, x, y, text, font, role = item
+                texts.append(f'<text x="{_num(x)}" y="{_num(y)}" font-size="{_num(font)}" '
+                             f'fill="{COLORS[role]}">{escape(text)}</text>')
+
+        parts.append(f'<g stroke="{COLORS["frame"]}" stroke-width="1.5">{"".join(lines)}</g>')
+        parts.append("<g>" + "".join(texts) + "</g>")
+        parts.append("</svg>")
+        return "".join(parts)
+
+    def drawing(self, chart: Dict, style: str = "north_indian", size: float = 216, degrees: bool = False) -> Drawing:
+        """Chart as a reportlab Drawing (a platypus flowable); size is in points"""
+        flip = lambda y: size - y
+        drawing = Drawing(size, size)
+        for item in self.display_list(chart, style, size, degrees):
+            if item[0] == "rect":
+                _, x, y, w, h = item
+                drawing.add(Rect(x, flip(y + h), w, h, fillColor=colors.HexColor(COLORS["background"]),
+                                 strokeColor=colors.HexColor(COLORS["frame"]), strokeWidth=1.5))
+            elif item[0] == "line":
+                _, x1, y1, x2, y2 = item
+                drawing.add(Line(x1, flip(y1), x2, flip(y2), strokeColor=colors.HexColor(COLORS["frame"]), strokeWidth=1))
+            else:
+                _, x, y, text, font, role = item
+                drawing.add(String(x, flip(y), text, fontName="Helvetica", fontSize=font,
+                                   fillColor=colors.HexColor(COLORS[role]), textAnchor="middle"))
+        return drawing
+
+
+class ChartImageCache:
+    """
+    Rendered chart images addressed by a digest of their inputs. A process-level
+    LRU sits in front of an optional directory of <digest>.svg files shared by
+    workers; the digest doubles as the HTTP ETag.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 2048):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "disk_hits": 0, "renders": 0}
+
+    def key(self, chart_hash: str, division: int, style: str, options: Dict) -> str:
+        payload = json.dumps([RENDER_VERSION, chart_hash, division, style, options], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f"{key}.svg")
+
+    def _remember(self, key: str, data: bytes):
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return data
+
+        if not self.path:
+            return None
+        try:
+            with open(self._file(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("Could not read cached chart image %s: %s", key, e)
+            return None
+        self.stats["disk_hits"] += 1
+        self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes):
+        self._remember(key, data)
+        if not self.path:
+            return
+        # Written under a temporary name and renamed so readers never see a partial file
+        target = self._file(key)
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            temporary = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary, "wb") as f:
+                f.write(data)
+            os.replace(temporary, target)
+        except OSError as e:
+            logger.warning("Could not write cached chart image %s: %s", key, e)
+
+    def get_or_render(self, key: str, render: Callable[[], bytes]) -> bytes:
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.stats["renders"] += 1
+            self.put(key, data)
+        return data
+
+
+chart_renderer = ChartRenderer()
+
+_chart_image_cache = None
+
+
+def get_chart_image_cache() -> ChartImageCache:
+    """Get singleton chart image cache instance"""
+    global _chart_image_cache
+    if _chart_image_cache is None:
+        _chart_image_cache = ChartImageCache(settings.CHART_IMAGE_CACHE_PATH or None, settings.CHART_IMAGE_CACHE_MAX_ENTRIES)
+    return _chart_image_cache
@@ -0,0 +1,229 @@
+"""
+Chart Similarity Index
+Every stored natal chart is encoded as a fixed-length vector (sin/cos of the
+ascendant and planet longitudes, one-hot D1/D9/D10 placements, Sarvashtakavarga)
+and kept in an HNSW FAISS index, separate from the KB index, keyed by chart id.
+Searches are restricted to an allowed set of chart ids (owner and filters);
+small sets are ranked exactly, large ones through the graph with an id selector.
+"""
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import faiss
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.modules.ashtakavarga.calculator import ashtakavarga_calculator
+from app.modules.charts.calculator import DivisionalChartCalculator
+
+BODIES = ["ASCENDANT", "SUN", "MOON", "MERCURY", "VENUS", "MARS", "JUPITER", "SATURN", "RAHU", "KETU"]
+SIMILARITY_VARGAS = [1, 9, 10]
+
+# One changed varga placement adds 1 to the squared distance, as does a 60° move
+VARGA_WEIGHT = np.sqrt(0.5)
+SAV_CENTER, SAV_SCALE = 28.0, 8.0
+
+HNSW_NEIGHBORS = 32
+SYNC_BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def feature_slices() -> Dict[str, slice]:
+    """Position of each feature group in the vector"""
+    sizes = [("longitudes", 2 * len(BODIES))] + [(f"D{d}", 12 * len(BODIES)) for d in SIMILARITY_VARGAS] + [("sav", 12)]
+    slices, offset = {}, 0
+    for name, size in sizes:
+        slices[name] = slice(offset, offset + size)
+        offset += size
+    return slices
+
+
+FEATURES = feature_slices()
+DIMENSION = max(s.stop for s in FEATURES.values())
+
+
+class ChartEncoder:
+    """Fixed-length feature vectors for natal charts"""
+
+    def __init__(self):
+        self.div_calculator = DivisionalChartCalculator()
+
+    def encode(self, ascendant: float, longitudes: Dict[str, float]) -> np.ndarray:
+        """Vector for one chart from its sidereal ascendant and planet longitudes"""
+        values = np.array([ascendant] + [longitudes[b] for b in BODIES[1:]], dtype=np.float64)
+        vector = np.zeros(DIMENSION, dtype=np.float32)
+
+        radians = np.radians(values)
+        vector[FEATURES["longitudes"]] = np.column_stack([np.sin(radians), np.cos(radians)]).ravel()
+
+        rows = np.arange(len(BODIES))
+        for d in SIMILARITY_VARGAS:
+            one_hot = np.zeros((len(BODIES), 12), dtype=np.float32)
+            one_hot[rows, self.div_calculator.calculate_divisional_array(values, d) - 1] = VARGA_WEIGHT
+            vector[FEATURES[f"D{d}"]] = one_hot.ravel()
+
+        rasis = {b: int(lon // 30.0) + 1 for b, lon in zip(BODIES[1:], values[1:])}
+        sav = ashtakavarga_calculator.calculate_all({b: {"rasi": r} for b, r in rasis.items()})["sav"]
+        vector[FEATURES["sav"]] = (np.array(sav, dtype=np.float32) - SAV_CENTER) / SAV_SCALE
+        return vector
+
+    def feature_distances(self, query: np.ndarray, vectors: np.ndarray) -> List[Dict[str, float]]:
+        """Squared L2 distance per feature group for each row of vectors"""
+        squared = (np.asarray(vectors) - query[None, :]) ** 2
+        per_feature = {name: squared[:, s].sum(axis=1) for name, s in FEATURES.items()}
+        return [{name: round(float(values[i]), 4) for name, values in per_feature.items()} for i in range(len(squared))]
+
+
+class ChartSimilarityIndex:
+    """HNSW index of chart vectors keyed by natal chart id"""
+
+    def __init__(self, index_path: str = None):
+        self.index_path = Path(index_path or settings.CHART_SIMILARITY_INDEX_PATH)
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        self.encoder = ChartEncoder()
+        self.index: Optional[faiss.IndexIDMap2] = None
+        self.chart_ids = set()
+        self.pending = 0
+        # Set when the saved index could not be read; the next sync rebuilds from the table
+        self.needs_rebuild = False
+        self._lock = threading.Lock()
+
+        self._load_or_create_index()
+
+    def _load_or_create_index(self):
+        index_file = self.index_path / "index.faiss"
+        if index_file.exists():
+            try:
+                self.index = faiss.read_index(str(index_file))
+                self.chart_ids = set(faiss.vector_to_array(self.index.id_map).tolist())
+                return
+            except RuntimeError:
+                logger.exception("Could not read chart similarity index %s, rebuilding it", index_file)
+                self.needs_rebuild = True
+        self.index = faiss.IndexIDMap2(faiss.IndexHNSWFlat(DIMENSION, HNSW_NEIGHBORS))
+        self.chart_ids = set()
+
+    def save(self):
+        # Import workers share the file, so it is written under a temporary name and
+        # renamed; readers never load a partial index and writers do not interleave
+        target = self.index_path / "index.faiss"
+        with self._lock:
+            temporary = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+            faiss.write_index(self.index, temporary)
+            os.replace(temporary, target)
+            self.pending = 0
+
+    def add(self, chart_ids: Iterable[int], vectors: np.ndarray):
+        """Add charts not yet indexed; the index is written every CHART_SIMILARITY_SAVE_EVERY additions"""
+        with self._lock:
+            ids = np.asarray(list(chart_ids), dtype=np.int64)
+            fresh = np.array([cid not in self.chart_ids for cid in ids.tolist()], dtype=bool)
+            if not fresh.any():
+                return
+            self.index.add_with_ids(np.ascontiguousarray(np.asarray(vectors, dtype=np.float32)[fresh]), ids[fresh])
+            self.chart_ids.update(ids[fresh].tolist())
+            self.pending += int(fresh.sum())
+            due = self.pending >= settings.CHART_SIMILARITY_SAVE_EVERY
+        if due:
+            self.save()
+
+    def add_chart(self, chart_id: int, ascendant: float, longitudes: Dict[str, float]):
+        self.add([chart_id], self.encoder.encode(ascendant, longitudes)[None, :])
+
+    def sync(self, db: Session, force: bool = False) -> int:
+        """
+        Index stored charts that are missing (e.g. created in another worker process).
+        Unless forced (or the saved index was unreadable), the id scan is skipped while the
+        index holds as many charts as the table.
+        """
+        from app.models.chart import NatalChart, PlanetaryPosition
+
+        force, self.needs_rebuild = force or self.needs_rebuild, False
+        if not force and db.query(func.count(NatalChart.id)).scalar() <= len(self.chart_ids):
+            return 0
+        stored = [cid for (cid,) in db.query(NatalChart.id)]
+        missing = [cid for cid in stored if cid not in self.chart_ids]
+        for start in range(0, len(missing), SYNC_BATCH_SIZE):
+            batch = missing[start:start + SYNC_BATCH_SIZE]
+            ascendants = dict(db.query(NatalChart.id, NatalChart.ascendant).filter(NatalChart.id.in_(batch)))
+            longitudes = {cid: {} for cid in batch}
+            for cid, planet, longitude in db.query(
+                PlanetaryPosition.natal_chart_id, PlanetaryPosition.planet, PlanetaryPosition.longitude
+            ).filter(PlanetaryPosition.natal_chart_id.in_(batch)):
+                longitudes[cid][planet] = longitude
+
+            complete = [cid for cid in batch if all(b in longitudes[cid] for b in BODIES[1:])]
+            if complete:
+                self.add(complete, np.stack([self.encoder.encode(ascendants[cid], longitudes[cid]) for cid in complete]))
+        if missing:
+            self.save()
+        return len(missing)
+
+    def vectors(self, chart_ids: List[int]) -> np.ndarray:
+        if not chart_ids:
+            return np.empty((0, DIMENSION), dtype=np.float32)
+        with self._lock:
+            return np.stack([self.index.reconstruct(int(cid)) for cid in chart_ids])
+
+    def search(self, query: np.ndarray, k: int, allowed_ids: Optional[Iterable[int]] = None,
+               exclude: Iterable[int] = ()) -> List[Dict]:
+        """Nearest charts with total and per-feature squared distances"""
+        exclude = set(exclude)
+        candidates = None
+        if allowed_ids is not None:
+            candidates = [cid for cid in dict.fromkeys(allowed_ids) if cid in self.chart_ids and cid not in exclude]
+            if not candidates:
+                return []
+
+        if candidates is not None and len(candidates) <= settings.CHART_SIMILARITY_EXACT_LIMIT:
+            # Small filtered sets are ranked exactly
+            distances = ((self.vectors(candidates) - query[None, :]) ** 2).sum(axis=1)
+            order = np.argsort(distances, kind="stable")[:k]
+            ids = [candidates[i] for i in order.tolist()]
+        else:
+            with self._lock:
+                if self.index.ntotal == 0:
+                    return []
+                selector = None
+                if candidates is not None:
+                    selector = faiss.IDSelectorBatch(np.asarray(candidates, dtype=np.int64))
+                elif exclude:
+                    selector = faiss.IDSelectorNot(faiss.IDSelectorBatch(np.asarray(list(exclude), dtype=np.int64)))
+                params = faiss.SearchParametersHNSW(sel=selector, efSearch=max(settings.CHART_SIMILARITY_EF_SEARCH, k))
+                _, labels = self.index.search(query[None, :].astype(np.float32), k, params=params)
+            ids = [int(cid) for cid in labels[0] if cid >= 0]
+
+        vectors = self.vectors(ids)
+        per_feature = self.encoder.feature_distances(query, vectors)
+        return [
+            {"chart_id": cid, "distance": round(sum(features.values()), 4), "features": features}
+            for cid, features in zip(ids, per_feature)
+        ]
+
+    def get_stats(self) -> dict:
+        return {
+            "total_vectors": self.index.ntotal,
+            "dimension": DIMENSION,
+            "features": {name: s.stop - s.start for name, s in FEATURES.items()},
+            "index_path": str(self.index_path)
+        }
+
+
+chart_encoder = ChartEncoder()
+
+# Singleton instance
+_chart_similarity_index: Optional[ChartSimilarityIndex] = None
+
+
+def get_chart_similarity_index() -> ChartSimilarityIndex:
+    """Get singleton chart similarity index instance"""
+    global _chart_similarity_index
+    if _chart_similarity_index is None:
+        _chart_similarity_index = ChartSimilarityIndex()
+    return _chart_similarity_index
@@ -0,0 +1,123 @@
+"""
+Ashtakoot Matrix
+Every koota depends only on the two Moons' nakshatra-pada (108 states each),
+so all scores are precomputed once into a 108 x 108 x 8 tensor and
+many-to-many matching becomes an array gather.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from app.modules.compatibility.calculator import compatibility_calculator
+
+KOOTAS = ["varna", "vashya", "tara", "yoni", "graha_maitri", "gana", "bhakoot", "nadi"]
+MAX_SCORE = 36
+
+PADA_SPAN = 360.0 / 108.0
+NUM_STATES = 108
+
+MANGLIK_HOUSES = [1, 4, 7, 8, 12]
+
+
+def moon_state(longitude):
+    """Nakshatra-pada index (0-107) for one or many sidereal Moon longitudes"""
+    states = (np.asarray(longitude, dtype=float) // PADA_SPAN).astype(int) % NUM_STATES
+    return int(states) if states.ndim == 0 else states
+
+
+def state_rasi(state: int) -> int:
+    """Rasi (1-12) of a nakshatra-pada state; each rasi holds 9 padas"""
+    return state // 9 + 1
+
+
+def state_nakshatra(state: int) -> int:
+    """Nakshatra number (1-27) of a nakshatra-pada state"""
+    return state // 4 + 1
+
+
+class AshtakootTable:
+    """Precomputed Ashtakoot scores for every pair of Moon states (rows are the male side)"""
+
+    def __init__(self):
+        self._scores = None
+        self._totals = None
+        self._description_ids = None
+        self.descriptions: List[str] = []
+
+    @property
+    def scores(self) -> np.ndarray:
+        if self._scores is None:
+            self._build()
+        return self._scores
+
+    @property
+    def totals(self) -> np.ndarray:
+        if self._totals is None:
+            self._build()
+        return self._totals
+
+    def _build(self):
+        """Evaluate every koota function once per state pair"""
+        calc = compatibility_calculator
+        scores = np.zeros((NUM_STATES, NUM_STATES, len(KOOTAS)), dtype=np.float32)
+        description_ids = np.zeros((NUM_STATES, NUM_STATES, len(KOOTAS)), dtype=np.uint16)
+        descriptions = {}
+
+        for male in range(NUM_STATES):
+            male_rasi, male_nak = state_rasi(male), state_nakshatra(male)
+            for female in range(NUM_STATES):
+                female_rasi, female_nak = state_rasi(female), state_nakshatra(female)
+                results = [
+                    calc.calculate_varna(male_rasi, female_rasi),
+                    calc.calculate_vashya(male_rasi, female_rasi),
+                    calc.calculate_tara(male_nak, female_nak),
+                    calc.calculate_yoni(male_nak, female_nak),
+                    # Matches calculate_ashtakoot, which scores Graha Maitri as MOON-MOON
+                    calc.calculate_graha_maitri("MOON", "MOON"),
+                    calc.calculate_gana(male_nak, female_nak),
+                    calc.calculate_bhakoot(male_rasi, female_rasi),
+                    calc.calculate_nadi(male_nak, female_nak)
+                ]
+                for k, (score, description) in enumerate(results):
+                    scores[male, female, k] = score
+                    description_ids[male, female, k] = descriptions.setdefault(description, len(descriptions))
+
+        self.descriptions = list(descriptions)
+        self._description_ids = description_ids
+        self._scores = scores
+        self._totals = scores.sum(axis=2)
+
+    def score_matrix(self, male_states, female_states) -> np.ndarray:
+        """Total scores as a (len(male), len(female)) array"""
+        male_states = np.asarray(male_states, dtype=int)
+        female_states = np.asarray(female_states, dtype=int)
+        return self.totals[male_states[:, None], female_states[None, :]]
+
+    def breakdown(self, male_state: int, female_state: int) -> Dict[str, Dict]:
+        """Per-koota scores and descriptions for one pair"""
+        scores = self.scores[male_state, female_state]
+        description_ids = self._description_ids[male_state, female_state]
+        return {
+            koot: {"score": float(scores[k]), "description": self.descriptions[description_ids[k]]}
+            for k, koot in enumerate(KOOTAS)
+        }
+
+
+def manglik_screen(mars_rasi, asc_rasi, jupiter_rasi, mars_strong) -> Dict[str, np.ndarray]:
+    """Vectorized check_manglik: Manglik status, Mars house and cancellation per chart"""
+    mars_rasi = np.asarray(mars_rasi, dtype=int)
+    jupiter_rasi = np.asarray(jupiter_rasi, dtype=int)
+
+    mars_house = (mars_rasi - np.asarray(asc_rasi, dtype=int)) % 12 + 1
+    is_manglik = np.isin(mars_house, MANGLIK_HOUSES)
+    cancelled = np.asarray(mars_strong, dtype=bool) | np.isin(np.abs(mars_rasi - jupiter_rasi), [4, 8])
+
+    return {"is_manglik": is_manglik, "mars_house": mars_house, "cancelled": cancelled}
+
+
+def compatibility_label(total: float) -> str:
+    """Same banding as calculate_ashtakoot"""
+    return "Excellent" if total >= 25 else "Good" if total >= 18 else "Average" if total >= 12 else "Poor"
+
+
+ashtakoot_table = AshtakootTable()
@@ -0,0 +1,165 @@
+"""
+Compatibility Search
+Top-K Ashtakoot matches over stored profiles. Profiles are bucketed by Moon
+nakshatra-pada; since the score depends only on the pair of buckets, buckets
+are walked best-first and the walk stops after K hits.
+"""
+import math
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models.chart import PlanetaryPosition
+from app.models.compatibility import CompatibilityIndexEntry
+from app.models.profile import Profile
+from app.modules.compatibility.matrix import (
+    ashtakoot_table, moon_state, manglik_screen, compatibility_label
+)
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class CompatibilitySearch:
+    """Maintain the compatibility index and answer best-first top-K queries"""
+
+    def sync(self, db: Session, user_id: int, chart_loader: Callable) -> int:
+        """Index the user's profiles that are new or changed since last indexed"""
+        stale = db.query(Profile).outerjoin(
+            CompatibilityIndexEntry, CompatibilityIndexEntry.profile_id == Profile.id
+        ).filter(
+            Profile.user_id == user_id,
+            or_(
+                CompatibilityIndexEntry.id == None,  # noqa: E711
+                Profile.updated_at > CompatibilityIndexEntry.updated_at
+            )
+        ).all()
+
+        for profile in stale:
+            natal_chart = chart_loader(profile, db)
+            positions = {
+                pos.planet: pos for pos in db.query(PlanetaryPosition).filter(
+                    PlanetaryPosition.natal_chart_id == natal_chart.id,
+                    PlanetaryPosition.planet.in_(["MOON", "MARS", "JUPITER"])
+                ).all()
+            }
+            manglik = manglik_screen(
+                [positions["MARS"].rasi],
+                [int(natal_chart.ascendant / 30.0) + 1],
+                [positions["JUPITER"].rasi],
+                [positions["MARS"].dignity in ["Own", "Exalted"]]
+            )
+
+            entry = db.query(CompatibilityIndexEntry).filter(
+                CompatibilityIndexEntry.profile_id == profile.id
+            ).first() or CompatibilityIndexEntry(profile_id=profile.id)
+            entry.user_id = profile.user_id
+            entry.moon_state = moon_state(positions["MOON"].longitude)
+            entry.is_manglik = int(manglik["is_manglik"][0])
+            entry.manglik_cancelled = int(manglik["cancelled"][0])
+            entry.birth_date = profile.birth_date
+            entry.latitude = profile.latitude
+            entry.longitude = profile.longitude
+            entry.updated_at = datetime.utcnow()
+            db.add(entry)
+
+        if stale:
+            db.commit()
+        return len(stale)
+
+    def ranked_buckets(self, query_state: int, query_side: str = "male") -> List[tuple]:
+        """Candidate buckets grouped by score, best first: [(score, [states])]"""
+        if query_side == "male":
+            scores = ashtakoot_table.totals[query_state, :]
+        else:
+            scores = ashtakoot_table.totals[:, query_state]
+
+        groups = []
+        for score in np.unique(scores)[::-1]:
+            groups.append((float(score), np.nonzero(scores == score)[0].tolist()))
+        return groups
+
+    def search(
+        self,
+        db: Session,
+        user_id: int,
+        query_entry: CompatibilityIndexEntry,
+        k: int = 50,
+        query_side: str = "male",
+        min_score: float = 0,
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None,
+        near: Optional[tuple] = None,
+        radius_km: Optional[float] = None,
+        manglik_match: bool = False
+    ) -> Dict:
+        """Walk score buckets best-first, applying filters, until K matches are found"""
+        base = db.query(CompatibilityIndexEntry).filter(
+            CompatibilityIndexEntry.user_id == user_id,
+            CompatibilityIndexEntry.profile_id != query_entry.profile_id
+        )
+
+        # Secondary-index filters
+        today = datetime.utcnow()
+        if min_age is not None:
+            base = base.filter(CompatibilityIndexEntry.birth_date <= today - timedelta(days=365.25 * min_age))
+        if max_age is not None:
+            base = base.filter(CompatibilityIndexEntry.birth_date > today - timedelta(days=365.25 * (max_age + 1)))
+        if manglik_match:
+            base = base.filter(CompatibilityIndexEntry.is_manglik == query_entry.is_manglik)
+        if near is not None and radius_km is not None:
+            lat_delta = radius_km / 111.0
+            lon_delta = radius_km / (111.0 * max(math.cos(math.radians(near[0])), 0.01))
+            base = base.filter(
+                CompatibilityIndexEntry.latitude.between(near[0] - lat_delta, near[0] + lat_delta)
+            )
+            if lon_delta < 180.0:
+                low, high = near[1] - lon_delta, near[1] + lon_delta
+                longitude = CompatibilityIndexEntry.longitude
+                # A box crossing the antimeridian is split into its two halves
+                if low < -180.0:
+                    base = base.filter(or_(longitude >= low + 360.0, longitude <= high))
+                elif high > 180.0:
+                    base = base.filter(or_(longitude >= low, longitude <= high - 360.0))
+                else:
+                    base = base.filter(longitude.between(low, high))
+
+        matches = []
+        buckets_scanned = 0
+        for score, states in self.ranked_buckets(query_entry.moon_state, query_side):
+            if score < min_score or len(matches) >= k:
+                break
+            buckets_scanned += len(states)
+
+            rows = base.filter(
+                CompatibilityIndexEntry.moon_state.in_(states)
+            ).order_by(CompatibilityIndexEntry.profile_id).yield_per(500)
+
+            for entry in rows:
+                if near is not None and radius_km is not None and \
+                        haversine_km(near[0], near[1], entry.latitude, entry.longitude) > radius_km:
+                    continue
+                matches.append({
+                    "profile_id": entry.profile_id,
+                    "total": score,
+                    "compatibility": compatibility_label(score),
+                    "is_manglik": bool(entry.is_manglik)
+                })
+                if len(matches) >= k:
+                    break
+
+        return {"matches": matches, "buckets_scanned": buckets_scanned}
+
+
+compatibility_search = CompatibilitySearch()
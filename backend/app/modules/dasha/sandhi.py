@@ -0,0 +1,109 @@
+"""
+Dasha Sandhi
+Finds windows where several people change Vimshottari Maha or Antar dasha at
+about the same time. Every transition is flattened into one sorted boundary
+array and swept once, so couples and groups cost O(N log N) in total
+transitions instead of a pairwise comparison of dasha lists.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.modules.dasha.calculator import VimshottariDasha
+
+SANDHI_LEVELS = ["maha", "antar"]
+DEFAULT_TOLERANCE_DAYS = 180
+
+
+class DashaSandhiDetector:
+    """Sweep merged dasha transition boundaries for shared sandhi windows"""
+
+    def transitions(self, birth_date: datetime, moon_longitude: float,
+                    levels: Sequence[str] = ("maha", "antar"), num_years: int = 120) -> Dict:
+        """Transition boundaries for one person as parallel arrays sorted by time"""
+        calculator = VimshottariDasha(birth_date, moon_longitude)
+
+        periods = []
+        for maha in calculator.calculate_maha_dashas(num_years):
+            for antar in calculator.calculate_antar_dashas(maha):
+                periods.append((antar["start_date"], maha["lord"], antar["lord"]))
+
+        times, level_codes, from_lords, to_lords = [], [], [], []
+        for (_, prev_maha, prev_antar), (start, maha, antar) in zip(periods, periods[1:]):
+            # A Maha change is also an Antar change; report it once at the higher level
+            level = "maha" if maha != prev_maha else "antar"
+            if level not in levels:
+                continue
+            times.append(start)
+            level_codes.append(SANDHI_LEVELS.index(level))
+            from_lords.append(f"{prev_maha}/{prev_antar}")
+            to_lords.append(f"{maha}/{antar}")
+
+        return {
+            "times": np.array(times, dtype="datetime64[s]"),
+            "levels": np.array(level_codes, dtype=np.uint8),
+            "from_lords": from_lords,
+            "to_lords": to_lords
+        }
+
+    def detect(self, people: List[Dict], tolerance_days: float = DEFAULT_TOLERANCE_DAYS,
+               min_people: int = 2, start: Optional[datetime] = None,
+               end: Optional[datetime] = None) -> List[Dict]:
+        """
+        Windows where at least min_people distinct people have a transition.
+        Each person is {"id": ..., **transitions(...)}; boundaries closer than
+        tolerance_days to a neighbour are chained into the same window.
+        """
+        if not people:
+            return []
+
+        times = np.concatenate([p["times"] for p in people]).astype("datetime64[s]")
+        owners = np.concatenate([np.full(len(p["times"]), i, dtype=np.int32) for i, p in enumerate(people)])
+        rows = np.concatenate([np.arange(len(p["times"]), dtype=np.int32) for p in people])
+
+        keep = np.ones(len(times), dtype=bool)
+        if start is not None:
+            keep &= times >= np.datetime64(start, "s")
+        if end is not None:
+            keep &= times <= np.datetime64(end, "s")
+        times, owners, rows = times[keep], owners[keep], rows[keep]
+        if len(times) == 0:
+            return []
+
+        order = np.argsort(times, kind="stable")
+        times, owners, rows = times[order], owners[order], rows[order]
+
+        # Split the sorted boundaries wherever the gap exceeds the tolerance
+        seconds = times.astype(np.int64)
+        breaks = np.nonzero(np.diff(seconds) > tolerance_days * 86400)[0] + 1
+        bounds = np.concatenate([[0], breaks, [len(times)]])
+
+        windows = []
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            if hi - lo < min_people or len(np.unique(owners[lo:hi])) < min_people:
+                continue
+
+            entries = []
+            for k in range(lo, hi):
+                person = people[owners[k]]
+                row = rows[k]
+                entries.append({
+                    "profile_id": person["id"],
+                    "date": times[k].astype(datetime).isoformat(),
+                    "level": SANDHI_LEVELS[person["levels"][row]],
+                    "from": person["from_lords"][row],
+                    "to": person["to_lords"][row]
+                })
+
+            windows.append({
+                "start": entries[0]["date"],
+                "end": entries[-1]["date"],
+                "profile_ids": sorted({e["profile_id"] for e in entries}),
+                "transitions": entries
+            })
+
+        return windows
+
+
+sandhi_detector = DashaSandhiDetector()
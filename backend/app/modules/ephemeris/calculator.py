@@ -1,8 +1,11 @@
 import swisseph as swe
 import os
-from datetime import datetime, timezone
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Tuple
 import math
+import numpy as np
 from app.core.config import settings
 
 # Initialize Swiss Ephemeris
@@ -43,12 +46,59 @@ NAKSHATRAS = [
     "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
 ]
 
+# Sign lords, Aries to Pisces
+RASI_LORDS = ["MARS", "VENUS", "MERCURY", "MOON", "SUN", "MERCURY",
+              "VENUS", "MARS", "JUPITER", "SATURN", "SATURN", "JUPITER"]
+
+# Houses signifying each kind of event, and the varga that refines them
+EVENT_SIGNIFICATIONS = {
+    "marriage": {"houses": [2, 7, 11], "varga": 9},
+    "career": {"houses": [6, 10, 11], "varga": 10},
+    "childbirth": {"houses": [2, 5, 11], "varga": 7},
+    "education": {"houses": [4, 5, 9], "varga": 24},
+    "property": {"houses": [4, 11], "varga": 4},
+    "relocation": {"houses": [3, 9, 12], "varga": 4},
+    "health": {"houses": [1, 6, 8], "varga": 6},
+    "parent_death": {"houses": [3, 8, 10], "varga": 12}
+}
+
 RAHU_KETU_SPEED = -0.0529  # Mean daily motion in degrees
 
+# Combustion orbs (degrees from the Sun)
+COMBUSTION_DEGREES = {
+    "MOON": 12, "MARS": 17, "MERCURY": 14,
+    "JUPITER": 11, "VENUS": 10, "SATURN": 15
+}
+
+# Guards the process-wide Swiss Ephemeris sidereal mode
+_sid_mode_lock = threading.RLock()
+
+# Swiss Ephemeris keeps its settings per thread (threadpool endpoints, workers)
+_thread_state = threading.local()
+
 class EphemerisCalculator:
     def __init__(self, ayanamsa: str = "LAHIRI"):
         self.ayanamsa = ayanamsa
-        swe.set_sid_mode(AYANAMSA_MAP.get(ayanamsa, swe.SIDM_LAHIRI))
+        self.prepare_thread()
+    
+    def prepare_thread(self):
+        """Apply ephemeris path and sidereal mode in the calling thread"""
+        if getattr(_thread_state, "ready", False):
+            return
+        swe.set_ephe_path(settings.EPHEMERIS_PATH)
+        swe.set_sid_mode(AYANAMSA_MAP.get(self.ayanamsa, swe.SIDM_LAHIRI))
+        _thread_state.ready = True
+    
+    @contextmanager
+    def sidereal_mode(self, ayanamsa: str):
+        """Temporarily switch the global sidereal mode to another ayanamsa"""
+        self.prepare_thread()
+        with _sid_mode_lock:
+            swe.set_sid_mode(AYANAMSA_MAP.get(ayanamsa, swe.SIDM_LAHIRI))
+            try:
+                yield self
+            finally:
+                swe.set_sid_mode(AYANAMSA_MAP.get(self.ayanamsa, swe.SIDM_LAHIRI))
     
     def get_julian_day(self, dt: datetime) -> float:
         """Convert datetime to Julian Day"""
@@ -58,16 +108,55 @@ class EphemerisCalculator:
         return swe.julday(utc_dt.year, utc_dt.month, utc_dt.day,
                          utc_dt.hour + utc_dt.minute/60.0 + utc_dt.second/3600.0)
     
+    def get_datetime(self, jd: float) -> datetime:
+        """Convert Julian Day to a naive UTC datetime"""
+        year, month, day, hour = swe.revjul(jd)
+        return datetime(year, month, day) + timedelta(milliseconds=round(hour * 3600000))
+    
     def get_ayanamsa(self, jd: float) -> float:
         """Get ayanamsa value for given Julian Day"""
+        self.prepare_thread()
         return swe.get_ayanamsa(jd)
     
+    def get_ayanamsa_values(self, jd: float, ayanamsas: List[str] = None) -> Dict[str, float]:
+        """True (nutation-corrected) ayanamsa for several systems at one Julian Day"""
+        values = {}
+        for name in ayanamsas or list(AYANAMSA_MAP):
+            with self.sidereal_mode(name):
+                values[name] = swe.get_ayanamsa_ex_ut(jd, 0)[1]
+        return values
+    
+    def get_tropical_planets(self, jd: float) -> Dict[str, Dict]:
+        """Tropical positions and speeds of all planets, independent of ayanamsa"""
+        self.prepare_thread()
+        flag = swe.FLG_SWIEPH | swe.FLG_SPEED
+        positions = {}
+        for planet in ["SUN", "MOON", "MERCURY", "VENUS", "MARS", "JUPITER", "SATURN", "RAHU"]:
+            result = swe.calc_ut(jd, PLANETS[planet], flag)[0]
+            positions[planet] = {
+                "longitude": result[0],
+                "latitude": result[1],
+                "distance": result[2],
+                "speed": result[3]
+            }
+        
+        # Ketu mirrors Rahu, as in get_planet_position
+        rahu = positions["RAHU"]
+        positions["KETU"] = {
+            "longitude": (rahu["longitude"] + 180.0) % 360.0,
+            "latitude": -rahu["latitude"],
+            "distance": rahu["distance"],
+            "speed": -rahu["speed"]
+        }
+        return positions
+    
     def get_planet_position(self, jd: float, planet: str, sidereal: bool = True) -> Dict:
         """Get position of a planet"""
         planet_id = PLANETS.get(planet.upper())
         if planet_id is None:
             raise ValueError(f"Unknown planet: {planet}")
         
+        self.prepare_thread()
         flag = swe.FLG_SIDEREAL if sidereal else swe.FLG_SWIEPH
         
         if planet.upper() == "KETU":
@@ -99,12 +188,56 @@ class EphemerisCalculator:
         for planet in ["SUN", "MOON", "MERCURY", "VENUS", "MARS", "JUPITER", "SATURN", "RAHU", "KETU"]:
             positions[planet] = self.get_planet_position(jd, planet)
         return positions
-    
+
+    def get_planet_series(self, jds: np.ndarray, planets: List[str] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        """Get sidereal longitude and speed arrays for planets over many Julian Days"""
+        planets = planets or ["SUN", "MOON", "MERCURY", "VENUS", "MARS", "JUPITER", "SATURN", "RAHU", "KETU"]
+        jds = np.asarray(jds, dtype=float)
+        flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
+        self.prepare_thread()
+
+        computed = {}
+        series = {}
+        for planet in planets:
+            # Ketu is derived from the Rahu series
+            base = "RAHU" if planet.upper() == "KETU" else planet.upper()
+            if base not in computed:
+                planet_id = PLANETS.get(base)
+                if planet_id is None:
+                    raise ValueError(f"Unknown planet: {planet}")
+                longitudes = np.empty(len(jds))
+                speeds = np.empty(len(jds))
+                for i, jd in enumerate(jds):
+                    result = swe.calc_ut(jd, planet_id, flag)[0]
+                    longitudes[i] = result[0]
+                    speeds[i] = result[3]
+                computed[base] = (longitudes, speeds)
+
+            longitudes, speeds = computed[base]
+            if base != planet.upper():
+                longitudes = (longitudes + 180.0) % 360.0
+            series[planet.upper()] = {"longitude": longitudes, "speed": speeds}
+
+        return series
+
+    def get_ascendant_series(self, jds: np.ndarray, lat: float, lon: float) -> np.ndarray:
+        """Sidereal ascendant over many Julian Days (equal houses, so it works at any latitude)"""
+        self.prepare_thread()
+        ascendants = np.empty(len(jds))
+        for i, jd in enumerate(np.asarray(jds, dtype=float)):
+            ascendants[i] = swe.houses_ex(jd, lat, lon, b'E', swe.FLG_SIDEREAL)[1][0]
+        return ascendants
+
+    def get_rasi_array(self, longitudes: np.ndarray) -> np.ndarray:
+        """Get rasi numbers (1-12) for an array of longitudes"""
+        return (np.asarray(longitudes) // 30.0).astype(int) % 12 + 1
+
     def get_houses(self, jd: float, lat: float, lon: float) -> Tuple[float, List[float]]:
         """Calculate house cusps and ascendant using Placidus system"""
+        self.prepare_thread()
         cusps, ascmc = swe.houses(jd, lat, lon, b'P')  # Placidus
         ascendant = ascmc[0]
-        return ascendant, list(cusps[1:])  # cusps[0] is unused, houses start from cusps[1]
+        return ascendant, list(cusps[-12:])  # pyswisseph drops the unused cusps[0] of the C API
     
     def get_nakshatra(self, longitude: float) -> Tuple[str, int]:
         """Get nakshatra and pada for a given longitude"""
@@ -122,13 +255,7 @@ class EphemerisCalculator:
         if planet.upper() in ["SUN", "RAHU", "KETU"]:
             return False
         
-        # Combustion degrees
-        combustion_degrees = {
-            "MOON": 12, "MARS": 17, "MERCURY": 14,
-            "JUPITER": 11, "VENUS": 10, "SATURN": 15
-        }
-        
-        degrees = combustion_degrees.get(planet.upper(), 15)
+        degrees = COMBUSTION_DEGREES.get(planet.upper(), 15)
         diff = abs(planet_lon - sun_lon)
         if diff > 180:
             diff = 360 - diff
@@ -0,0 +1,227 @@
+"""
+Gazetteer
+Offline populated-places table for place autocomplete and coordinate-to-timezone
+lookup. Places and their normalized name keys are stored as memory-mapped
+arrays. Autocomplete uses a prefix trie compressed into the sorted key array
+(every trie node is a contiguous key range) whose top levels keep their best
+places precomputed. Reverse lookup is a KD-tree over unit vectors.
+"""
+import json
+import math
+import os
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+PLACE_DTYPE = np.dtype([
+    ("name", "U64"),
+    ("country", "U2"),
+    ("admin1", "U20"),
+    ("latitude", "f4"),
+    ("longitude", "f4"),
+    ("population", "u4"),
+    ("zone", "u2")
+])
+
+KEY_WIDTH = 32
+TRIE_DEPTH = 3
+TRIE_TOP_K = 10
+
+EARTH_RADIUS_KM = 6371.0
+MAX_REVERSE_KM = 250.0
+
+
+def normalize(text: str) -> str:
+    """Lowercase, accent-free, single-spaced search key"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    cleaned = "".join(ch if ch.isalnum() else " " for ch in stripped.casefold())
+    return " ".join(cleaned.split())
+
+
+def unit_vectors(latitudes, longitudes) -> np.ndarray:
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def offset_timezone(longitude: float) -> str:
+    """Nautical Etc/GMT zone for a longitude (Etc signs are inverted)"""
+    hours = int(round(longitude / 15.0))
+    return "Etc/GMT" if hours == 0 else f"Etc/GMT{-hours:+d}"
+
+
+class Gazetteer:
+    """Places, sorted name keys and the precomputed top of the prefix trie"""
+
+    FILES = ["places", "keys", "key_places", "nodes", "node_top"]
+    META_FILE = "meta.json"
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Dict):
+        self.places = arrays["places"]
+        self.keys = arrays["keys"]
+        self.key_places = arrays["key_places"]
+        self.nodes = arrays["nodes"]
+        self.node_top = arrays["node_top"]
+        self.meta = meta
+        self.zones: List[str] = meta["zones"]
+        self._tree = None
+
+    @classmethod
+    def from_places(cls, rows: Iterable[Dict]) -> "Gazetteer":
+        """Build from dicts with name, ascii_name, country, admin1, latitude, longitude, population, timezone"""
+        rows = list(rows)
+        zones = sorted({row["timezone"] for row in rows})
+        zone_ids = {zone: i for i, zone in enumerate(zones)}
+
+        places = np.zeros(len(rows), dtype=PLACE_DTYPE)
+        key_rows = []
+        for i, row in enumerate(rows):
+            places[i] = (
+                row["name"], row.get("country", ""), row.get("admin1", ""),
+                row["latitude"], row["longitude"], row.get("population", 0), zone_ids[row["timezone"]]
+            )
+            for key in {normalize(row["name"]), normalize(row.get("ascii_name", ""))}:
+                if key:
+                    key_rows.append((key[:KEY_WIDTH], i))
+
+        key_rows.sort()
+        keys = np.array([key for key, _ in key_rows], dtype=f"U{KEY_WIDTH}")
+        key_places = np.array([place for _, place in key_rows], dtype=np.int32)
+
+        # Precompute the best places under every short prefix
+        nodes, node_top = [], []
+        population = places["population"].astype(np.int64)
+        for depth in range(1, TRIE_DEPTH + 1):
+            prefixes = np.array([key[:depth] for key in keys.tolist()], dtype=f"U{TRIE_DEPTH}")
+            unique, starts = np.unique(prefixes, return_index=True)
+            ends = np.append(starts[1:], len(prefixes))
+            for prefix, lo, hi in zip(unique.tolist(), starts, ends):
+                if len(prefix) < depth:
+                    continue
+                top = cls._top_places(key_places[lo:hi], population, TRIE_TOP_K)
+                nodes.append(prefix)
+                node_top.append(np.pad(top, (0, TRIE_TOP_K - len(top)), constant_values=-1))
+
+        order = np.argsort(np.array(nodes, dtype=f"U{TRIE_DEPTH}"), kind="stable")
+        arrays = {
+            "places": places,
+            "keys": keys,
+            "key_places": key_places,
+            "nodes": np.array(nodes, dtype=f"U{TRIE_DEPTH}")[order],
+            "node_top": np.array(node_top, dtype=np.int32).reshape(-1, TRIE_TOP_K)[order]
+        }
+        return cls(arrays, {"zones": zones, "count": len(rows)})
+
+    @classmethod
+    def load(cls, path: str) -> Optional["Gazetteer"]:
+        """Memory-map a saved gazetteer, or None if absent"""
+        if not os.path.exists(os.path.join(path, cls.META_FILE)):
+            return None
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in cls.FILES}
+        with open(os.path.join(path, cls.META_FILE)) as f:
+            meta = json.load(f)
+        return cls(arrays, meta)
+
+    def save(self, path: str):
+        """Write the gazetteer to a directory"""
+        os.makedirs(path, exist_ok=True)
+        for name in self.FILES:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, self.META_FILE), "w") as f:
+            json.dump(self.meta, f)
+
+    @staticmethod
+    def _top_places(place_ids: np.ndarray, population: np.ndarray, limit: int) -> np.ndarray:
+        """Distinct places, most populous first"""
+        place_ids = np.unique(place_ids)
+        order = np.argsort(-population[place_ids], kind="stable")[:limit]
+        return place_ids[order]
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Places whose name starts with the query, most populous first"""
+        key = normalize(query)[:KEY_WIDTH]
+        if not key:
+            return []
+
+        if len(key) <= TRIE_DEPTH:
+            i = int(np.searchsorted(self.nodes, key))
+            if i == len(self.nodes) or self.nodes[i] != key:
+                return []
+            top = self.node_top[i]
+            place_ids = top[top >= 0][:limit]
+        else:
+            lo = int(np.searchsorted(self.keys, key, side="left"))
+            hi = int(np.searchsorted(self.keys, key + "\U0010ffff", side="right"))
+            population = self.places["population"]
+            place_ids = self._top_places(np.asarray(self.key_places[lo:hi]), population, limit)
+
+        return [self.describe(int(i)) for i in place_ids]
+
+    def reverse(self, latitude: float, longitude: float) -> Dict:
+        """Nearest place and its timezone; far from any place, the nautical zone"""
+        if self._tree is None:
+            from scipy.spatial import cKDTree
+            self._tree = cKDTree(unit_vectors(self.places["latitude"], self.places["longitude"]))
+
+        chord, index = self._tree.query(unit_vectors([latitude], [longitude])[0])
+        distance_km = 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0))
+
+        if distance_km > MAX_REVERSE_KM:
+            return {"timezone": offset_timezone(longitude), "place": None, "distance_km": round(distance_km, 1)}
+
+        place = self.describe(int(index))
+        return {"timezone": place["timezone"], "place": place, "distance_km": round(distance_km, 1)}
+
+    def describe(self, index: int) -> Dict:
+        place = self.places[index]
+        return {
+            "name": str(place["name"]),
+            "admin1": str(place["admin1"]),
+            "country": str(place["country"]),
+            "latitude": round(float(place["latitude"]), 4),
+            "longitude": round(float(place["longitude"]), 4),
+            "population": int(place["population"]),
+            "timezone": self.zones[int(place["zone"])]
+        }
+
+
+class GazetteerIndex:
+    """Lazily loaded gazetteer; None until scripts/build_gazetteer.py has been run"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._gazetteer = None
+        self._loaded = False
+
+    @property
+    def gazetteer(self) -> Optional[Gazetteer]:
+        if not self._loaded:
+            self._gazetteer = Gazetteer.load(self.path)
+            self._loaded = True
+        return self._gazetteer
+
+    def resolve(self, birth_place: str, latitude: Optional[float] = None,
+                longitude: Optional[float] = None, timezone: Optional[str] = None) -> tuple:
+        """Fill in missing (latitude, longitude, timezone) from the place name and coordinates"""
+        if latitude is None or longitude is None:
+            # "New Delhi, India" is looked up by its first component
+            name = (birth_place or "").split(",")[0]
+            places = self.gazetteer.search(name, 1) if self.gazetteer and name else []
+            if not places:
+                raise ValueError("Could not resolve birth_place; provide latitude and longitude")
+            latitude, longitude = places[0]["latitude"], places[0]["longitude"]
+            timezone = timezone or places[0]["timezone"]
+
+        if not timezone:
+            if self.gazetteer is None:
+                raise ValueError("timezone is required")
+            timezone = self.gazetteer.reverse(latitude, longitude)["timezone"]
+
+        return latitude, longitude, timezone
+
+
+gazetteer = GazetteerIndex(settings.GAZETTEER_PATH)
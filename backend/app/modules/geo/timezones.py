@@ -0,0 +1,135 @@
+"""
+Timezone Resolution
+Converts local birth datetimes in an IANA zone to UTC instants. Each zone's
+offset history is flattened once into a sorted transition table, so a
+conversion is one bisect (or one searchsorted for a whole batch) instead of a
+walk through tz rules, including DST and pre-1970 local mean time.
+"""
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+EPOCH = datetime(1970, 1, 1)
+
+# Span covered by the transition tables; instants outside it go through zoneinfo
+TABLE_START = datetime(1800, 1, 1)
+TABLE_END = datetime(2100, 1, 1)
+SAMPLE_STEP_SECONDS = 24 * 3600
+
+ZONE_CACHE_SIZE = 512
+CONVERSION_CACHE_SIZE = 65536
+
+
+def to_seconds(dt: datetime) -> int:
+    """Seconds since the Unix epoch for a naive datetime"""
+    return (dt - EPOCH) // timedelta(seconds=1)
+
+
+class ZoneTable:
+    """Offset history of one zone as parallel arrays, indexed by local wall time"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.zone = ZoneInfo(name)
+        utc_starts, offsets = self._transitions()
+
+        # Interval i applies from wall time utc_starts[i] + max(offset before, offset after);
+        # this resolves repeated wall times to the first occurrence and skipped
+        # ones with the earlier offset, as zoneinfo does for fold=0
+        self.offsets: List[int] = offsets
+        self.wall_starts: List[int] = [
+            start + max(offsets[i - 1], offsets[i]) for i, start in enumerate(utc_starts) if i > 0
+        ]
+        self.offsets_array = np.array(offsets, dtype=np.int64)
+        self.wall_starts_array = np.array(self.wall_starts, dtype=np.int64)
+        self.wall_range = (to_seconds(TABLE_START) + offsets[0], to_seconds(TABLE_END) + offsets[-1])
+
+    def _offset_at(self, utc_seconds: int) -> int:
+        return int(datetime.fromtimestamp(utc_seconds, self.zone).utcoffset().total_seconds())
+
+    def _transitions(self) -> Tuple[List[int], List[int]]:
+        """UTC start and offset of every interval, found by sampling then bisecting to the second"""
+        start, end = to_seconds(TABLE_START), to_seconds(TABLE_END)
+        utc_starts = [start]
+        offsets = [self._offset_at(start)]
+
+        previous = start
+        for sample in range(start + SAMPLE_STEP_SECONDS, end + 1, SAMPLE_STEP_SECONDS):
+            offset = self._offset_at(sample)
+            if offset != offsets[-1]:
+                lo, hi = previous, sample
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    if self._offset_at(mid) == offsets[-1]:
+                        lo = mid
+                    else:
+                        hi = mid
+                utc_starts.append(hi)
+                offsets.append(offset)
+            previous = sample
+
+        return utc_starts, offsets
+
+    def offset_for_wall(self, wall_seconds: int) -> int:
+        return self.offsets[bisect_right(self.wall_starts, wall_seconds)]
+
+
+class TimezoneResolver:
+    """Cached local-to-UTC conversion over per-zone transition tables"""
+
+    @lru_cache(maxsize=ZONE_CACHE_SIZE)
+    def table(self, name: str) -> ZoneTable:
+        """Transition table for a zone, built on first use"""
+        return ZoneTable(name)
+
+    def is_valid(self, name: str) -> bool:
+        try:
+            ZoneInfo(name)
+            return True
+        except (ZoneInfoNotFoundError, ValueError):
+            return False
+
+    @lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+    def to_utc(self, local_dt: datetime, name: str) -> datetime:
+        """Naive UTC instant for a naive local datetime; unknown zones are taken as UTC"""
+        if local_dt.tzinfo is not None:
+            return local_dt.astimezone(timezone.utc).replace(tzinfo=None)
+        if not name or not self.is_valid(name):
+            return local_dt
+
+        table = self.table(name)
+        wall = to_seconds(local_dt)
+        if not table.wall_range[0] <= wall < table.wall_range[1]:
+            return local_dt.replace(tzinfo=table.zone).astimezone(timezone.utc).replace(tzinfo=None)
+
+        return local_dt - timedelta(seconds=table.offset_for_wall(wall))
+
+    def to_utc_many(self, local_dts: Sequence, names: Sequence[str]) -> np.ndarray:
+        """Vectorized to_utc: datetime64[s] UTC instants for parallel arrays of local datetimes and zones"""
+        wall = np.asarray(local_dts, dtype="datetime64[s]").astype(np.int64)
+        names = np.asarray(names, dtype=object)
+        utc = wall.copy()
+
+        for name in set(names.tolist()):
+            if not name or not self.is_valid(name):
+                continue
+            rows = np.nonzero(names == name)[0]
+            table = self.table(name)
+            zone_wall = wall[rows]
+
+            in_range = (zone_wall >= table.wall_range[0]) & (zone_wall < table.wall_range[1])
+            index = np.searchsorted(table.wall_starts_array, zone_wall, side="right")
+            utc[rows] = zone_wall - table.offsets_array[index]
+
+            for row in rows[~in_range]:
+                local_dt = EPOCH + timedelta(seconds=int(wall[row]))
+                utc[row] = to_seconds(self.to_utc(local_dt, name))
+
+        return utc.astype("datetime64[s]")
+
+
+timezone_resolver = TimezoneResolver()
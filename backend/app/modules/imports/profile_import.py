@@ -0,0 +1,118 @@
+"""
+Profile Import
+Parses and validates bulk profile uploads (CSV or JSON) into rows ready for a
+bulk insert, collecting per-row errors instead of failing the whole file.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from app.modules.ephemeris.calculator import AYANAMSA_MAP
+from app.modules.geo.gazetteer import gazetteer
+from app.modules.geo.timezones import timezone_resolver
+
+REQUIRED_FIELDS = ["name", "birth_date", "birth_time", "birth_place"]
+
+
+class ProfileImportParser:
+    """Turn an uploaded file into validated profile rows and row errors"""
+
+    def parse(self, content: bytes, filename: str) -> List[Dict]:
+        """Records from a CSV (header row) or JSON (list, or {"profiles": [...]}) file"""
+        text = content.decode("utf-8-sig")
+        if filename.lower().endswith(".json"):
+            data = json.loads(text)
+            records = data.get("profiles") if isinstance(data, dict) else data
+            if not isinstance(records, list):
+                raise ValueError("JSON must be a list of profiles or {\"profiles\": [...]}")
+            return records
+        if filename.lower().endswith(".csv"):
+            return list(csv.DictReader(io.StringIO(text)))
+        raise ValueError("Unsupported file type. Use .csv or .json")
+
+    def validate(self, records: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Valid rows (with their 1-based record number) and [{row, error}] for the rest"""
+        valid, errors = [], []
+        for number, record in enumerate(records, start=1):
+            try:
+                row = self.validate_record(record)
+                row["row"] = number
+                valid.append(row)
+            except ValueError as e:
+                errors.append({"row": number, "error": str(e)})
+        return valid, errors
+
+    def validate_record(self, record: Dict) -> Dict:
+        """Normalized profile fields for one record; raises ValueError describing the problem"""
+        if not isinstance(record, dict):
+            raise ValueError("Record must be an object")
+        record = {k.strip().lower(): v.strip() if isinstance(v, str) else v for k, v in record.items() if k}
+
+        missing = [field for field in REQUIRED_FIELDS if not record.get(field)]
+        if missing:
+            raise ValueError(f"Missing fields: {', '.join(missing)}")
+
+        try:
+            birth_date = datetime.fromisoformat(str(record["birth_date"]))
+        except ValueError:
+            raise ValueError("Invalid birth_date. Use YYYY-MM-DD")
+
+        birth_time = str(record["birth_time"])
+        try:
+            fmt = "%H:%M:%S" if birth_time.count(":") == 2 else "%H:%M"
+            birth_time = datetime.strptime(birth_time, fmt).strftime("%H:%M:%S")
+        except ValueError:
+            raise ValueError("Invalid birth_time. Use HH:MM or HH:MM:SS")
+
+        latitude = self._coordinate(record.get("latitude"), "latitude", 90)
+        longitude = self._coordinate(record.get("longitude"), "longitude", 180)
+        latitude, longitude, timezone = gazetteer.resolve(
+            record["birth_place"], latitude, longitude, record.get("timezone") or None
+        )
+        if not timezone_resolver.is_valid(timezone):
+            raise ValueError(f"Unknown timezone: {timezone}")
+
+        ayanamsa = str(record.get("ayanamsa") or "LAHIRI").upper()
+        if ayanamsa not in AYANAMSA_MAP:
+            raise ValueError(f"Unknown ayanamsa: {ayanamsa}")
+
+        return {
+            "name": str(record["name"])[:255],
+            "birth_date": birth_date,
+            "birth_time": birth_time,
+            "birth_place": str(record["birth_place"])[:255],
+            "latitude": latitude,
+            "longitude": longitude,
+            "timezone": timezone,
+            "ayanamsa": ayanamsa
+        }
+
+    def _coordinate(self, value, field: str, limit: float):
+        if value in (None, ""):
+            return None
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid {field}")
+        if not -limit <= value <= limit:
+            raise ValueError(f"{field} out of range")
+        return value
+
+
+def plan_chunks(profile_ids: List[int], chunk_size: int) -> List[Dict]:
+    """Split sorted profile ids into contiguous precompute chunks"""
+    profile_ids = sorted(profile_ids)
+    return [
+        {
+            "chunk_index": i,
+            "first_profile_id": profile_ids[start],
+            "last_profile_id": profile_ids[min(start + chunk_size, len(profile_ids)) - 1],
+            "size": len(profile_ids[start:start + chunk_size])
+        }
+        for i, start in enumerate(range(0, len(profile_ids), chunk_size))
+    ]
+
+
+profile_import_parser = ProfileImportParser()
@@ -0,0 +1,96 @@
+"""
+Interval Sets
+Sorted, disjoint half-open time intervals with linear-merge set operations
+"""
+from typing import Iterable, Iterator, Tuple
+
+import numpy as np
+
+
+class IntervalSet:
+    """Disjoint [start, end) intervals (Julian Days) held as sorted parallel arrays"""
+
+    def __init__(self, starts: Iterable[float] = (), ends: Iterable[float] = ()):
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+
+    @classmethod
+    def from_intervals(cls, starts: Iterable[float], ends: Iterable[float]) -> "IntervalSet":
+        """Normalize arbitrary intervals: drop empty ones, sort, merge overlapping and touching"""
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        keep = ends > starts
+        starts, ends = starts[keep], ends[keep]
+        if not len(starts):
+            return cls()
+
+        order = np.argsort(starts, kind="stable")
+        starts, ends = starts[order], np.maximum.accumulate(ends[order])
+        # A new run begins where an interval starts after everything before it ended
+        begins = np.concatenate([[True], starts[1:] > ends[:-1]])
+        run_ends = np.concatenate([np.flatnonzero(begins)[1:] - 1, [len(starts) - 1]])
+        return cls(starts[begins], ends[run_ends])
+
+    @classmethod
+    def from_segments(cls, starts: np.ndarray, ends: np.ndarray, mask: np.ndarray) -> "IntervalSet":
+        """Contiguous segments whose mask is set (segments are sorted and non-overlapping)"""
+        mask = np.asarray(mask, dtype=bool)
+        return cls.from_intervals(np.asarray(starts)[mask], np.asarray(ends)[mask])
+
+    @classmethod
+    def span(cls, start: float, end: float) -> "IntervalSet":
+        return cls([start], [end]) if end > start else cls()
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        return zip(self.starts.tolist(), self.ends.tolist())
+
+    @property
+    def duration(self) -> float:
+        return float(np.sum(self.ends - self.starts))
+
+    def intersect(self, other: "IntervalSet") -> "IntervalSet":
+        """Intersection by a single linear merge of both sorted lists"""
+        a_starts, a_ends = self.starts.tolist(), self.ends.tolist()
+        b_starts, b_ends = other.starts.tolist(), other.ends.tolist()
+        starts, ends = [], []
+        i = j = 0
+        while i < len(a_starts) and j < len(b_starts):
+            lo = max(a_starts[i], b_starts[j])
+            hi = min(a_ends[i], b_ends[j])
+            if lo < hi:
+                starts.append(lo)
+                ends.append(hi)
+            # Advance whichever interval finishes first
+            if a_ends[i] < b_ends[j]:
+                i += 1
+            else:
+                j += 1
+        return IntervalSet(starts, ends)
+
+    def union(self, other: "IntervalSet") -> "IntervalSet":
+        return IntervalSet.from_intervals(
+            np.concatenate([self.starts, other.starts]), np.concatenate([self.ends, other.ends])
+        )
+
+    def complement(self, start: float, end: float) -> "IntervalSet":
+        """Gaps between intervals within [start, end)"""
+        clipped = self.intersect(IntervalSet.span(start, end))
+        gap_starts = np.concatenate([[start], clipped.ends])
+        gap_ends = np.concatenate([clipped.starts, [end]])
+        keep = gap_ends > gap_starts
+        return IntervalSet(gap_starts[keep], gap_ends[keep])
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        """Whether each point lies inside an interval"""
+        points = np.asarray(points, dtype=np.float64)
+        i = np.searchsorted(self.starts, points, side="right") - 1
+        inside = i >= 0
+        inside[inside] = points[inside] < self.ends[i[inside]]
+        return inside
+
+    def longer_than(self, min_length: float) -> "IntervalSet":
+        keep = (self.ends - self.starts) >= min_length
+        return IntervalSet(self.starts[keep], self.ends[keep])
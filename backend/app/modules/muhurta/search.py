@@ -0,0 +1,176 @@
+"""
+Muhurta Search
+Electional search. Every constraint becomes a sorted interval set built from its
+boundary times (panchang limbs, vara, horas, Rahu Kalam, lagna changes) and
+windows come from intersecting the sets, never from scanning minute by minute.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.modules.ephemeris.calculator import NAKSHATRAS
+from app.modules.muhurta.intervals import IntervalSet
+from app.modules.panchang.calculator import panchang_calculator, tithi_name, YOGAS, karana_name, VARAS
+from app.modules.panchang.lagna import lagna_calculator
+
+CONSTRAINTS = ["tithi", "nakshatra", "yoga", "karana", "vara", "hora", "lagna", "rahu_kalam"]
+LIMB_CONSTRAINTS = {"tithi": 30, "nakshatra": 27, "yoga": 27, "karana": 60}
+
+# Hora lords run in descending orbital speed (Chaldean order) from the vara lord
+HORA_SEQUENCE = ["SUN", "VENUS", "MERCURY", "MOON", "SATURN", "JUPITER", "MARS"]
+LORDS = set(HORA_SEQUENCE)
+BENEFIC_LORDS = ["JUPITER", "VENUS", "MERCURY", "MOON"]
+
+SIGN_GROUPS = {
+    "movable": [1, 4, 7, 10],
+    "fixed": [2, 5, 8, 11],
+    "dual": [3, 6, 9, 12]
+}
+
+# Eighth of the daytime ruled by Rahu, by vara (Sunday first)
+RAHU_KALAM_PART = [8, 2, 7, 5, 6, 4, 3]
+
+MAX_SEARCH_DAYS = 90
+
+Segments = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+class MuhurtaSearch:
+    """Build per-constraint interval sets and intersect them into ranked windows"""
+
+    def normalize(self, name: str, values: Iterable) -> List:
+        """Allowed values for a constraint; group names (benefic, fixed, ...) are expanded"""
+        if name not in CONSTRAINTS:
+            raise ValueError(f"Unknown constraint: {name}")
+        if name == "rahu_kalam":
+            return [False]
+
+        allowed = []
+        for value in values:
+            text = str(value).strip()
+            if name in LIMB_CONSTRAINTS:
+                if not text.isdigit() or not 1 <= int(text) <= LIMB_CONSTRAINTS[name]:
+                    raise ValueError(f"{name} must be 1-{LIMB_CONSTRAINTS[name]}")
+                allowed.append(int(text))
+            elif name == "lagna":
+                if text.lower() in SIGN_GROUPS:
+                    allowed.extend(SIGN_GROUPS[text.lower()])
+                elif text.isdigit() and 1 <= int(text) <= 12:
+                    allowed.append(int(text))
+                else:
+                    raise ValueError("lagna must be 1-12 or movable/fixed/dual")
+            elif text.lower() == "benefic":
+                allowed.extend(BENEFIC_LORDS)
+            elif text.upper() in LORDS:
+                allowed.append(text.upper())
+            else:
+                raise ValueError(f"{name} must be a planet (SUN ... SATURN) or 'benefic'")
+
+        if not allowed:
+            raise ValueError(f"No values given for {name}")
+        return sorted(set(allowed))
+
+    def segments(self, name: str, start_jd: float, end_jd: float, latitude: float,
+                 longitude: float, ayanamsa: str) -> Segments:
+        """(starts, ends, values) covering [start_jd, end_jd) for one constraint"""
+        if name in LIMB_CONSTRAINTS:
+            starts, ends, values = panchang_calculator.limb_segments(name, start_jd, end_jd, ayanamsa)
+            return starts, ends, values + 1
+        if name == "lagna":
+            return lagna_calculator.segments(start_jd, end_jd, latitude, longitude, ayanamsa)
+
+        days = panchang_calculator.days_between(start_jd, end_jd, latitude, longitude)
+        if name == "vara":
+            lords = np.array([VARAS[v][1] for v in days["vara"]])
+            return days["sunrise"], days["next_sunrise"], lords
+        if name == "hora":
+            return self.hora_segments(days)
+        return self.rahu_kalam_segments(days)
+
+    def hora_segments(self, days: Dict[str, np.ndarray]) -> Segments:
+        """Twelve day and twelve night horas per day, led by the vara lord"""
+        twelfths = np.arange(12) / 12.0
+        day_starts = days["sunrise"][:, None] + (days["sunset"] - days["sunrise"])[:, None] * twelfths
+        night_starts = days["sunset"][:, None] + (days["next_sunrise"] - days["sunset"])[:, None] * twelfths
+        starts = np.hstack([day_starts, night_starts])
+        ends = np.hstack([starts[:, 1:], days["next_sunrise"][:, None]])
+
+        first = np.array([HORA_SEQUENCE.index(VARAS[v][1]) for v in days["vara"]], dtype=np.int64)
+        lords = np.array(HORA_SEQUENCE)[(first[:, None] + np.arange(24)) % 7]
+        return starts.ravel(), ends.ravel(), lords.ravel()
+
+    def rahu_kalam_segments(self, days: Dict[str, np.ndarray]) -> Segments:
+        """Each day as (before, during, after) Rahu Kalam, valued True during it"""
+        part = np.array(RAHU_KALAM_PART)[days["vara"]]
+        eighth = (days["sunset"] - days["sunrise"]) / 8.0
+        rk_start = days["sunrise"] + (part - 1) * eighth
+        rk_end = rk_start + eighth
+        starts = np.column_stack([days["sunrise"], rk_start, rk_end]).ravel()
+        ends = np.column_stack([rk_start, rk_end, days["next_sunrise"]]).ravel()
+        values = np.tile([False, True, False], len(days["sunrise"]))
+        return starts, ends, values
+
+    def search(self, start_jd: float, end_jd: float, latitude: float, longitude: float,
+               required: Dict[str, List], optional: Optional[Dict[str, List]] = None,
+               ayanamsa: str = None, min_minutes: float = 15, limit: int = 20) -> List[Dict]:
+        """
+        Windows inside [start_jd, end_jd) meeting every required constraint, ranked by
+        how many optional constraints they also meet, then by length.
+        """
+        ayanamsa = ayanamsa or settings.DEFAULT_AYANAMSA
+        optional = optional or {}
+        span = IntervalSet.span(start_jd, end_jd)
+
+        segments, sets = {}, {}
+        for name, allowed in {**required, **optional}.items():
+            segments[name] = self.segments(name, start_jd, end_jd, latitude, longitude, ayanamsa)
+            starts, ends, values = segments[name]
+            sets[name] = IntervalSet.from_segments(starts, ends, np.isin(values, allowed)).intersect(span)
+
+        windows = span
+        for name in required:
+            windows = windows.intersect(sets[name])
+
+        # Cut the windows wherever an optional constraint starts or stops holding
+        cuts = [windows.starts, windows.ends] + [a for name in optional for a in (sets[name].starts, sets[name].ends)]
+        points = np.unique(np.concatenate(cuts)) if len(windows) else np.array([])
+        piece_starts, piece_ends = points[:-1], points[1:]
+        middles = (piece_starts + piece_ends) / 2.0
+        inside = windows.contains(middles) & ((piece_ends - piece_starts) * 1440.0 >= min_minutes)
+        piece_starts, piece_ends, middles = piece_starts[inside], piece_ends[inside], middles[inside]
+
+        met = {name: sets[name].contains(middles) for name in optional}
+        count = np.sum([met[name] for name in optional], axis=0) if optional else np.zeros(len(middles))
+        order = np.lexsort((piece_starts, -(piece_ends - piece_starts), -count))[:limit]
+
+        return [
+            {
+                "start": panchang_calculator._datetime(piece_starts[i]),
+                "end": panchang_calculator._datetime(piece_ends[i]),
+                "duration_minutes": round(float(piece_ends[i] - piece_starts[i]) * 1440.0, 1),
+                "satisfied": list(required) + [name for name in optional if met[name][i]],
+                "missed": [name for name in optional if not met[name][i]],
+                "details": {name: self._describe(name, segments[name], piece_starts[i]) for name in segments}
+            }
+            for i in order.tolist()
+        ]
+
+    def _describe(self, name: str, segments: Segments, jd: float):
+        """Constraint value in force at a moment"""
+        starts, _, values = segments
+        value = values[max(int(np.searchsorted(starts, jd, side="right")) - 1, 0)]
+        if name == "tithi":
+            return {"number": int(value), "name": tithi_name(int(value) - 1)}
+        if name == "nakshatra":
+            return {"number": int(value), "name": NAKSHATRAS[int(value) - 1]}
+        if name == "yoga":
+            return {"number": int(value), "name": YOGAS[int(value) - 1]}
+        if name == "karana":
+            return {"number": int(value), "name": karana_name(int(value) - 1)}
+        if name == "lagna":
+            return int(value)
+        return bool(value) if name == "rahu_kalam" else str(value)
+
+
+muhurta_search = MuhurtaSearch()
@@ -0,0 +1,329 @@
+"""
+Notification Scheduler
+Plans per-profile push notifications (upcoming Align27 golden moments and
+Vimshottari Maha/Antar dasha changes) into a persistent queue: pending rows
+indexed by (status, due_at) act as a min-heap that a worker drains in batches.
+Each profile is only planned a short horizon ahead; a cursor records how far,
+and profiles whose plan is running out (or whose birth data changed) are
+replanned lazily, lowest cursor first.
+"""
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.chart import PlanetaryPosition
+from app.models.notification import ScheduledNotification, NotificationCursor
+from app.models.profile import Profile
+from app.modules.align27.calculator import align27_calculator
+from app.modules.charts.canonical import chart_canonicalizer
+from app.modules.dasha.sandhi import sandhi_detector, SANDHI_LEVELS
+from app.modules.geo.timezones import timezone_resolver
+
+NOTIFICATION_KINDS = ["GOLDEN_MOMENT", "DASHA_CHANGE"]
+
+
+class NotificationSink(ABC):
+    """Delivers a batch of due notifications; push providers implement send"""
+
+    @abstractmethod
+    def send(self, batch: List[Dict]):
+        """Deliver every message in the batch or raise"""
+
+
+class LocalNotificationSink(NotificationSink):
+    """Keeps delivered notifications in memory, for tests and local development"""
+
+    def __init__(self):
+        self.sent: List[Dict] = []
+        self.batches = 0
+
+    def send(self, batch: List[Dict]):
+        self.sent.extend(batch)
+        self.batches += 1
+
+
+NOTIFICATION_SINKS = {"local": LocalNotificationSink}
+
+
+def get_notification_sink(name: str = None) -> NotificationSink:
+    """Sink configured by NOTIFICATION_SINK"""
+    name = name or settings.NOTIFICATION_SINK
+    if not name:
+        raise ValueError("No notification sink configured (set NOTIFICATION_SINK)")
+    if name not in NOTIFICATION_SINKS:
+        raise ValueError(f"Unknown notification sink: {name}")
+    return NOTIFICATION_SINKS[name]()
+
+
+def lead_phrase(lead: timedelta) -> str:
+    """'in 15 minutes', 'tomorrow', 'in 6 hours'"""
+    minutes = int(lead.total_seconds() // 60)
+    if minutes == 24 * 60:
+        return "tomorrow"
+    if minutes % 60 or minutes < 60:
+        return f"in {minutes} minutes"
+    return f"in {minutes // 60} hours"
+
+
+class NotificationPlanner:
+    """Notifications due in a UTC window for one profile"""
+
+    def golden_moments(self, profile: Profile, moon_rasi: int, asc_rasi: int,
+                       start: datetime, end: datetime, transit_loader: Callable,
+                       transits: Dict[date, Dict]) -> List[Dict]:
+        """GOLDEN moments starting after start + lead; moments are in the profile's local time"""
+        lead = timedelta(minutes=settings.NOTIFICATION_GOLDEN_LEAD_MINUTES)
+        items = []
+        day, last = (start - timedelta(days=1)).date(), (end + timedelta(days=1)).date()
+        while day <= last:
+            # Transits are shared by every profile planned in the same pass
+            if day not in transits:
+                transits[day] = transit_loader(day)
+            for moment in align27_calculator.generate_moments(day, moon_rasi, asc_rasi, transits[day]):
+                if moment["type"] != "GOLDEN":
+                    continue
+                event_at = timezone_resolver.to_utc(moment["start"], profile.timezone)
+                if not start <= event_at - lead < end:
+                    continue
+                items.append({
+                    "kind": "GOLDEN_MOMENT",
+                    "due_at": event_at - lead,
+                    "event_at": event_at,
+                    "title": f"{profile.name}: golden moment starts {lead_phrase(lead)}",
+                    "body": moment["reason"],
+                    "payload": {
+                        "start": moment["start"].isoformat(),
+                        "end": moment["end"].isoformat(),
+                        **(moment.get("planetary_basis") or {})
+                    }
+                })
+            day += timedelta(days=1)
+        return items
+
+    def dasha_changes(self, profile: Profile, birth_datetime: datetime, moon_longitude: float,
+                      start: datetime, end: datetime) -> List[Dict]:
+        """Maha and Antar dasha changes whose notice falls in the window"""
+        lead = timedelta(hours=settings.NOTIFICATION_DASHA_LEAD_HOURS)
+        transitions = sandhi_detector.transitions(birth_datetime, moon_longitude)
+        if not len(transitions["times"]):
+            return []
+        # Dasha dates follow the local birth time, like the stored dashas
+        instants = timezone_resolver.to_utc_many(transitions["times"], [profile.timezone] * len(transitions["times"]))
+
+        items = []
+        for i, instant in enumerate(instants.tolist()):
+            if not start <= instant - lead < end:
+                continue
+            level = SANDHI_LEVELS[transitions["levels"][i]]
+            maha, antar = transitions["to_lords"][i].split("/")
+            lord = maha if level == "maha" else antar
+            items.append({
+                "kind": "DASHA_CHANGE",
+                "due_at": instant - lead,
+                "event_at": instant,
+                "title": f"{profile.name}: {lord.title()} {level} dasha begins {lead_phrase(lead)}",
+                "body": f"{transitions['from_lords'][i].replace('/', '-').title()} gives way to "
+                        f"{transitions['to_lords'][i].replace('/', '-').title()}",
+                "payload": {
+                    "level": level,
+                    "from": transitions["from_lords"][i],
+                    "to": transitions["to_lords"][i],
+                    "date": transitions["times"][i].astype(datetime).isoformat()
+                }
+            })
+        return items
+
+
+class NotificationScheduler:
+    """Fill, refill and drain the persistent notification queue"""
+
+    def __init__(self, planner: NotificationPlanner = None):
+        self.planner = planner or NotificationPlanner()
+
+    def plan_profile(self, profile: Profile, start: datetime, end: datetime, db: Session,
+                     chart_loader: Callable, transit_loader: Callable, transits: Dict) -> List[Dict]:
+        natal_chart = chart_loader(profile, db)
+        moon = db.query(PlanetaryPosition).filter(
+            PlanetaryPosition.natal_chart_id == natal_chart.id,
+            PlanetaryPosition.planet == "MOON"
+        ).first()
+        if not moon:
+            return []
+
+        birth_datetime = chart_canonicalizer.local_datetime(profile.birth_date, profile.birth_time)
+        items = self.planner.golden_moments(
+            profile, moon.rasi, int(natal_chart.ascendant / 30.0) + 1, start, end, transit_loader, transits
+        )
+        items += self.planner.dasha_changes(profile, birth_datetime, moon.longitude, start, end)
+        return sorted(items, key=lambda item: item["due_at"])
+
+    def enqueue(self, db: Session, profile: Profile, items: List[Dict]) -> int:
+        """Add planned notifications, skipping any already queued"""
+        for item in items:
+            item["dedupe_key"] = f"{item['kind']}:{profile.id}:{item['event_at'].isoformat()}"
+        keys = [item["dedupe_key"] for item in items]
+        queued = {key for (key,) in db.query(ScheduledNotification.dedupe_key).filter(
+            ScheduledNotification.dedupe_key.in_(keys)
+        )} if keys else set()
+
+        added = 0
+        for item in items:
+            if item["dedupe_key"] in queued:
+                continue
+            queued.add(item["dedupe_key"])
+            db.add(ScheduledNotification(
+                user_id=profile.user_id,
+                profile_id=profile.id,
+                status="PENDING",
+                created_at=datetime.utcnow(),
+                **item
+            ))
+            added += 1
+        return added
+
+    def discard_pending(self, db: Session, profile_id: int) -> int:
+        """Drop a profile's unsent notifications"""
+        return db.query(ScheduledNotification).filter(
+            ScheduledNotification.profile_id == profile_id,
+            ScheduledNotification.status == "PENDING"
+        ).delete(synchronize_session=False)
+
+    def refill(self, db: Session, chart_loader: Callable, transit_loader: Callable,
+               now: datetime = None, user_id: Optional[int] = None, limit: int = None,
+               profile_id: Optional[int] = None) -> int:
+        """
+        Plan up to limit profiles whose plan ends within NOTIFICATION_REFILL_HOURS
+        (never planned, nearest end first) or whose birth data changed since.
+        """
+        now = now or datetime.utcnow()
+        horizon_end = now + timedelta(hours=settings.NOTIFICATION_HORIZON_HOURS)
+        query = db.query(Profile, NotificationCursor).outerjoin(
+            NotificationCursor, NotificationCursor.profile_id == Profile.id
+        ).filter(
+            or_(
+                NotificationCursor.id == None,  # noqa: E711
+                NotificationCursor.planned_until < now + timedelta(hours=settings.NOTIFICATION_REFILL_HOURS),
+                Profile.updated_at > NotificationCursor.updated_at
+            )
+        )
+        if user_id is not None:
+            query = query.filter(Profile.user_id == user_id)
+        if profile_id is not None:
+            query = query.filter(Profile.id == profile_id)
+        # Profiles without a cursor have never been planned and go first; MySQL already
+        # sorts NULLs first and has no NULLS FIRST
+        planned_until = NotificationCursor.planned_until.asc()
+        if db.get_bind().dialect.name != "mysql":
+            planned_until = planned_until.nullsfirst()
+        rows = query.order_by(planned_until).limit(limit or settings.NOTIFICATION_REFILL_BATCH).all()
+
+        transits = {}
+        for profile, cursor in rows:
+            start = now
+            profile_id = profile.id
+            changed = cursor is not None and profile.updated_at and cursor.updated_at and \
+                profile.updated_at > cursor.updated_at
+            if cursor is None:
+                cursor = NotificationCursor(profile_id=profile_id, planned_until=now)
+                db.add(cursor)
+            elif changed:
+                # Birth data changed: the pending plan no longer applies
+                self.discard_pending(db, profile_id)
+            else:
+                start = max(cursor.planned_until, now)
+
+            try:
+                items = self.plan_profile(profile, start, horizon_end, db, chart_loader, transit_loader, transits)
+                self.enqueue(db, profile, items)
+            except Exception:
+                # A profile that cannot be planned is retried once its window comes round again.
+                # The rollback restores a stale plan too, which must not be sent.
+                db.rollback()
+                if changed:
+                    self.discard_pending(db, profile_id)
+                cursor = db.query(NotificationCursor).filter(
+                    NotificationCursor.profile_id == profile_id
+                ).first() or NotificationCursor(profile_id=profile_id, planned_until=now)
+                db.add(cursor)
+
+            cursor.planned_until = horizon_end
+            cursor.updated_at = datetime.utcnow()
+            db.commit()
+
+        return len(rows)
+
+    def drain(self, db: Session, sink: NotificationSink, now: datetime = None,
+              batch_size: int = None) -> Dict[str, int]:
+        """
+        Send one batch of due notifications, earliest first. Notifications whose event
+        has already begun are expired instead of sent; if the sink fails the batch stays
+        pending. Rows are locked with SKIP LOCKED so several workers can drain at once.
+        """
+        now = now or datetime.utcnow()
+        rows = db.query(ScheduledNotification).filter(
+            ScheduledNotification.status == "PENDING",
+            ScheduledNotification.due_at <= now
+        ).order_by(ScheduledNotification.due_at).limit(
+            batch_size or settings.NOTIFICATION_SEND_BATCH
+        ).with_for_update(skip_locked=True).all()
+
+        due = [r for r in rows if r.event_at > now]
+        try:
+            if due:
+                sink.send([self.to_message(r) for r in due])
+        except Exception:
+            db.rollback()
+            raise
+
+        sent_at = datetime.utcnow()
+        for row in rows:
+            row.status = "SENT" if row.event_at > now else "EXPIRED"
+            row.sent_at = sent_at if row.event_at > now else None
+        db.commit()
+        return {"sent": len(due), "expired": len(rows) - len(due)}
+
+    def tick(self, db: Session, sink: NotificationSink, chart_loader: Callable,
+             transit_loader: Callable, now: datetime = None) -> Dict[str, int]:
+        """One worker pass: refill one batch of profiles, then drain everything due"""
+        now = now or datetime.utcnow()
+        refilled = self.refill(db, chart_loader, transit_loader, now)
+        totals = {"refilled": refilled, "sent": 0, "expired": 0}
+        batch_size = settings.NOTIFICATION_SEND_BATCH
+        while True:
+            result = self.drain(db, sink, now, batch_size)
+            totals["sent"] += result["sent"]
+            totals["expired"] += result["expired"]
+            if result["sent"] + result["expired"] < batch_size:
+                return totals
+
+    def upcoming(self, db: Session, user_id: int, profile_id: Optional[int] = None,
+                 now: datetime = None, limit: int = 50) -> List[Dict]:
+        """A user's pending notifications, soonest first"""
+        query = db.query(ScheduledNotification).filter(
+            ScheduledNotification.user_id == user_id,
+            ScheduledNotification.status == "PENDING",
+            ScheduledNotification.event_at > (now or datetime.utcnow())
+        )
+        if profile_id is not None:
+            query = query.filter(ScheduledNotification.profile_id == profile_id)
+        return [self.to_message(r) for r in query.order_by(ScheduledNotification.due_at).limit(limit)]
+
+    def to_message(self, row: ScheduledNotification) -> Dict:
+        return {
+            "id": row.id,
+            "user_id": row.user_id,
+            "profile_id": row.profile_id,
+            "kind": row.kind,
+            "title": row.title,
+            "body": row.body,
+            "due_at": row.due_at.isoformat(),
+            "event_at": row.event_at.isoformat(),
+            "payload": row.payload
+        }
+
+
+notification_scheduler = NotificationScheduler()
@@ -0,0 +1,292 @@
+"""
+Panchang
+The five limbs (vara, tithi, nakshatra, yoga, karana) prevailing at sunrise, with
+exact end times. Limb boundaries for a whole year are found at once from batched
+Sun and Moon series refined by vectorized Newton steps, and sunrises are computed
+per location tile; both are cached, so a day's panchang is array indexing.
+"""
+import math
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from app.core.config import settings
+from app.modules.ephemeris.calculator import ephemeris, NAKSHATRAS
+
+TITHIS = [
+    "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi", "Saptami",
+    "Ashtami", "Navami", "Dashami", "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi"
+]
+
+YOGAS = [
+    "Vishkumbha", "Priti", "Ayushman", "Saubhagya", "Shobhana", "Atiganda", "Sukarma",
+    "Dhriti", "Shula", "Ganda", "Vriddhi", "Dhruva", "Vyaghata", "Harshana", "Vajra",
+    "Siddhi", "Vyatipata", "Variyana", "Parigha", "Shiva", "Siddha", "Sadhya", "Shubha",
+    "Shukla", "Brahma", "Indra", "Vaidhriti"
+]
+
+MOVABLE_KARANAS = ["Bava", "Balava", "Kaulava", "Taitila", "Gara", "Vanija", "Vishti"]
+
+# Sunday first, matching date.toordinal() % 7
+VARAS = [
+    ("Ravivara", "SUN"), ("Somavara", "MOON"), ("Mangalavara", "MARS"), ("Budhavara", "MERCURY"),
+    ("Guruvara", "JUPITER"), ("Shukravara", "VENUS"), ("Shanivara", "SATURN")
+]
+
+NAKSHATRA_SPAN = 360.0 / 27.0
+
+# Limbs solved for directly: (span in degrees, segments per cycle). A tithi is
+# two karanas, so tithi boundaries are every other karana boundary.
+LIMBS = {
+    "karana": (6.0, 60),
+    "nakshatra": (NAKSHATRA_SPAN, 27),
+    "yoga": (NAKSHATRA_SPAN, 27)
+}
+
+GRID_STEP_DAYS = 0.25  # No limb advances a full span in 6 hours
+NEWTON_STEPS = 4
+MARGIN_DAYS = 3
+
+
+def limb_angles(sun: np.ndarray, moon: np.ndarray) -> Dict[str, np.ndarray]:
+    """Angle driving each limb from sidereal Sun and Moon longitudes"""
+    return {
+        "karana": (moon - sun) % 360.0,
+        "nakshatra": moon % 360.0,
+        "yoga": (sun + moon) % 360.0
+    }
+
+
+def limb_rates(sun_speed: np.ndarray, moon_speed: np.ndarray) -> Dict[str, np.ndarray]:
+    """Daily motion of each limb angle"""
+    return {
+        "karana": moon_speed - sun_speed,
+        "nakshatra": moon_speed,
+        "yoga": sun_speed + moon_speed
+    }
+
+
+def tithi_name(index: int) -> str:
+    """Name of a 0-based tithi (0-14 Shukla, 15-29 Krishna)"""
+    if index == 14:
+        return "Purnima"
+    if index == 29:
+        return "Amavasya"
+    return TITHIS[index % 15]
+
+
+def karana_name(index: int) -> str:
+    """Name of a 0-based karana (half-tithi) in the lunar month"""
+    if index == 0:
+        return "Kimstughna"
+    if index >= 57:
+        return ["Shakuni", "Chatushpada", "Naga"][index - 57]
+    return MOVABLE_KARANAS[(index - 1) % 7]
+
+
+class PanchangCalculator:
+    """Yearly limb tables shared by every location and per-tile sunrise tables"""
+
+    def tile(self, latitude: float, longitude: float, size: float = None) -> Tuple[float, float]:
+        """Centre of the location tile whose sunrises stand in for this place"""
+        size = size or settings.PANCHANG_TILE_DEGREES
+        return (
+            round((math.floor(latitude / size) + 0.5) * size, 6),
+            round((math.floor(longitude / size) + 0.5) * size, 6)
+        )
+
+    @lru_cache(maxsize=16)
+    def limb_boundaries(self, year: int, ayanamsa: str) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Per limb, (start Julian Days, 0-based limb index from each start) covering the year"""
+        start = swe.julday(year, 1, 1, 0.0) - MARGIN_DAYS
+        end = swe.julday(year + 1, 1, 1, 0.0) + MARGIN_DAYS
+        jds = np.arange(start, end + GRID_STEP_DAYS, GRID_STEP_DAYS)
+        sun, moon, _, _ = self._sun_moon(jds, ayanamsa)
+        angles = limb_angles(sun, moon)
+
+        # Bracket every crossing between grid samples and guess it linearly
+        guesses, targets, segments = {}, {}, {}
+        for limb, (span, _) in LIMBS.items():
+            unwrapped = np.degrees(np.unwrap(np.radians(angles[limb])))
+            segment = np.floor(unwrapped / span).astype(np.int64)
+            crossings = np.diff(segment)
+            left = np.repeat(np.arange(len(crossings)), crossings)
+            nth = np.arange(len(left)) - np.repeat(np.cumsum(crossings) - crossings, crossings) + 1
+
+            segments[limb] = np.concatenate([segment[:1], segment[left] + nth])
+            targets[limb] = (segment[left] + nth) * span
+            lo, hi = unwrapped[left], unwrapped[left + 1]
+            guesses[limb] = jds[left] + (targets[limb] - lo) / (hi - lo) * GRID_STEP_DAYS
+
+        # Newton steps for all limbs share one batched Sun/Moon evaluation
+        limbs = list(LIMBS)
+        sizes = [len(guesses[limb]) for limb in limbs]
+        estimate = np.concatenate([guesses[limb] for limb in limbs])
+        target = np.concatenate([targets[limb] for limb in limbs])
+        limb_of = np.repeat(np.arange(len(limbs)), sizes)
+        for _ in range(NEWTON_STEPS):
+            sun, moon, sun_speed, moon_speed = self._sun_moon(estimate, ayanamsa)
+            angles, rates = limb_angles(sun, moon), limb_rates(sun_speed, moon_speed)
+            angle = np.choose(limb_of, [angles[l] for l in limbs])
+            rate = np.choose(limb_of, [rates[l] for l in limbs])
+            estimate = estimate - ((angle - target + 180.0) % 360.0 - 180.0) / rate
+
+        tables = {}
+        for limb, refined in zip(limbs, np.split(estimate, np.cumsum(sizes)[:-1])):
+            count = LIMBS[limb][1]
+            tables[limb] = (np.concatenate([[start], refined]), segments[limb] % count)
+
+        starts, karanas = tables["karana"]
+        begins_tithi = np.concatenate([[True], karanas[1:] % 2 == 0])
+        tables["tithi"] = (starts[begins_tithi], karanas[begins_tithi] // 2)
+        return tables
+
+    @lru_cache(maxsize=256)
+    def sunrises(self, year: int, tile_latitude: float, tile_longitude: float) -> np.ndarray:
+        """Sunrise Julian Day on each local mean date of the year, plus the next year's first"""
+        days = date(year + 1, 1, 1).toordinal() - date(year, 1, 1).toordinal() + 1
+        midnights = swe.julday(year, 1, 1, 0.0) - tile_longitude / 360.0 + np.arange(days)
+
+        ephemeris.prepare_thread()
+        rises = np.empty(days)
+        for i, jd in enumerate(midnights):
+            result, times = swe.rise_trans(jd, swe.SUN, swe.CALC_RISE, (tile_longitude, tile_latitude, 0.0))
+            # Polar day or night (no rise within the day): fall back to 06:00 local mean time
+            rises[i] = times[0] if result == 0 and times[0] < jd + 1.0 else jd + 0.25
+        return rises
+
+    @lru_cache(maxsize=256)
+    def sunsets(self, year: int, tile_latitude: float, tile_longitude: float) -> np.ndarray:
+        """Sunset Julian Day following each sunrise of the year"""
+        rises = self.sunrises(year, tile_latitude, tile_longitude)
+
+        ephemeris.prepare_thread()
+        sets = np.empty(len(rises) - 1)
+        for i, jd in enumerate(rises[:-1]):
+            result, times = swe.rise_trans(jd, swe.SUN, swe.CALC_SET, (tile_longitude, tile_latitude, 0.0))
+            # Polar day or night: an even split between sunrises
+            sets[i] = times[0] if result == 0 and times[0] < rises[i + 1] else (jd + rises[i + 1]) / 2
+        return sets
+
+    def days_between(self, start_jd: float, end_jd: float, latitude: float, longitude: float) -> Dict[str, np.ndarray]:
+        """Sunrise, sunset, next sunrise and vara index of the days overlapping [start_jd, end_jd)"""
+        tile = self.tile(latitude, longitude)
+        parts = {"sunrise": [], "sunset": [], "next_sunrise": [], "vara": []}
+        for year in range(swe.revjul(start_jd - 1)[0], swe.revjul(end_jd)[0] + 1):
+            rises = self.sunrises(year, *tile)
+            first = date(year, 1, 1).toordinal()
+            parts["sunrise"].append(rises[:-1])
+            parts["sunset"].append(self.sunsets(year, *tile))
+            parts["next_sunrise"].append(rises[1:])
+            parts["vara"].append(np.arange(first, first + len(rises) - 1) % 7)
+
+        days = {key: np.concatenate(values) for key, values in parts.items()}
+        overlapping = (days["next_sunrise"] > start_jd) & (days["sunrise"] < end_jd)
+        return {key: values[overlapping] for key, values in days.items()}
+
+    def limb_segments(self, limb: str, start_jd: float, end_jd: float,
+                      ayanamsa: str = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(starts, ends, 0-based values) of a limb's segments overlapping [start_jd, end_jd)"""
+        ayanamsa = ayanamsa or settings.DEFAULT_AYANAMSA
+        first_year, last_year = swe.revjul(start_jd)[0], swe.revjul(end_jd)[0]
+        starts, values = [], []
+        for year in range(first_year, last_year + 1):
+            year_starts, year_values = self.limb_boundaries(year, ayanamsa)[limb]
+            # Each year keeps the boundaries inside it; the margins overlap the neighbours
+            own = np.ones(len(year_starts), dtype=bool)
+            if year > first_year:
+                own &= year_starts >= swe.julday(year, 1, 1, 0.0)
+            if year < last_year:
+                own &= year_starts < swe.julday(year + 1, 1, 1, 0.0)
+            starts.append(year_starts[own])
+            values.append(year_values[own])
+
+        starts, values = np.concatenate(starts), np.concatenate(values)
+        ends = starts[1:]
+        starts, values = starts[:-1], values[:-1]
+        overlapping = (ends > start_jd) & (starts < end_jd)
+        return starts[overlapping], ends[overlapping], values[overlapping]
+
+    def year_table(self, year: int, latitude: float, longitude: float, ayanamsa: str = None) -> Dict[str, np.ndarray]:
+        """Vara, sunrise and each limb's 0-based index and end time for every day of the year"""
+        return self.tile_table(year, *self.tile(latitude, longitude), ayanamsa or settings.DEFAULT_AYANAMSA)
+
+    @lru_cache(maxsize=256)
+    def tile_table(self, year: int, tile_latitude: float, tile_longitude: float, ayanamsa: str) -> Dict[str, np.ndarray]:
+        """Year table shared by every place in a location tile"""
+        sunrises = self.sunrises(year, tile_latitude, tile_longitude)
+        boundaries = self.limb_boundaries(year, ayanamsa)
+
+        first = date(year, 1, 1).toordinal()
+        ordinals = np.arange(first, first + len(sunrises) - 1)
+        table = {
+            "ordinal": ordinals,
+            "vara": ordinals % 7,
+            "sunrise": sunrises[:-1],
+            "sunset": self.sunsets(year, tile_latitude, tile_longitude),
+            "next_sunrise": sunrises[1:]
+        }
+        for limb in ["tithi", "nakshatra", "yoga", "karana"]:
+            starts, values = boundaries[limb]
+            k = np.searchsorted(starts, table["sunrise"], side="right") - 1
+            table[limb] = values[k]
+            table[f"{limb}_end"] = starts[k + 1]
+        return table
+
+    def for_date(self, target_date: date, latitude: float, longitude: float, ayanamsa: str = None) -> Dict:
+        """Panchang at sunrise on a date, with limb end times as naive UTC datetimes"""
+        table = self.year_table(target_date.year, latitude, longitude, ayanamsa)
+        return self._describe(table, target_date.toordinal() - int(table["ordinal"][0]))
+
+    def for_year(self, year: int, latitude: float, longitude: float, ayanamsa: str = None) -> List[Dict]:
+        """Panchang at sunrise for every day of a year"""
+        table = self.year_table(year, latitude, longitude, ayanamsa)
+        return [self._describe(table, i) for i in range(len(table["ordinal"]))]
+
+    def tithi_at_sunrise(self, target_date: date, latitude: Optional[float] = None,
+                         longitude: Optional[float] = None) -> int:
+        """Tithi number (1-30) at sunrise; the default location stands in when none is given"""
+        if latitude is None or longitude is None:
+            latitude, longitude = settings.PANCHANG_DEFAULT_LATITUDE, settings.PANCHANG_DEFAULT_LONGITUDE
+        table = self.year_table(target_date.year, latitude, longitude)
+        return int(table["tithi"][target_date.toordinal() - int(table["ordinal"][0])]) + 1
+
+    def _describe(self, table: Dict[str, np.ndarray], i: int) -> Dict:
+        tithi = int(table["tithi"][i])
+        nakshatra = int(table["nakshatra"][i])
+        yoga = int(table["yoga"][i])
+        karana = int(table["karana"][i])
+        vara_name, vara_lord = VARAS[int(table["vara"][i])]
+        return {
+            "date": date.fromordinal(int(table["ordinal"][i])).isoformat(),
+            "sunrise": self._datetime(table["sunrise"][i]),
+            "sunset": self._datetime(table["sunset"][i]),
+            "next_sunrise": self._datetime(table["next_sunrise"][i]),
+            "vara": {"name": vara_name, "lord": vara_lord},
+            "tithi": {
+                "number": tithi + 1,
+                "name": tithi_name(tithi),
+                "paksha": "Shukla" if tithi < 15 else "Krishna",
+                "ends": self._datetime(table["tithi_end"][i])
+            },
+            "nakshatra": {"number": nakshatra + 1, "name": NAKSHATRAS[nakshatra],
+                          "ends": self._datetime(table["nakshatra_end"][i])},
+            "yoga": {"number": yoga + 1, "name": YOGAS[yoga], "ends": self._datetime(table["yoga_end"][i])},
+            "karana": {"number": karana + 1, "name": karana_name(karana),
+                       "ends": self._datetime(table["karana_end"][i])}
+        }
+
+    def _datetime(self, jd: float) -> datetime:
+        return ephemeris.get_datetime(float(jd)).replace(microsecond=0)
+
+    def _sun_moon(self, jds: np.ndarray, ayanamsa: str):
+        with ephemeris.sidereal_mode(ayanamsa):
+            series = ephemeris.get_planet_series(jds, ["SUN", "MOON"])
+        return (series["SUN"]["longitude"], series["MOON"]["longitude"],
+                series["SUN"]["speed"], series["MOON"]["speed"])
+
+
+panchang_calculator = PanchangCalculator()
@@ -0,0 +1,132 @@
+"""
+Lagna Table
+Times at which the sidereal ascendant enters each sign (or nakshatra). An ecliptic
+point rises when the local sidereal time reaches its oblique ascension less 90°,
+which places every boundary of a day in closed form from a single house
+evaluation; Newton steps on the ascendant then absorb nutation and ayanamsa drift.
+"""
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from app.core.config import settings
+from app.modules.ephemeris.calculator import ephemeris
+from app.modules.panchang.calculator import panchang_calculator
+
+DIVISIONS = {"sign": 30.0, "nakshatra": 360.0 / 27.0}
+NEWTON_STEPS = 2
+
+
+class LagnaCalculator:
+    """Ascendant boundary tables per day and location tile, with a yearly batch mode"""
+
+    def boundaries(self, day_starts: np.ndarray, latitude: float, longitude: float,
+                   ayanamsa: str, division: str = "sign") -> Tuple[np.ndarray, np.ndarray]:
+        """Boundary Julian Days within [start, start + 1) of each day, and the 0-based division entered"""
+        span = DIVISIONS[division]
+        day_starts = np.asarray(day_starts, dtype=np.float64)
+        flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+        with ephemeris.sidereal_mode(ayanamsa):
+            armc, armc_rate, ayanamsas, obliquity = (np.empty(len(day_starts)) for _ in range(4))
+            for i, jd in enumerate(day_starts):
+                _, ascmc, _, ascmc_speed = swe.houses_ex2(jd, latitude, longitude, b'E', flag)
+                armc[i], armc_rate[i] = ascmc[2], ascmc_speed[2]
+                ayanamsas[i] = swe.get_ayanamsa_ex_ut(jd, 0)[1]
+                obliquity[i] = swe.calc_ut(jd, swe.ECL_NUT)[0][0]
+
+            # Sidereal time at which each boundary point rises (days x divisions)
+            targets = np.arange(round(360.0 / span)) * span
+            lam = np.radians(targets[None, :] + ayanamsas[:, None])
+            eps = np.radians(obliquity)[:, None]
+            ra = np.degrees(np.arctan2(np.sin(lam) * np.cos(eps), np.cos(lam)))
+            dec = np.arcsin(np.sin(eps) * np.sin(lam))
+            ascensional = np.degrees(np.arcsin(np.clip(np.tan(np.radians(latitude)) * np.tan(dec), -1.0, 1.0)))
+            rising_armc = ra - ascensional - 90.0
+
+            # A sidereal day is ~4 minutes short, so a boundary can rise twice in a day
+            first = day_starts[:, None] + ((rising_armc - armc[:, None]) % 360.0) / armc_rate[:, None]
+            second = first + 360.0 / armc_rate[:, None]
+            day_ends = (day_starts + 1.0)[:, None]
+            index = np.broadcast_to(np.arange(len(targets)), first.shape)
+            again = second < day_ends
+            times = np.concatenate([first.ravel(), second[again]])
+            entered = np.concatenate([index.ravel(), index[again]])
+            owner = np.concatenate([np.repeat(np.arange(len(day_starts)), len(targets)),
+                                    np.nonzero(again)[0]])
+
+            for _ in range(NEWTON_STEPS):
+                ascendant, speed = np.empty(len(times)), np.empty(len(times))
+                for i, jd in enumerate(times):
+                    _, ascmc, _, ascmc_speed = swe.houses_ex2(jd, latitude, longitude, b'E', flag)
+                    ascendant[i], speed[i] = ascmc[0], ascmc_speed[0]
+                times = times - ((ascendant - targets[entered] + 180.0) % 360.0 - 180.0) / speed
+
+        # Refinement can move a boundary just across midnight; keep each day's own
+        inside = (times >= day_starts[owner]) & (times < day_starts[owner] + 1.0)
+        order = np.argsort(times[inside], kind="stable")
+        return times[inside][order], entered[inside][order]
+
+    def day_start(self, target_date: date, longitude: float) -> float:
+        """Julian Day of local mean midnight"""
+        return swe.julday(target_date.year, target_date.month, target_date.day, 0.0) - longitude / 360.0
+
+    def day(self, target_date: date, latitude: float, longitude: float, ayanamsa: str = None,
+            division: str = "sign") -> Dict[str, np.ndarray]:
+        """Segment starts and 1-based divisions for a local mean day (first segment opens the day)"""
+        tile = panchang_calculator.tile(latitude, longitude, settings.LAGNA_TILE_DEGREES)
+        return self.tile_day(target_date.toordinal(), *tile, ayanamsa or settings.DEFAULT_AYANAMSA, division)
+
+    @lru_cache(maxsize=4096)
+    def tile_day(self, ordinal: int, tile_latitude: float, tile_longitude: float,
+                 ayanamsa: str, division: str) -> Dict[str, np.ndarray]:
+        start = self.day_start(date.fromordinal(ordinal), tile_longitude)
+        times, entered = self.boundaries(np.array([start]), tile_latitude, tile_longitude, ayanamsa, division)
+        return self._table(np.array([start]), times, entered, tile_latitude, tile_longitude, ayanamsa, division)
+
+    def year(self, year: int, latitude: float, longitude: float, ayanamsa: str = None,
+             division: str = "sign") -> Dict[str, np.ndarray]:
+        """Segments for every day of a year, solved in one batch"""
+        tile = panchang_calculator.tile(latitude, longitude, settings.LAGNA_TILE_DEGREES)
+        return self.tile_year(year, *tile, ayanamsa or settings.DEFAULT_AYANAMSA, division)
+
+    @lru_cache(maxsize=64)
+    def tile_year(self, year: int, tile_latitude: float, tile_longitude: float,
+                  ayanamsa: str, division: str) -> Dict[str, np.ndarray]:
+        first = date(year, 1, 1).toordinal()
+        ordinals = range(first, date(year + 1, 1, 1).toordinal())
+        starts = np.array([self.day_start(date.fromordinal(o), tile_longitude) for o in ordinals])
+        times, entered = self.boundaries(starts, tile_latitude, tile_longitude, ayanamsa, division)
+        return self._table(starts, times, entered, tile_latitude, tile_longitude, ayanamsa, division)
+
+    def segments(self, start_jd: float, end_jd: float, latitude: float, longitude: float,
+                 ayanamsa: str = None, division: str = "sign") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(starts, ends, 1-based divisions) covering [start_jd, end_jd), from cached days"""
+        first = date(*swe.revjul(start_jd + longitude / 360.0)[:3]).toordinal()
+        last = date(*swe.revjul(end_jd + longitude / 360.0)[:3]).toordinal()
+        days = [self.day(date.fromordinal(o), latitude, longitude, ayanamsa, division) for o in range(first, last + 1)]
+
+        starts = np.concatenate([d["starts"] for d in days])
+        values = np.concatenate([d["values"] for d in days])
+        # Day openings continue the previous day's last segment
+        changes = np.concatenate([[True], values[1:] != values[:-1]])
+        starts, values = starts[changes], values[changes]
+        ends = np.append(starts[1:], days[-1]["end"])
+        overlapping = (ends > start_jd) & (starts < end_jd)
+        return starts[overlapping], ends[overlapping], values[overlapping]
+
+    def _table(self, day_starts: np.ndarray, times: np.ndarray, entered: np.ndarray,
+               latitude: float, longitude: float, ayanamsa: str, division: str) -> Dict[str, np.ndarray]:
+        """Boundaries plus a segment opening each day, valued by the division in force"""
+        with ephemeris.sidereal_mode(ayanamsa):
+            opening = ephemeris.get_ascendant_series(day_starts, latitude, longitude)
+        starts = np.concatenate([day_starts, times])
+        values = np.concatenate([(opening // DIVISIONS[division]).astype(np.int64), entered])
+        order = np.argsort(starts, kind="stable")
+        return {"starts": starts[order], "values": values[order] + 1, "end": float(day_starts[-1] + 1.0)}
+
+
+lagna_calculator = LagnaCalculator()
@@ -0,0 +1,317 @@
+"""
+Transit Events
+Global (user-independent) transit events: sign ingresses, stations,
+nakshatra changes, combustion windows and eclipses.
+Events are solved by sampling plus bisection, and can be precomputed
+into a memory-mapped table sorted by (type, planet, jd) for O(log n) queries.
+"""
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import swisseph as swe
+
+from app.core.config import settings
+from app.modules.ephemeris.calculator import ephemeris, COMBUSTION_DEGREES, NAKSHATRAS, PLANETS
+
+EVENT_TYPES = [
+    "INGRESS", "NAKSHATRA", "STATION_RETRO", "STATION_DIRECT",
+    "COMBUSTION_START", "COMBUSTION_END", "SOLAR_ECLIPSE", "LUNAR_ECLIPSE"
+]
+EVENT_PLANETS = ["SUN", "MOON", "MERCURY", "VENUS", "MARS", "JUPITER", "SATURN", "RAHU", "KETU"]
+
+EVENT_DTYPE = np.dtype([("type", "u1"), ("planet", "u1"), ("jd", "f8"), ("value", "f8")])
+
+# Sampling step (days) per planet; small enough that no two boundaries are crossed in one step
+SAMPLE_STEP_DAYS = {"MOON": 0.25, "JUPITER": 5.0, "SATURN": 10.0, "RAHU": 10.0, "KETU": 10.0}
+DEFAULT_SAMPLE_STEP_DAYS = 1.0
+
+# Planets that have stations (nodes use the mean node, which is always retrograde)
+STATION_PLANETS = ["MERCURY", "VENUS", "MARS", "JUPITER", "SATURN"]
+
+# Bisection tolerance in days (~0.1 second)
+TIME_TOLERANCE_DAYS = 1e-6
+
+NAKSHATRA_SPAN = 360.0 / 27.0
+
+ECLIPSE_KINDS = [
+    (swe.ECL_ANNULAR_TOTAL, "hybrid"),
+    (swe.ECL_TOTAL, "total"),
+    (swe.ECL_ANNULAR, "annular"),
+    (swe.ECL_PARTIAL, "partial"),
+    (swe.ECL_PENUMBRAL, "penumbral")
+]
+
+
+def _signed_diff(a, b):
+    """Signed shortest angular difference a - b in (-180, 180]"""
+    return (np.asarray(a) - b + 180.0) % 360.0 - 180.0
+
+
+class TransitEventSolver:
+    """Solve transit events directly from the ephemeris"""
+
+    def solve(self, start_jd: float, end_jd: float,
+              event_types: List[str] = None, planets: List[str] = None) -> np.ndarray:
+        """Find events in [start_jd, end_jd) sorted by jd"""
+        event_types = set(event_types or EVENT_TYPES)
+        planets = planets or EVENT_PLANETS
+        found = []
+        ephemeris.prepare_thread()
+
+        sun_longitudes = {}
+        for planet in planets:
+            step = SAMPLE_STEP_DAYS.get(planet, DEFAULT_SAMPLE_STEP_DAYS)
+            jds = np.append(np.arange(start_jd, end_jd, step), end_jd)
+            series = ephemeris.get_planet_series(jds, [planet])[planet]
+            lons, speeds = series["longitude"], series["speed"]
+
+            if "INGRESS" in event_types:
+                found += self._boundary_events(planet, jds, lons, 30.0, "INGRESS")
+            if "NAKSHATRA" in event_types:
+                found += self._boundary_events(planet, jds, lons, NAKSHATRA_SPAN, "NAKSHATRA")
+            if planet in STATION_PLANETS and event_types & {"STATION_RETRO", "STATION_DIRECT"}:
+                found += self._station_events(planet, jds, speeds, event_types)
+            if planet in COMBUSTION_DEGREES and event_types & {"COMBUSTION_START", "COMBUSTION_END"}:
+                if step not in sun_longitudes:
+                    sun_longitudes[step] = ephemeris.get_planet_series(jds, ["SUN"])["SUN"]["longitude"]
+                found += self._combustion_events(planet, jds, lons, sun_longitudes[step], event_types)
+
+        if "SOLAR_ECLIPSE" in event_types and "SUN" in planets:
+            found += self._eclipse_events(start_jd, end_jd, "SOLAR_ECLIPSE")
+        if "LUNAR_ECLIPSE" in event_types and "MOON" in planets:
+            found += self._eclipse_events(start_jd, end_jd, "LUNAR_ECLIPSE")
+
+        events = np.array(found, dtype=EVENT_DTYPE)
+        return events[np.argsort(events["jd"], kind="stable")]
+
+    def build(self, start_year: int, end_year: int) -> np.ndarray:
+        """Solve all events for whole years, one year at a time"""
+        chunks = []
+        for year in range(start_year, end_year + 1):
+            start_jd = swe.julday(year, 1, 1, 0.0)
+            end_jd = swe.julday(year + 1, 1, 1, 0.0)
+            chunks.append(self.solve(start_jd, end_jd))
+        return np.concatenate(chunks) if chunks else np.array([], dtype=EVENT_DTYPE)
+
+    def _longitude(self, planet: str, jd: float) -> float:
+        if planet == "KETU":
+            return (swe.calc_ut(jd, PLANETS["RAHU"], swe.FLG_SIDEREAL)[0][0] + 180.0) % 360.0
+        return swe.calc_ut(jd, PLANETS[planet], swe.FLG_SIDEREAL)[0][0]
+
+    def _bisect(self, func, a: float, b: float) -> float:
+        """Find the sign change of func in [a, b]"""
+        fa = func(a)
+        while b - a > TIME_TOLERANCE_DAYS:
+            mid = (a + b) / 2
+            fm = func(mid)
+            if (fm < 0) == (fa < 0):
+                a, fa = mid, fm
+            else:
+                b = mid
+        return (a + b) / 2
+
+    def _boundary_events(self, planet: str, jds: np.ndarray, lons: np.ndarray,
+                         span: float, event_type: str) -> list:
+        """Events where the longitude crosses a multiple of span"""
+        index = (lons // span).astype(int)
+        changes = np.nonzero(index[1:] != index[:-1])[0]
+        events = []
+
+        for i in changes:
+            moving_forward = _signed_diff(lons[i + 1], lons[i]) > 0
+            boundary = ((index[i] + 1) * span if moving_forward else index[i] * span) % 360.0
+            jd = self._bisect(
+                lambda t: _signed_diff(self._longitude(planet, t), boundary),
+                jds[i], jds[i + 1]
+            )
+            # Value is the 1-based sign or nakshatra entered
+            entered = int(index[i + 1]) + 1
+            events.append((EVENT_TYPES.index(event_type), EVENT_PLANETS.index(planet), jd, entered))
+
+        return events
+
+    def _station_events(self, planet: str, jds: np.ndarray, speeds: np.ndarray, event_types: set) -> list:
+        """Events where the speed changes sign"""
+        retro = speeds < 0
+        changes = np.nonzero(retro[1:] != retro[:-1])[0]
+        planet_id = PLANETS[planet]
+        flag = swe.FLG_SIDEREAL | swe.FLG_SPEED
+        events = []
+
+        for i in changes:
+            event_type = "STATION_RETRO" if retro[i + 1] else "STATION_DIRECT"
+            if event_type not in event_types:
+                continue
+            jd = self._bisect(lambda t: swe.calc_ut(t, planet_id, flag)[0][3], jds[i], jds[i + 1])
+            events.append((
+                EVENT_TYPES.index(event_type), EVENT_PLANETS.index(planet), jd,
+                self._longitude(planet, jd)
+            ))
+
+        return events
+
+    def _combustion_events(self, planet: str, jds: np.ndarray, lons: np.ndarray,
+                           sun_lons: np.ndarray, event_types: set) -> list:
+        """Events where the distance from the Sun crosses the combustion orb"""
+        orb = COMBUSTION_DEGREES[planet]
+        combust = np.abs(_signed_diff(lons, sun_lons)) <= orb
+        changes = np.nonzero(combust[1:] != combust[:-1])[0]
+        events = []
+
+        def distance_from_orb(t):
+            return abs(_signed_diff(self._longitude(planet, t), self._longitude("SUN", t))) - orb
+
+        for i in changes:
+            event_type = "COMBUSTION_START" if combust[i + 1] else "COMBUSTION_END"
+            if event_type not in event_types:
+                continue
+            jd = self._bisect(distance_from_orb, jds[i], jds[i + 1])
+            events.append((EVENT_TYPES.index(event_type), EVENT_PLANETS.index(planet), jd, orb))
+
+        return events
+
+    def _eclipse_events(self, start_jd: float, end_jd: float, event_type: str) -> list:
+        """Eclipse maxima in the range; value holds the Swiss Ephemeris eclipse flags"""
+        events = []
+        jd = start_jd
+        planet = "SUN" if event_type == "SOLAR_ECLIPSE" else "MOON"
+
+        while True:
+            if event_type == "SOLAR_ECLIPSE":
+                flags, times = swe.sol_eclipse_when_glob(jd, swe.FLG_SWIEPH, 0)
+            else:
+                flags, times = swe.lun_eclipse_when(jd, swe.FLG_SWIEPH, 0)
+            if times[0] >= end_jd:
+                break
+            events.append((EVENT_TYPES.index(event_type), EVENT_PLANETS.index(planet), times[0], flags))
+            jd = times[0] + 1
+
+        return events
+
+
+class TransitEventTable:
+    """Precomputed events sorted by (type, planet, jd) with group offsets"""
+
+    EVENTS_FILE = "events.npy"
+    OFFSETS_FILE = "offsets.npy"
+    META_FILE = "meta.json"
+
+    def __init__(self, events: np.ndarray, offsets: np.ndarray, meta: Dict):
+        self.events = events
+        self.offsets = offsets
+        self.meta = meta
+
+    @classmethod
+    def from_events(cls, events: np.ndarray, start_jd: float, end_jd: float) -> "TransitEventTable":
+        """Sort events into groups and compute offsets"""
+        events = events[np.lexsort((events["jd"], events["planet"], events["type"]))]
+        group = events["type"].astype(int) * len(EVENT_PLANETS) + events["planet"]
+        offsets = np.searchsorted(group, np.arange(len(EVENT_TYPES) * len(EVENT_PLANETS) + 1))
+        meta = {
+            "start_jd": start_jd,
+            "end_jd": end_jd,
+            "ayanamsa": ephemeris.ayanamsa,
+            "count": int(len(events))
+        }
+        return cls(events, offsets, meta)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["TransitEventTable"]:
+        """Memory-map a saved table, or None if absent"""
+        events_path = os.path.join(path, cls.EVENTS_FILE)
+        if not os.path.exists(events_path):
+            return None
+        events = np.load(events_path, mmap_mode="r")
+        offsets = np.load(os.path.join(path, cls.OFFSETS_FILE))
+        with open(os.path.join(path, cls.META_FILE)) as f:
+            meta = json.load(f)
+        return cls(events, offsets, meta)
+
+    def save(self, path: str):
+        """Write the table to a directory"""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, self.EVENTS_FILE), self.events)
+        np.save(os.path.join(path, self.OFFSETS_FILE), self.offsets)
+        with open(os.path.join(path, self.META_FILE), "w") as f:
+            json.dump(self.meta, f)
+
+    def covers(self, start_jd: float, end_jd: float) -> bool:
+        return self.meta["start_jd"] <= start_jd and end_jd <= self.meta["end_jd"]
+
+    def query(self, event_type: str, planet: str, start_jd: float, end_jd: float) -> np.ndarray:
+        """Events of one type and planet in [start_jd, end_jd)"""
+        group = EVENT_TYPES.index(event_type) * len(EVENT_PLANETS) + EVENT_PLANETS.index(planet)
+        lo, hi = int(self.offsets[group]), int(self.offsets[group + 1])
+        jds = self.events["jd"][lo:hi]
+        first = lo + int(np.searchsorted(jds, start_jd, side="left"))
+        last = lo + int(np.searchsorted(jds, end_jd, side="left"))
+        return self.events[first:last]
+
+
+class TransitEventIndex:
+    """Answer event queries from the precomputed table, solving directly outside its coverage"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.solver = TransitEventSolver()
+        self._table = None
+        self._loaded = False
+
+    @property
+    def table(self) -> Optional[TransitEventTable]:
+        if not self._loaded:
+            self._table = TransitEventTable.load(self.path)
+            self._loaded = True
+        return self._table
+
+    def find(self, start_jd: float, end_jd: float,
+             event_types: List[str] = None, planets: List[str] = None) -> np.ndarray:
+        """Events in [start_jd, end_jd) sorted by jd"""
+        event_types = event_types or EVENT_TYPES
+        planets = planets or EVENT_PLANETS
+
+        table = self.table
+        if table is None or not table.covers(start_jd, end_jd):
+            return self.solver.solve(start_jd, end_jd, event_types, planets)
+
+        parts = [
+            table.query(event_type, planet, start_jd, end_jd)
+            for event_type in event_types
+            for planet in planets
+        ]
+        events = np.concatenate(parts) if parts else np.array([], dtype=EVENT_DTYPE)
+        return events[np.argsort(events["jd"], kind="stable")]
+
+    def to_dicts(self, events: np.ndarray) -> List[Dict]:
+        """Format events for API responses"""
+        return [self.describe(event) for event in events]
+
+    def describe(self, event) -> Dict:
+        event_type = EVENT_TYPES[int(event["type"])]
+        value = float(event["value"])
+        result = {
+            "type": event_type,
+            "planet": EVENT_PLANETS[int(event["planet"])],
+            "datetime": ephemeris.get_datetime(float(event["jd"])).isoformat(),
+            "jd": float(event["jd"])
+        }
+
+        if event_type == "INGRESS":
+            result["rasi"] = int(value)
+        elif event_type == "NAKSHATRA":
+            result["nakshatra"] = NAKSHATRAS[int(value) - 1]
+        elif event_type.startswith("STATION"):
+            result["longitude"] = value
+        elif event_type.startswith("COMBUSTION"):
+            result["orb"] = value
+        else:
+            result["kind"] = next(
+                (name for flag, name in ECLIPSE_KINDS if int(value) & flag), "partial"
+            )
+
+        return result
+
+
+transit_events = TransitEventIndex(settings.TRANSIT_EVENTS_PATH)
@@ -0,0 +1,164 @@
+"""
+Lifetime Event-Timing Heatmap
+Month-by-month activation scores for life areas over a lifetime. Each month
+combines the running Vimshottari Maha/Antar lords (looked up in a sorted antar
+boundary index) with Jupiter and Saturn transits over the natal houses of the
+area, weighted by the planet's own Bhinnashtakavarga and the Sarvashtakavarga
+of the transited sign. Transits are computed in one batched ephemeris call and
+every month is scored with array lookups, so a 100-year chart costs a few ms.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.modules.ashtakavarga.calculator import ashtakavarga_calculator
+from app.modules.dasha.calculator import VimshottariDasha, VIMSHOTTARI_SEQUENCE
+from app.modules.ephemeris.calculator import ephemeris, EVENT_SIGNIFICATIONS, RASI_LORDS
+
+LIFE_AREAS = ["career", "marriage", "health", "childbirth", "education", "property", "relocation"]
+TRANSIT_PLANETS = ["JUPITER", "SATURN"]
+
+# Special (graha drishti) aspects in houses counted from the planet, besides the 7th
+ASPECTS = {"JUPITER": [5, 7, 9], "SATURN": [3, 7, 10]}
+OCCUPY_WEIGHT, ASPECT_WEIGHT = 1.0, 0.5
+
+# Share of each component in the 0-100 score; the Maha lord counts more than the Antar lord
+WEIGHTS = {"dasha": 0.5, "JUPITER": 0.3, "SATURN": 0.2}
+MAHA_SHARE = 0.6
+
+# Bindus at which a transit is neither helped nor hindered
+NEUTRAL_BAV, NEUTRAL_SAV = 4.0, 28.0
+
+UNIX_EPOCH_JD = 2440587.5
+
+
+def house_matrix(areas: Sequence[str]) -> np.ndarray:
+    """(13, areas) 0/1 table: row h is 1 where house h belongs to the area (row 0 unused)"""
+    table = np.zeros((13, len(areas)))
+    for column, area in enumerate(areas):
+        table[EVENT_SIGNIFICATIONS[area]["houses"], column] = 1.0
+    return table
+
+
+class LifetimeHeatmap:
+    """Build the (months x areas) activation matrix and its strongest windows"""
+
+    def month_starts(self, birth_datetime: datetime, years: int) -> np.ndarray:
+        """First day of every month from the birth month on, as datetime64[D]"""
+        first = np.datetime64(birth_datetime, "M")
+        return (first + np.arange(years * 12)).astype("datetime64[D]")
+
+    def dasha_index(self, birth_datetime: datetime, moon_longitude: float, years: int) -> Dict[str, np.ndarray]:
+        """Antar periods as a sorted start array with parallel Maha/Antar lord codes"""
+        calculator = VimshottariDasha(birth_datetime, moon_longitude)
+        starts, mahas, antars = [], [], []
+        for maha in calculator.calculate_maha_dashas(years + 1):
+            for antar in calculator.calculate_antar_dashas(maha):
+                starts.append(antar["start_date"])
+                mahas.append(VIMSHOTTARI_SEQUENCE.index(maha["lord"]))
+                antars.append(VIMSHOTTARI_SEQUENCE.index(antar["lord"]))
+        return {
+            "starts": np.array(starts, dtype="datetime64[s]"),
+            "maha": np.array(mahas, dtype=np.int8),
+            "antar": np.array(antars, dtype=np.int8)
+        }
+
+    def lord_matrix(self, ascendant_rasi: int, rasis: Dict[str, int], areas: Sequence[str]) -> np.ndarray:
+        """(9, areas) how strongly each dasha lord signifies each area: occupying and owning its houses"""
+        houses = house_matrix(areas)
+        matrix = np.zeros((len(VIMSHOTTARI_SEQUENCE), len(areas)))
+        for row, lord in enumerate(VIMSHOTTARI_SEQUENCE):
+            occupied = (rasis[lord] - ascendant_rasi) % 12 + 1
+            owned = [h for h in range(1, 13) if RASI_LORDS[(ascendant_rasi - 1 + h - 1) % 12] == lord]
+            matrix[row] = houses[occupied] + houses[owned].sum(axis=0)
+        return np.minimum(matrix / 2.0, 1.0)
+
+    def touch_matrix(self, planet: str, areas: Sequence[str]) -> np.ndarray:
+        """(13, areas) influence of a planet transiting house h on each area, by occupation or aspect"""
+        houses = house_matrix(areas)
+        touch = np.zeros_like(houses)
+        for h in range(1, 13):
+            aspected = [(h - 1 + k - 1) % 12 + 1 for k in ASPECTS[planet]]
+            touch[h] = np.maximum(houses[h] * OCCUPY_WEIGHT, houses[aspected].max(axis=0) * ASPECT_WEIGHT)
+        return touch
+
+    def calculate(self, birth_datetime: datetime, ascendant_rasi: int, rasis: Dict[str, int],
+                  moon_longitude: float, ayanamsa: str, years: int = 100,
+                  areas: Sequence[str] = LIFE_AREAS) -> Dict:
+        """
+        Scores (0-100) per area and month, with the lords and transit houses behind them.
+        birth_datetime is the local birth time that dashas are reckoned from.
+        """
+        areas = list(areas)
+        months = self.month_starts(birth_datetime, years)
+        middles = months + np.timedelta64(14, "D")
+
+        # Dasha lords running mid-month
+        index = self.dasha_index(birth_datetime, moon_longitude, years)
+        rows = np.clip(np.searchsorted(index["starts"], middles.astype("datetime64[s]"), side="right") - 1, 0, None)
+        maha, antar = index["maha"][rows], index["antar"][rows]
+        lords = self.lord_matrix(ascendant_rasi, rasis, areas)
+        dasha = MAHA_SHARE * lords[maha] + (1.0 - MAHA_SHARE) * lords[antar]
+
+        # Jupiter and Saturn for every month in one batched call
+        jds = middles.astype(np.int64) + UNIX_EPOCH_JD
+        with ephemeris.sidereal_mode(ayanamsa):
+            series = ephemeris.get_planet_series(jds, TRANSIT_PLANETS)
+
+        ashtakavarga = ashtakavarga_calculator.calculate_all({p: {"rasi": r} for p, r in rasis.items()})
+        sav = np.array(ashtakavarga["sav"], dtype=np.float64)
+        score = WEIGHTS["dasha"] * dasha
+        transit_houses = {}
+        for planet in TRANSIT_PLANETS:
+            rasi = (series[planet]["longitude"] // 30.0).astype(np.int64)  # 0-11
+            house = (rasi + 1 - ascendant_rasi) % 12 + 1
+            bav = np.array(ashtakavarga["bav"][planet], dtype=np.float64)
+            support = (bav[rasi] / NEUTRAL_BAV + sav[rasi] / NEUTRAL_SAV) / 2.0
+            score += WEIGHTS[planet] * self.touch_matrix(planet, areas)[house] * support[:, None]
+            transit_houses[planet] = house
+
+        scores = np.clip(np.rint(score * 100.0), 0, 100).astype(np.uint8)
+        return {
+            "months": months,
+            "areas": areas,
+            "scores": scores,
+            "maha": maha,
+            "antar": antar,
+            "transit_houses": transit_houses
+        }
+
+    def top_windows(self, heatmap: Dict, limit: int = 5, threshold: Optional[float] = None,
+                    start: Optional[datetime] = None) -> Dict[str, List[Dict]]:
+        """
+        Strongest runs of consecutive months per area, ranked by peak then mean score.
+        Without a threshold, a run is any stretch in the area's top decile.
+        """
+        months = heatmap["months"]
+        keep = months >= np.datetime64(start, "D") if start is not None else np.ones(len(months), dtype=bool)
+
+        windows = {}
+        for column, area in enumerate(heatmap["areas"]):
+            scores = heatmap["scores"][:, column].astype(np.float64)
+            cutoff = threshold if threshold is not None else np.percentile(scores[keep], 90) if keep.any() else 101
+            above = np.concatenate([[False], (scores >= cutoff) & keep, [False]])
+            edges = np.flatnonzero(np.diff(above.astype(np.int8)))
+            runs = []
+            for first, stop in zip(edges[::2], edges[1::2]):
+                peak = first + int(np.argmax(scores[first:stop]))
+                runs.append({
+                    "start": str(months[first].astype("datetime64[M]")),
+                    "end": str(months[stop - 1].astype("datetime64[M]")),
+                    "peak": int(scores[peak]),
+                    "mean": round(float(scores[first:stop].mean()), 1),
+                    "peak_month": str(months[peak].astype("datetime64[M]")),
+                    "maha": VIMSHOTTARI_SEQUENCE[heatmap["maha"][peak]],
+                    "antar": VIMSHOTTARI_SEQUENCE[heatmap["antar"][peak]],
+                    "transits": {p: int(h[peak]) for p, h in heatmap["transit_houses"].items()}
+                })
+            runs.sort(key=lambda r: (-r["peak"], -r["mean"], r["start"]))
+            windows[area] = runs[:limit]
+        return windows
+
+
+lifetime_heatmap = LifetimeHeatmap()
@@ -0,0 +1,185 @@
+"""
+Natal Longitude Index
+Reverse transit lookup: which natal charts a transiting planet touches. For each
+ayanamsa and natal body the longitudes of every stored chart are kept as one sorted
+array (with parallel chart ids), so an orb window is one or two binary searches
+(two when it wraps past 0°) plus the k matches. New charts are merged in as they
+appear; the index is only rebuilt from scratch when charts have been deleted.
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.modules.ephemeris.calculator import ephemeris
+from app.modules.transits.events import EVENT_PLANETS, SAMPLE_STEP_DAYS, DEFAULT_SAMPLE_STEP_DAYS, _signed_diff
+
+NATAL_BODIES = ["ASCENDANT"] + EVENT_PLANETS
+
+Partition = Tuple[np.ndarray, np.ndarray]
+
+
+class NatalLongitudeIndex:
+    """Sorted natal longitudes per (ayanamsa, body) across all stored charts"""
+
+    def __init__(self):
+        self._partitions: Dict[Tuple[str, str], Partition] = {}
+        self.max_chart_id = 0
+        self.chart_count = 0
+        self._lock = threading.Lock()
+
+    def refresh(self, db: Session) -> int:
+        """Merge charts created since the last refresh, or rebuild if any were deleted"""
+        from app.models.chart import NatalChart
+
+        with self._lock:
+            total, newest = db.query(func.count(NatalChart.id), func.max(NatalChart.id)).one()
+            fresh = db.query(func.count(NatalChart.id)).filter(NatalChart.id > self.max_chart_id).scalar()
+            if total != self.chart_count + fresh:
+                self._partitions, self.max_chart_id, self.chart_count = {}, 0, 0
+                fresh = total
+            if not fresh:
+                return 0
+
+            for key, (longitudes, chart_ids) in self._load(db, self.max_chart_id).items():
+                self._partitions[key] = self._merge(self._partitions.get(key), longitudes, chart_ids)
+            self.max_chart_id = newest or 0
+            self.chart_count = total
+            return fresh
+
+    def _load(self, db: Session, after_id: int) -> Dict[Tuple[str, str], Partition]:
+        """Natal longitudes of charts with id > after_id, grouped by (ayanamsa, body)"""
+        from app.models.chart import NatalChart, PlanetaryPosition
+        from app.models.profile import Profile
+
+        # A chart hash covers one ayanamsa, so any profile sharing it gives the chart's ayanamsa
+        charts = {}
+        for chart_id, ascendant, ayanamsa in db.query(
+            NatalChart.id, NatalChart.ascendant, Profile.ayanamsa
+        ).outerjoin(Profile, Profile.chart_hash == NatalChart.chart_hash).filter(NatalChart.id > after_id):
+            if chart_id not in charts:
+                charts[chart_id] = (ascendant, ayanamsa or settings.DEFAULT_AYANAMSA)
+
+        rows = {}
+        for chart_id, (ascendant, ayanamsa) in charts.items():
+            if ascendant is not None:
+                rows.setdefault((ayanamsa, "ASCENDANT"), []).append((ascendant, chart_id))
+        for chart_id, planet, longitude in db.query(
+            PlanetaryPosition.natal_chart_id, PlanetaryPosition.planet, PlanetaryPosition.longitude
+        ).filter(PlanetaryPosition.natal_chart_id > after_id):
+            if chart_id in charts and planet in NATAL_BODIES:
+                rows.setdefault((charts[chart_id][1], planet), []).append((longitude, chart_id))
+
+        return {
+            key: (np.array([r[0] for r in values], dtype=np.float64) % 360.0,
+                  np.array([r[1] for r in values], dtype=np.int64))
+            for key, values in rows.items()
+        }
+
+    def _merge(self, partition: Optional[Partition], longitudes: np.ndarray, chart_ids: np.ndarray) -> Partition:
+        """Insert new entries into a sorted partition in one linear pass"""
+        order = np.argsort(longitudes, kind="stable")
+        longitudes, chart_ids = longitudes[order], chart_ids[order]
+        if partition is None:
+            return longitudes, chart_ids
+        positions = np.searchsorted(partition[0], longitudes, side="right")
+        return np.insert(partition[0], positions, longitudes), np.insert(partition[1], positions, chart_ids)
+
+    def ayanamsas(self, body: str) -> List[str]:
+        return sorted(ayanamsa for ayanamsa, b in self._partitions if b == body)
+
+    def lookup(self, ayanamsa: str, body: str, low: float, high: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Entries with natal longitude in the arc [low, high] (degrees, may wrap past 0°)"""
+        partition = self._partitions.get((ayanamsa, body))
+        if partition is None:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        longitudes = partition[0]
+        width = high - low
+        if width >= 360.0:
+            return np.arange(len(longitudes)), longitudes
+
+        low = low % 360.0
+        high = low + max(width, 0.0)
+        ranges = [(low, min(high, 360.0))]
+        if high > 360.0:
+            ranges.append((0.0, high - 360.0))
+        rows = np.concatenate([
+            np.arange(np.searchsorted(longitudes, lo, side="left"), np.searchsorted(longitudes, hi, side="right"))
+            for lo, hi in ranges
+        ])
+        return rows, longitudes[rows]
+
+    def sweep(self, planet: str, natal_body: str, start_jd: float, end_jd: float,
+              orb: float = 1.0, angle: float = 0.0, chart_ids: Optional[Iterable[int]] = None) -> List[Dict]:
+        """
+        Charts whose natal body the transiting planet (offset by angle, e.g. 180 for an
+        opposition) comes within orb of during [start_jd, end_jd). Each step queries
+        only the arc the planet covers in it, widened by the orb. When chart_ids is
+        given, entries of other charts are dropped as soon as they are looked up.
+        """
+        allowed = None if chart_ids is None else np.unique(np.fromiter(chart_ids, dtype=np.int64))
+        if allowed is not None and not len(allowed):
+            return []
+
+        step = SAMPLE_STEP_DAYS.get(planet, DEFAULT_SAMPLE_STEP_DAYS)
+        jds = np.append(np.arange(start_jd, end_jd, step), end_jd)
+        hits = []
+        for ayanamsa in self.ayanamsas(natal_body):
+            partition_ids = self._partitions[(ayanamsa, natal_body)][1]
+            if allowed is not None and not np.isin(allowed, partition_ids).any():
+                continue
+            with ephemeris.sidereal_mode(ayanamsa):
+                transit = (ephemeris.get_planet_series(jds, [planet])[planet]["longitude"] - angle) % 360.0
+            moves = _signed_diff(transit[1:], transit[:-1])
+
+            steps, rows, natal = [], [], []
+            for i, move in enumerate(moves.tolist()):
+                low = transit[i] + min(move, 0.0) - orb
+                found, longitudes = self.lookup(ayanamsa, natal_body, low, low + abs(move) + 2 * orb)
+                if allowed is not None:
+                    mine = np.isin(partition_ids[found], allowed)
+                    found, longitudes = found[mine], longitudes[mine]
+                steps.append(np.full(len(found), i))
+                rows.append(found)
+                natal.append(longitudes)
+            if not steps:
+                continue
+            steps, rows, natal = np.concatenate(steps), np.concatenate(rows), np.concatenate(natal)
+            if not len(steps):
+                continue
+
+            # Separation is taken as linear across a step
+            before = _signed_diff(transit[steps], natal)
+            after = before + moves[steps]
+            change = after - before
+            moving = change != 0.0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                enter = np.where(moving, np.minimum((-orb - before) / change, (orb - before) / change), 0.0)
+                leave = np.where(moving, np.maximum((-orb - before) / change, (orb - before) / change), 1.0)
+                exact = np.where(moving, -before / change, np.nan)
+            enter, leave = np.clip(enter, 0.0, 1.0), np.clip(leave, 0.0, 1.0)
+            inside = (enter < leave) | (~moving & (np.abs(before) <= orb))
+            crossing = inside & (exact >= 0.0) & (exact < 1.0)
+            closest = np.where(crossing, 0.0, np.minimum(np.abs(before), np.abs(after)))
+
+            span = jds[steps + 1] - jds[steps]
+            row_charts = partition_ids[rows]
+            for chart_id in np.unique(row_charts[inside]).tolist():
+                mine = inside & (row_charts == chart_id)
+                hits.append({
+                    "chart_id": chart_id,
+                    "ayanamsa": ayanamsa,
+                    "natal_longitude": float(natal[mine][0]),
+                    "start_jd": float(np.min(jds[steps[mine]] + enter[mine] * span[mine])),
+                    "end_jd": float(np.max(jds[steps[mine]] + leave[mine] * span[mine])),
+                    "exact_jds": sorted((jds[steps[mine & crossing]] + exact[mine & crossing] * span[mine & crossing]).tolist()),
+                    "closest_orb": round(float(np.min(np.abs(closest[mine]))), 4)
+                })
+
+        return sorted(hits, key=lambda h: (h["start_jd"], h["chart_id"]))
+
+
+natal_longitude_index = NatalLongitudeIndex()
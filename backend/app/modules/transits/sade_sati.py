@@ -0,0 +1,94 @@
+"""
+Saturn Transit Timeline
+Lifetime Sade Sati, Dhaiya and Kantaka periods from Saturn sign ingresses
+"""
+from typing import Dict, List, Optional, Tuple
+
+from app.modules.ephemeris.calculator import ephemeris
+from app.modules.transits.events import transit_events
+
+# Saturn's sign counted from the natal Moon sign (0 = over the Moon)
+SADE_SATI_PHASES = {11: "rising", 0: "peak", 1: "setting"}
+DHAIYA_KANTAKA_TYPES = {3: "dhaiya", 7: "kantaka"}
+
+# Retrograde excursions out of a period shorter than this do not end it
+MERGE_GAP_DAYS = 365
+
+
+class SaturnTransitTimeline:
+    """Build Saturn-from-Moon periods for a time span"""
+
+    def get_sign_stays(self, start_jd: float, end_jd: float) -> List[Tuple[float, float, int]]:
+        """Saturn sign stays (start_jd, end_jd, rasi) covering the span"""
+        ingresses = transit_events.find(start_jd, end_jd, ["INGRESS"], ["SATURN"])
+        rasi = ephemeris.get_rasi(ephemeris.get_planet_position(start_jd, "SATURN")["longitude"])
+
+        stays = []
+        stay_start = start_jd
+        for event in ingresses:
+            stays.append((stay_start, float(event["jd"]), rasi))
+            stay_start = float(event["jd"])
+            rasi = int(event["value"])
+        stays.append((stay_start, end_jd, rasi))
+
+        return stays
+
+    def calculate(self, natal_moon_rasi: int, start_jd: float, end_jd: float) -> Dict:
+        """Get Sade Sati cycles and Dhaiya/Kantaka periods between two Julian Days"""
+        stays = self.get_sign_stays(start_jd, end_jd)
+
+        sade_sati_stays = []
+        dhaiya_kantaka_stays = {kind: [] for kind in DHAIYA_KANTAKA_TYPES.values()}
+        for stay_start, stay_end, rasi in stays:
+            diff = (rasi - natal_moon_rasi) % 12
+            if diff in SADE_SATI_PHASES:
+                sade_sati_stays.append((stay_start, stay_end, SADE_SATI_PHASES[diff]))
+            elif diff in DHAIYA_KANTAKA_TYPES:
+                dhaiya_kantaka_stays[DHAIYA_KANTAKA_TYPES[diff]].append((stay_start, stay_end, None))
+
+        sade_sati = []
+        for cycle in self._merge_stays(sade_sati_stays):
+            sade_sati.append({
+                "start": self._format_jd(cycle[0][0], start_jd),
+                "end": self._format_jd(cycle[-1][1], end_jd),
+                "phases": [
+                    {
+                        "phase": phase,
+                        "start": self._format_jd(phase_start, start_jd),
+                        "end": self._format_jd(phase_end, end_jd)
+                    }
+                    for phase_start, phase_end, phase in cycle
+                ]
+            })
+
+        dhaiya_kantaka = []
+        for kind, kind_stays in dhaiya_kantaka_stays.items():
+            for period in self._merge_stays(kind_stays):
+                dhaiya_kantaka.append({
+                    "type": kind,
+                    "start": self._format_jd(period[0][0], start_jd),
+                    "end": self._format_jd(period[-1][1], end_jd),
+                    "entries": len(period)
+                })
+        dhaiya_kantaka.sort(key=lambda p: p["start"] or "")
+
+        return {"sade_sati": sade_sati, "dhaiya_kantaka": dhaiya_kantaka}
+
+    def _merge_stays(self, stays: List[Tuple[float, float, str]]) -> List[List[Tuple[float, float, str]]]:
+        """Group stays separated by short retrograde excursions"""
+        groups = []
+        for stay in stays:
+            if groups and stay[0] - groups[-1][-1][1] < MERGE_GAP_DAYS:
+                groups[-1].append(stay)
+            else:
+                groups.append([stay])
+        return groups
+
+    def _format_jd(self, jd: float, span_edge: float) -> Optional[str]:
+        """ISO datetime, or None when the period extends past the span edge"""
+        if jd == span_edge:
+            return None
+        return ephemeris.get_datetime(jd).isoformat()
+
+
+saturn_timeline = SaturnTransitTimeline()
@@ -0,0 +1,176 @@
+"""
+Transit Snapshot Cache
+Shared, user-independent planetary positions keyed by quantized time and ayanamsa
+"""
+import copy
+import json
+import math
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.modules.ephemeris.calculator import ephemeris
+
+# Planets whose longitude is interpolated between bucket boundaries
+INTERPOLATED_PLANETS = ("MOON",)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class _Flight:
+    """In-progress computation shared by concurrent callers of one key"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class TransitSnapshotCache:
+    """
+    Process-level LRU of transit snapshots with an optional Redis tier.
+    Snapshots are computed at bucket boundaries (time quantized to step_minutes);
+    requests inside a bucket reuse them, interpolating fast planets.
+    Concurrent misses on one key trigger a single computation.
+    """
+
+    def __init__(self, step_minutes: int = 60, max_entries: int = 4096, redis_client=None):
+        self.step_minutes = step_minutes
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self._entries: "OrderedDict[Tuple[str, int], Dict]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, int], _Flight] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "redis_hits": 0, "computations": 0}
+
+    def get_positions(self, dt: datetime, ayanamsa: str = None) -> Dict[str, Dict]:
+        """Get transit positions for a moment (naive datetimes are treated as UTC)"""
+        ayanamsa = ayanamsa or settings.DEFAULT_AYANAMSA
+        bucket, fraction = self.quantize(dt)
+
+        positions = copy.deepcopy(self._get_snapshot(ayanamsa, bucket))
+        if fraction == 0:
+            return positions
+
+        following = self._get_snapshot(ayanamsa, bucket + 1)
+        for planet in INTERPOLATED_PLANETS:
+            if planet not in positions:
+                continue
+            start_lon = positions[planet]["longitude"]
+            delta = (following[planet]["longitude"] - start_lon + 180.0) % 360.0 - 180.0
+            positions[planet]["longitude"] = (start_lon + fraction * delta) % 360.0
+        return positions
+
+    def quantize(self, dt: datetime) -> Tuple[int, float]:
+        """Split a moment into (bucket index, fraction of the bucket elapsed)"""
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        step_seconds = self.step_minutes * 60
+        elapsed = (dt - _EPOCH).total_seconds()
+        bucket = math.floor(elapsed / step_seconds)
+        return bucket, (elapsed - bucket * step_seconds) / step_seconds
+
+    def bucket_start(self, bucket: int) -> datetime:
+        """UTC datetime at which a bucket begins"""
+        return _EPOCH + timedelta(minutes=bucket * self.step_minutes)
+
+    def clear(self):
+        """Drop all process-level entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def _get_snapshot(self, ayanamsa: str, bucket: int) -> Dict[str, Dict]:
+        key = (ayanamsa, bucket)
+
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return snapshot
+
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            snapshot = self._redis_get(key)
+            if snapshot is None:
+                snapshot = self._compute_snapshot(ayanamsa, bucket)
+                self._redis_set(key, snapshot)
+            flight.result = snapshot
+            with self._lock:
+                self._entries[key] = snapshot
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return snapshot
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def _compute_snapshot(self, ayanamsa: str, bucket: int) -> Dict[str, Dict]:
+        """Compute positions at a bucket boundary"""
+        self.stats["computations"] += 1
+        jd = ephemeris.get_julian_day(self.bucket_start(bucket))
+        with ephemeris.sidereal_mode(ayanamsa):
+            return ephemeris.get_all_planets(jd)
+
+    def _redis_key(self, key: Tuple[str, int]) -> str:
+        return f"astroos:transit:{key[0]}:{self.step_minutes}:{key[1]}"
+
+    def _redis_get(self, key: Tuple[str, int]) -> Optional[Dict]:
+        if self.redis is None:
+            return None
+        try:
+            raw = self.redis.get(self._redis_key(key))
+        except Exception:
+            # Redis is an optional tier; fall back to computing locally
+            return None
+        if raw is None:
+            return None
+        self.stats["redis_hits"] += 1
+        return json.loads(raw)
+
+    def _redis_set(self, key: Tuple[str, int], snapshot: Dict):
+        if self.redis is None:
+            return
+        try:
+            self.redis.setex(
+                self._redis_key(key),
+                settings.TRANSIT_CACHE_REDIS_TTL_SECONDS,
+                json.dumps(snapshot)
+            )
+        except Exception:
+            pass
+
+
+def _create_redis_client():
+    """Create the optional Redis client when enabled in settings"""
+    if not settings.TRANSIT_CACHE_REDIS_ENABLED:
+        return None
+    try:
+        import redis
+    except ImportError:
+        return None
+    return redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5)
+
+
+transit_cache = TransitSnapshotCache(
+    step_minutes=settings.TRANSIT_CACHE_STEP_MINUTES,
+    max_entries=settings.TRANSIT_CACHE_MAX_ENTRIES,
+    redis_client=_create_redis_client()
+)
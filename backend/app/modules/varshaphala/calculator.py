@@ -2,6 +2,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List
 from app.modules.ephemeris.calculator import ephemeris
 from app.modules.dasha.calculator import VimshottariDasha
+import numpy as np
+
+SIDEREAL_YEAR_DAYS = 365.256363
+SOLAR_RETURN_TOLERANCE = 1e-7  # degrees (~0.2 seconds of time)
+MAX_NEWTON_ITERATIONS = 8
 
 class VarshaphalaCalculator:
     """Calculate Varshaphala (Annual Solar Return)"""
@@ -14,56 +19,63 @@ class VarshaphalaCalculator:
     
     def calculate_varsha_pravesh(self, birth_date: datetime, birth_sun_lon: float, year: int) -> datetime:
         """Calculate Varsha Pravesh (Solar Return) time for a given year"""
-        # Start from birthday in target year
-        target_date = birth_date.replace(year=year)
-        jd = ephemeris.get_julian_day(target_date)
+        return self.calculate_varsha_pravesh_batch(birth_date, birth_sun_lon, [year])[0]
+    
+    def calculate_varsha_pravesh_batch(self, birth_date: datetime, birth_sun_lon: float,
+                                       years: List[int]) -> List[datetime]:
+        """Calculate Varsha Pravesh times for many years with a vectorized Newton solve"""
+        birth_jd = ephemeris.get_julian_day(birth_date)
+        jds = birth_jd + (np.asarray(years, dtype=float) - birth_date.year) * SIDEREAL_YEAR_DAYS
         
-        # Find exact moment when Sun returns to birth longitude
-        for hours_offset in range(-48, 49):  # Check 2 days before/after
-            test_jd = jd + (hours_offset / 24.0)
-            sun_pos = ephemeris.get_planet_position(test_jd, "SUN")
-            
-            # Check if Sun is within 1 degree
-            diff = abs(sun_pos["longitude"] - birth_sun_lon)
-            if diff > 180:
-                diff = 360 - diff
-            
-            if diff < 1.0:
-                # Refine to minutes
-                for minutes_offset in range(-60, 61):
-                    refined_jd = test_jd + (minutes_offset / 1440.0)
-                    sun_pos = ephemeris.get_planet_position(refined_jd, "SUN")
-                    diff = abs(sun_pos["longitude"] - birth_sun_lon)
-                    if diff > 180:
-                        diff = 360 - diff
-                    if diff < 0.1:
-                        # Convert JD back to datetime
-                        return target_date + timedelta(hours=hours_offset, minutes=minutes_offset)
+        for _ in range(MAX_NEWTON_ITERATIONS):
+            sun = ephemeris.get_planet_series(jds, ["SUN"])["SUN"]
+            delta = (birth_sun_lon - sun["longitude"] + 180.0) % 360.0 - 180.0
+            jds = jds + delta / sun["speed"]
+            if np.max(np.abs(delta)) < SOLAR_RETURN_TOLERANCE:
+                break
         
-        return target_date
+        return [ephemeris.get_datetime(jd) for jd in jds]
     
     def calculate_annual_chart(self, varsha_pravesh_time: datetime, lat: float, lon: float) -> Dict:
         """Calculate annual chart for Varsha Pravesh"""
-        jd = ephemeris.get_julian_day(varsha_pravesh_time)
-        ayanamsa = ephemeris.get_ayanamsa(jd)
-        
-        # Get houses
-        ascendant, house_cusps = ephemeris.get_houses(jd, lat, lon)
-        asc_sidereal = (ascendant - ayanamsa) % 360.0
+        return self.calculate_annual_charts([varsha_pravesh_time], lat, lon)[0]
+    
+    def calculate_annual_charts(self, varsha_pravesh_times: List[datetime], lat: float, lon: float) -> List[Dict]:
+        """Calculate annual charts for many Varsha Pravesh times with one batched ephemeris call"""
+        jds = np.array([ephemeris.get_julian_day(t) for t in varsha_pravesh_times])
+        series = ephemeris.get_planet_series(jds)
         
-        # Get planets and add rasi/nakshatra
-        planets = ephemeris.get_all_planets(jd)
-        for planet, pos in planets.items():
-            lon = pos["longitude"]
-            pos["rasi"] = ephemeris.get_rasi(lon)
-            pos["nakshatra"], pos["pada"] = ephemeris.get_nakshatra(lon)
+        charts = []
+        for i, jd in enumerate(jds):
+            jd = float(jd)
+            ayanamsa = ephemeris.get_ayanamsa(jd)
+            
+            # Get houses
+            ascendant, house_cusps = ephemeris.get_houses(jd, lat, lon)
+            asc_sidereal = (ascendant - ayanamsa) % 360.0
+            
+            # Get planets and add rasi/nakshatra
+            planets = {}
+            for planet, data in series.items():
+                planet_lon = float(data["longitude"][i])
+                speed = float(data["speed"][i])
+                pos = {
+                    "longitude": planet_lon,
+                    "speed": speed,
+                    "is_retrograde": speed < 0 if planet not in ["RAHU", "KETU"] else False,
+                    "rasi": ephemeris.get_rasi(planet_lon)
+                }
+                pos["nakshatra"], pos["pada"] = ephemeris.get_nakshatra(planet_lon)
+                planets[planet] = pos
+            
+            charts.append({
+                "julian_day": jd,
+                "ascendant": asc_sidereal,
+                "house_cusps": [(cusp - ayanamsa) % 360.0 for cusp in house_cusps],
+                "planets": planets
+            })
         
-        return {
-            "julian_day": jd,
-            "ascendant": asc_sidereal,
-            "house_cusps": [(cusp - ayanamsa) % 360.0 for cusp in house_cusps],
-            "planets": planets
-        }
+        return charts
     
     def detect_tajika_yogas(self, planets: Dict[str, Dict]) -> List[Dict]:
         """Detect Tajika yogas in annual chart"""
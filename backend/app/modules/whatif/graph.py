@@ -0,0 +1,288 @@
+"""
+What-If Graph
+Incremental recomputation for the chart editor. The pipeline is a fixed graph of
+nodes (ephemeris → positions → vargas → yogas, strength, ashtakavarga → dashas →
+remedies, Align27); each node fingerprints only the fields its calculator reads and
+is recomputed only when that fingerprint changes, so a small nudge stops
+propagating as soon as an intermediate result comes out the same.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.modules.align27.calculator import align27_calculator
+from app.modules.ashtakavarga.calculator import ashtakavarga_calculator
+from app.modules.charts.ayanamsa import ayanamsa_variants
+from app.modules.charts.calculator import DivisionalChartCalculator
+from app.modules.dasha.calculator import VIMSHOTTARI_PERIODS, VIMSHOTTARI_SEQUENCE
+from app.modules.ephemeris.calculator import ephemeris
+from app.modules.remedies.calculator import remedies_calculator
+from app.modules.strength.calculator import strength_calculator
+from app.modules.transits.snapshot_cache import transit_cache
+from app.modules.yoga.detector import yoga_detector
+
+# Nodes in evaluation order, with the nodes each one reads
+NODES = OrderedDict([
+    ("ephemeris", []),
+    ("positions", ["ephemeris"]),
+    ("vargas", ["positions"]),
+    ("yogas", ["positions"]),
+    ("strength", ["positions", "vargas"]),
+    ("ashtakavarga", ["positions"]),
+    ("dasha_tree", ["positions"]),
+    ("dashas", ["positions", "dasha_tree"]),
+    ("remedies", ["positions", "strength", "yogas"]),
+    ("transits", []),
+    ("align27", ["positions", "dashas", "transits"])
+])
+
+# Nodes whose values are results; the rest are intermediates
+RESULTS = ["positions", "vargas", "yogas", "strength", "ashtakavarga", "dashas", "remedies", "align27"]
+
+SHADBALA_PLANETS = ["SUN", "MOON", "MARS", "MERCURY", "JUPITER", "VENUS", "SATURN"]
+VARGABALA_DIVISIONS = [1, 2, 3, 9, 12, 30]
+NAKSHATRA_SPAN = 360.0 / 27.0
+DASHA_YEARS = 120
+
+State = Dict[str, Dict[str, Any]]
+
+
+def fingerprint(key: Any) -> str:
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[Dict]:
+    """Leaf-level changes between two JSON-like values, as dotted paths"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key in list(old) + [k for k in new if k not in old]:
+            child = f"{path}.{key}" if path else str(key)
+            if key not in new:
+                changes.append({"path": child, "from": old[key], "to": None})
+            elif key not in old:
+                changes.append({"path": child, "from": None, "to": new[key]})
+            else:
+                changes.extend(diff(old[key], new[key], child))
+        return changes
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        return [c for i, (a, b) in enumerate(zip(old, new)) for c in diff(a, b, f"{path}[{i}]")]
+    return [] if old == new else [{"path": path, "from": old, "to": new}]
+
+
+class WhatIfGraph:
+    """Evaluate the chart pipeline, reusing every node whose inputs are unchanged"""
+
+    def __init__(self):
+        self.div_calculator = DivisionalChartCalculator()
+
+    def evaluate(self, params: Dict, previous: Optional[State] = None) -> Tuple[State, List[str]]:
+        """
+        New state for birth params (instant, birth_datetime, latitude, longitude,
+        ayanamsa, date), plus the names of the nodes that had to be recomputed.
+        birth_datetime is the local birth time, from which dashas are timed.
+        """
+        state, recomputed = {}, []
+        for name, deps in NODES.items():
+            inputs = {dep: state[dep]["value"] for dep in deps}
+            key = fingerprint(getattr(self, f"_key_{name}")(inputs, params))
+            if previous and name in previous and previous[name]["key"] == key:
+                state[name] = previous[name]
+                continue
+            state[name] = {"key": key, "value": getattr(self, f"_compute_{name}")(inputs, params)}
+            recomputed.append(name)
+        return state, recomputed
+
+    def changes(self, previous: State, state: State) -> Dict[str, List[Dict]]:
+        """Per-result diff of values between two evaluations"""
+        changes = {}
+        for name in RESULTS:
+            if previous[name]["key"] != state[name]["key"]:
+                node_changes = diff(previous[name]["value"], state[name]["value"])
+                if node_changes:
+                    changes[name] = node_changes
+        return changes
+
+    # Ephemeris: the ayanamsa-independent pass, only birth instant and place matter
+    def _key_ephemeris(self, inputs: Dict, params: Dict):
+        return [params["instant"].isoformat(), params["latitude"], params["longitude"]]
+
+    def _compute_ephemeris(self, inputs: Dict, params: Dict):
+        return ayanamsa_variants.tropical_pass(params["instant"], params["latitude"], params["longitude"])
+
+    def _key_positions(self, inputs: Dict, params: Dict):
+        return [inputs["ephemeris"], params["ayanamsa"]]
+
+    def _compute_positions(self, inputs: Dict, params: Dict):
+        chart = ayanamsa_variants.derive(inputs["ephemeris"], params["ayanamsa"])
+        chart.pop("divisional_charts")
+        chart["ascendant_rasi"] = int(chart["ascendant"] / 30.0) + 1
+        return chart
+
+    def _key_vargas(self, inputs: Dict, params: Dict):
+        positions = inputs["positions"]
+        return [positions["ascendant"], {p: pos["longitude"] for p, pos in positions["planets"].items()}]
+
+    def _compute_vargas(self, inputs: Dict, params: Dict):
+        positions = inputs["positions"]
+        names = ["ASCENDANT"] + list(positions["planets"])
+        longitudes = [positions["ascendant"]] + [pos["longitude"] for pos in positions["planets"].values()]
+        return {
+            division: dict(zip(names, self.div_calculator.calculate_divisional_array(longitudes, division).tolist()))
+            for division in self.div_calculator.DIVISIONS
+        }
+
+    # Yoga rules read only rasis, dignities and the ascendant's rasi
+    def _key_yogas(self, inputs: Dict, params: Dict):
+        positions = inputs["positions"]
+        return [positions["ascendant_rasi"],
+                {p: [pos["rasi"], pos["dignity"]] for p, pos in positions["planets"].items()}]
+
+    def _compute_yogas(self, inputs: Dict, params: Dict):
+        positions = inputs["positions"]
+        return yoga_detector.detect_yogas(positions["planets"], positions["ascendant"])
+
+    def _key_strength(self, inputs: Dict, params: Dict):
+        positions = inputs["positions"]
+        planets = positions["planets"]
+        return [
+            positions["julian_day"],
+            {p: pos["rasi"] for p, pos in planets.items()},
+            {p: [planets[p]["longitude"], planets[p]["dignity"], planets[p]["is_retrograde"]]
+             for p in SHADBALA_PLANETS if p in planets},
+            {d: inputs["vargas"][d] for d in VARGABALA_DIVISIONS}
+        ]
+
+    def _compute_strength(self, inputs: Dict, params: Dict):
+        positions = inputs["positions"]
+        return {
+            "shadbala": strength_calculator.calculate_shadbala(positions["planets"], positions["julian_day"]),
+            "vargabala": strength_calculator.calculate_vargabala(
+                {d: inputs["vargas"][d] for d in VARGABALA_DIVISIONS}
+            )
+        }
+
+    def _key_ashtakavarga(self, inputs: Dict, params: Dict):
+        return {p: pos["rasi"] for p, pos in inputs["positions"]["planets"].items()}
+
+    def _compute_ashtakavarga(self, inputs: Dict, params: Dict):
+        return ashtakavarga_calculator.calculate_all(inputs["positions"]["planets"])
+
+    # The Vimshottari lord sequence depends only on the Moon's nakshatra; the exact
+    # Moon longitude and birth instant merely retime it
+    def _key_dasha_tree(self, inputs: Dict, params: Dict):
+        return int(inputs["positions"]["planets"]["MOON"]["longitude"] // NAKSHATRA_SPAN)
+
+    def _compute_dasha_tree(self, inputs: Dict, params: Dict):
+        nakshatra = int(inputs["positions"]["planets"]["MOON"]["longitude"] // NAKSHATRA_SPAN)
+        # Two cycles, enough for any balance of the first dasha
+        lords = [VIMSHOTTARI_SEQUENCE[(nakshatra + i) % 9] for i in range(18)]
+        return [
+            {"lord": lord, "antars": [VIMSHOTTARI_SEQUENCE[(VIMSHOTTARI_SEQUENCE.index(lord) + j) % 9]
+                                      for j in range(9)]}
+            for lord in lords
+        ]
+
+    def _key_dashas(self, inputs: Dict, params: Dict):
+        return [params["birth_datetime"].isoformat(), inputs["positions"]["planets"]["MOON"]["longitude"]]
+
+    def _compute_dashas(self, inputs: Dict, params: Dict):
+        """Maha and antar dates, stepped exactly as VimshottariDasha does"""
+        tree = inputs["dasha_tree"]
+        moon = inputs["positions"]["planets"]["MOON"]["longitude"]
+        balance = 1 - (moon % NAKSHATRA_SPAN) / NAKSHATRA_SPAN
+        total = sum(VIMSHOTTARI_PERIODS.values())
+
+        mahas, current, elapsed = [], params["birth_datetime"], 0.0
+        for i, node in enumerate(tree):
+            if i and elapsed >= DASHA_YEARS:
+                break
+            years = VIMSHOTTARI_PERIODS[node["lord"]] * (balance if i == 0 else 1)
+            end = current + timedelta(days=years * 365.25)
+
+            antars, antar_start = [], current
+            for lord in node["antars"]:
+                antar_end = antar_start + timedelta(days=years * VIMSHOTTARI_PERIODS[lord] / total * 365.25)
+                antars.append({"lord": lord, "start_date": antar_start.isoformat(), "end_date": antar_end.isoformat()})
+                antar_start = antar_end
+
+            mahas.append({"lord": node["lord"], "start_date": current.isoformat(), "end_date": end.isoformat(),
+                          "years": years, "antars": antars})
+            current, elapsed = end, elapsed + years
+        return mahas
+
+    # Remedies follow only which planets are weak or afflicted
+    def _key_remedies(self, inputs: Dict, params: Dict):
+        planets = inputs["positions"]["planets"]
+        return [
+            remedies_calculator.get_weak_planets(inputs["strength"]["shadbala"]),
+            remedies_calculator.get_afflicted_planets(planets, inputs["yogas"])
+        ]
+
+    def _compute_remedies(self, inputs: Dict, params: Dict):
+        return remedies_calculator.generate_all_remedies(
+            inputs["positions"]["planets"], inputs["strength"]["shadbala"], inputs["yogas"]
+        )
+
+    def _key_transits(self, inputs: Dict, params: Dict):
+        return [params["date"].isoformat(), params["ayanamsa"]]
+
+    def _compute_transits(self, inputs: Dict, params: Dict):
+        planets = transit_cache.get_positions(datetime.combine(params["date"], datetime.min.time()), params["ayanamsa"])
+        for pos in planets.values():
+            pos["rasi"] = ephemeris.get_rasi(pos["longitude"])
+        return planets
+
+    def _key_align27(self, inputs: Dict, params: Dict):
+        positions = inputs["positions"]
+        return [params["date"].isoformat(), positions["planets"]["MOON"]["rasi"], positions["ascendant_rasi"],
+                self.running_maha(inputs["dashas"], params["date"]), inputs["transits"]]
+
+    def _compute_align27(self, inputs: Dict, params: Dict):
+        positions = inputs["positions"]
+        return align27_calculator.calculate_day_score(
+            params["date"], positions["planets"]["MOON"]["rasi"], positions["ascendant_rasi"],
+            inputs["transits"], self.running_maha(inputs["dashas"], params["date"])
+        )
+
+    def running_maha(self, dashas: List[Dict], target_date: date) -> Optional[Dict]:
+        """Maha dasha in force on a date, shaped like the Align27 dasha overlay"""
+        moment = datetime.combine(target_date, datetime.min.time()).isoformat()
+        for maha in dashas:
+            if maha["start_date"] <= moment <= maha["end_date"]:
+                return {"lord": maha["lord"], "start_date": maha["start_date"], "end_date": maha["end_date"]}
+        return None
+
+
+class WhatIfSessions:
+    """Last evaluated state per editor session, least recently used evicted first"""
+
+    def __init__(self, max_sessions: int = None):
+        self.max_sessions = max_sessions or settings.WHATIF_MAX_SESSIONS
+        self._states: "OrderedDict[Tuple, State]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[State]:
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                self._states.move_to_end(key)
+            return state
+
+    def put(self, key: Tuple, state: State):
+        with self._lock:
+            self._states[key] = state
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_sessions:
+                self._states.popitem(last=False)
+
+    def discard(self, key: Tuple) -> bool:
+        with self._lock:
+            return self._states.pop(key, None) is not None
+
+
+whatif_graph = WhatIfGraph()
+whatif_sessions = WhatIfSessions()
@@ -1,6 +1,8 @@
 from celery import Celery
 import os
 
+from app.core.config import settings
+
 celery_app = Celery(
     "jyotish",
     broker=os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0"),
@@ -15,5 +17,14 @@ celery_app.conf.update(
     enable_utc=True,
 )
 
+# Notifications are only planned and sent once a delivery sink is configured
+if settings.NOTIFICATION_SINK:
+    celery_app.conf.beat_schedule = {
+        "notifications-tick": {
+            "task": "notifications.tick",
+            "schedule": float(settings.NOTIFICATION_TICK_SECONDS),
+        },
+    }
+
 # Discover tasks
-celery_app.autodiscover_tasks(["app"])
+celery_app.autodiscover_tasks(["app.workers"])
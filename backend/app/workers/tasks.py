@@ -0,0 +1,15 @@
+from app.workers.celery_app import celery_app
+
+
+@celery_app.task(name="imports.precompute_chunk", acks_late=True)
+def precompute_import_chunk(chunk_id: int):
+    """Precompute one bulk-import chunk; safe to retry, it resumes from the chunk cursor"""
+    from app.api.imports import precompute_chunk
+    precompute_chunk(chunk_id)
+
+
+@celery_app.task(name="notifications.tick")
+def notification_tick():
+    """Refill and drain the notification queue; scheduled by beat every NOTIFICATION_TICK_SECONDS"""
+    from app.api.notifications import run_notification_tick
+    return run_notification_tick()
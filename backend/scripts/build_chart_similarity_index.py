@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""Build (or top up) the chart similarity index from stored natal charts"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import time
+from pathlib import Path
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.modules.charts.similarity import ChartSimilarityIndex
+
+
+def build_chart_similarity_index(output: str, rebuild: bool = False):
+    index_file = Path(output) / "index.faiss"
+    if rebuild and index_file.exists():
+        index_file.unlink()
+
+    index = ChartSimilarityIndex(output)
+    db = SessionLocal()
+    try:
+        started = time.time()
+        added = index.sync(db, force=True)
+        print(f"✓ Indexed {added} charts ({index.index.ntotal} total, {time.time() - started:.0f}s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default=settings.CHART_SIMILARITY_INDEX_PATH)
+    parser.add_argument("--rebuild", action="store_true", help="Discard the existing index first")
+    args = parser.parse_args()
+
+    build_chart_similarity_index(args.output, args.rebuild)
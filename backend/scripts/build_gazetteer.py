@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Build the offline gazetteer from a GeoNames cities dump (e.g. cities15000.txt or .zip)"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import csv
+import io
+import zipfile
+from app.core.config import settings
+from app.modules.geo.gazetteer import Gazetteer
+
+# Columns of the GeoNames "geoname" table
+NAME, ASCII_NAME, LATITUDE, LONGITUDE, COUNTRY, ADMIN1, POPULATION, TIMEZONE = 1, 2, 4, 5, 8, 10, 14, 17
+
+
+def read_geonames(source: str):
+    if source.endswith(".zip"):
+        archive = zipfile.ZipFile(source)
+        member = next(name for name in archive.namelist() if name.endswith(".txt"))
+        handle = io.TextIOWrapper(archive.open(member), encoding="utf-8")
+    else:
+        handle = open(source, encoding="utf-8")
+
+    with handle:
+        for row in csv.reader(handle, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) <= TIMEZONE or not row[TIMEZONE]:
+                continue
+            yield {
+                "name": row[NAME],
+                "ascii_name": row[ASCII_NAME],
+                "country": row[COUNTRY],
+                "admin1": row[ADMIN1],
+                "latitude": float(row[LATITUDE]),
+                "longitude": float(row[LONGITUDE]),
+                "population": int(row[POPULATION] or 0),
+                "timezone": row[TIMEZONE]
+            }
+
+
+def build_gazetteer(source: str, output: str, min_population: int):
+    places = [place for place in read_geonames(source) if place["population"] >= min_population]
+    print(f"✓ Read {len(places)} places from {source}")
+
+    gazetteer = Gazetteer.from_places(places)
+    gazetteer.save(output)
+    print(f"✓ Saved {len(gazetteer.keys)} name keys and {len(gazetteer.nodes)} trie nodes to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("source", help="GeoNames citiesNNNN.txt or .zip")
+    parser.add_argument("--output", default=settings.GAZETTEER_PATH)
+    parser.add_argument("--min-population", type=int, default=0)
+    args = parser.parse_args()
+
+    build_gazetteer(args.source, args.output, args.min_population)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Build the precomputed transit events table"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import time
+import numpy as np
+import swisseph as swe
+from app.core.config import settings
+from app.modules.transits.events import TransitEventSolver, TransitEventTable
+
+
+def build_transit_events(start_year: int, end_year: int, output: str):
+    solver = TransitEventSolver()
+    chunks = []
+    started = time.time()
+
+    for year in range(start_year, end_year + 1):
+        chunks.append(solver.build(year, year))
+        if year % 10 == 0 or year == end_year:
+            count = sum(len(c) for c in chunks)
+            print(f"✓ {year}: {count} events ({time.time() - started:.0f}s)")
+
+    table = TransitEventTable.from_events(
+        np.concatenate(chunks),
+        swe.julday(start_year, 1, 1, 0.0),
+        swe.julday(end_year + 1, 1, 1, 0.0)
+    )
+    table.save(output)
+    print(f"✓ Saved {table.meta['count']} events to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--start-year", type=int, default=1900)
+    parser.add_argument("--end-year", type=int, default=2100)
+    parser.add_argument("--output", default=settings.TRANSIT_EVENTS_PATH)
+    args = parser.parse_args()
+
+    build_transit_events(args.start_year, args.end_year, args.output)
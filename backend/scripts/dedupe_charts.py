@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Re-key stored natal charts under the canonical hash and drop duplicates"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+from collections import defaultdict
+from app.core.database import SessionLocal
+from app.models import NatalChart, Profile
+from app.modules.charts.canonical import chart_canonicalizer
+from app.modules.ephemeris.calculator import ephemeris
+
+# Charts computed before 036 may predate timezone normalization or ignore the ayanamsa
+AYANAMSA_TOLERANCE = 0.01
+
+
+def is_current(chart: NatalChart, canonical: dict) -> bool:
+    """Whether a stored chart was computed for this canonical instant and ayanamsa"""
+    expected_jd = ephemeris.get_julian_day(canonical["instant"])
+    quantum_days = chart_canonicalizer.time_quantum.total_seconds() / 86400.0
+    if abs(chart.julian_day - expected_jd) > quantum_days:
+        return False
+
+    expected = ephemeris.get_ayanamsa_values(chart.julian_day, [canonical["ayanamsa"]])
+    return abs((chart.ayanamsa_value or 0.0) - expected[canonical["ayanamsa"]]) <= AYANAMSA_TOLERANCE
+
+
+def dedupe_charts(dry_run: bool = False):
+    db = SessionLocal()
+    try:
+        hashes = {}
+        for profile in db.query(Profile).all():
+            hashes[profile.id] = chart_canonicalizer.chart_hash(chart_canonicalizer.for_profile(profile))
+
+        groups = defaultdict(list)
+        stale = []
+        for chart in db.query(NatalChart).order_by(NatalChart.id).all():
+            owner = chart.profile
+            if owner is None or not is_current(chart, chart_canonicalizer.for_profile(owner)):
+                stale.append(chart)
+            else:
+                groups[hashes[owner.id]].append(chart)
+
+        duplicates = [chart for charts in groups.values() for chart in charts[1:]]
+        print(f"✓ {sum(len(c) for c in groups.values()) + len(stale)} charts, "
+              f"{len(groups)} canonical, {len(duplicates)} duplicate, {len(stale)} stale")
+
+        if dry_run:
+            return
+
+        # Delete first so re-keyed charts never collide on the unique hash
+        for chart in duplicates + stale:
+            db.delete(chart)
+        db.flush()
+
+        for chart_hash, charts in groups.items():
+            charts[0].chart_hash = chart_hash
+        for profile in db.query(Profile).all():
+            profile.chart_hash = hashes[profile.id]
+
+        db.commit()
+        print(f"✓ Removed {len(duplicates) + len(stale)} charts; stale charts recompute on next access")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dry-run", action="store_true", help="Report without changing anything")
+    args = parser.parse_args()
+
+    dedupe_charts(args.dry_run)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Run the notification scheduler without Celery, delivering to the local sink"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import time
+from app.core.config import settings
+from app.api.notifications import run_notification_tick
+from app.modules.notifications.scheduler import LocalNotificationSink
+
+
+def run_notification_worker(interval: int, once: bool = False):
+    sink = LocalNotificationSink()
+    while True:
+        delivered = len(sink.sent)
+        totals = run_notification_tick(sink)
+        for message in sink.sent[delivered:]:
+            print(f"  {message['due_at']}  {message['title']}")
+        print(f"✓ Refilled {totals['refilled']} profiles, sent {totals['sent']}, expired {totals['expired']}")
+        if once:
+            return
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--interval", type=int, default=settings.NOTIFICATION_TICK_SECONDS, help="Seconds between passes")
+    parser.add_argument("--once", action="store_true", help="Run a single pass")
+    args = parser.parse_args()
+
+    run_notification_worker(args.interval, args.once)
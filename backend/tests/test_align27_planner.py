@@ -187,5 +187,53 @@ class TestPlannerEdgeCases:
         assert planner[2]["date"] == "2024-03-01"
 
 
+class TestPlannerMatrix:
+    """Test multi-profile planner matrix"""
+
+    TRANSITS = {
+        "SUN": {"rasi": 9}, "MOON": {"rasi": 2}, "MARS": {"rasi": 11},
+        "MERCURY": {"rasi": 9}, "JUPITER": {"rasi": 3}, "VENUS": {"rasi": 10},
+        "SATURN": {"rasi": 12}, "RAHU": {"rasi": 11}, "KETU": {"rasi": 5}
+    }
+    PROFILES = [(5, 3, "SATURN"), (1, 1, None), (12, 7, "JUPITER"), (4, 10, "RAHU")]
+
+    def test_matrix_matches_single_planner(self):
+        """Test that every matrix cell equals the single-profile planner"""
+        start_date = date(2026, 1, 1)
+        matrix = align27_calculator.generate_planner_matrix(
+            start_date, 45,
+            [p[0] for p in self.PROFILES],
+            [p[1] for p in self.PROFILES],
+            self.TRANSITS,
+            [p[2] for p in self.PROFILES]
+        )
+        legend = matrix["color_legend"]
+
+        for row, (moon, asc, lord) in enumerate(self.PROFILES):
+            planner = align27_calculator.generate_planner(
+                start_date, 45, moon, asc, self.TRANSITS,
+                {"lord": lord} if lord else {}
+            )
+            for col, entry in enumerate(planner):
+                assert matrix["dates"][col] == entry["date"]
+                assert matrix["scores"][row][col] == entry["score"]
+                assert legend[matrix["colors"][row][col]] == entry["color"]
+                assert matrix["moment_counts"][row][col] == entry["moment_count"]
+                hora = matrix["horas"][matrix["best_hora"][row][col]]
+                assert hora["start"] == entry["best_moment"]["start"]
+                assert hora["end"] == entry["best_moment"]["end"]
+
+    def test_matrix_shape(self):
+        """Test that the matrix is profiles x days"""
+        matrix = align27_calculator.generate_planner_matrix(
+            date(2026, 1, 1), 90, [5] * 10, [3] * 10, self.TRANSITS, [None] * 10
+        )
+
+        assert len(matrix["dates"]) == 90
+        assert len(matrix["scores"]) == 10
+        assert all(len(row) == 90 for row in matrix["scores"])
+        assert all(len(row) == 90 for row in matrix["colors"])
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,57 @@
+from datetime import datetime
+import numpy as np
+import pytest
+from app.modules.charts.ayanamsa import ayanamsa_variants
+from app.modules.charts.calculator import DivisionalChartCalculator
+from app.modules.ephemeris.calculator import ephemeris, AYANAMSA_MAP
+
+
+@pytest.fixture(scope="module")
+def tropical():
+    return ayanamsa_variants.tropical_pass(datetime(1990, 1, 15, 5, 0), 28.6139, 77.2090)
+
+
+@pytest.mark.parametrize("ayanamsa", list(AYANAMSA_MAP))
+def test_derived_longitudes_match_sidereal_calculation(tropical, ayanamsa):
+    """Test that each derived variant equals a direct sidereal computation in that mode"""
+    chart = ayanamsa_variants.derive(tropical, ayanamsa)
+
+    with ephemeris.sidereal_mode(ayanamsa):
+        for planet, pos in chart["planets"].items():
+            expected = ephemeris.get_planet_position(tropical["julian_day"], planet)
+            assert pos["longitude"] == pytest.approx(expected["longitude"], abs=1e-9)
+            assert pos["rasi"] == ephemeris.get_rasi(expected["longitude"])
+            assert (pos["nakshatra"], pos["pada"]) == ephemeris.get_nakshatra(expected["longitude"])
+
+
+def test_variants_differ_by_ayanamsa_offset(tropical):
+    """Test that switching ayanamsa shifts every longitude by the same constant"""
+    lahiri = ayanamsa_variants.derive(tropical, "LAHIRI")
+    raman = ayanamsa_variants.derive(tropical, "RAMAN")
+    offset = raman["ayanamsa_value"] - lahiri["ayanamsa_value"]
+
+    for planet in lahiri["planets"]:
+        shift = (lahiri["planets"][planet]["longitude"] - raman["planets"][planet]["longitude"]) % 360.0
+        assert shift == pytest.approx(offset % 360.0, abs=1e-9)
+    assert (lahiri["ascendant"] - raman["ascendant"]) % 360.0 == pytest.approx(offset % 360.0, abs=1e-9)
+
+
+def test_divisional_array_matches_scalar():
+    """Test vectorized divisional positions against the scalar calculation"""
+    calc = DivisionalChartCalculator()
+    longitudes = np.random.default_rng(5).uniform(0, 360, 500)
+
+    for division in calc.DIVISIONS:
+        expected = [calc.calculate_divisional_position(lon, division) for lon in longitudes]
+        assert calc.calculate_divisional_array(longitudes, division).tolist() == expected
+
+
+def test_compare_reports_changed_factors(tropical):
+    """Test that differences list exactly the fields that vary across ayanamsas"""
+    result = ayanamsa_variants.compare(tropical)
+
+    assert set(result["ayanamsas"]) == set(AYANAMSA_MAP)
+    for planet, fields in result["differences"]["planets"].items():
+        for field in fields:
+            values = {chart["planets"][planet][field] for chart in result["ayanamsas"].values()}
+            assert len(values) > 1
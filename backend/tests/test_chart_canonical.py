@@ -0,0 +1,52 @@
+from datetime import datetime
+import pytest
+from app.modules.charts.canonical import ChartCanonicalizer
+
+
+@pytest.fixture
+def canon():
+    return ChartCanonicalizer(time_precision="second", coord_decimals=4)
+
+
+def test_equivalent_inputs_share_hash(canon):
+    """Test that float noise and an omitted seconds field do not change the hash"""
+    birth_date = datetime(1990, 1, 15)
+    a = canon.canonicalize(canon.local_datetime(birth_date, "10:30:00"), "Asia/Kolkata", 28.6139, 77.2090)
+    b = canon.canonicalize(canon.local_datetime(birth_date, "10:30"), "Asia/Kolkata", 28.61390001, 77.20899999)
+
+    assert canon.chart_hash(a) == canon.chart_hash(b)
+
+
+def test_instant_is_timezone_normalized(canon):
+    """Test that the same instant entered in different zones shares a hash"""
+    kolkata = canon.canonicalize(datetime(1990, 1, 15, 10, 30), "Asia/Kolkata", 28.6, 77.2)
+    utc = canon.canonicalize(datetime(1990, 1, 15, 5, 0), "UTC", 28.6, 77.2)
+
+    assert kolkata["instant"] == datetime(1990, 1, 15, 5, 0)
+    assert canon.chart_hash(kolkata) == canon.chart_hash(utc)
+
+
+def test_dst_and_unknown_zones():
+    """Test historical DST offsets and the UTC fallback for unknown zones"""
+    canon = ChartCanonicalizer()
+    assert canon.to_utc(datetime(1990, 7, 1, 12, 0), "Europe/London") == datetime(1990, 7, 1, 11, 0)
+    assert canon.to_utc(datetime(1990, 1, 1, 12, 0), "Europe/London") == datetime(1990, 1, 1, 12, 0)
+    assert canon.to_utc(datetime(1990, 1, 1, 12, 0), "Not/AZone") == datetime(1990, 1, 1, 12, 0)
+
+
+def test_minute_precision_and_distinct_births():
+    """Test minute quantization rounds to nearest and distinct births stay distinct"""
+    canon = ChartCanonicalizer(time_precision="minute", coord_decimals=2)
+    a = canon.canonicalize(datetime(1990, 1, 15, 10, 30, 20), "UTC", 28.611, 77.2)
+    b = canon.canonicalize(datetime(1990, 1, 15, 10, 29, 50), "UTC", 28.609, 77.2)
+    c = canon.canonicalize(datetime(1990, 1, 15, 10, 30, 40), "UTC", 28.61, 77.2)
+
+    assert a["instant"] == datetime(1990, 1, 15, 10, 30)
+    assert canon.chart_hash(a) == canon.chart_hash(b)
+    assert canon.chart_hash(a) != canon.chart_hash(c)
+    assert canon.chart_hash(a) != canon.chart_hash({**a, "ayanamsa": "KP"})
+
+
+def test_unknown_precision_rejected():
+    with pytest.raises(ValueError):
+        ChartCanonicalizer(time_precision="hour")
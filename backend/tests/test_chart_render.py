@@ -0,0 +1,77 @@
+import xml.etree.ElementTree as ET
+from app.modules.charts.render import ChartImageCache, chart_renderer
+
+CHART = {
+    "title": "D1 Rasi",
+    "ascendant_rasi": 4,
+    "placements": [
+        ("MOON", 10, 20.0, False), ("SUN", 10, 1.2, False), ("SATURN", 9, 12.5, True),
+        ("RAHU", 11, 3.0, True), ("KETU", 5, 3.0, True), ("MARS", 4, 7.0, False)
+    ]
+}
+
+
+def texts(style, degrees=False):
+    return {item[3]: item for item in chart_renderer.display_list(CHART, style, 400, degrees) if item[0] == "text"}
+
+
+def test_north_indian_places_lagna_in_first_house():
+    """Test signs rotate with the lagna while house positions stay fixed"""
+    labels = texts("north_indian")
+    # House 1 is the top diamond, house 7 the bottom one
+    assert labels["Asc"][1] == 200 and labels["Asc"][2] < 100
+    assert labels["Ma"][1] == 200 and labels["Ma"][2] < 120
+    assert labels["Su"][1] == 200 and labels["Su"][2] > 280
+    assert labels["4"][2] < 200 < labels["10"][2]
+
+
+def test_south_indian_signs_are_fixed():
+    labels = texts("south_indian", degrees=True)
+    # Cancer sits in the right column, second row; Capricorn in the left column, third row
+    assert labels["Asc"][1] == 350 and 100 < labels["Asc"][2] < 200
+    assert labels["Sa 12°(R)"][1] == 50 and labels["Sa 12°(R)"][2] > 300
+    assert "Ra 3°" in labels and "Ke 3°" in labels
+    assert labels["D1 Rasi"][1] == 200
+
+
+def test_svg_is_well_formed_and_deterministic():
+    svg = chart_renderer.svg(CHART, "south_indian", 300, degrees=True)
+    root = ET.fromstring(svg)
+    assert root.get("viewBox") == "0 0 300 300"
+    assert svg == chart_renderer.svg(CHART, "south_indian", 300, degrees=True)
+
+    drawing = chart_renderer.drawing(CHART, "north_indian", 216)
+    assert (drawing.width, drawing.height) == (216, 216)
+
+
+def test_cache_keys_and_tiers(tmp_path):
+    cache = ChartImageCache(str(tmp_path), max_entries=1)
+    key = cache.key("abc", 9, "north_indian", {"size": 400, "degrees": False})
+    assert key == cache.key("abc", 9, "north_indian", {"degrees": False, "size": 400})
+    assert key != cache.key("abc", 9, "south_indian", {"size": 400, "degrees": False})
+
+    renders = []
+    render = lambda: renders.append(1) or b"<svg/>"
+    assert cache.get_or_render(key, render) == b"<svg/>"
+    cache.get_or_render("0" * 64, render)
+    # Evicted from memory but still on disk
+    assert cache.get_or_render(key, render) == b"<svg/>"
+    assert len(renders) == 2 and cache.stats["disk_hits"] == 1
+
+    # A fresh process shares the files
+    assert ChartImageCache(str(tmp_path)).get(key) == b"<svg/>"
+
+
+def test_cache_directory_failures_are_logged(tmp_path, caplog):
+    """Test an unusable cache path still serves from memory but is reported"""
+    assert ChartImageCache(str(tmp_path)).get("0" * 64) is None
+    assert caplog.records == []
+
+    blocked = tmp_path / "not_a_directory"
+    blocked.write_text("")
+    cache = ChartImageCache(str(blocked))
+    key = "1" * 64
+    cache.put(key, b"<svg/>")
+    assert cache.get(key) == b"<svg/>"
+    assert [r.levelname for r in caplog.records] == ["WARNING"]
+    assert key in caplog.records[0].getMessage()
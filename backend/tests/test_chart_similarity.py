@@ -0,0 +1,95 @@
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models.chart import NatalChart, PlanetaryPosition
+from app.modules.charts.similarity import ChartSimilarityIndex, chart_encoder, BODIES, DIMENSION, FEATURES
+
+
+def random_chart(rng):
+    return rng.uniform(0, 360), {b: rng.uniform(0, 360) for b in BODIES[1:]}
+
+
+def build_index(path, count=300, seed=7):
+    rng = np.random.default_rng(seed)
+    index = ChartSimilarityIndex(str(path))
+    vectors = np.stack([chart_encoder.encode(*random_chart(rng)) for _ in range(count)])
+    index.add(range(1, count + 1), vectors)
+    return index, vectors
+
+
+def test_encoding_layout():
+    """Test each feature group and the one-hot weighting"""
+    vector = chart_encoder.encode(*random_chart(np.random.default_rng(1)))
+    assert vector.shape == (DIMENSION,)
+    assert np.isclose(np.sum(vector[FEATURES["longitudes"]] ** 2), len(BODIES))
+    for name in ["D1", "D9", "D10"]:
+        assert np.isclose(np.sum(vector[FEATURES[name]] ** 2), len(BODIES) / 2)
+
+
+def test_per_feature_distances_sum_to_total(tmp_path):
+    index, vectors = build_index(tmp_path)
+    results = index.search(vectors[0], 5, allowed_ids=range(1, 301))
+
+    assert results[0]["chart_id"] == 1 and results[0]["distance"] == 0
+    for r in results:
+        expected = float(np.sum((vectors[r["chart_id"] - 1] - vectors[0]) ** 2))
+        assert abs(r["distance"] - expected) < 1e-3
+        assert abs(sum(r["features"].values()) - r["distance"]) < 1e-3
+
+
+def test_filtered_graph_search_matches_exact(tmp_path, monkeypatch):
+    """Test HNSW search with an id selector against exact ranking over the same ids"""
+    index, vectors = build_index(tmp_path)
+    allowed = list(range(2, 301, 3))
+    exact = [r["chart_id"] for r in index.search(vectors[0], 5, allowed_ids=allowed)]
+
+    monkeypatch.setattr(settings, "CHART_SIMILARITY_EXACT_LIMIT", 0)
+    graph = [r["chart_id"] for r in index.search(vectors[0], 5, allowed_ids=allowed)]
+    assert set(graph) <= set(allowed)
+    assert graph == exact
+
+
+def test_exclude_and_duplicates(tmp_path):
+    index, vectors = build_index(tmp_path, count=20)
+    index.add([1, 2], vectors[:2])
+    assert index.index.ntotal == 20
+
+    results = index.search(vectors[0], 3, exclude=[1])
+    assert 1 not in [r["chart_id"] for r in results]
+
+
+def test_saved_index_reloads(tmp_path):
+    index, vectors = build_index(tmp_path, count=50)
+    index.save()
+    reloaded = ChartSimilarityIndex(str(tmp_path))
+    assert reloaded.chart_ids == set(range(1, 51))
+    assert np.allclose(reloaded.vectors([7]), vectors[6:7])
+
+
+def test_unreadable_index_is_rebuilt_from_the_table(tmp_path):
+    """Test a truncated index file falls back to an empty index and a forced sync"""
+    index, _ = build_index(tmp_path, count=20)
+    index.save()
+    assert [p.name for p in tmp_path.iterdir()] == ["index.faiss"]
+    data = (tmp_path / "index.faiss").read_bytes()
+    (tmp_path / "index.faiss").write_bytes(data[:len(data) // 2])
+
+    engine = create_engine("sqlite://")
+    NatalChart.__table__.create(engine)
+    PlanetaryPosition.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    ascendant, longitudes = random_chart(np.random.default_rng(3))
+    db.add(NatalChart(id=1, profile_id=1, julian_day=2447906.7, ascendant=ascendant))
+    db.add_all([
+        PlanetaryPosition(natal_chart_id=1, planet=planet, longitude=longitude)
+        for planet, longitude in longitudes.items()
+    ])
+    db.commit()
+
+    reloaded = ChartSimilarityIndex(str(tmp_path))
+    assert reloaded.chart_ids == set() and reloaded.needs_rebuild
+    assert reloaded.sync(db) == 1
+    assert reloaded.chart_ids == {1} and not reloaded.needs_rebuild
+    assert ChartSimilarityIndex(str(tmp_path)).chart_ids == {1}
@@ -0,0 +1,65 @@
+import numpy as np
+from app.modules.compatibility.calculator import compatibility_calculator
+from app.modules.compatibility.matrix import (
+    ashtakoot_table, moon_state, manglik_screen, KOOTAS
+)
+from app.modules.ephemeris.calculator import ephemeris
+
+
+def moon_chart(longitude: float) -> dict:
+    nakshatra, _ = ephemeris.get_nakshatra(longitude)
+    return {"planets": {"MOON": {"rasi": ephemeris.get_rasi(longitude), "nakshatra": nakshatra}}}
+
+
+def test_table_matches_calculate_ashtakoot():
+    """Test that every table cell equals the per-pair calculation"""
+    centers = (np.arange(108) + 0.5) * (360.0 / 108)
+
+    for male_lon in centers[::7]:
+        for female_lon in centers:
+            expected = compatibility_calculator.calculate_ashtakoot(moon_chart(male_lon), moon_chart(female_lon))
+            male, female = moon_state(male_lon), moon_state(female_lon)
+            assert ashtakoot_table.totals[male, female] == expected["total"]
+            breakdown = ashtakoot_table.breakdown(male, female)
+            for koot in KOOTAS:
+                assert breakdown[koot]["score"] == expected["scores"][koot][0]
+                assert breakdown[koot]["description"] == expected["scores"][koot][1]
+
+
+def test_score_matrix_against_many_candidates():
+    """Test one-to-many scoring against 100k candidates"""
+    rng = np.random.default_rng(7)
+    longitudes = rng.uniform(0, 360, 100_000)
+    candidates = moon_state(longitudes)
+
+    scores = ashtakoot_table.score_matrix([moon_state(123.4)], candidates)
+
+    assert scores.shape == (1, 100_000)
+    assert scores.max() <= 36
+    for i in rng.choice(100_000, 200, replace=False):
+        expected = compatibility_calculator.calculate_ashtakoot(moon_chart(123.4), moon_chart(longitudes[i]))
+        assert scores[0, i] == expected["total"]
+
+
+def test_manglik_screen_matches_check_manglik():
+    """Test vectorized Manglik screen against check_manglik"""
+    rng = np.random.default_rng(3)
+    mars = rng.integers(1, 13, 200)
+    asc = rng.integers(1, 13, 200)
+    jupiter = rng.integers(1, 13, 200)
+    strong = rng.random(200) < 0.2
+
+    screen = manglik_screen(mars, asc, jupiter, strong)
+
+    for i in range(200):
+        chart = {
+            "ascendant": (asc[i] - 1) * 30.0 + 15,
+            "planets": {
+                "MARS": {"rasi": int(mars[i]), "dignity": "Own" if strong[i] else "Neutral"},
+                "JUPITER": {"rasi": int(jupiter[i])}
+            }
+        }
+        expected = compatibility_calculator.check_manglik(chart)
+        assert screen["is_manglik"][i] == expected["is_manglik"]
+        assert screen["mars_house"][i] == expected["mars_house"]
+        assert screen["cancelled"][i] == expected["cancelled"]
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.chart import PlanetaryPosition
+from app.models.compatibility import CompatibilityIndexEntry
+from app.models.profile import Profile
+from app.modules.compatibility.matrix import ashtakoot_table, moon_state
+from app.modules.compatibility.search import compatibility_search, haversine_km
+
+
+def test_ranked_buckets_cover_all_states_best_first():
+    """Test that bucket groups are disjoint, complete and in descending score order"""
+    for side in ("male", "female"):
+        groups = compatibility_search.ranked_buckets(40, side)
+        scores = [score for score, _ in groups]
+        states = [state for _, group in groups for state in group]
+
+        assert scores == sorted(scores, reverse=True)
+        assert sorted(states) == list(range(108))
+
+
+def test_ranked_buckets_scores_match_table():
+    """Test that each bucket's score is the table score for the pair"""
+    for score, states in compatibility_search.ranked_buckets(17, "male"):
+        for state in states:
+            assert ashtakoot_table.totals[17, state] == score
+
+    for score, states in compatibility_search.ranked_buckets(17, "female"):
+        for state in states:
+            assert ashtakoot_table.totals[state, 17] == score
+
+
+def test_haversine_distance():
+    """Test great-circle distance between Delhi and Mumbai"""
+    assert haversine_km(28.6139, 77.2090, 19.0760, 72.8777) == pytest.approx(1150, abs=10)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    for model in (Profile, PlanetaryPosition, CompatibilityIndexEntry):
+        model.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def add_profile(db, profile_id, moon, mars_rasi=3, user_id=1):
+    """Profile whose (fake) chart id equals its profile id; the ascendant is in Aries"""
+    db.add(Profile(
+        id=profile_id, user_id=user_id, name=f"P{profile_id}", birth_date=datetime(1990, 1, 1),
+        birth_time="10:00:00", birth_place="X", latitude=28.6, longitude=77.2, timezone="Asia/Kolkata"
+    ))
+    for planet, longitude, rasi in [("MOON", moon, int(moon / 30) + 1), ("MARS", mars_rasi * 30 - 15, mars_rasi),
+                                    ("JUPITER", 15.0, 1)]:
+        db.add(PlanetaryPosition(natal_chart_id=profile_id, planet=planet, longitude=longitude, rasi=rasi, dignity="Neutral"))
+    db.commit()
+
+
+def chart_loader(profile, db):
+    return SimpleNamespace(id=profile.id, ascendant=10.0)
+
+
+def add_entry(db, profile_id, state, manglik=0, latitude=28.6, longitude=77.2):
+    db.add(CompatibilityIndexEntry(
+        profile_id=profile_id, user_id=1, moon_state=state, is_manglik=manglik,
+        birth_date=datetime(1990, 1, 1), latitude=latitude, longitude=longitude
+    ))
+    db.commit()
+
+
+def test_sync_indexes_new_and_updated_profiles(db):
+    add_profile(db, 1, moon=100.0, mars_rasi=7)
+    add_profile(db, 2, moon=200.0)
+    add_profile(db, 3, moon=50.0, user_id=2)
+
+    assert compatibility_search.sync(db, 1, chart_loader) == 2
+    entries = {e.profile_id: e for e in db.query(CompatibilityIndexEntry)}
+    assert set(entries) == {1, 2}
+    assert entries[1].moon_state == moon_state(100.0) and entries[1].is_manglik == 1
+    assert entries[2].moon_state == moon_state(200.0) and entries[2].is_manglik == 0
+
+    # Nothing changed, nothing reindexed
+    assert compatibility_search.sync(db, 1, chart_loader) == 0
+
+    profile = db.get(Profile, 2)
+    profile.updated_at = datetime.utcnow() + timedelta(seconds=1)
+    db.query(PlanetaryPosition).filter(
+        PlanetaryPosition.natal_chart_id == 2, PlanetaryPosition.planet == "MOON"
+    ).update({"longitude": 300.0})
+    db.commit()
+
+    assert compatibility_search.sync(db, 1, chart_loader) == 1
+    assert db.query(CompatibilityIndexEntry).filter_by(profile_id=2).one().moon_state == moon_state(300.0)
+
+
+def test_search_walks_buckets_best_first_with_filters(db):
+    groups = compatibility_search.ranked_buckets(40, "male")
+    best, worst = groups[0][1][0], groups[-1][1][0]
+    add_entry(db, 1, 40, manglik=1)
+    add_entry(db, 2, worst)
+    add_entry(db, 3, best)
+    add_entry(db, 4, best, manglik=1)
+    add_entry(db, 5, best, latitude=19.08, longitude=72.88)
+    query = db.query(CompatibilityIndexEntry).filter_by(profile_id=1).one()
+
+    result = compatibility_search.search(db, 1, query, k=10)
+    ids = [m["profile_id"] for m in result["matches"]]
+    assert ids[:3] == [3, 4, 5] and ids[-1] == 2
+    assert result["matches"][0]["total"] == groups[0][0]
+
+    manglik = compatibility_search.search(db, 1, query, k=10, manglik_match=True)
+    assert [m["profile_id"] for m in manglik["matches"]] == [4]
+
+    # Mumbai is ~1150 km from Delhi
+    nearby = compatibility_search.search(db, 1, query, k=10, near=(28.6, 77.2), radius_km=500)
+    assert 5 not in [m["profile_id"] for m in nearby["matches"]]
+    assert compatibility_search.search(db, 1, query, k=1)["matches"][0]["profile_id"] == 3
+
+
+def test_radius_filter_wraps_at_antimeridian(db):
+    add_entry(db, 1, 40)
+    add_entry(db, 2, 41, latitude=-17.7, longitude=-179.9)
+    add_entry(db, 3, 42, latitude=-17.7, longitude=179.9)
+    query = db.query(CompatibilityIndexEntry).filter_by(profile_id=1).one()
+
+    for near in [(-17.7, 179.95), (-17.7, -179.95)]:
+        result = compatibility_search.search(db, 1, query, k=10, near=near, radius_km=100)
+        assert sorted(m["profile_id"] for m in result["matches"]) == [2, 3]
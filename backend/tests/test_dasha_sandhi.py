@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+import numpy as np
+from app.modules.dasha.calculator import VimshottariDasha
+from app.modules.dasha.sandhi import sandhi_detector
+
+
+def person(pid, dates, level="maha"):
+    return {
+        "id": pid,
+        "times": np.array(dates, dtype="datetime64[s]"),
+        "levels": np.zeros(len(dates), dtype=np.uint8) if level == "maha" else np.ones(len(dates), dtype=np.uint8),
+        "from_lords": ["A/A"] * len(dates),
+        "to_lords": ["B/B"] * len(dates)
+    }
+
+
+def test_transitions_match_maha_dashas():
+    """Test that Maha transitions are the Maha Dasha start dates after birth"""
+    birth = datetime(1990, 5, 15, 10, 30)
+    mahas = VimshottariDasha(birth, 123.4).calculate_maha_dashas(120)
+    result = sandhi_detector.transitions(birth, 123.4, levels=["maha"])
+
+    expected = np.array([m["start_date"] for m in mahas[1:]], dtype="datetime64[s]")
+    assert np.array_equal(result["times"], expected)
+    assert result["from_lords"][0].split("/")[0] == mahas[0]["lord"]
+    assert result["to_lords"][0] == f"{mahas[1]['lord']}/{mahas[1]['lord']}"
+
+
+def test_antar_transitions_exclude_maha_boundaries():
+    """Test that a Maha change is reported once, at the Maha level"""
+    birth = datetime(1985, 1, 1, 6, 0)
+    result = sandhi_detector.transitions(birth, 10.0)
+    maha_times = set(sandhi_detector.transitions(birth, 10.0, levels=["maha"])["times"].tolist())
+
+    assert np.all(np.diff(result["times"].astype(np.int64)) > 0)
+    for t, level in zip(result["times"].tolist(), result["levels"]):
+        assert (level == 0) == (t in maha_times)
+
+
+def test_detect_matches_pairwise_check():
+    """Test sweep windows against a brute-force pairwise comparison"""
+    rng = np.random.default_rng(11)
+    base = datetime(2000, 1, 1)
+    people = [
+        person(i, sorted(base + timedelta(days=int(d)) for d in rng.integers(0, 20000, 15)))
+        for i in range(4)
+    ]
+    windows = sandhi_detector.detect(people, tolerance_days=90)
+
+    in_window = set()
+    for window in windows:
+        assert len(window["profile_ids"]) >= 2
+        for entry in window["transitions"]:
+            in_window.add((entry["profile_id"], entry["date"]))
+
+    # Every transition with another person's transition within tolerance is covered
+    for a in people:
+        for t in a["times"]:
+            close = any(
+                abs((t - u).astype(int)) <= 90 * 86400
+                for b in people if b["id"] != a["id"] for u in b["times"]
+            )
+            if close:
+                assert (a["id"], t.astype(datetime).isoformat()) in in_window
+
+
+def test_detect_ignores_single_person_clusters_and_filters_dates():
+    """Test that one person's close transitions are not a shared sandhi"""
+    a = person(1, ["2020-01-01", "2020-02-01"])
+    b = person(2, ["2030-01-01", "2030-03-01"])
+    assert sandhi_detector.detect([a, b], tolerance_days=120) == []
+
+    c = person(3, ["2030-02-01"])
+    windows = sandhi_detector.detect([a, b, c], tolerance_days=120, min_people=2)
+    assert len(windows) == 1
+    assert windows[0]["profile_ids"] == [2, 3]
+    assert windows[0]["start"] == "2030-01-01T00:00:00"
+
+    assert sandhi_detector.detect([a, b, c], tolerance_days=120, end=datetime(2025, 1, 1)) == []
+    assert sandhi_detector.detect([a, b, c], tolerance_days=120, min_people=3) == []
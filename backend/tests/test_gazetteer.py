@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from app.modules.geo.gazetteer import Gazetteer, GazetteerIndex, normalize
+
+PLACES = [
+    {"name": "New Delhi", "ascii_name": "New Delhi", "country": "IN", "admin1": "07",
+     "latitude": 28.6139, "longitude": 77.2090, "population": 317797, "timezone": "Asia/Kolkata"},
+    {"name": "Delhi", "ascii_name": "Delhi", "country": "IN", "admin1": "07",
+     "latitude": 28.6519, "longitude": 77.2315, "population": 10927986, "timezone": "Asia/Kolkata"},
+    {"name": "Mumbai", "ascii_name": "Mumbai", "country": "IN", "admin1": "16",
+     "latitude": 19.0728, "longitude": 72.8826, "population": 12691836, "timezone": "Asia/Kolkata"},
+    {"name": "Newark", "ascii_name": "Newark", "country": "US", "admin1": "NJ",
+     "latitude": 40.7357, "longitude": -74.1724, "population": 281944, "timezone": "America/New_York"},
+    {"name": "New York City", "ascii_name": "New York City", "country": "US", "admin1": "NY",
+     "latitude": 40.7143, "longitude": -74.0060, "population": 8804190, "timezone": "America/New_York"},
+    {"name": "São Paulo", "ascii_name": "Sao Paulo", "country": "BR", "admin1": "27",
+     "latitude": -23.5475, "longitude": -46.6361, "population": 10021295, "timezone": "America/Sao_Paulo"},
+]
+
+
+@pytest.fixture(scope="module")
+def saved(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("gazetteer"))
+    Gazetteer.from_places(PLACES).save(path)
+    return Gazetteer.load(path)
+
+
+def test_normalize():
+    assert normalize("  São   Paulo ") == "sao paulo"
+    assert normalize("Saint-Denis") == "saint denis"
+
+
+def test_search_ranks_prefix_matches_by_population(saved):
+    """Test short (trie node) and long (key range) prefixes"""
+    assert [p["name"] for p in saved.search("new")] == ["New York City", "New Delhi", "Newark"]
+    assert [p["name"] for p in saved.search("new d")] == ["New Delhi"]
+    assert [p["name"] for p in saved.search("Del", 1)] == ["Delhi"]
+    assert [p["name"] for p in saved.search("sao pa")] == ["São Paulo"]
+    assert [p["name"] for p in saved.search("são")] == ["São Paulo"]
+    assert saved.search("xyz") == []
+    assert saved.search("   ") == []
+
+
+def test_reverse_lookup(saved):
+    """Test nearest-place timezone and the offshore fallback"""
+    near_delhi = saved.reverse(28.70, 77.10)
+    assert near_delhi["timezone"] == "Asia/Kolkata"
+    assert near_delhi["place"]["name"] == "Delhi"
+    assert near_delhi["distance_km"] < 20
+
+    mid_atlantic = saved.reverse(0.0, -30.0)
+    assert mid_atlantic["place"] is None
+    assert mid_atlantic["timezone"] == "Etc/GMT+2"
+
+
+def test_resolve_fills_missing_fields(saved):
+    index = GazetteerIndex("/nonexistent")
+    index._gazetteer, index._loaded = saved, True
+
+    assert index.resolve("New Delhi, India") == (28.6139, 77.209, "Asia/Kolkata")
+    assert index.resolve("Anywhere", 40.72, -74.0)[2] == "America/New_York"
+    assert index.resolve("Anywhere", 1.0, 2.0, "UTC") == (1.0, 2.0, "UTC")
+    with pytest.raises(ValueError):
+        index.resolve("Atlantis")
+
+
+def test_search_on_large_table_matches_brute_force():
+    """Test trie and key-range autocomplete over 100k places against a linear scan"""
+    rng = np.random.default_rng(1)
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz "))
+    places = [
+        {"name": "".join(rng.choice(letters, 10)).strip() or "x", "latitude": 0.0, "longitude": 0.0,
+         "population": int(p), "timezone": "UTC"}
+        for p in rng.integers(0, 10**6, 100_000)
+    ]
+    gazetteer = Gazetteer.from_places(places)
+    names = [normalize(p["name"]) for p in places]
+
+    for q in ["a", "ab", "abc", "abcd", "mno", "qrst", "zzzzzz"]:
+        expected = sorted(
+            (p["population"] for p, name in zip(places, names) if name.startswith(q)), reverse=True
+        )[:10]
+        results = gazetteer.search(q)
+        assert [p["population"] for p in results] == expected
+        assert all(normalize(p["name"]).startswith(q) for p in results)
@@ -0,0 +1,70 @@
+import bisect
+
+import numpy as np
+from app.modules.charts.kp import kp_calculator, KP_PLANETS, SIGNIFICATOR_LEVELS
+from app.modules.dasha.calculator import VIMSHOTTARI_PERIODS
+from app.modules.ephemeris.calculator import ephemeris
+
+
+def test_249_subs():
+    table = kp_calculator.sub_table()
+    assert len(table) == 249
+    assert table[0] == {"number": 1, "start": 0.0, "end": 0.777778, "sign": 1, "sign_lord": "MARS",
+                        "star_lord": "KETU", "sub_lord": "KETU"}
+    # Krittika's Rahu sub straddles Aries/Taurus and is split into 22 and 23
+    assert (table[21]["sign"], table[21]["star_lord"], table[21]["sub_lord"], table[21]["end"]) == (1, "SUN", "RAHU", 30.0)
+    assert (table[22]["sign"], table[22]["star_lord"], table[22]["sub_lord"]) == (2, "SUN", "RAHU")
+    assert table[-1]["end"] == 360.0
+
+
+def test_sub_spans_follow_vimshottari_proportion():
+    table = kp_calculator.sub_table()
+    ashwini = [row for row in table if row["end"] <= 360.0 / 27.0 + 1e-9]
+    assert [row["sub_lord"] for row in ashwini][:3] == ["KETU", "VENUS", "SUN"]
+    for row in ashwini:
+        expected = (360.0 / 27.0) * VIMSHOTTARI_PERIODS[row["sub_lord"]] / 120.0
+        assert abs((row["end"] - row["start"]) - expected) < 1e-5
+
+
+def test_batch_lookup_matches_bisect():
+    """Test the vectorized lookup over many charts against a per-longitude bisect"""
+    longitudes = np.random.default_rng(5).uniform(0, 360, (200, 9))
+    codes = kp_calculator.lookup(longitudes)
+    assert codes["sub"].shape == (200, 9)
+
+    boundaries = kp_calculator.boundaries.tolist()
+    for lon, sub, sub_sub in zip(longitudes.ravel()[:300], codes["sub"].ravel(), codes["sub_sub"].ravel()):
+        row = bisect.bisect_right(boundaries, lon) - 1
+        assert (sub, sub_sub) == (kp_calculator.sub[row], kp_calculator.sub_sub[row])
+        assert boundaries[row] <= lon < (boundaries[row + 1] if row + 1 < len(boundaries) else 360.0)
+
+
+def test_significators_on_equal_houses():
+    """Test the four significator levels with Aries rising and equal 30° houses"""
+    cusps = np.arange(12) * 30.0
+    positions = {"SUN": 5.0, "MOON": 35.0, "MARS": 185.0, "MERCURY": 10.0, "JUPITER": 95.0,
+                 "VENUS": 40.0, "SATURN": 280.0, "RAHU": 70.0, "KETU": 250.0}
+    longitudes = np.array([positions[p] for p in KP_PLANETS])
+
+    assert kp_calculator.houses(longitudes, cusps)[0].tolist() == [1, 2, 7, 1, 4, 2, 10, 3, 9]
+    significators = kp_calculator.significators(longitudes, cusps)[0]
+    names = dict(zip(SIGNIFICATOR_LEVELS, significators))
+
+    def planets(level, house):
+        return {KP_PLANETS[p] for p in np.flatnonzero(names[level][:, house - 1])}
+
+    assert planets("occupants", 1) == {"SUN", "MERCURY"}
+    assert planets("owners", 1) == {"MARS"}
+    # Nodes own no sign and act for their sign lord: Ketu (Sagittarius) for Jupiter, Rahu (Gemini) for Mercury
+    assert planets("owners", 9) == {"JUPITER", "KETU"}
+    assert planets("owners", 6) == {"MERCURY", "RAHU"}
+    # Ketu occupies the 9th; Sun and Mercury (Ashwini) and Ketu itself (Mula) are in its star
+    assert planets("star_of_occupants", 9) == {"SUN", "MERCURY", "KETU"}
+    # Venus owns the 7th; Bharani (13°20'-26°40') and Purva Phalguni hold no planet here
+    assert planets("star_of_owners", 7) == set()
+
+
+def test_houses_keep_all_twelve_cusps():
+    ascendant, cusps = ephemeris.get_houses(2451545.0, 28.6, 77.2)
+    assert len(cusps) == 12
+    assert abs(cusps[0] - ascendant) < 1e-9
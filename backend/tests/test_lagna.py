@@ -0,0 +1,63 @@
+from datetime import date
+import numpy as np
+import pytest
+from app.modules.ephemeris.calculator import ephemeris
+from app.modules.panchang.lagna import lagna_calculator, DIVISIONS
+
+# Tile centres, where tables are exact
+PLACES = [(28.615, 77.205), (60.005, 10.755), (-45.005, 170.505)]
+
+
+def ascendant_divisions(jds, latitude, longitude, division):
+    with ephemeris.sidereal_mode("LAHIRI"):
+        ascendants = ephemeris.get_ascendant_series(np.asarray(jds), latitude, longitude)
+    return (ascendants // DIVISIONS[division]).astype(int) + 1
+
+
+@pytest.mark.parametrize("latitude,longitude", PLACES)
+@pytest.mark.parametrize("division", ["sign", "nakshatra"])
+def test_boundaries_match_ascendant(latitude, longitude, division):
+    """Test each boundary to within a second and the divisions in between"""
+    for target in [date(2026, 3, 20), date(2026, 6, 21), date(2026, 12, 21)]:
+        table = lagna_calculator.day(target, latitude, longitude, division=division)
+        starts, values = table["starts"], table["values"]
+        middles = (starts + np.append(starts[1:], table["end"])) / 2
+
+        assert np.array_equal(ascendant_divisions(middles, latitude, longitude, division), values)
+        assert np.array_equal(ascendant_divisions(starts[1:] + 0.5 / 86400, latitude, longitude, division), values[1:])
+        assert np.array_equal(ascendant_divisions(starts[1:] - 0.5 / 86400, latitude, longitude, division), values[:-1])
+
+
+def test_day_uses_few_house_evaluations(monkeypatch):
+    """Test a day's sign table against the 1,440 samples of a minute scan"""
+    import swisseph as swe
+    calls = {"n": 0}
+    houses_ex2 = swe.houses_ex2
+
+    def counting(*args):
+        calls["n"] += 1
+        return houses_ex2(*args)
+
+    monkeypatch.setattr(swe, "houses_ex2", counting)
+    lagna_calculator.boundaries(np.array([lagna_calculator.day_start(date(2031, 1, 1), 77.2)]), 28.6, 77.2, "LAHIRI")
+    assert calls["n"] < 40
+
+
+def test_year_batch_matches_days():
+    latitude, longitude = PLACES[0]
+    year = lagna_calculator.year(2026, latitude, longitude)
+    for target in [date(2026, 1, 1), date(2026, 7, 4), date(2026, 12, 31)]:
+        day = lagna_calculator.day(target, latitude, longitude)
+        start = lagna_calculator.day_start(target, longitude)
+        mask = (year["starts"] >= start - 1e-9) & (year["starts"] < start + 1)
+        assert np.allclose(year["starts"][mask], day["starts"], atol=1e-8)
+        assert np.array_equal(year["values"][mask], day["values"])
+
+
+def test_segments_span_days_contiguously():
+    latitude, longitude = PLACES[0]
+    start = lagna_calculator.day_start(date(2026, 2, 27), longitude) + 0.3
+    starts, ends, values = lagna_calculator.segments(start, start + 5, latitude, longitude)
+    assert starts[0] <= start < ends[0] and starts[-1] < start + 5 <= ends[-1]
+    assert np.allclose(starts[1:], ends[:-1])
+    assert 55 <= len(starts) <= 65
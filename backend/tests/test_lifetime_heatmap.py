@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+from app.modules.dasha.calculator import VimshottariDasha, VIMSHOTTARI_SEQUENCE
+from app.modules.transits.heatmap import lifetime_heatmap, LIFE_AREAS
+
+BIRTH = datetime(1990, 1, 15, 10, 30)
+MOON = 140.12
+RASIS = {"SUN": 10, "MOON": 5, "MARS": 8, "MERCURY": 10, "JUPITER": 3,
+         "VENUS": 11, "SATURN": 9, "RAHU": 10, "KETU": 4}
+
+
+def test_lifetime_shape():
+    heatmap = lifetime_heatmap.calculate(BIRTH, 12, RASIS, MOON, "LAHIRI", 100)
+
+    assert heatmap["scores"].shape == (1200, len(LIFE_AREAS))
+    assert heatmap["scores"].max() <= 100
+    assert str(heatmap["months"][0]) == "1990-01-01"
+    assert str(heatmap["months"][-1]) == "2089-12-01"
+
+
+def test_dasha_index_matches_calculator():
+    """Test the lords looked up mid-month are the Maha/Antar running then"""
+    heatmap = lifetime_heatmap.calculate(BIRTH, 12, RASIS, MOON, "LAHIRI", 60)
+    calculator = VimshottariDasha(BIRTH, MOON)
+    mahas = calculator.calculate_maha_dashas(61)
+
+    for month in [3, 100, 333, 600, 719]:
+        middle = datetime.combine(heatmap["months"][month].astype(datetime), datetime.min.time()) + timedelta(days=14)
+        maha = next(m for m in mahas if m["start_date"] <= middle < m["end_date"])
+        antar = next(a for a in calculator.calculate_antar_dashas(maha) if a["start_date"] <= middle < a["end_date"])
+        assert VIMSHOTTARI_SEQUENCE[heatmap["maha"][month]] == maha["lord"]
+        assert VIMSHOTTARI_SEQUENCE[heatmap["antar"][month]] == antar["lord"]
+
+
+def test_lord_and_aspect_arithmetic():
+    lords = lifetime_heatmap.lord_matrix(12, RASIS, ["career"])
+    # Pisces lagna: Jupiter owns the 10th (Sagittarius) and 1st; Saturn sits in the 10th
+    assert lords[VIMSHOTTARI_SEQUENCE.index("JUPITER"), 0] == 0.5
+    assert lords[VIMSHOTTARI_SEQUENCE.index("SATURN"), 0] == 1.0
+    assert lords[VIMSHOTTARI_SEQUENCE.index("KETU"), 0] == 0.0
+
+    touch = lifetime_heatmap.touch_matrix("SATURN", ["career"])
+    # Career houses 6, 10, 11: occupied, or aspected by Saturn's 3rd/7th/10th
+    assert touch[10, 0] == 1.0
+    assert touch[4, 0] == 0.5  # 7th from 4 is 10
+    assert touch[2, 0] == 0.5  # 10th from 2 is 11
+    assert touch[3, 0] == 0.0
+
+
+def test_top_windows_are_runs_above_threshold():
+    heatmap = lifetime_heatmap.calculate(BIRTH, 12, RASIS, MOON, "LAHIRI", 100)
+    windows = lifetime_heatmap.top_windows(heatmap, limit=3, threshold=60)
+    months = [str(m) for m in heatmap["months"].astype("datetime64[M]")]
+
+    for column, area in enumerate(heatmap["areas"]):
+        scores = heatmap["scores"][:, column]
+        for window in windows[area]:
+            first, last = months.index(window["start"]), months.index(window["end"])
+            assert (scores[first:last + 1] >= 60).all()
+            assert first == 0 or scores[first - 1] < 60
+            assert last == len(months) - 1 or scores[last + 1] < 60
+            assert window["peak"] == scores[first:last + 1].max()
+        peaks = [w["peak"] for w in windows[area]]
+        assert peaks == sorted(peaks, reverse=True)
+
+    upcoming = lifetime_heatmap.top_windows(heatmap, start=datetime(2040, 1, 1))
+    assert all(w["start"] >= "2040-01" for area in upcoming.values() for w in area)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+import swisseph as swe
+from app.modules.ephemeris.calculator import ephemeris
+from app.modules.muhurta.intervals import IntervalSet
+from app.modules.muhurta.search import muhurta_search
+
+DELHI = (28.6139, 77.2090)
+START = swe.julday(2026, 3, 1, 0.0)
+
+
+def random_set(rng, n):
+    starts = rng.uniform(0, 100, n)
+    return IntervalSet.from_intervals(starts, starts + rng.uniform(0, 5, n))
+
+
+def test_interval_set_operations_match_pointwise_logic():
+    rng = np.random.default_rng(3)
+    points = np.linspace(-1, 106, 20000)
+    for _ in range(20):
+        a, b = random_set(rng, 30), random_set(rng, 30)
+        assert np.all(np.diff(a.starts) > 0) and np.all(a.starts[1:] > a.ends[:-1])
+        assert np.array_equal(a.intersect(b).contains(points), a.contains(points) & b.contains(points))
+        assert np.array_equal(a.union(b).contains(points), a.contains(points) | b.contains(points))
+        inside = (points >= 0) & (points < 105)
+        assert np.array_equal(a.complement(0, 105).contains(points), inside & ~a.contains(points))
+
+
+def test_touching_intervals_merge():
+    merged = IntervalSet.from_intervals([0, 1, 5], [1, 2, 6])
+    assert list(merged) == [(0.0, 2.0), (5.0, 6.0)]
+    assert len(IntervalSet.from_intervals([3], [3])) == 0
+
+
+def test_search_windows_satisfy_constraints():
+    """Test returned windows against direct positions and the panchang day"""
+    required = {
+        "tithi": muhurta_search.normalize("tithi", [2, 3, 5, 7, 10, 11, 13]),
+        "lagna": muhurta_search.normalize("lagna", ["fixed"]),
+        "hora": muhurta_search.normalize("hora", ["benefic"]),
+        "rahu_kalam": muhurta_search.normalize("rahu_kalam", [])
+    }
+    optional = {"nakshatra": muhurta_search.normalize("nakshatra", [4, 8, 13])}
+    windows = muhurta_search.search(START, START + 30, *DELHI, required, optional, min_minutes=10, limit=100)
+    assert windows
+
+    for window in windows:
+        jd = ephemeris.get_julian_day(window["start"]) + 60 / 86400
+        with ephemeris.sidereal_mode("LAHIRI"):
+            series = ephemeris.get_planet_series(np.array([jd]), ["SUN", "MOON"])
+            ascendant = ephemeris.get_ascendant_series(np.array([jd]), *DELHI)[0]
+        elongation = (series["MOON"]["longitude"][0] - series["SUN"]["longitude"][0]) % 360
+        assert int(elongation // 12) + 1 in required["tithi"]
+        assert ephemeris.get_rasi(ascendant) in [2, 5, 8, 11]
+        assert window["details"]["hora"] in required["hora"]
+        assert window["duration_minutes"] >= 10
+        assert ("nakshatra" in window["satisfied"]) == (window["details"]["nakshatra"]["number"] in [4, 8, 13])
+
+    # Windows meeting the optional constraint rank first
+    met = ["nakshatra" in w["satisfied"] for w in windows]
+    assert met == sorted(met, reverse=True)
+
+
+def test_normalize_rejects_bad_values():
+    for name, values in [("tithi", [31]), ("lagna", ["square"]), ("hora", ["PLUTO"]), ("foo", [1])]:
+        with pytest.raises(ValueError):
+            muhurta_search.normalize(name, values)
@@ -0,0 +1,88 @@
+import numpy as np
+from app.modules.ephemeris.calculator import ephemeris
+from app.modules.transits.events import _signed_diff
+from app.modules.transits.natal_index import NatalLongitudeIndex
+
+
+def build_index(longitudes, ayanamsa="LAHIRI", body="MOON"):
+    index = NatalLongitudeIndex()
+    ids = np.arange(1, len(longitudes) + 1, dtype=np.int64)
+    index._partitions[(ayanamsa, body)] = index._merge(None, np.asarray(longitudes, dtype=np.float64), ids)
+    return index
+
+
+def test_lookup_wraps_past_zero():
+    """Test an orb window crossing 0° is split into two ranges"""
+    index = build_index([0.5, 10.0, 180.0, 359.2, 359.9])
+    rows, longitudes = index.lookup("LAHIRI", "MOON", 359.0, 361.0)
+    assert sorted(longitudes.tolist()) == [0.5, 359.2, 359.9]
+
+    rows, longitudes = index.lookup("LAHIRI", "MOON", -0.5, 1.0)
+    assert sorted(longitudes.tolist()) == [0.5, 359.9]
+    assert index.lookup("LAHIRI", "SUN", 0.0, 10.0)[0].size == 0
+
+
+def test_incremental_merge_matches_rebuild():
+    rng = np.random.default_rng(3)
+    values = rng.uniform(0, 360, 500)
+    ids = np.arange(1, 501, dtype=np.int64)
+
+    index = NatalLongitudeIndex()
+    merged = index._merge(None, values[:300], ids[:300])
+    merged = index._merge(merged, values[300:], ids[300:])
+    rebuilt = index._merge(None, values, ids)
+
+    assert np.array_equal(merged[0], rebuilt[0])
+    assert np.all(np.diff(merged[0]) >= 0)
+    assert np.allclose(values[merged[1] - 1], merged[0])
+
+
+def test_sweep_matches_brute_force():
+    """Test hits and exact crossings against a fine scan of the transit"""
+    rng = np.random.default_rng(11)
+    natal = rng.uniform(0, 360, 400)
+    index = build_index(natal, body="SUN")
+    start_jd = 2461041.5
+    end_jd = start_jd + 60
+
+    hits = {h["chart_id"]: h for h in index.sweep("SUN", "SUN", start_jd, end_jd, orb=1.0)}
+
+    jds = np.arange(start_jd, end_jd, 0.02)
+    with ephemeris.sidereal_mode("LAHIRI"):
+        transit = ephemeris.get_planet_series(jds, ["SUN"])["SUN"]["longitude"]
+    separation = np.abs(_signed_diff(transit[:, None], natal[None, :]))
+    expected = set((np.nonzero((separation <= 1.0).any(axis=0))[0] + 1).tolist())
+    assert set(hits) == expected
+
+    for chart_id, hit in hits.items():
+        inside = jds[separation[:, chart_id - 1] <= 1.0]
+        assert abs(hit["start_jd"] - max(inside.min(), start_jd)) < 0.05
+        assert abs(hit["end_jd"] - inside.max()) < 0.05
+        for jd in hit["exact_jds"]:
+            with ephemeris.sidereal_mode("LAHIRI"):
+                lon = ephemeris.get_planet_series([jd], ["SUN"])["SUN"]["longitude"][0]
+            assert abs(_signed_diff(lon, natal[chart_id - 1])) < 0.01
+
+
+def test_sweep_aspect_angle():
+    """Test an opposition finds charts 180° from the transiting planet"""
+    start_jd = 2461041.5
+    with ephemeris.sidereal_mode("LAHIRI"):
+        sun = ephemeris.get_planet_series([start_jd + 5], ["SUN"])["SUN"]["longitude"][0]
+    index = build_index([(sun + 180.0) % 360.0, sun])
+
+    hits = index.sweep("SUN", "MOON", start_jd, start_jd + 10, orb=1.0, angle=180.0)
+    assert [h["chart_id"] for h in hits] == [1]
+    assert len(hits[0]["exact_jds"]) == 1
+
+
+def test_sweep_limited_to_chart_ids():
+    """Test that only the given charts are swept"""
+    start_jd = 2461041.5
+    with ephemeris.sidereal_mode("LAHIRI"):
+        sun = ephemeris.get_planet_series([start_jd + 5], ["SUN"])["SUN"]["longitude"][0]
+    index = build_index([sun, sun + 0.2, sun + 0.4])
+
+    assert [h["chart_id"] for h in index.sweep("SUN", "MOON", start_jd, start_jd + 10)] == [1, 2, 3]
+    assert [h["chart_id"] for h in index.sweep("SUN", "MOON", start_jd, start_jd + 10, chart_ids=[3, 9])] == [3]
+    assert index.sweep("SUN", "MOON", start_jd, start_jd + 10, chart_ids=[]) == []
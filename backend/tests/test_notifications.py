@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models.notification import ScheduledNotification, NotificationCursor
+from app.models.profile import Profile
+from app.modules.dasha.sandhi import sandhi_detector
+from app.modules.notifications.scheduler import (
+    NotificationScheduler, NotificationSink, LocalNotificationSink, get_notification_sink, lead_phrase,
+    notification_scheduler
+)
+
+PROFILE = SimpleNamespace(id=7, user_id=3, name="Asha", timezone="Asia/Kolkata")
+BIRTH = datetime(1990, 1, 15, 10, 30)
+MOON = 123.4
+
+
+def test_golden_moments_are_converted_to_utc_with_lead():
+    start = datetime(2026, 10, 19)
+    items = notification_scheduler.planner.golden_moments(
+        PROFILE, 5, 3, start, start + timedelta(days=2), lambda day: {}, {}
+    )
+    assert len(items) == 2
+    for item in items:
+        assert item["kind"] == "GOLDEN_MOMENT"
+        assert item["event_at"] - item["due_at"] == timedelta(minutes=15)
+        # Moments are local (IST) wall times
+        local_start = datetime.fromisoformat(item["payload"]["start"])
+        assert local_start - item["event_at"] == timedelta(hours=5, minutes=30)
+        assert start <= item["due_at"] < start + timedelta(days=2)
+
+
+def test_dasha_changes_in_window():
+    """Test every Maha/Antar boundary is announced once, a day ahead"""
+    transitions = sandhi_detector.transitions(BIRTH, MOON)
+    boundary = transitions["times"][20].astype(datetime) - timedelta(hours=5, minutes=30)
+
+    window = (boundary - timedelta(days=3), boundary)
+    items = notification_scheduler.planner.dasha_changes(PROFILE, BIRTH, MOON, *window)
+    assert [item["event_at"] for item in items] == [boundary]
+    assert items[0]["due_at"] == boundary - timedelta(hours=24)
+    assert "begins tomorrow" in items[0]["title"]
+    assert items[0]["payload"]["to"] == transitions["to_lords"][20]
+
+    later = notification_scheduler.planner.dasha_changes(PROFILE, BIRTH, MOON, boundary, boundary + timedelta(days=3))
+    assert boundary not in [item["event_at"] for item in later]
+
+
+def test_lead_phrase():
+    assert lead_phrase(timedelta(minutes=15)) == "in 15 minutes"
+    assert lead_phrase(timedelta(hours=24)) == "tomorrow"
+    assert lead_phrase(timedelta(hours=6)) == "in 6 hours"
+
+
+def test_unknown_sink(monkeypatch):
+    assert isinstance(get_notification_sink("local"), LocalNotificationSink)
+    with pytest.raises(ValueError):
+        get_notification_sink("pigeon")
+
+    # Nothing is delivered (or marked sent) until a sink is configured
+    monkeypatch.setattr(settings, "NOTIFICATION_SINK", "")
+    with pytest.raises(ValueError):
+        get_notification_sink()
+    with pytest.raises(TypeError):
+        NotificationSink()
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    for model in (Profile, ScheduledNotification, NotificationCursor):
+        model.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_drain_sends_due_in_order_and_expires_missed(db):
+    """Test batches come out earliest first and started events are not announced"""
+    now = datetime(2026, 10, 19, 12, 0)
+    scheduler = NotificationScheduler()
+    items = [
+        {"kind": "GOLDEN_MOMENT", "due_at": now + timedelta(minutes=m), "event_at": now + timedelta(minutes=m + 15),
+         "title": f"m{m}", "body": None, "payload": {}}
+        for m in [30, -5, -10, -40, 90]
+    ]
+    assert scheduler.enqueue(db, PROFILE, items) == 5
+    assert scheduler.enqueue(db, PROFILE, [dict(items[0])]) == 0
+    db.commit()
+
+    sink = LocalNotificationSink()
+    assert scheduler.drain(db, sink, now, batch_size=2) == {"sent": 1, "expired": 1}
+    assert scheduler.drain(db, sink, now, batch_size=2) == {"sent": 1, "expired": 0}
+    assert scheduler.drain(db, sink, now, batch_size=2) == {"sent": 0, "expired": 0}
+    assert [m["title"] for m in sink.sent] == ["m-10", "m-5"]
+    assert sink.batches == 2
+
+    upcoming = scheduler.upcoming(db, PROFILE.user_id, now=now)
+    assert [m["title"] for m in upcoming] == ["m30", "m90"]
+
+
+def test_failed_sink_keeps_batch_pending(db):
+    now = datetime(2026, 10, 19, 12, 0)
+    scheduler = NotificationScheduler()
+    scheduler.enqueue(db, PROFILE, [{"kind": "DASHA_CHANGE", "due_at": now, "event_at": now + timedelta(days=1),
+                                     "title": "t", "body": None, "payload": {}}])
+    db.commit()
+
+    class FailingSink(LocalNotificationSink):
+        def send(self, batch):
+            raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        scheduler.drain(db, FailingSink(), now)
+    sink = LocalNotificationSink()
+    assert scheduler.drain(db, sink, now)["sent"] == 1
+
+
+def test_refill_plans_never_planned_profiles_first(db):
+    """Test cursorless profiles precede expiring plans, and a single profile can be refilled alone"""
+    now = datetime(2026, 10, 19, 12, 0)
+    for profile_id in (1, 2, 3):
+        db.add(Profile(id=profile_id, user_id=3, name=f"P{profile_id}", birth_date=BIRTH, birth_time="10:30:00",
+                       birth_place="X", latitude=28.6, longitude=77.2, timezone="Asia/Kolkata",
+                       updated_at=now - timedelta(days=1)))
+    for profile_id in (1, 3):
+        db.add(NotificationCursor(profile_id=profile_id, planned_until=now + timedelta(hours=profile_id), updated_at=now))
+    db.commit()
+
+    planned = []
+
+    class RecordingScheduler(NotificationScheduler):
+        def plan_profile(self, profile, start, end, *args):
+            planned.append(profile.id)
+            return []
+
+    scheduler = RecordingScheduler()
+    assert scheduler.refill(db, None, None, now, limit=1) == 1
+    assert planned == [2]
+    assert scheduler.refill(db, None, None, now, profile_id=3) == 1
+    assert planned == [2, 3]
+    assert scheduler.refill(db, None, None, now) == 1
+    assert planned == [2, 3, 1]
+
+
+def test_failed_replan_after_profile_update_drops_stale_plan(db):
+    """Test a changed profile whose chart cannot be loaded keeps none of its old notifications"""
+    now = datetime(2026, 10, 19, 12, 0)
+    db.add(Profile(id=PROFILE.id, user_id=3, name="P1", birth_date=BIRTH, birth_time="10:30:00", birth_place="X",
+                   latitude=28.6, longitude=77.2, timezone="Asia/Kolkata", updated_at=now - timedelta(hours=1)))
+    db.add(NotificationCursor(profile_id=PROFILE.id, planned_until=now + timedelta(hours=40), updated_at=now - timedelta(hours=2)))
+    scheduler = NotificationScheduler()
+    scheduler.enqueue(db, PROFILE, [{"kind": "DASHA_CHANGE", "due_at": now + timedelta(hours=1),
+                                     "event_at": now + timedelta(days=1), "title": "old plan", "body": None,
+                                     "payload": {}}])
+    db.commit()
+
+    def chart_loader(profile, session):
+        raise ValueError("ephemeris unavailable")
+
+    assert scheduler.refill(db, chart_loader, None, now) == 1
+    assert scheduler.upcoming(db, 3, now=now) == []
+    assert db.query(ScheduledNotification).count() == 0
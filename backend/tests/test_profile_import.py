@@ -0,0 +1,162 @@
+import asyncio
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import charts, imports
+from app.models.chart import NatalChart, PlanetaryPosition, DivisionalChart
+from app.models.profile import Profile
+from app.models.profile_import import ProfileImportJob, ProfileImportChunk
+from app.modules.imports.profile_import import profile_import_parser, plan_chunks
+
+CSV = (
+    "name,birth_date,birth_time,birth_place,latitude,longitude,timezone,ayanamsa\n"
+    "Asha,1990-01-15,10:30,New Delhi,28.6139,77.2090,Asia/Kolkata,\n"
+    "Ravi,1985-07-04,23:15:30,Mumbai,19.0760,72.8777,Asia/Kolkata,raman\n"
+    "Bad Date,1990-13-45,10:30,Delhi,28.6,77.2,Asia/Kolkata,\n"
+    ",1990-01-15,10:30,Delhi,28.6,77.2,Asia/Kolkata,\n"
+    "Bad Zone,1990-01-15,10:30,Delhi,28.6,77.2,Mars/Olympus,\n"
+    "Far North,1990-01-15,10:30,Delhi,98.6,77.2,Asia/Kolkata,\n"
+)
+
+
+def test_csv_rows_are_normalized_and_errors_reported_per_row():
+    records = profile_import_parser.parse(CSV.encode(), "people.csv")
+    rows, errors = profile_import_parser.validate(records)
+
+    assert [r["name"] for r in rows] == ["Asha", "Ravi"]
+    assert rows[0]["birth_time"] == "10:30:00"
+    assert rows[0]["ayanamsa"] == "LAHIRI"
+    assert rows[1]["ayanamsa"] == "RAMAN"
+    assert rows[1]["latitude"] == 19.0760
+
+    assert [e["row"] for e in errors] == [3, 4, 5, 6]
+    assert "birth_date" in errors[0]["error"]
+    assert "name" in errors[1]["error"]
+    assert "timezone" in errors[2]["error"]
+    assert "latitude" in errors[3]["error"]
+
+
+def test_json_list_or_wrapped_object():
+    person = {"name": "Asha", "birth_date": "1990-01-15", "birth_time": "10:30", "birth_place": "Delhi",
+              "latitude": 28.6, "longitude": 77.2, "timezone": "Asia/Kolkata"}
+    for payload in ([person], {"profiles": [person]}):
+        records = profile_import_parser.parse(json.dumps(payload).encode(), "people.json")
+        rows, errors = profile_import_parser.validate(records)
+        assert len(rows) == 1 and errors == []
+
+    with pytest.raises(ValueError):
+        profile_import_parser.parse(b'{"name": "Asha"}', "people.json")
+    with pytest.raises(ValueError):
+        profile_import_parser.parse(b"", "people.xlsx")
+
+
+def test_plan_chunks_covers_ids_contiguously():
+    ids = [7, 3, 4, 10, 11, 12, 5]
+    chunks = plan_chunks(ids, 3)
+
+    assert [(c["first_profile_id"], c["last_profile_id"], c["size"]) for c in chunks] == \
+        [(3, 5, 3), (7, 11, 3), (12, 12, 1)]
+    assert [c["chunk_index"] for c in chunks] == [0, 1, 2]
+    assert plan_chunks([], 3) == []
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """File-backed SQLite shared by the test and the chunk runner's own sessions"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'import.db'}")
+    for model in (ProfileImportJob, ProfileImportChunk, Profile, NatalChart, PlanetaryPosition, DivisionalChart):
+        model.__table__.create(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(imports, "SessionLocal", factory)
+    return factory
+
+
+def add_import_job(db, count=5):
+    job = ProfileImportJob(user_id=1, filename="people.csv", status="PRECOMPUTING", total_rows=count,
+                           imported_rows=count, row_errors=[])
+    db.add(job)
+    db.flush()
+    for i in range(count):
+        db.add(Profile(user_id=1, name=f"P{i}", birth_date=datetime(1990, 1, 1 + i), birth_time="10:30:00",
+                       birth_place="Delhi", latitude=28.6, longitude=77.2, timezone="Asia/Kolkata",
+                       import_job_id=job.id))
+    db.flush()
+    chunk = ProfileImportChunk(job_id=job.id, status="PENDING", processed=0, failed=0, errors=[], cursor=None,
+                               **plan_chunks(list(range(1, count + 1)), count)[0])
+    db.add(chunk)
+    db.commit()
+    return job.id, chunk.id
+
+
+class WorkerStopped(BaseException):
+    """Stands in for a worker process dying mid-chunk"""
+
+
+def test_chunk_records_failures_and_resumes_after_interruption(session_factory, monkeypatch):
+    db = session_factory()
+    job_id, chunk_id = add_import_job(db)
+
+    calls = []
+
+    def precompute_profile(profile, days, transits, db):
+        calls.append(profile.id)
+        if profile.id == 2:
+            raise ValueError("no chart")
+        if profile.id == 4 and calls.count(4) == 1:
+            raise WorkerStopped()
+
+    monkeypatch.setattr(imports, "precompute_profile", precompute_profile)
+
+    with pytest.raises(WorkerStopped):
+        imports.precompute_chunk(chunk_id)
+
+    db.expire_all()
+    chunk = db.get(ProfileImportChunk, chunk_id)
+    assert chunk.status == "RUNNING" and chunk.cursor == 3
+    assert (chunk.processed, chunk.failed) == (3, 1)
+    assert chunk.errors == [{"profile_id": 2, "error": "no chart"}]
+    assert db.get(ProfileImportJob, job_id).status == "PRECOMPUTING"
+
+    # Resuming re-dispatches the unfinished chunk, which skips profiles already done
+    tasks = BackgroundTasks()
+    asyncio.run(imports.resume_import(job_id, tasks, SimpleNamespace(id=1), db))
+    asyncio.run(tasks())
+
+    assert calls == [1, 2, 3, 4, 4, 5]
+    db.expire_all()
+    chunk = db.get(ProfileImportChunk, chunk_id)
+    assert chunk.status == "COMPLETED" and chunk.cursor == 5
+    assert (chunk.processed, chunk.failed) == (5, 1)
+    assert db.get(ProfileImportJob, job_id).status == "COMPLETED"
+    db.close()
+
+
+def test_concurrent_chart_insert_reuses_the_stored_chart(session_factory, monkeypatch):
+    """Test a worker losing the chart_hash insert race picks up the winner's chart"""
+    db = session_factory()
+    add_import_job(db, count=1)
+    profile = db.get(Profile, 1)
+    chart_hash = charts.chart_canonicalizer.chart_hash(charts.chart_canonicalizer.for_profile(profile))
+
+    calculate = charts.chart_calculator.calculate_natal_chart
+
+    def calculate_while_another_worker_stores(*args):
+        other = session_factory()
+        other.add(NatalChart(profile_id=99, chart_hash=chart_hash, julian_day=0.0))
+        other.commit()
+        other.close()
+        return calculate(*args)
+
+    monkeypatch.setattr(charts.chart_calculator, "calculate_natal_chart", calculate_while_another_worker_stores)
+
+    natal_chart = charts.get_or_compute_chart(profile, db)
+    assert natal_chart.profile_id == 99
+    assert db.query(NatalChart).count() == 1
+    assert db.get(Profile, 1).chart_hash == chart_hash
+    db.close()
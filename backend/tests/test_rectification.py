@@ -0,0 +1,78 @@
+from datetime import date
+import numpy as np
+import pytest
+from app.modules.charts.rectification import rectification_engine, BODIES
+
+BIRTH_JD = 2447907.71  # 1990-01-15 ~05:02 UT
+PLACES = [(28.6139, 77.2090), (59.9139, 10.7522)]
+
+
+def chart_table(jds, latitude, longitude, vargas):
+    _, columns = rectification_engine.placements(np.asarray(jds), latitude, longitude, "LAHIRI", vargas)
+    return np.column_stack([columns[key] for key in columns])
+
+
+@pytest.mark.parametrize("latitude,longitude", PLACES)
+def test_segments_match_scan(latitude, longitude):
+    """Test segment starts against a 2-second scan of every placement"""
+    vargas = [1, 2, 3, 9, 10, 60]
+    segments = rectification_engine.segments(BIRTH_JD, 45, latitude, longitude, "LAHIRI", vargas)
+
+    grid = np.arange(BIRTH_JD - 45 / 1440, BIRTH_JD + 45 / 1440, 2 / 86400)
+    table = chart_table(grid, latitude, longitude, vargas)
+    changed = np.flatnonzero(np.any(table[1:] != table[:-1], axis=1))
+
+    starts = np.array([s["start_jd"] for s in segments[1:]])
+    assert len(starts) == len(changed)
+    assert np.all(np.abs(starts - grid[changed] - 1 / 86400) <= 1.01 / 86400)
+    assert all(s["changes"] for s in segments[1:])
+    assert segments[0]["end_jd"] == segments[1]["start_jd"]
+
+
+def test_segment_charts_and_changes():
+    """Test each segment's chart and the changes reported at its start"""
+    segments = rectification_engine.segments(BIRTH_JD, 20, *PLACES[0], "LAHIRI")
+    for previous, segment in zip(segments, segments[1:]):
+        for change in segment["changes"]:
+            assert previous["chart"][change["body"]][change["division"]] == change["from"]
+            assert segment["chart"][change["body"]][change["division"]] == change["to"]
+    assert set(segments[0]["chart"]) == set(BODIES)
+    assert all(1 <= v <= 27 for v in segments[0]["chart"]["MOON"].values())
+
+
+def test_boundary_events_list_shared_divisions():
+    """Test a whole-sign boundary is reported once with every varga it bounds"""
+    events = rectification_engine.boundary_events(BIRTH_JD - 0.1, BIRTH_JD + 0.1, *PLACES[0], "LAHIRI")
+    signs = [e for e in events if e["body"] == "ASCENDANT" and e["degree"] % 30 == 0]
+    assert signs
+    assert {"D1", "D9", "D60"} <= set(signs[0]["divisions"])
+    assert "nakshatra" not in signs[0]["divisions"] or signs[0]["degree"] % 120 == 0
+
+
+def test_score_ranks_segments():
+    """Test scores stay in range and rank best first"""
+    segments = rectification_engine.segments(BIRTH_JD, 30, *PLACES[0], "LAHIRI", [1, 9, 10])
+    events = [{"date": date(2015, 2, 10), "kind": "marriage"}, {"date": date(2012, 7, 1), "kind": "career"}]
+    ranked = rectification_engine.score(segments, events)
+
+    assert sorted(r["segment"] for r in ranked) == list(range(len(segments)))
+    scores = [r["score"] for r in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert all(0.0 <= s <= 1.0 for s in scores)
+    assert all(e["maha"] and e["antar"] for r in ranked for e in r["events"])
+
+
+def test_station_crossing_a_boundary_twice(monkeypatch):
+    """Test a body that stations across a boundary yields both crossings"""
+    def body_series(body, jds, latitude, longitude):
+        offset = np.asarray(jds) - BIRTH_JD
+        return (10.05 - 400.0 * offset ** 2) % 360.0, -800.0 * offset
+
+    monkeypatch.setattr(rectification_engine, "body_series", body_series)
+    events = rectification_engine.boundary_events(
+        BIRTH_JD - 30 / 1440, BIRTH_JD + 30 / 1440, *PLACES[0], "LAHIRI", [3]
+    )
+
+    crossing = np.sqrt(0.05 / 400.0)
+    assert [e["degree"] for e in events[::len(BODIES)]] == [10.0, 10.0]
+    assert np.allclose([events[0]["jd"], events[-1]["jd"]], [BIRTH_JD - crossing, BIRTH_JD + crossing], atol=1e-9)
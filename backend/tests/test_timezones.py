@@ -0,0 +1,53 @@
+import random
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import numpy as np
+import pytest
+from app.modules.geo.timezones import timezone_resolver
+
+ZONES = ["Asia/Kolkata", "America/New_York", "Europe/London", "Australia/Lord_Howe", "Asia/Kathmandu"]
+
+
+def zoneinfo_utc(local_dt: datetime, name: str) -> datetime:
+    return local_dt.replace(tzinfo=ZoneInfo(name)).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@pytest.mark.parametrize("name", ZONES)
+def test_matches_zoneinfo_on_random_datetimes(name):
+    """Test table lookups against zoneinfo across 1800-2100"""
+    rng = random.Random(name)
+    for _ in range(500):
+        local_dt = datetime(1800, 1, 1) + timedelta(seconds=rng.randrange(300 * 365 * 86400))
+        assert timezone_resolver.to_utc(local_dt, name) == zoneinfo_utc(local_dt, name)
+
+
+def test_dst_gap_and_fold_follow_zoneinfo():
+    """Test skipped and repeated wall times around New York DST changes"""
+    for local_dt in [datetime(2021, 3, 14, 2, 30), datetime(2021, 11, 7, 1, 30), datetime(1944, 6, 1, 12, 0)]:
+        assert timezone_resolver.to_utc(local_dt, "America/New_York") == zoneinfo_utc(local_dt, "America/New_York")
+
+
+def test_pre_1970_local_mean_time():
+    """Test historical offsets such as Kolkata's pre-standard local time"""
+    assert timezone_resolver.to_utc(datetime(1850, 1, 1, 12, 0), "Asia/Kolkata") == \
+        zoneinfo_utc(datetime(1850, 1, 1, 12, 0), "Asia/Kolkata")
+    assert timezone_resolver.to_utc(datetime(1990, 1, 15, 10, 30), "Asia/Kolkata") == datetime(1990, 1, 15, 5, 0)
+
+
+def test_unknown_zone_and_out_of_range():
+    """Test UTC fallback for unknown zones and zoneinfo fallback outside the table"""
+    assert timezone_resolver.to_utc(datetime(1990, 1, 1), "Mars/Olympus") == datetime(1990, 1, 1)
+    far = datetime(2150, 7, 1, 12, 0)
+    assert timezone_resolver.to_utc(far, "Europe/London") == zoneinfo_utc(far, "Europe/London")
+
+
+def test_to_utc_many_matches_scalar():
+    """Test the vectorized variant against per-row conversion"""
+    rng = random.Random(4)
+    local_dts = [datetime(1900, 1, 1) + timedelta(seconds=rng.randrange(150 * 365 * 86400)) for _ in range(2000)]
+    names = [rng.choice(ZONES + ["Bad/Zone"]) for _ in local_dts]
+
+    result = timezone_resolver.to_utc_many(local_dts, names)
+
+    expected = np.array([timezone_resolver.to_utc(d, n) for d, n in zip(local_dts, names)], dtype="datetime64[s]")
+    assert np.array_equal(result, expected)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Test shared transit snapshot cache"""
+import threading
+import time
+import pytest
+from datetime import datetime, timedelta, timezone
+from app.modules.ephemeris.calculator import ephemeris
+from app.modules.transits.snapshot_cache import TransitSnapshotCache
+
+
+class SlowSnapshotCache(TransitSnapshotCache):
+    """Cache whose computation is slow enough to overlap concurrent misses"""
+
+    def _compute_snapshot(self, ayanamsa, bucket):
+        time.sleep(0.05)
+        return super()._compute_snapshot(ayanamsa, bucket)
+
+
+class TestTransitSnapshotCache:
+    """Test quantization, interpolation and sharing of transit snapshots"""
+
+    def test_boundary_matches_direct_calculation(self):
+        """Test that a bucket boundary returns exact ephemeris positions"""
+        cache = TransitSnapshotCache(step_minutes=60)
+        moment = datetime(2026, 3, 15, 6, 0, tzinfo=timezone.utc)
+
+        cached = cache.get_positions(moment)
+        direct = ephemeris.get_all_planets(ephemeris.get_julian_day(moment))
+
+        for planet, pos in direct.items():
+            assert cached[planet]["longitude"] == pos["longitude"], planet
+
+    def test_moon_interpolation_accuracy(self):
+        """Test that interpolated Moon stays close to the true position"""
+        cache = TransitSnapshotCache(step_minutes=60)
+        start = datetime(2026, 3, 15, tzinfo=timezone.utc)
+
+        for minutes in range(7, 24 * 60, 53):
+            moment = start + timedelta(minutes=minutes)
+            cached = cache.get_positions(moment)["MOON"]["longitude"]
+            direct = ephemeris.get_all_planets(ephemeris.get_julian_day(moment))["MOON"]["longitude"]
+            error = abs((cached - direct + 180) % 360 - 180)
+            assert error < 0.02, f"Moon error {error} at +{minutes}m"
+
+    def test_same_bucket_reuses_snapshot(self):
+        """Test that requests inside one bucket do not recompute"""
+        cache = TransitSnapshotCache(step_minutes=60)
+        start = datetime(2026, 3, 15, 10, 0)
+
+        for minutes in (5, 20, 35, 50):
+            cache.get_positions(start + timedelta(minutes=minutes))
+
+        assert cache.stats["computations"] == 2
+
+    def test_results_are_independent_copies(self):
+        """Test that callers mutating results do not corrupt the cache"""
+        cache = TransitSnapshotCache(step_minutes=60)
+        moment = datetime(2026, 3, 15, 10, 0)
+
+        first = cache.get_positions(moment)
+        first["SATURN"]["rasi"] = 99
+        second = cache.get_positions(moment)
+
+        assert "rasi" not in second["SATURN"]
+
+    def test_lru_eviction(self):
+        """Test that the cache is bounded"""
+        cache = TransitSnapshotCache(step_minutes=60, max_entries=3)
+        start = datetime(2026, 3, 15)
+
+        for hour in range(6):
+            cache.get_positions(start + timedelta(hours=hour))
+
+        assert len(cache._entries) == 3
+
+    def test_concurrent_misses_compute_once(self):
+        """Test that concurrent requests for one bucket share a computation"""
+        cache = SlowSnapshotCache(step_minutes=60)
+        moment = datetime(2026, 3, 15, 10, 0)
+        results = []
+
+        def worker():
+            results.append(cache.get_positions(moment)["MOON"]["longitude"])
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.stats["computations"] == 1
+        assert len(set(results)) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
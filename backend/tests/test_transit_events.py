@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Test global transit events solver and precomputed table"""
+import threading
+import pytest
+import swisseph as swe
+from app.modules.ephemeris.calculator import ephemeris
+from app.modules.transits.events import (
+    TransitEventSolver, TransitEventTable, TransitEventIndex, EVENT_TYPES, EVENT_PLANETS
+)
+
+START_JD = swe.julday(2026, 1, 1, 0.0)
+END_JD = swe.julday(2027, 1, 1, 0.0)
+
+
+@pytest.fixture(scope="module")
+def events():
+    return TransitEventSolver().solve(START_JD, END_JD)
+
+
+class TestTransitEventSolver:
+    """Test solved event times"""
+
+    def test_ingresses_are_exact(self, events):
+        """Test that the sign changes within a second of each ingress"""
+        ingress = EVENT_TYPES.index("INGRESS")
+        second = 1 / 86400
+
+        for event in events[events["type"] == ingress]:
+            planet = EVENT_PLANETS[event["planet"]]
+            before = ephemeris.get_planet_position(event["jd"] - second, planet)["longitude"]
+            after = ephemeris.get_planet_position(event["jd"] + second, planet)["longitude"]
+            assert ephemeris.get_rasi(after) == event["value"]
+            assert ephemeris.get_rasi(before) != event["value"]
+
+    def test_stations_alternate(self, events):
+        """Test that retrograde and direct stations alternate per planet"""
+        retro = EVENT_TYPES.index("STATION_RETRO")
+        direct = EVENT_TYPES.index("STATION_DIRECT")
+
+        for planet in ("MERCURY", "VENUS", "MARS", "JUPITER", "SATURN"):
+            code = EVENT_PLANETS.index(planet)
+            stations = events[(events["planet"] == code) & ((events["type"] == retro) | (events["type"] == direct))]
+            types = list(stations["type"])
+            assert all(a != b for a, b in zip(types, types[1:])), planet
+
+    def test_eclipses_found(self, events):
+        """Test that 2026 has two solar and two lunar eclipses"""
+        assert (events["type"] == EVENT_TYPES.index("SOLAR_ECLIPSE")).sum() == 2
+        assert (events["type"] == EVENT_TYPES.index("LUNAR_ECLIPSE")).sum() == 2
+
+    def test_solver_in_worker_thread(self):
+        """Test that worker threads use the same ayanamsa as the main thread"""
+        results = []
+        solver = TransitEventSolver()
+        thread = threading.Thread(
+            target=lambda: results.append(solver.solve(START_JD, END_JD, ["INGRESS"], ["JUPITER"]))
+        )
+        thread.start()
+        thread.join()
+
+        expected = solver.solve(START_JD, END_JD, ["INGRESS"], ["JUPITER"])
+        assert list(results[0]["jd"]) == list(expected["jd"])
+
+
+class TestTransitEventTable:
+    """Test the memory-mapped event table"""
+
+    def test_table_matches_solver(self, events, tmp_path):
+        """Test that table queries return the solved events"""
+        TransitEventTable.from_events(events, START_JD, END_JD).save(str(tmp_path))
+        index = TransitEventIndex(str(tmp_path))
+        mid_jd = swe.julday(2026, 4, 1, 0.0)
+        later_jd = swe.julday(2026, 9, 1, 0.0)
+
+        found = index.find(mid_jd, later_jd, ["INGRESS", "NAKSHATRA"], ["SUN", "MOON"])
+        expected = events[
+            (events["jd"] >= mid_jd) & (events["jd"] < later_jd)
+            & ((events["type"] == 0) | (events["type"] == 1))
+            & ((events["planet"] == 0) | (events["planet"] == 1))
+        ]
+
+        assert index.table is not None
+        assert list(found["jd"]) == list(expected["jd"])
+
+    def test_falls_back_outside_coverage(self, tmp_path):
+        """Test that ranges outside the table are solved directly"""
+        index = TransitEventIndex(str(tmp_path / "missing"))
+        found = index.find(START_JD, START_JD + 30, ["INGRESS"], ["SUN"])
+
+        assert len(found) == 1
+        assert index.describe(found[0])["rasi"] == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,48 @@
+import pytest
+from datetime import datetime
+from fastapi import HTTPException
+from app.api.transits import (
+    parse_transit_range, compute_transit_columns, MAX_RANGE_DAYS
+)
+from app.modules.ephemeris.calculator import ephemeris
+
+
+def test_planet_series_matches_single_positions():
+    """Test that batched series match per-date planet positions"""
+    dates = [datetime(2026, 1, 1, h) for h in range(0, 24, 6)]
+    jds = [ephemeris.get_julian_day(d) for d in dates]
+    series = ephemeris.get_planet_series(jds)
+
+    for i, jd in enumerate(jds):
+        positions = ephemeris.get_all_planets(jd)
+        for planet, pos in positions.items():
+            assert series[planet]["longitude"][i] == pytest.approx(pos["longitude"], abs=1e-9)
+
+
+def test_range_steps():
+    """Test sample counts for each step"""
+    assert len(parse_transit_range("2026-01-01", "2026-01-02", "hourly", MAX_RANGE_DAYS)) == 25
+    assert len(parse_transit_range("2026-01-01", "2026-01-31", "daily", MAX_RANGE_DAYS)) == 31
+    assert len(parse_transit_range("2026-01-01", "2026-01-31", "weekly", MAX_RANGE_DAYS)) == 5
+
+
+def test_range_limits():
+    """Test that invalid or oversized ranges are rejected"""
+    with pytest.raises(HTTPException):
+        parse_transit_range("2026-01-01", "2027-01-01", "hourly", MAX_RANGE_DAYS)
+    with pytest.raises(HTTPException):
+        parse_transit_range("2026-01-01", "2025-01-01", "daily", MAX_RANGE_DAYS)
+    with pytest.raises(HTTPException):
+        parse_transit_range("2026-01-01", "2026-02-01", "monthly", MAX_RANGE_DAYS)
+
+
+def test_columnar_shape():
+    """Test that columnar output has one value per date for every planet"""
+    dates = parse_transit_range("2026-01-01", "2026-03-01", "daily", MAX_RANGE_DAYS)
+    columns = compute_transit_columns(dates)
+
+    assert len(columns["dates"]) == len(dates)
+    for planet, data in columns["planets"].items():
+        assert len(data["longitude"]) == len(dates)
+        assert all(1 <= r <= 12 for r in data["rasi"])
+    assert columns["planets"]["KETU"]["rasi"][0] == (columns["planets"]["RAHU"]["rasi"][0] + 5) % 12 + 1
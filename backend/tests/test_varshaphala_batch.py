@@ -0,0 +1,32 @@
+from datetime import datetime
+from app.modules.ephemeris.calculator import ephemeris
+from app.modules.varshaphala.calculator import varshaphala_calculator
+
+BIRTH = datetime(1990, 1, 15, 10, 30)
+BIRTH_SUN = ephemeris.get_planet_position(ephemeris.get_julian_day(BIRTH), "SUN")["longitude"]
+
+
+def test_solar_returns_are_exact():
+    """Test that the Sun is back at its natal longitude at every return"""
+    returns = varshaphala_calculator.calculate_varsha_pravesh_batch(BIRTH, BIRTH_SUN, list(range(1991, 2071)))
+
+    assert len(returns) == 80
+    for year, moment in zip(range(1991, 2071), returns):
+        sun = ephemeris.get_planet_position(ephemeris.get_julian_day(moment), "SUN")["longitude"]
+        assert abs((sun - BIRTH_SUN + 180) % 360 - 180) < 1e-4
+        assert moment.year == year
+
+
+def test_batch_matches_single_year():
+    """Test that batched returns and charts equal the single-year path"""
+    years = [2000, 2025, 2050]
+    returns = varshaphala_calculator.calculate_varsha_pravesh_batch(BIRTH, BIRTH_SUN, years)
+    charts = varshaphala_calculator.calculate_annual_charts(returns, 28.6139, 77.2090)
+
+    for year, moment, chart in zip(years, returns, charts):
+        assert varshaphala_calculator.calculate_varsha_pravesh(BIRTH, BIRTH_SUN, year) == moment
+        single = varshaphala_calculator.calculate_annual_chart(moment, 28.6139, 77.2090)
+        assert single["ascendant"] == chart["ascendant"]
+        for planet, pos in single["planets"].items():
+            assert pos["longitude"] == chart["planets"][planet]["longitude"]
+            assert pos["rasi"] == chart["planets"][planet]["rasi"]
@@ -0,0 +1,127 @@
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api import charts
+from app.api.dashas import get_or_compute_dashas
+from app.api.whatif import WhatIfRequest, whatif_params
+from app.models.chart import NatalChart, PlanetaryPosition, DivisionalChart
+from app.models.dasha import Dasha
+from app.models.profile import Profile
+from app.modules.dasha.calculator import VimshottariDasha
+from app.modules.whatif.graph import whatif_graph, diff, NODES, WhatIfSessions
+
+PARAMS = {
+    "instant": datetime(1990, 1, 15, 5, 0),
+    "birth_datetime": datetime(1990, 1, 15, 10, 30),
+    "latitude": 28.6139,
+    "longitude": 77.209,
+    "ayanamsa": "LAHIRI",
+    "date": date(2026, 10, 19)
+}
+
+
+def shift(params, minutes):
+    delta = timedelta(minutes=minutes)
+    return {**params, "instant": params["instant"] + delta, "birth_datetime": params["birth_datetime"] + delta}
+
+
+def test_first_evaluation_computes_every_node():
+    """Test a fresh evaluation runs the whole graph"""
+    state, recomputed = whatif_graph.evaluate(PARAMS)
+    assert recomputed == list(NODES)
+    assert set(state) == set(NODES)
+
+
+def test_minute_shift_keeps_dasha_tree():
+    """Test a one-minute nudge retimes dashas but reuses the tree and rasi-only nodes"""
+    state, _ = whatif_graph.evaluate(PARAMS)
+    shifted = shift(PARAMS, 1)
+    new_state, recomputed = whatif_graph.evaluate(shifted, state)
+
+    assert "dashas" in recomputed
+    for name in ["dasha_tree", "yogas", "ashtakavarga", "remedies", "transits"]:
+        assert name not in recomputed
+        assert new_state[name] is state[name]
+
+    changes = whatif_graph.changes(state, new_state)
+    assert "yogas" not in changes
+    assert any(c["path"].startswith("planets.MOON.longitude") for c in changes["positions"])
+
+
+def test_unchanged_params_reuse_everything():
+    state, _ = whatif_graph.evaluate(PARAMS)
+    _, recomputed = whatif_graph.evaluate(dict(PARAMS), state)
+    assert recomputed == []
+
+
+def test_ayanamsa_change_skips_ephemeris():
+    state, _ = whatif_graph.evaluate(PARAMS)
+    _, recomputed = whatif_graph.evaluate({**PARAMS, "ayanamsa": "RAMAN"}, state)
+    assert "ephemeris" not in recomputed
+    assert "positions" in recomputed
+
+
+def test_retimed_dashas_match_full_calculation():
+    """Test dashas built from the cached tree equal a full Vimshottari calculation"""
+    state, _ = whatif_graph.evaluate(PARAMS)
+    shifted = shift(PARAMS, 7)
+    state, _ = whatif_graph.evaluate(shifted, state)
+
+    moon = state["positions"]["value"]["planets"]["MOON"]["longitude"]
+    calculator = VimshottariDasha(shifted["birth_datetime"], moon)
+    mahas = calculator.calculate_maha_dashas(120)
+    retimed = state["dashas"]["value"]
+
+    assert [m["lord"] for m in mahas] == [m["lord"] for m in retimed]
+    for maha, node in zip(mahas, retimed):
+        assert maha["start_date"].isoformat() == node["start_date"]
+        assert maha["end_date"].isoformat() == node["end_date"]
+        antars = calculator.calculate_antar_dashas(maha)
+        assert [a["end_date"].isoformat() for a in antars] == [a["end_date"] for a in node["antars"]]
+
+
+def test_dashas_match_stored_dashas_for_local_birth_time(monkeypatch):
+    """Test an unedited what-if times dashas like GET /api/dashas, from the local birth time"""
+    engine = create_engine("sqlite://")
+    for model in (Profile, NatalChart, PlanetaryPosition, DivisionalChart, Dasha):
+        model.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    monkeypatch.setattr(charts, "get_chart_similarity_index", lambda: SimpleNamespace(add_chart=lambda *a: None))
+
+    profile = Profile(
+        user_id=1, name="Asha", birth_date=datetime(1990, 1, 15), birth_time="10:30:00",
+        birth_place="New Delhi", latitude=28.6139, longitude=77.209, timezone="Asia/Kolkata", ayanamsa="LAHIRI"
+    )
+    db.add(profile)
+    db.commit()
+
+    stored = get_or_compute_dashas(charts.get_or_compute_chart(profile, db), profile, "VIMSHOTTARI", db)
+    state, _ = whatif_graph.evaluate(whatif_params(profile, WhatIfRequest()))
+
+    stored_mahas = [d for d in stored if d["level"] == "maha"]
+    assert [(d["lord"], d["start_date"]) for d in stored_mahas] == \
+        [(m["lord"], m["start_date"]) for m in state["dashas"]["value"]]
+
+
+def test_diff_paths():
+    old = {"a": 1, "b": {"c": [1, 2], "d": "x"}}
+    new = {"a": 1, "b": {"c": [1, 3], "e": "y"}}
+    assert diff(old, new) == [
+        {"path": "b.c[1]", "from": 2, "to": 3},
+        {"path": "b.d", "from": "x", "to": None},
+        {"path": "b.e", "from": None, "to": "y"}
+    ]
+
+
+def test_sessions_evict_least_recent():
+    sessions = WhatIfSessions(max_sessions=2)
+    sessions.put((1, 1), {})
+    sessions.put((1, 2), {})
+    sessions.get((1, 1))
+    sessions.put((1, 3), {})
+    assert sessions.get((1, 2)) is None
+    assert sessions.get((1, 1)) == {}
+    assert sessions.discard((1, 3))